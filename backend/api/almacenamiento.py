@@ -0,0 +1,178 @@
+"""Almacenamiento de media deduplicado por contenido.
+
+Cada archivo subido se escribe una sola vez en `MEDIA_ROOT/.blobs/` bajo su
+SHA-256: el que trae el contenido en `sha256` (lo deja ahí
+`ArchivoConMetadatosField`) o, si no, uno calculado mientras se transmite.
+Los nombres lógicos que usan los `FileField` (`evaluaciones/rubricas/...`,
+`practicas/documentos/...`) son enlaces duros al blob, de modo que `path()`,
+`servir_media` y la delegación a nginx siguen funcionando sin cambios. El
+contador de enlaces del sistema de archivos es el conteo de referencias: un
+blob con un único enlace ya no tiene nombres lógicos y se elimina.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+
+from .archivos import sha256_conocido
+
+
+logger = logging.getLogger(__name__)
+
+
+DIRECTORIO_BLOBS = ".blobs"
+TAMANO_BLOQUE = 64 * 1024
+
+
+def calcular_sha256(ruta: str | os.PathLike) -> str:
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+class AlmacenamientoDeduplicado(FileSystemStorage):
+    """`FileSystemStorage` que guarda cada contenido distinto una sola vez."""
+
+    # ------------------------------------------------------------------
+    # Blobs
+
+    def directorio_blobs(self) -> Path:
+        return Path(self.location) / DIRECTORIO_BLOBS
+
+    def ruta_blob(self, digest: str) -> Path:
+        return self.directorio_blobs() / digest[:2] / digest
+
+    def referencias(self, name: str) -> int:
+        """Cantidad de nombres lógicos que comparten el contenido de `name`."""
+
+        return max(os.stat(self.path(name)).st_nlink - 1, 0)
+
+    def _crear_directorio(self, directorio: str | os.PathLike) -> None:
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directorio, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directorio, exist_ok=True)
+
+    def _guardar_blob(self, content) -> str:
+        """Escribe `content` como blob y devuelve su SHA-256."""
+
+        temporales = self.directorio_blobs() / "tmp"
+        self._crear_directorio(temporales)
+        conocido = sha256_conocido(content)
+
+        if hasattr(content, "temporary_file_path"):
+            # El archivo ya está en disco (subidas grandes o por fragmentos):
+            # se mueve sin copiarlo.
+            origen = content.temporary_file_path()
+            digest = conocido or calcular_sha256(origen)
+            blob = self.ruta_blob(digest)
+            if blob.exists():
+                os.unlink(origen)
+            else:
+                self._crear_directorio(blob.parent)
+                file_move_safe(origen, str(blob), allow_overwrite=True)
+            return digest
+
+        digest = hashlib.sha256()
+        descriptor, temporal = tempfile.mkstemp(dir=temporales)
+        try:
+            with os.fdopen(descriptor, "wb") as destino:
+                for bloque in content.chunks():
+                    if isinstance(bloque, str):
+                        bloque = bloque.encode("utf-8")
+                    if not conocido:
+                        digest.update(bloque)
+                    destino.write(bloque)
+
+            resultado = conocido or digest.hexdigest()
+            blob = self.ruta_blob(resultado)
+            if blob.exists():
+                os.unlink(temporal)
+            else:
+                self._crear_directorio(blob.parent)
+                os.replace(temporal, blob)
+        except BaseException:
+            try:
+                os.unlink(temporal)
+            except OSError:
+                pass
+            raise
+        return resultado
+
+    def _enlazar(self, blob: Path, destino: str) -> None:
+        try:
+            os.link(blob, destino)
+        except FileExistsError:
+            raise
+        except OSError:
+            # Sistemas de archivos sin enlaces duros: se guarda una copia.
+            logger.warning("No se pudo enlazar %s; se copia el contenido", destino)
+            with open(blob, "rb") as origen, open(destino, "xb") as copia:
+                shutil.copyfileobj(origen, copia, TAMANO_BLOQUE)
+
+    def _podar_blob(self, digest: str) -> None:
+        blob = self.ruta_blob(digest)
+        try:
+            if os.stat(blob).st_nlink <= 1:
+                os.unlink(blob)
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------
+    # API de Storage
+
+    def _save(self, name, content):
+        full_path = self.path(name)
+        self._crear_directorio(os.path.dirname(full_path))
+
+        digest = self._guardar_blob(content)
+        blob = self.ruta_blob(digest)
+
+        while True:
+            try:
+                self._enlazar(blob, full_path)
+            except FileExistsError:
+                if self._allow_overwrite:
+                    os.unlink(full_path)
+                    continue
+                name = self.get_available_name(name)
+                full_path = self.path(name)
+            else:
+                break
+
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+
+        name = os.path.relpath(full_path, self.location)
+        self._ensure_location_group_id(full_path)
+        return str(name).replace("\\", "/")
+
+    def delete(self, name):
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        full_path = self.path(name)
+        try:
+            info = os.stat(full_path)
+        except FileNotFoundError:
+            return
+
+        # Solo cuando este nombre es la última referencia hace falta ubicar
+        # el blob, lo que exige recalcular el hash.
+        digest = calcular_sha256(full_path) if info.st_nlink == 2 else None
+        super().delete(name)
+        if digest:
+            self._podar_blob(digest)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Registran las señales de invalidación.
+        from . import (  # noqa: F401
+            cache_lecturas,
+            conteos,
+            dashboard,
+            directorio_usuarios,
+            resumen_notas,
+        )
@@ -0,0 +1,172 @@
+"""Metadatos persistidos de archivos y construcción rápida de sus URLs.
+
+`ArchivoConMetadatosField` es un `FileField` que, al guardar un archivo,
+registra tamaño, tipo MIME, nombre original y SHA-256 en columnas hermanas
+del modelo (`<campo>_tamano`, `<campo>_tipo`, `<campo>_nombre_original` y
+`<campo>_sha256`), de la misma forma en que `ImageField` mantiene
+`width_field`/`height_field`. El SHA-256 se calcula una vez y viaja en el
+contenido hasta el almacenamiento, que lo usa para deduplicar. El tipo MIME
+sale de la extensión; el que declara el cliente solo se acepta si la
+extensión no dice nada y es un tipo conocido.
+
+Los serializadores leen esas columnas en vez de consultar el almacenamiento,
+y `url_archivo` arma la URL con `MEDIA_URL` y el nombre guardado (la media se
+sirve siempre desde `servir_media`), calculando la base absoluta una sola vez
+por request.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.utils.encoding import filepath_to_uri
+
+
+TAMANO_BLOQUE = 64 * 1024
+TIPO_POR_DEFECTO = "application/octet-stream"
+SUFIJOS_METADATOS = ("tamano", "tipo", "nombre_original", "sha256")
+_TIPO_MIME = re.compile(r"^[a-z0-9][\w!#$&^.+-]*/[a-z0-9][\w!#$&^.+-]*$")
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+def adivinar_tipo(nombre: str | None) -> str:
+    tipo, _ = mimetypes.guess_type(nombre or "")
+    return tipo or TIPO_POR_DEFECTO
+
+
+def tipo_de_contenido(nombre: str, declarado: str | None) -> str:
+    """Tipo MIME de un archivo subido; la extensión prima sobre lo declarado."""
+
+    tipo = adivinar_tipo(nombre)
+    if tipo != TIPO_POR_DEFECTO:
+        return tipo
+    declarado = (declarado or "").split(";", 1)[0].strip().lower()
+    if _TIPO_MIME.match(declarado) and mimetypes.guess_extension(declarado):
+        return declarado
+    return TIPO_POR_DEFECTO
+
+
+def sha256_conocido(content) -> str | None:
+    """SHA-256 ya calculado para `content` (ver `ArchivoConMetadatos.save`)."""
+
+    digest = getattr(content, "sha256", None)
+    return digest if isinstance(digest, str) and _SHA256.match(digest) else None
+
+
+def calcular_sha256_contenido(content) -> str:
+    ruta_temporal = getattr(content, "temporary_file_path", None)
+    digest = hashlib.sha256()
+    if ruta_temporal is not None:
+        with open(ruta_temporal(), "rb") as archivo:
+            for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b""):
+                digest.update(bloque)
+        return digest.hexdigest()
+
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for bloque in content.chunks(TAMANO_BLOQUE):
+        if isinstance(bloque, str):
+            bloque = bloque.encode("utf-8")
+        digest.update(bloque)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def metadatos_de_contenido(nombre: str, content) -> dict:
+    return {
+        "tamano": content.size,
+        "tipo": tipo_de_contenido(nombre, getattr(content, "content_type", None)),
+        "nombre_original": Path(nombre).name[:255],
+        "sha256": sha256_conocido(content) or calcular_sha256_contenido(content),
+    }
+
+
+class ArchivoConMetadatos(FieldFile):
+    def save(self, name, content, save=True):
+        metadatos = metadatos_de_contenido(name, content)
+        for sufijo, valor in metadatos.items():
+            setattr(self.instance, f"{self.field.name}_{sufijo}", valor)
+        try:
+            # El almacenamiento lo reutiliza en vez de volver a leer el contenido.
+            content.sha256 = metadatos["sha256"]
+        except AttributeError:
+            pass
+        super().save(name, content, save=save)
+
+    save.alters_data = True
+
+    def delete(self, save=True):
+        for sufijo in SUFIJOS_METADATOS:
+            setattr(self.instance, f"{self.field.name}_{sufijo}", None if sufijo == "tamano" else "")
+        super().delete(save=save)
+
+    delete.alters_data = True
+
+
+class ArchivoConMetadatosField(models.FileField):
+    """`FileField` que mantiene las columnas de metadatos de su archivo."""
+
+    attr_class = ArchivoConMetadatos
+
+
+# ----------------------------------------------------------------------
+# Lectura desde serializadores
+
+
+def _metadato(instancia, campo: str, sufijo: str):
+    return getattr(instancia, f"{campo}_{sufijo}", None)
+
+
+def tipo_archivo(instancia, campo: str) -> str | None:
+    archivo = getattr(instancia, campo)
+    if not archivo:
+        return None
+    return _metadato(instancia, campo, "tipo") or adivinar_tipo(archivo.name)
+
+
+def nombre_archivo(instancia, campo: str) -> str:
+    archivo = getattr(instancia, campo)
+    if not archivo:
+        return ""
+    return _metadato(instancia, campo, "nombre_original") or Path(archivo.name).name
+
+
+def base_absoluta(request) -> str:
+    """`scheme://host` del request, calculado una sola vez por request."""
+
+    base = getattr(request, "_base_absoluta_archivos", None)
+    if base is None:
+        base = request.build_absolute_uri("/").rstrip("/")
+        try:
+            request._base_absoluta_archivos = base
+        except AttributeError:
+            pass
+    return base
+
+
+def url_archivo(archivo, request=None) -> str | None:
+    if not archivo:
+        return None
+    url = urljoin(settings.MEDIA_URL, filepath_to_uri(archivo.name).lstrip("/"))
+    if request is None or not url.startswith("/"):
+        return url
+    return base_absoluta(request) + url
+
+
+def campos_con_metadatos():
+    """Pares `(modelo, campo)` que usan `ArchivoConMetadatosField`."""
+
+    from django.apps import apps
+
+    for modelo in apps.get_app_config("api").get_models():
+        for campo in modelo._meta.concrete_fields:
+            if isinstance(campo, ArchivoConMetadatosField):
+                yield modelo, campo
@@ -0,0 +1,71 @@
+"""Tokens firmados para identificar al usuario sin consultar la base.
+
+`login_view` entrega un token `django.core.signing` con el id, el rol y la
+carrera del usuario. `TokenFirmadoAuthentication` lo valida con HMAC (usando
+`SECRET_KEY`) y deja en `request.user` una instancia de `Usuario` construida
+con esos tres campos; el resto de los campos queda diferido y solo se lee de
+la base si una vista lo usa.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core import signing
+from django.db import router
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import Usuario
+
+
+SAL_TOKEN = "api.autenticacion.token"
+PREFIJO = b"bearer"
+CAMPOS_TOKEN = ("id", "rol", "carrera")
+
+
+def duracion_token() -> int:
+    """Segundos de validez de un token (`AUTH_TOKEN_DURACION`, 12 horas por defecto)."""
+
+    return int(getattr(settings, "AUTH_TOKEN_DURACION", 12 * 3600))
+
+
+def emitir_token(usuario: Usuario) -> str:
+    return signing.dumps(
+        [getattr(usuario, campo) for campo in CAMPOS_TOKEN],
+        salt=SAL_TOKEN,
+        compress=True,
+    )
+
+
+def usuario_desde_token(token: str) -> Usuario:
+    """Reconstruye el usuario del token; lanza `signing.BadSignature` si no es válido."""
+
+    valores = dict(
+        zip(CAMPOS_TOKEN, signing.loads(token, salt=SAL_TOKEN, max_age=duracion_token()))
+    )
+    # `from_db` espera los valores en el orden de los campos del modelo.
+    campos = [campo.attname for campo in Usuario._meta.concrete_fields if campo.attname in valores]
+    return Usuario.from_db(
+        router.db_for_read(Usuario), campos, [valores[campo] for campo in campos]
+    )
+
+
+class TokenFirmadoAuthentication(BaseAuthentication):
+    """Autenticación DRF con `Authorization: Bearer <token>`."""
+
+    def authenticate(self, request):
+        partes = get_authorization_header(request).split()
+        if not partes or partes[0].lower() != PREFIJO:
+            return None
+        if len(partes) != 2:
+            raise AuthenticationFailed("Encabezado de autorización inválido.")
+
+        try:
+            token = partes[1].decode()
+            usuario = usuario_desde_token(token)
+        except (UnicodeError, ValueError, signing.BadSignature):
+            raise AuthenticationFailed("Token inválido o expirado.")
+        return usuario, token
+
+    def authenticate_header(self, request) -> str:
+        return "Bearer"
@@ -0,0 +1,221 @@
+"""Caché de lecturas que cambian poco, con claves versionadas por espacio.
+
+Cada `EspacioCache` agrupa valores derivados de unos pocos modelos (los
+docentes, el coordinador de cada carrera, los totales de los listados, los
+resúmenes del dashboard, etc.). Sus claves llevan el nombre del espacio y una
+versión guardada en la misma caché; invalidar el espacio incrementa esa
+versión y deja inalcanzables todas las entradas anteriores, que luego expiran
+solas. Un espacio puede además separar sus entradas en ámbitos (un modelo, un
+usuario) con versión propia, que se invalidan por separado. Las versiones
+parten desde el reloj, así que una versión desalojada nunca vuelve a un
+valor ya usado.
+
+`espacio()` conecta `post_save`/`post_delete` de los modelos indicados; los
+demás módulos (`conteos`, `dashboard`, `directorio_usuarios`, `estadisticas`)
+invalidan sus espacios desde sus propias señales. Las escrituras masivas
+(`update`, `bulk_create`) no emiten señales y deben llamar a `invalidar_todo()`.
+
+Los valores viven en la caché `CACHE_LECTURAS_ALIAS` (por defecto `default`,
+cuyo backend se elige en `settings.CACHES`) durante `CACHE_LECTURAS_TTL`
+segundos, salvo que el espacio indique otro plazo. Cada proceso cuenta
+aciertos y fallos por espacio; `/metrics` los publica como
+`api_cache_aciertos_total` y `api_cache_fallos_total`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from typing import Callable, TypeVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+from .models import PracticaDocumento, PracticaEvaluacion, TemaDisponible, Usuario
+
+
+T = TypeVar("T")
+
+# Guardar solo la contraseña (al actualizar el hash en el login) no cambia lo cacheado.
+CAMPOS_USUARIO_IGNORADOS = frozenset({"contrasena"})
+
+_lock = threading.Lock()
+_aciertos: Counter[str] = Counter()
+_fallos: Counter[str] = Counter()
+_espacios: dict[str, "EspacioCache"] = {}
+
+
+def _cache():
+    return caches[getattr(settings, "CACHE_LECTURAS_ALIAS", "default")]
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "CACHE_LECTURAS_TTL", 600))
+
+
+class EspacioCache:
+    def __init__(self, nombre: str, modelos=(), campos_ignorados=frozenset(), ttl=None):
+        self.nombre = nombre
+        self.modelos = tuple(modelos)
+        self.campos_ignorados = frozenset(campos_ignorados)
+        # Segundos (o función que los devuelve); `None` usa `CACHE_LECTURAS_TTL`.
+        self._ttl = ttl
+
+    def __repr__(self) -> str:
+        return f"<EspacioCache {self.nombre}>"
+
+    def ttl(self) -> int:
+        if self._ttl is None:
+            return _ttl()
+        return int(self._ttl() if callable(self._ttl) else self._ttl)
+
+    def clave_version(self, ambito: str | None = None) -> str:
+        base = f"lecturas:version:{self.nombre}"
+        return base if ambito is None else f"{base}:{ambito}"
+
+    def versiones(self, *ambitos: str) -> list[int]:
+        """Versión del espacio seguida de la de cada ámbito, en una sola lectura."""
+
+        cache = _cache()
+        claves = [self.clave_version()] + [self.clave_version(ambito) for ambito in ambitos]
+        encontradas = cache.get_many(claves)
+        versiones = []
+        for clave in claves:
+            version = encontradas.get(clave)
+            if version is None:
+                # Partir desde el reloj evita reutilizar valores antiguos si la
+                # versión fue desalojada de la caché.
+                cache.add(clave, time.time_ns(), None)
+                version = cache.get(clave)
+            versiones.append(version)
+        return versiones
+
+    def version(self) -> int:
+        return self.versiones()[0]
+
+    def clave(self, *partes, ambitos=()) -> str:
+        version = ".".join(str(version) for version in self.versiones(*ambitos))
+        firma = json.dumps(partes, sort_keys=True, default=str)
+        digest = hashlib.sha1(firma.encode("utf-8")).hexdigest()
+        return f"lecturas:{self.nombre}:v{version}:{digest}"
+
+    def obtener(self, partes: tuple, calcular: Callable[[], T], *, ambitos=()) -> T:
+        """Valor cacheado para `partes`; si no está, lo calcula y lo guarda.
+
+        La entrada depende de la versión del espacio y de la de cada uno de
+        `ambitos`. `None` también se guarda: una búsqueda sin resultado no se
+        repite hasta la siguiente escritura.
+        """
+
+        cache = _cache()
+        clave = self.clave(*partes, ambitos=ambitos)
+        guardado = cache.get(clave)
+        if guardado is not None:
+            with _lock:
+                _aciertos[self.nombre] += 1
+            return guardado[0]
+
+        with _lock:
+            _fallos[self.nombre] += 1
+        valor = calcular()
+        cache.set(clave, (valor,), self.ttl())
+        return valor
+
+    def invalidar(self, *ambitos: str) -> int:
+        """Incrementa la versión de `ambitos` o, sin argumentos, la del espacio.
+
+        Devuelve la última versión escrita.
+        """
+
+        cache = _cache()
+        claves = [self.clave_version(ambito) for ambito in ambitos] or [self.clave_version()]
+        for clave in claves:
+            try:
+                nueva = cache.incr(clave)
+            except ValueError:
+                nueva = time.time_ns()
+                cache.set(clave, nueva, None)
+        return nueva
+
+    def _al_escribir(self, sender, update_fields=None, **kwargs) -> None:
+        if update_fields is not None and set(update_fields) <= self.campos_ignorados:
+            return
+        self.invalidar()
+
+
+def espacio(nombre: str, *modelos, campos_ignorados=frozenset(), ttl=None) -> EspacioCache:
+    """Crea el espacio `nombre` y lo invalida con las escrituras de `modelos`."""
+
+    if nombre in _espacios:
+        raise ValueError(f"El espacio de caché {nombre!r} ya existe.")
+    nuevo = _espacios[nombre] = EspacioCache(nombre, modelos, campos_ignorados, ttl)
+    for modelo in modelos:
+        etiqueta = modelo._meta.label_lower
+        post_save.connect(
+            nuevo._al_escribir,
+            sender=modelo,
+            weak=False,
+            dispatch_uid=f"cache_lecturas_{nombre}_{etiqueta}_save",
+        )
+        post_delete.connect(
+            nuevo._al_escribir,
+            sender=modelo,
+            weak=False,
+            dispatch_uid=f"cache_lecturas_{nombre}_{etiqueta}_delete",
+        )
+    return nuevo
+
+
+def invalidar_todo() -> None:
+    """Invalida todos los espacios; para después de escrituras masivas."""
+
+    for espacio_cache in list(_espacios.values()):
+        espacio_cache.invalidar()
+
+
+def contadores() -> dict[str, tuple[int, int]]:
+    """`(aciertos, fallos)` de cada espacio en este proceso."""
+
+    with _lock:
+        return {nombre: (_aciertos[nombre], _fallos[nombre]) for nombre in _espacios}
+
+
+def reiniciar_contadores() -> None:
+    """Pone los contadores en cero (para pruebas)."""
+
+    with _lock:
+        _aciertos.clear()
+        _fallos.clear()
+
+
+# ----------------------------------------------------------------------
+# Espacios
+
+CARRERAS_TEMAS = espacio("carreras_temas", TemaDisponible)
+"""Valores de `TemaDisponible.carrera` compatibles con cada carrera."""
+
+DOCENTES = espacio("docentes", Usuario, campos_ignorados=CAMPOS_USUARIO_IGNORADOS)
+"""Listado serializado de `DocenteListView` por filtro de carrera."""
+
+COORDINADORES = espacio("coordinadores", Usuario, campos_ignorados=CAMPOS_USUARIO_IGNORADOS)
+"""Coordinador que corresponde a cada carrera."""
+
+DOCUMENTOS_PRACTICA = espacio(
+    "documentos_practica",
+    PracticaDocumento,
+    Usuario,
+    campos_ignorados=CAMPOS_USUARIO_IGNORADOS,
+)
+"""Páginas de documentos de práctica por carrera."""
+
+EVALUACION_PRACTICA = espacio(
+    "evaluacion_practica",
+    PracticaEvaluacion,
+    Usuario,
+    campos_ignorados=CAMPOS_USUARIO_IGNORADOS,
+)
+"""Evaluación de práctica vigente y evaluaciones compatibles por carrera."""
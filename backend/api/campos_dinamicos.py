@@ -0,0 +1,147 @@
+"""Respuestas parciales para los listados: `?fields=`, `?omit=` y `?vista=resumen`.
+
+`CamposDinamicosMixin` quita del serializador los campos declarados que el
+cliente no pidió, de modo que sus `SerializerMethodField` y serializadores
+anidados ni siquiera se evalúan, y filtra las claves de la respuesta final.
+`optimizar_queryset` descarta además los `select_related`/`Prefetch` de la
+vista que solo alimentaban esos campos, según `Meta.relaciones_campos`.
+
+Solo se aplica a lecturas (GET/HEAD/OPTIONS); las escrituras siempre validan
+y responden con el serializador completo.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from rest_framework.permissions import SAFE_METHODS
+
+
+PARAMETRO_CAMPOS = "fields"
+PARAMETRO_OMITIR = "omit"
+PARAMETRO_VISTA = "vista"
+VISTA_RESUMEN = "resumen"
+
+# Siempre se devuelve el identificador, aunque no se pida.
+CAMPOS_OBLIGATORIOS = frozenset({"id"})
+
+
+def _lista_parametro(valor: str | None) -> set[str]:
+    return {parte.strip() for parte in (valor or "").split(",") if parte.strip()}
+
+
+@dataclass(frozen=True)
+class SeleccionCampos:
+    incluir: frozenset[str] | None
+    omitir: frozenset[str]
+
+    def incluye(self, nombre: str) -> bool:
+        if nombre in CAMPOS_OBLIGATORIOS:
+            return True
+        if nombre in self.omitir:
+            return False
+        return self.incluir is None or nombre in self.incluir
+
+
+def _rutas_select_related(arbol: dict, prefijo: str = ""):
+    for nombre, hijos in arbol.items():
+        ruta = f"{prefijo}{nombre}"
+        if hijos:
+            yield from _rutas_select_related(hijos, f"{ruta}__")
+        else:
+            yield ruta
+
+
+class CamposDinamicosMixin:
+    """Mixin para serializadores de listados con campos seleccionables.
+
+    En `Meta` se pueden declarar:
+
+    * `campos_resumen`: claves que devuelve `?vista=resumen`.
+    * `relaciones_campos`: `{lookup: (campos, ...)}` con los `select_related`
+      o `prefetch_related` que solo hacen falta para esos campos.
+
+    Las subclases que arman su propia representación sobrescriben
+    `representar` en lugar de `to_representation`.
+    """
+
+    @classmethod
+    def seleccion_campos(cls, request) -> SeleccionCampos | None:
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+
+        parametros = getattr(request, "query_params", request.GET)
+        campos = _lista_parametro(parametros.get(PARAMETRO_CAMPOS))
+        omitir = _lista_parametro(parametros.get(PARAMETRO_OMITIR))
+        resumen = parametros.get(PARAMETRO_VISTA) == VISTA_RESUMEN
+        if not (campos or omitir or resumen):
+            return None
+
+        if not campos and resumen:
+            campos = set(getattr(cls.Meta, "campos_resumen", ()))
+        return SeleccionCampos(
+            incluir=frozenset(campos) if campos else None,
+            omitir=frozenset(omitir),
+        )
+
+    @classmethod
+    def optimizar_queryset(cls, queryset, request):
+        """Quita del queryset las relaciones que solo usan campos no pedidos."""
+
+        seleccion = cls.seleccion_campos(request)
+        relaciones = getattr(cls.Meta, "relaciones_campos", None)
+        if seleccion is None or not relaciones:
+            return queryset
+
+        def necesaria(ruta: str) -> bool:
+            partes = ruta.split("__")
+            for fin in range(1, len(partes) + 1):
+                campos = relaciones.get("__".join(partes[:fin]))
+                if campos is not None and not any(seleccion.incluye(c) for c in campos):
+                    return False
+            return True
+
+        arbol = queryset.query.select_related
+        if isinstance(arbol, dict):
+            rutas = list(_rutas_select_related(arbol))
+            conservar = [ruta for ruta in rutas if necesaria(ruta)]
+            if len(conservar) != len(rutas):
+                queryset = queryset.select_related(None)
+                if conservar:
+                    queryset = queryset.select_related(*conservar)
+
+        lookups = queryset._prefetch_related_lookups
+        conservar = [
+            lookup
+            for lookup in lookups
+            if necesaria(getattr(lookup, "prefetch_through", lookup))
+        ]
+        if len(conservar) != len(lookups):
+            queryset = queryset.prefetch_related(None).prefetch_related(*conservar)
+
+        return queryset
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        contexto = self.context if isinstance(self.context, dict) else {}
+        self._seleccion_campos = self.seleccion_campos(contexto.get("request"))
+        if self._seleccion_campos is None:
+            return
+
+        for nombre in self._declared_fields:
+            if not self._seleccion_campos.incluye(nombre):
+                self.fields.pop(nombre, None)
+
+    def incluye_campo(self, nombre: str) -> bool:
+        seleccion = getattr(self, "_seleccion_campos", None)
+        return seleccion is None or seleccion.incluye(nombre)
+
+    def representar(self, instance):
+        return super().to_representation(instance)
+
+    def to_representation(self, instance):
+        datos = self.representar(instance)
+        seleccion = getattr(self, "_seleccion_campos", None)
+        if seleccion is None:
+            return datos
+        return {clave: valor for clave, valor in datos.items() if seleccion.incluye(clave)}
@@ -0,0 +1,158 @@
+"""Registro de consultas SQL lentas con su plan de ejecución.
+
+`ConsultasLentasMiddleware` (en `api/middleware.py`) instala un
+`execute_wrapper` que cronometra cada consulta de la solicitud. Las que
+superan `CONSULTAS_LENTAS_UMBRAL_MS` se registran en el logger
+`api.consultas_lentas` con el SQL, los parámetros, la vista que las ejecutó y
+el plan: `EXPLAIN (ANALYZE, BUFFERS)` en PostgreSQL (solo para `SELECT`, ya
+que ANALYZE vuelve a ejecutar la consulta; el resto usa `EXPLAIN` a secas) y
+`EXPLAIN QUERY PLAN` en SQLite.
+
+Las consultas se agrupan por huella (el SQL sin literales ni listas de
+parámetros): cada huella se registra a lo más una vez cada
+`CONSULTAS_LENTAS_INTERVALO` segundos, informando cuántas repeticiones se
+omitieron, y en total no se registran más de
+`CONSULTAS_LENTAS_MAX_POR_MINUTO` por proceso.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+
+logger = logging.getLogger(__name__)
+
+vista_actual: ContextVar[str | None] = ContextVar("vista_actual", default=None)
+
+_DML = re.compile(r"^\s*(select|insert|update|delete|with)\b", re.IGNORECASE)
+_LARGO_MAXIMO = 2000
+
+_lock = threading.Lock()
+# huella -> (último registro, repeticiones omitidas desde entonces)
+_registradas: dict[str, tuple[float, int]] = {}
+_ventana = [0.0, 0]
+_local = threading.local()
+
+
+def umbral_ms() -> float:
+    return float(getattr(settings, "CONSULTAS_LENTAS_UMBRAL_MS", 500))
+
+
+def huella_sql(sql: str) -> str:
+    normalizado = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    normalizado = re.sub(r"\b\d+(?:\.\d+)?\b", "?", normalizado)
+    normalizado = re.sub(r"%s|\?", "?", normalizado)
+    normalizado = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", normalizado)
+    normalizado = " ".join(normalizado.split()).lower()
+    return hashlib.sha1(normalizado.encode()).hexdigest()[:12]
+
+
+def reiniciar() -> None:
+    """Olvida las huellas registradas (para pruebas)."""
+
+    with _lock:
+        _registradas.clear()
+        _ventana[:] = [0.0, 0]
+
+
+def _admitir(huella: str, ahora: float) -> int | None:
+    """Repeticiones omitidas si corresponde registrar la huella; `None` si no."""
+
+    intervalo = float(getattr(settings, "CONSULTAS_LENTAS_INTERVALO", 300))
+    maximo = int(getattr(settings, "CONSULTAS_LENTAS_MAX_POR_MINUTO", 20))
+    with _lock:
+        ultimo, omitidas = _registradas.get(huella, (None, 0))
+        if ultimo is not None and ahora - ultimo < intervalo:
+            _registradas[huella] = (ultimo, omitidas + 1)
+            return None
+        if ahora - _ventana[0] >= 60:
+            _ventana[:] = [ahora, 0]
+        if _ventana[1] >= maximo:
+            # Sobre el tope global: se cuenta como omitida para informarla después.
+            _registradas[huella] = (ultimo if ultimo is not None else float("-inf"), omitidas + 1)
+            return None
+        _ventana[1] += 1
+        _registradas[huella] = (ahora, 0)
+        return omitidas
+
+
+def _plan(conexion, sql: str, params) -> str | None:
+    if not getattr(settings, "CONSULTAS_LENTAS_EXPLAIN", True) or not _DML.match(sql):
+        return None
+
+    if conexion.vendor == "postgresql":
+        es_select = sql.lstrip()[:6].lower() == "select"
+        prefijo = "EXPLAIN (ANALYZE, BUFFERS) " if es_select else "EXPLAIN "
+    elif conexion.vendor == "sqlite":
+        prefijo = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+
+    _local.explicando = True
+    try:
+        # En un savepoint: un EXPLAIN fallido no debe abortar la transacción en curso.
+        with transaction.atomic(using=conexion.alias), conexion.cursor() as cursor:
+            cursor.execute(prefijo + sql, params)
+            filas = cursor.fetchall()
+    except DatabaseError as exc:
+        return f"(no se pudo obtener el plan: {exc})"
+    finally:
+        _local.explicando = False
+
+    if conexion.vendor == "sqlite":
+        # (id, padre, _, detalle): se indenta según la profundidad.
+        profundidad = {0: -1}
+        lineas = []
+        for id_, padre, _, detalle in filas:
+            profundidad[id_] = profundidad.get(padre, -1) + 1
+            lineas.append("  " * profundidad[id_] + detalle)
+        return "\n".join(lineas)
+    return "\n".join(str(fila[0]) for fila in filas)
+
+
+def _recortar(texto: str) -> str:
+    return texto if len(texto) <= _LARGO_MAXIMO else texto[:_LARGO_MAXIMO] + "…"
+
+
+class RegistroConsultasLentas:
+    """`execute_wrapper` que registra las consultas sobre el umbral."""
+
+    def __init__(self, umbral: float | None = None):
+        self.umbral = (umbral_ms() if umbral is None else umbral) / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_local, "explicando", False):
+            return execute(sql, params, many, context)
+
+        inicio = time.perf_counter()
+        resultado = execute(sql, params, many, context)
+        duracion = time.perf_counter() - inicio
+        if duracion >= self.umbral:
+            self._registrar(context["connection"], sql, params, many, duracion)
+        return resultado
+
+    def _registrar(self, conexion, sql, params, many, duracion) -> None:
+        huella = huella_sql(sql)
+        omitidas = _admitir(huella, time.monotonic())
+        if omitidas is None:
+            return
+
+        plan = None if many else _plan(conexion, sql, params)
+        logger.warning(
+            "Consulta lenta: %.1f ms en %s [huella %s%s]\nSQL: %s\nParámetros: %s%s",
+            duracion * 1000,
+            vista_actual.get() or "(fuera de una vista)",
+            huella,
+            f", {omitidas} repeticiones omitidas" if omitidas else "",
+            _recortar(sql),
+            _recortar(repr(params)),
+            f"\nPlan:\n{plan}" if plan else "",
+        )
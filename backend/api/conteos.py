@@ -0,0 +1,85 @@
+"""Caché de totales para los listados paginados de coordinación."""
+
+from __future__ import annotations
+
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache_lecturas import espacio
+from .models import PracticaDocumento, SolicitudCartaPractica
+
+
+CONTEO_TIMEOUT = 300
+"""Segundos que un total permanece en caché aunque no haya escrituras."""
+
+ESTIMACION_UMBRAL = 10_000
+"""Filas a partir de las cuales se acepta la estimación del planificador."""
+
+CONTEOS = espacio("conteos", ttl=CONTEO_TIMEOUT)
+"""Totales por modelo y filtros; cada modelo es un ámbito con versión propia."""
+
+
+def _normalizar_filtros(filtros: dict | None) -> dict:
+    normalizados = {}
+    for clave, valor in (filtros or {}).items():
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if valor in (None, ""):
+            continue
+        normalizados[clave] = valor
+    return normalizados
+
+
+def _estimar_total(queryset) -> int | None:
+    """Usa `pg_class.reltuples` como total aproximado en PostgreSQL."""
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    tabla = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [tabla],
+        )
+        fila = cursor.fetchone()
+
+    if not fila or fila[0] is None or fila[0] < 0:
+        return None
+    return int(fila[0])
+
+
+def contar_total(
+    queryset,
+    filtros: dict | None = None,
+    *,
+    estimar: bool = False,
+) -> tuple[int, bool]:
+    """Devuelve `(total, exacto)` para un listado paginado.
+
+    `filtros` debe describir los filtros efectivamente aplicados al queryset;
+    se usa como clave de caché junto a una versión que se incrementa con cada
+    escritura del modelo. Con `estimar=True` y sin filtros, las tablas grandes
+    en PostgreSQL informan la estimación del planificador en vez de un COUNT.
+    """
+
+    normalizados = _normalizar_filtros(filtros)
+
+    if estimar and not normalizados:
+        estimado = _estimar_total(queryset)
+        if estimado is not None and estimado >= ESTIMACION_UMBRAL:
+            return estimado, False
+
+    etiqueta = queryset.model._meta.label_lower
+    total = CONTEOS.obtener((etiqueta, normalizados), queryset.count, ambitos=(etiqueta,))
+    return total, True
+
+
+@receiver(post_save, sender=SolicitudCartaPractica, dispatch_uid="conteos_solicitudes_save")
+@receiver(post_delete, sender=SolicitudCartaPractica, dispatch_uid="conteos_solicitudes_delete")
+@receiver(post_save, sender=PracticaDocumento, dispatch_uid="conteos_documentos_save")
+@receiver(post_delete, sender=PracticaDocumento, dispatch_uid="conteos_documentos_delete")
+def invalidar_conteos(sender, **kwargs) -> None:
+    CONTEOS.invalidar(sender._meta.label_lower)
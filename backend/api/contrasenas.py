@@ -0,0 +1,68 @@
+"""Hash de contraseñas en varios procesos.
+
+PBKDF2 ocupa la CPU durante cientos de milisegundos por contraseña y el GIL
+impide repartirlo entre hilos. Este módulo no importa modelos para que los
+procesos hijos puedan cargarlo aunque se inicien con `spawn`.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+
+
+def _inicializar_proceso() -> None:
+    from django.conf import settings
+
+    if not settings.configured:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    import django
+
+    django.setup()
+
+
+def _hashear(contrasena: str) -> str:
+    try:
+        identify_hasher(contrasena)
+    except ValueError:
+        return make_password(contrasena)
+    # Ya viene hasheada (por ejemplo, desde un respaldo).
+    return contrasena
+
+
+def hashear_lote(contrasenas: list[str]) -> list[str]:
+    return [_hashear(contrasena) for contrasena in contrasenas]
+
+
+class HasheadorParalelo:
+    """Reparte los hashes entre `procesos` procesos; con 0 trabaja en el actual."""
+
+    def __init__(self, procesos: int | None = None):
+        self.procesos = (os.cpu_count() or 1) if procesos is None else procesos
+        self._ejecutor = None
+
+    def __enter__(self):
+        if self.procesos > 0:
+            self._ejecutor = ProcessPoolExecutor(
+                max_workers=self.procesos, initializer=_inicializar_proceso
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown()
+            self._ejecutor = None
+
+    def hashear(self, contrasenas: list[str]) -> list[str]:
+        if self._ejecutor is None or len(contrasenas) < 2:
+            return hashear_lote(contrasenas)
+
+        tamano = -(-len(contrasenas) // (self.procesos * 4))
+        tramos = [contrasenas[i : i + tamano] for i in range(0, len(contrasenas), tamano)]
+        return [
+            hash_
+            for resultado in self._ejecutor.map(hashear_lote, tramos)
+            for hash_ in resultado
+        ]
@@ -0,0 +1,385 @@
+"""Resumen por rol para la página de inicio de cada usuario.
+
+En vez de que el frontend pida temas, evaluaciones, reuniones, solicitudes y
+notificaciones por separado, cada sección se arma con una consulta
+`aggregate` para los contadores y otra para los primeros elementos. El
+resultado se guarda por usuario durante `DASHBOARD_TTL` segundos; la clave
+incluye la versión del espacio `dashboard` de `cache_lecturas` y la de los
+ámbitos que correspondan, que las señales incrementan al escribir:
+
+* `usuario:<id>` para lo que pertenece a usuarios concretos (notificaciones,
+  reuniones, solicitudes de reunión y entregas),
+* `coordinacion` para cualquier escritura que cambie los totales generales,
+* la del espacio completo para catálogos compartidos (temas, inscripciones,
+  evaluaciones, propuestas y cartas de práctica).
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache_lecturas import espacio
+from .estados_evaluaciones import EN_PROGRESO, EVALUADA, PENDIENTE, expresion_estado
+from .models import (
+    EvaluacionEntregaAlumno,
+    EvaluacionGrupoDocente,
+    InscripcionTema,
+    Notificacion,
+    PropuestaTema,
+    PropuestaTemaDocente,
+    Reunion,
+    SolicitudCartaPractica,
+    SolicitudReunion,
+    TemaDisponible,
+    Usuario,
+)
+
+
+ROLES = ("alumno", "docente", "coordinador")
+ELEMENTOS_POR_SECCION = 5
+
+VERSION_COORDINACION = "coordinacion"
+
+REUNIONES_VIGENTES = ("aprobada", "reprogramada")
+
+
+def dashboard_ttl() -> int:
+    return int(getattr(settings, "DASHBOARD_TTL", 60))
+
+
+DASHBOARD = espacio("dashboard", ttl=dashboard_ttl)
+
+
+# ----------------------------------------------------------------------
+# Consultas
+
+
+def _conteos(queryset, **filtros: Q) -> dict[str, int]:
+    """`total` más un contador por filtro, en un solo `aggregate`."""
+
+    return queryset.order_by().aggregate(
+        total=Count("pk", distinct=True),
+        **{nombre: Count("pk", filter=filtro, distinct=True) for nombre, filtro in filtros.items()},
+    )
+
+
+def _conteos_por_estado(queryset, estados) -> dict[str, int]:
+    return _conteos(queryset, **{estado: Q(estado=estado) for estado in estados})
+
+
+def _evaluaciones(hoy: date, **filtros):
+    """Evaluaciones con su estado derivado de la fecha, como en el serializador."""
+
+    return EvaluacionGrupoDocente.objects.filter(**filtros).annotate(
+        estado_actual=expresion_estado(hoy)
+    )
+
+
+def _elementos(queryset, campos: dict[str, str]) -> list[dict]:
+    """Los primeros elementos como diccionarios `{salida: lookup}`."""
+
+    nombres = list(campos)
+    filas = queryset[:ELEMENTOS_POR_SECCION].values_list(*campos.values())
+    return [dict(zip(nombres, fila)) for fila in filas]
+
+
+CAMPOS_TEMA = {"id": "pk", "titulo": "titulo", "carrera": "carrera", "cupos": "cupos"}
+
+CAMPOS_EVALUACION = {
+    "id": "pk",
+    "titulo": "titulo",
+    "grupo": "grupo_nombre",
+    "fecha": "fecha",
+    # `estado_actual` sale de `_evaluaciones`: el estado guardado puede estar
+    # desactualizado hasta el refresco diario.
+    "estado": "estado_actual",
+}
+
+CAMPOS_REUNION = {
+    "id": "pk",
+    "fecha": "fecha",
+    "horaInicio": "hora_inicio",
+    "horaTermino": "hora_termino",
+    "modalidad": "modalidad",
+    "estado": "estado",
+    "alumno": "alumno__nombre_completo",
+    "docente": "docente__nombre_completo",
+}
+
+CAMPOS_SOLICITUD_REUNION = {
+    "id": "pk",
+    "motivo": "motivo",
+    "estado": "estado",
+    "creadoEn": "creado_en",
+    "alumno": "alumno__nombre_completo",
+    "docente": "docente__nombre_completo",
+}
+
+CAMPOS_NOTIFICACION = {
+    "id": "pk",
+    "titulo": "titulo",
+    "tipo": "tipo",
+    "creadaEn": "created_at",
+}
+
+
+def _seccion_notificaciones(usuario: Usuario) -> dict:
+    queryset = Notificacion.objects.filter(usuario=usuario)
+    return {
+        **_conteos(queryset, noLeidas=Q(leida=False)),
+        "items": _elementos(
+            queryset.filter(leida=False).order_by("-created_at"), CAMPOS_NOTIFICACION
+        ),
+    }
+
+
+def _seccion_reuniones(queryset, hoy: date) -> dict:
+    return {
+        **_conteos_por_estado(queryset, [codigo for codigo, _ in Reunion.ESTADOS]),
+        "items": _elementos(
+            queryset.filter(fecha__gte=hoy, estado__in=REUNIONES_VIGENTES)
+            .select_related("alumno", "docente")
+            .order_by("fecha", "hora_inicio"),
+            CAMPOS_REUNION,
+        ),
+    }
+
+
+def _seccion_solicitudes_reunion(queryset) -> dict:
+    return {
+        **_conteos_por_estado(queryset, [codigo for codigo, _ in SolicitudReunion.ESTADOS]),
+        "items": _elementos(
+            queryset.filter(estado="pendiente")
+            .select_related("alumno", "docente")
+            .order_by("-creado_en"),
+            CAMPOS_SOLICITUD_REUNION,
+        ),
+    }
+
+
+def _temas_con_cupo(queryset):
+    return queryset.annotate(
+        inscritos=Count("inscripciones", filter=Q(inscripciones__activo=True))
+    ).filter(cupos__gt=F("inscritos"))
+
+
+def dashboard_alumno(usuario: Usuario, hoy: date, catalogo_temas) -> dict:
+    inscripcion = (
+        InscripcionTema.objects.filter(alumno=usuario, activo=True)
+        .select_related("tema__docente_responsable")
+        .order_by("-created_at")
+        .first()
+    )
+    tema = None
+    if inscripcion:
+        responsable = inscripcion.tema.docente_responsable
+        tema = {
+            "id": inscripcion.tema_id,
+            "titulo": inscripcion.tema.titulo,
+            "docente": responsable.nombre_completo if responsable else None,
+            "esResponsable": inscripcion.es_responsable,
+        }
+
+    disponibles = _temas_con_cupo(catalogo_temas())
+
+    entregada = EvaluacionEntregaAlumno.objects.filter(
+        evaluacion=OuterRef("pk"), alumno=usuario, es_bitacora=False
+    )
+    evaluaciones = _evaluaciones(
+        hoy, tema__inscripciones__alumno=usuario, tema__inscripciones__activo=True
+    ).annotate(entregada=Exists(entregada))
+
+    return {
+        "tema": tema,
+        "temas": {
+            "disponibles": disponibles.count(),
+            "items": _elementos(disponibles.order_by("-created_at"), CAMPOS_TEMA),
+        },
+        "evaluaciones": {
+            **_conteos(
+                evaluaciones,
+                proximas=Q(fecha__gte=hoy),
+                porEntregar=Q(fecha__gte=hoy, entregada=False),
+            ),
+            "items": _elementos(
+                evaluaciones.filter(fecha__gte=hoy).order_by("fecha", "pk"),
+                {**CAMPOS_EVALUACION, "entregada": "entregada"},
+            ),
+        },
+        "reuniones": _seccion_reuniones(Reunion.objects.filter(alumno=usuario), hoy),
+        "solicitudesReunion": _seccion_solicitudes_reunion(
+            SolicitudReunion.objects.filter(alumno=usuario)
+        ),
+        "notificaciones": _seccion_notificaciones(usuario),
+    }
+
+
+def dashboard_docente(usuario: Usuario, hoy: date, catalogo_temas=None) -> dict:
+    temas = TemaDisponible.objects.filter(
+        Q(docente_responsable=usuario) | Q(created_by=usuario)
+    )
+    evaluaciones = _evaluaciones(hoy, docente=usuario)
+    entregas = EvaluacionEntregaAlumno.objects.filter(evaluacion__docente=usuario)
+
+    return {
+        "temas": {
+            **_conteos(temas, conInscritos=Q(inscripciones__activo=True)),
+            "items": _elementos(temas.order_by("-created_at"), CAMPOS_TEMA),
+        },
+        "evaluaciones": {
+            **_conteos(
+                evaluaciones,
+                pendientes=Q(estado_actual=PENDIENTE),
+                enProgreso=Q(estado_actual=EN_PROGRESO),
+                evaluadas=Q(estado_actual=EVALUADA),
+            ),
+            "entregasPorRevisar": entregas.filter(estado_revision="pendiente").count(),
+            "items": _elementos(
+                evaluaciones.filter(fecha__gte=hoy).order_by("fecha", "pk"),
+                CAMPOS_EVALUACION,
+            ),
+        },
+        "reuniones": _seccion_reuniones(Reunion.objects.filter(docente=usuario), hoy),
+        "solicitudesReunion": _seccion_solicitudes_reunion(
+            SolicitudReunion.objects.filter(docente=usuario)
+        ),
+        "notificaciones": _seccion_notificaciones(usuario),
+    }
+
+
+def dashboard_coordinador(usuario: Usuario, hoy: date, catalogo_temas) -> dict:
+    temas = catalogo_temas()
+    solicitudes = SolicitudCartaPractica.objects.all()
+
+    return {
+        "temas": {
+            "total": temas.count(),
+            "conCupo": _temas_con_cupo(temas).count(),
+        },
+        "propuestas": _conteos_por_estado(
+            PropuestaTema.objects.all(), [codigo for codigo, _ in PropuestaTema.ESTADOS]
+        ),
+        "solicitudesCarta": {
+            **_conteos_por_estado(
+                solicitudes, [codigo for codigo, _ in SolicitudCartaPractica.ESTADOS]
+            ),
+            "items": _elementos(
+                solicitudes.filter(estado="pendiente").order_by("-creado_en"),
+                {
+                    "id": "pk",
+                    "alumno": "alumno_nombres",
+                    "apellidos": "alumno_apellidos",
+                    "carrera": "alumno_carrera",
+                    "empresa": "dest_empresa",
+                    "creadoEn": "creado_en",
+                },
+            ),
+        },
+        "reuniones": _seccion_reuniones(Reunion.objects.all(), hoy),
+        "notificaciones": _seccion_notificaciones(usuario),
+    }
+
+
+CONSTRUCTORES = {
+    "alumno": dashboard_alumno,
+    "docente": dashboard_docente,
+    "coordinador": dashboard_coordinador,
+}
+
+
+# ----------------------------------------------------------------------
+# Caché
+
+
+def _ambitos(usuario: Usuario) -> list[str]:
+    ambitos = [f"usuario:{usuario.pk}"]
+    if usuario.rol == "coordinador":
+        ambitos.append(VERSION_COORDINACION)
+    return ambitos
+
+
+def obtener_dashboard(usuario: Usuario, catalogo_temas, hoy: date | None = None) -> dict:
+    """Resumen del rol de `usuario`, desde la caché si sigue vigente.
+
+    `catalogo_temas` es una función que devuelve los temas visibles para el
+    usuario; solo se llama si hay que recalcular.
+    """
+
+    hoy = hoy or timezone.localdate()
+
+    def calcular() -> dict:
+        return {
+            "rol": usuario.rol,
+            "usuario": usuario.pk,
+            "fecha": hoy.isoformat(),
+            **CONSTRUCTORES[usuario.rol](usuario, hoy, catalogo_temas),
+        }
+
+    return DASHBOARD.obtener(
+        (usuario.rol, usuario.pk, hoy.isoformat()),
+        calcular,
+        ambitos=_ambitos(usuario),
+    )
+
+
+def invalidar_dashboards(*usuarios, general: bool = False) -> None:
+    """Descarta los resúmenes de `usuarios` y el de coordinación.
+
+    Con `general=True` se descartan los de todos los usuarios.
+    """
+
+    if general:
+        DASHBOARD.invalidar()
+        return
+    ambitos = [f"usuario:{pk}" for pk in set(usuarios) if pk is not None]
+    DASHBOARD.invalidar(*ambitos, VERSION_COORDINACION)
+
+
+@receiver(post_save, sender=Notificacion, dispatch_uid="dashboard_notificaciones_save")
+@receiver(post_delete, sender=Notificacion, dispatch_uid="dashboard_notificaciones_delete")
+def _invalidar_por_notificacion(sender, instance, **kwargs) -> None:
+    # Las notificaciones solo aparecen en el resumen de su destinatario.
+    DASHBOARD.invalidar(f"usuario:{instance.usuario_id}")
+
+
+@receiver(post_save, sender=Reunion, dispatch_uid="dashboard_reuniones_save")
+@receiver(post_delete, sender=Reunion, dispatch_uid="dashboard_reuniones_delete")
+@receiver(post_save, sender=SolicitudReunion, dispatch_uid="dashboard_solicitudes_reunion_save")
+@receiver(post_delete, sender=SolicitudReunion, dispatch_uid="dashboard_solicitudes_reunion_delete")
+def _invalidar_por_reunion(sender, instance, **kwargs) -> None:
+    invalidar_dashboards(instance.alumno_id, instance.docente_id)
+
+
+@receiver(post_save, sender=EvaluacionEntregaAlumno, dispatch_uid="dashboard_entregas_save")
+@receiver(post_delete, sender=EvaluacionEntregaAlumno, dispatch_uid="dashboard_entregas_delete")
+def _invalidar_por_entrega(sender, instance, **kwargs) -> None:
+    docente_id = (
+        EvaluacionGrupoDocente.objects.filter(pk=instance.evaluacion_id)
+        .values_list("docente_id", flat=True)
+        .first()
+    )
+    invalidar_dashboards(instance.alumno_id, docente_id)
+
+
+@receiver(post_save, sender=TemaDisponible, dispatch_uid="dashboard_temas_save")
+@receiver(post_delete, sender=TemaDisponible, dispatch_uid="dashboard_temas_delete")
+@receiver(post_save, sender=InscripcionTema, dispatch_uid="dashboard_inscripciones_save")
+@receiver(post_delete, sender=InscripcionTema, dispatch_uid="dashboard_inscripciones_delete")
+@receiver(post_save, sender=EvaluacionGrupoDocente, dispatch_uid="dashboard_evaluaciones_save")
+@receiver(post_delete, sender=EvaluacionGrupoDocente, dispatch_uid="dashboard_evaluaciones_delete")
+@receiver(post_save, sender=PropuestaTema, dispatch_uid="dashboard_propuestas_save")
+@receiver(post_delete, sender=PropuestaTema, dispatch_uid="dashboard_propuestas_delete")
+@receiver(post_save, sender=PropuestaTemaDocente, dispatch_uid="dashboard_propuestas_docente_save")
+@receiver(
+    post_delete, sender=PropuestaTemaDocente, dispatch_uid="dashboard_propuestas_docente_delete"
+)
+@receiver(post_save, sender=SolicitudCartaPractica, dispatch_uid="dashboard_cartas_save")
+@receiver(post_delete, sender=SolicitudCartaPractica, dispatch_uid="dashboard_cartas_delete")
+def _invalidar_general(sender, **kwargs) -> None:
+    invalidar_dashboards(general=True)
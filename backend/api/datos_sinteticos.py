@@ -0,0 +1,537 @@
+"""Conjunto de datos sintético para medir la API a escala.
+
+`generar_datos` llena una base vacía con `bulk_create` por lotes; los
+volúmenes vienen de `Escala` y la aleatoriedad de una semilla, de modo que
+dos corridas con los mismos parámetros producen los mismos datos. Devuelve
+una `Muestra` con ids representativos (un alumno con tema activo y
+evaluaciones, su docente guía, la coordinación de su carrera, etc.) que usan
+los casos de `manage.py bench`.
+
+Las escrituras masivas no emiten señales: al terminar se reconstruyen los
+resúmenes derivados y se invalidan las cachés que dependen de las señales.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, fields, replace
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .cache_lecturas import invalidar_todo as invalidar_cache_lecturas
+from .importacion_usuarios import digito_verificador
+from .models import (
+    EvaluacionEntregaAlumno,
+    EvaluacionGrupoDocente,
+    InscripcionTema,
+    Notificacion,
+    PracticaDocumento,
+    PracticaEvaluacion,
+    PracticaEvaluacionEntrega,
+    PracticaFirmaCoordinador,
+    PropuestaTema,
+    Reunion,
+    SolicitudCartaPractica,
+    SolicitudReunion,
+    TemaDisponible,
+    TrazabilidadReunion,
+    Usuario,
+)
+from .resumen_notas import reconstruir_resumenes
+
+
+CONTRASENA = "bench-contrasena"
+DOMINIO = "bench.example.com"
+RAMAS = ["Investigación", "Desarrollo", "Innovación", "Emprendimiento"]
+CARRERAS = [codigo for codigo, _ in Usuario.CARRERA_CHOICES]
+
+
+@dataclass(frozen=True)
+class Escala:
+    alumnos: int = 20_000
+    docentes: int = 500
+    temas: int = 5_000
+    inscripciones: int = 50_000
+    evaluaciones: int = 2_500
+    propuestas: int = 2_000
+    notificaciones: int = 200_000
+    solicitudes_reunion: int = 15_000
+    reuniones: int = 30_000
+    cartas: int = 10_000
+    entregas_practica: int = 5_000
+
+    def escalada(self, factor: float) -> "Escala":
+        return replace(
+            self,
+            **{
+                campo.name: max(int(getattr(self, campo.name) * factor), 1)
+                for campo in fields(self)
+            },
+        )
+
+
+@dataclass
+class Muestra:
+    """Ids de filas representativas para armar las solicitudes del benchmark."""
+
+    carrera: str
+    alumno: int
+    alumno_correo: str
+    alumno_rut: str
+    alumno_sin_tema: int
+    docente: int
+    coordinador: int
+    tema: int
+    tema_con_cupo: int
+    propuesta: int
+    propuesta_docente: int
+    notificacion: int
+    solicitud_reunion: int
+    solicitud_reunion_alumno: int
+    solicitud_reunion_docente: int
+    reunion: int
+    reunion_docente: int
+    carta: int
+    evaluacion: int
+    entrega: int
+    evaluacion_practica: int
+    entrega_practica: int
+    alumno_sin_practica: int
+    documento_practica: int
+
+
+def _rut(numero: int) -> str:
+    cuerpo = str(numero)
+    return f"{cuerpo}-{digito_verificador(cuerpo)}"
+
+
+class _Generador:
+    def __init__(self, escala: Escala, semilla: int, lote: int):
+        self.escala = escala
+        self.azar = random.Random(semilla)
+        self.lote = lote
+        self.hoy = timezone.localdate()
+
+    def _crear(self, modelo, objetos):
+        return modelo.objects.bulk_create(objetos, batch_size=self.lote)
+
+    def usuarios(self):
+        contrasena = make_password(CONTRASENA)
+        self.coordinadores = {
+            carrera: usuario
+            for carrera, usuario in zip(
+                CARRERAS,
+                self._crear(
+                    Usuario,
+                    [
+                        Usuario(
+                            nombre_completo=f"Coordinación {indice}",
+                            correo=f"coordinacion{indice}@{DOMINIO}",
+                            rut=_rut(5_000_000 + indice),
+                            carrera=carrera,
+                            rol="coordinador",
+                            contrasena=contrasena,
+                        )
+                        for indice, carrera in enumerate(CARRERAS)
+                    ],
+                ),
+            )
+        }
+        self.docentes = self._crear(
+            Usuario,
+            [
+                Usuario(
+                    nombre_completo=f"Docente {indice}",
+                    correo=f"docente{indice}@{DOMINIO}",
+                    rut=_rut(6_000_000 + indice),
+                    carrera=self.azar.choice(CARRERAS),
+                    telefono=f"+569{self.azar.randint(10_000_000, 99_999_999)}",
+                    rol="docente",
+                    contrasena=contrasena,
+                )
+                for indice in range(self.escala.docentes)
+            ],
+        )
+        self.alumnos = self._crear(
+            Usuario,
+            [
+                Usuario(
+                    nombre_completo=f"Alumno {indice}",
+                    correo=f"alumno{indice}@{DOMINIO}",
+                    rut=_rut(20_000_000 + indice),
+                    carrera=self.azar.choice(CARRERAS),
+                    telefono=f"+569{self.azar.randint(10_000_000, 99_999_999)}",
+                    rol="alumno",
+                    contrasena=contrasena,
+                    docente_guia=(
+                        self.azar.choice(self.docentes) if self.azar.random() < 0.8 else None
+                    ),
+                )
+                for indice in range(self.escala.alumnos)
+            ],
+        )
+
+    def temas(self):
+        temas = []
+        for indice in range(self.escala.temas):
+            docente = self.azar.choice(self.docentes)
+            temas.append(
+                TemaDisponible(
+                    titulo=f"Tema {indice}",
+                    carrera=self.azar.choice(CARRERAS),
+                    rama=self.azar.choice(RAMAS),
+                    descripcion=f"Descripción del tema {indice}.",
+                    requisitos=["Requisito A", "Requisito B"],
+                    cupos=self.azar.randint(1, 3),
+                    created_by=docente,
+                    docente_responsable=docente,
+                )
+            )
+        self.temas = self._crear(TemaDisponible, temas)
+
+    def inscripciones(self):
+        # Cada alumno queda activo a lo más en un tema de su carrera y sin
+        # superar los cupos; el resto de las inscripciones son históricas.
+        alumnos = list(self.alumnos)
+        self.azar.shuffle(alumnos)
+        libres: dict[str, list[Usuario]] = {}
+        for alumno in alumnos:
+            libres.setdefault(alumno.carrera, []).append(alumno)
+        self.activos_por_tema: dict[int, list[Usuario]] = {}
+        pares = set()
+        inscripciones = []
+        for tema in self.temas:
+            if len(inscripciones) >= self.escala.inscripciones // 2:
+                break
+            # Se deja un cupo libre en algunos temas para poder reservarlos.
+            ocupados = tema.cupos - (1 if self.azar.random() < 0.3 else 0)
+            disponibles = libres.get(tema.carrera, [])
+            grupo = [disponibles.pop() for _ in range(min(ocupados, len(disponibles)))]
+            for posicion, alumno in enumerate(grupo):
+                pares.add((tema.pk, alumno.pk))
+                inscripciones.append(
+                    InscripcionTema(
+                        tema=tema, alumno=alumno, activo=True, es_responsable=posicion == 0
+                    )
+                )
+            if grupo:
+                self.activos_por_tema[tema.pk] = grupo
+
+        objetivo = min(self.escala.inscripciones, len(self.temas) * len(self.alumnos))
+        while len(inscripciones) < objetivo:
+            tema, alumno = self.azar.choice(self.temas), self.azar.choice(self.alumnos)
+            if (tema.pk, alumno.pk) in pares:
+                continue
+            pares.add((tema.pk, alumno.pk))
+            inscripciones.append(InscripcionTema(tema=tema, alumno=alumno, activo=False))
+        self._crear(InscripcionTema, inscripciones)
+
+    def evaluaciones(self):
+        temas_activos = [tema for tema in self.temas if tema.pk in self.activos_por_tema]
+        evaluaciones = []
+        for indice in range(min(self.escala.evaluaciones, len(temas_activos) * 3)):
+            tema = temas_activos[indice % len(temas_activos)]
+            evaluaciones.append(
+                EvaluacionGrupoDocente(
+                    docente=tema.docente_responsable,
+                    tema=tema,
+                    grupo_nombre=tema.titulo,
+                    titulo=f"Evaluación {indice // len(temas_activos) + 1}",
+                    fecha=self.hoy + timedelta(days=self.azar.randint(-60, 60)),
+                    bitacoras_requeridas=self.azar.choice([0, 2, 4]),
+                )
+            )
+        self.evaluaciones = self._crear(EvaluacionGrupoDocente, evaluaciones)
+
+        entregas = []
+        for evaluacion in self.evaluaciones:
+            for alumno in self.activos_por_tema[evaluacion.tema_id]:
+                revisada = self.azar.random() < 0.5
+                entregas.append(
+                    EvaluacionEntregaAlumno(
+                        evaluacion=evaluacion,
+                        alumno=alumno,
+                        titulo=f"Entrega {evaluacion.titulo}",
+                        archivo=f"evaluaciones/entregas/bench/{evaluacion.pk}-{alumno.pk}.pdf",
+                        archivo_tipo="application/pdf",
+                        archivo_tamano=1024,
+                        nota=Decimal(self.azar.randint(10, 70)) / 10 if revisada else None,
+                        estado_revision="revisada" if revisada else "pendiente",
+                    )
+                )
+        self.entregas = self._crear(EvaluacionEntregaAlumno, entregas)
+
+    def propuestas(self):
+        estados = [codigo for codigo, _ in PropuestaTema.ESTADOS]
+        self.propuestas = self._crear(
+            PropuestaTema,
+            [
+                PropuestaTema(
+                    alumno=self.azar.choice(self.alumnos),
+                    docente=self.azar.choice(self.docentes),
+                    titulo=f"Propuesta {indice}",
+                    objetivo="Objetivo general",
+                    descripcion="Descripción de la propuesta.",
+                    rama=self.azar.choice(RAMAS),
+                    estado=self.azar.choice(estados),
+                    preferencias_docentes=[
+                        docente.pk
+                        for docente in self.azar.sample(self.docentes, min(2, len(self.docentes)))
+                    ],
+                )
+                for indice in range(self.escala.propuestas)
+            ],
+        )
+
+    def notificaciones(self):
+        tipos = [codigo for codigo, _ in Notificacion.TIPOS]
+        usuarios = self.alumnos + self.docentes
+        restantes = self.escala.notificaciones
+        primera = None
+        while restantes > 0:
+            cantidad = min(restantes, self.lote)
+            creadas = self._crear(
+                Notificacion,
+                [
+                    Notificacion(
+                        usuario=self.azar.choice(usuarios),
+                        titulo="Aviso",
+                        mensaje="Mensaje de prueba para el benchmark.",
+                        tipo=self.azar.choice(tipos),
+                        leida=self.azar.random() < 0.6,
+                    )
+                    for _ in range(cantidad)
+                ],
+            )
+            primera = primera or creadas[0]
+            restantes -= cantidad
+        self.notificacion = primera
+
+    def reuniones(self):
+        estados_solicitud = [codigo for codigo, _ in SolicitudReunion.ESTADOS]
+        solicitudes = []
+        for _ in range(self.escala.solicitudes_reunion):
+            alumno = self.azar.choice(self.alumnos)
+            solicitudes.append(
+                SolicitudReunion(
+                    alumno=alumno,
+                    docente=alumno.docente_guia or self.azar.choice(self.docentes),
+                    motivo="Revisión de avance",
+                    disponibilidad_sugerida="Lunes en la mañana",
+                    estado=self.azar.choice(estados_solicitud),
+                )
+            )
+        self.solicitudes = self._crear(SolicitudReunion, solicitudes)
+        self._crear(
+            TrazabilidadReunion,
+            [
+                TrazabilidadReunion(
+                    solicitud=solicitud,
+                    usuario_id=solicitud.alumno_id,
+                    tipo="creacion_solicitud",
+                    estado_nuevo="pendiente",
+                )
+                for solicitud in self.solicitudes
+            ],
+        )
+
+        estados = [codigo for codigo, _ in Reunion.ESTADOS]
+        modalidades = [codigo for codigo, _ in Reunion.MODALIDADES]
+        reuniones = []
+        for _ in range(self.escala.reuniones):
+            alumno = self.azar.choice(self.alumnos)
+            hora = self.azar.randint(9, 17)
+            docente = alumno.docente_guia or self.azar.choice(self.docentes)
+            reuniones.append(
+                Reunion(
+                    alumno=alumno,
+                    docente=docente,
+                    fecha=self.hoy + timedelta(days=self.azar.randint(-120, 60)),
+                    hora_inicio=time(hora),
+                    hora_termino=time(hora, 45),
+                    modalidad=self.azar.choice(modalidades),
+                    motivo="Reunión de seguimiento",
+                    estado=self.azar.choice(estados),
+                    creado_por=docente,
+                )
+            )
+        self.reuniones = self._crear(Reunion, reuniones)
+
+    def practicas(self):
+        estados = [codigo for codigo, _ in SolicitudCartaPractica.ESTADOS]
+        cartas = []
+        for indice in range(self.escala.cartas):
+            alumno = self.azar.choice(self.alumnos)
+            cartas.append(
+                SolicitudCartaPractica(
+                    alumno=alumno,
+                    coordinador=self.coordinadores[alumno.carrera],
+                    alumno_rut=alumno.rut,
+                    alumno_nombres=alumno.nombre_completo,
+                    alumno_apellidos="Bench",
+                    alumno_carrera=alumno.carrera,
+                    practica_jefe_directo="Jefatura",
+                    practica_correo_encargado=f"encargado{indice}@empresa.example.com",
+                    practica_cargo_alumno="Practicante",
+                    practica_fecha_inicio=self.hoy + timedelta(days=self.azar.randint(0, 90)),
+                    practica_empresa_rut=_rut(76_000_000 + indice),
+                    practica_sector="Tecnología",
+                    practica_duracion_horas=320,
+                    dest_nombres="Nombre",
+                    dest_apellidos="Apellido",
+                    dest_cargo="Gerencia",
+                    dest_empresa=f"Empresa {indice % 500}",
+                    escuela_id="1",
+                    escuela_nombre="Escuela de Ingeniería",
+                    escuela_direccion="Av. Siempre Viva 123",
+                    escuela_telefono="+56 2 2222 2222",
+                    estado=self.azar.choice(estados),
+                )
+            )
+        self.cartas = self._crear(SolicitudCartaPractica, cartas)
+
+        self.documentos = self._crear(
+            PracticaDocumento,
+            [
+                PracticaDocumento(
+                    carrera=carrera,
+                    nombre=f"Documento {indice}",
+                    archivo=f"practicas/documentos/bench/{indice}-{posicion}.pdf",
+                    archivo_tipo="application/pdf",
+                    uploaded_by=coordinador,
+                )
+                for indice, (carrera, coordinador) in enumerate(self.coordinadores.items())
+                for posicion in range(5)
+            ],
+        )
+        self._crear(
+            PracticaFirmaCoordinador,
+            [
+                PracticaFirmaCoordinador(carrera=carrera, uploaded_by=coordinador)
+                for carrera, coordinador in self.coordinadores.items()
+            ],
+        )
+        self.evaluaciones_practica = {
+            evaluacion.carrera: evaluacion
+            for evaluacion in self._crear(
+                PracticaEvaluacion,
+                [
+                    PracticaEvaluacion(
+                        carrera=carrera,
+                        nombre=f"Pauta práctica {indice}",
+                        archivo=f"practicas/evaluaciones/bench/{indice}.pdf",
+                        uploaded_by=coordinador,
+                    )
+                    for indice, (carrera, coordinador) in enumerate(self.coordinadores.items())
+                ],
+            )
+        }
+        alumnos = self.azar.sample(self.alumnos, min(self.escala.entregas_practica, len(self.alumnos)))
+        self.entregas_practica = self._crear(
+            PracticaEvaluacionEntrega,
+            [
+                PracticaEvaluacionEntrega(
+                    evaluacion=self.evaluaciones_practica[alumno.carrera],
+                    alumno=alumno,
+                    archivo=f"practicas/evaluaciones/entregas/bench/{alumno.pk}.pdf",
+                    nota=str(self.azar.randint(40, 70) / 10) if self.azar.random() < 0.5 else "",
+                )
+                for alumno in alumnos
+            ],
+        )
+
+    def muestra(self) -> Muestra:
+        evaluacion = self.evaluaciones[0]
+        alumno = self.activos_por_tema[evaluacion.tema_id][0]
+        activos = {a.pk for grupo in self.activos_por_tema.values() for a in grupo}
+        # Para reservar hace falta un tema con cupo y un alumno libre de su carrera.
+        libres: dict[str, Usuario] = {}
+        for candidato in self.alumnos:
+            if candidato.pk not in activos:
+                libres.setdefault(candidato.carrera, candidato)
+        tema_con_cupo = next(
+            (
+                tema
+                for tema in self.temas
+                if len(self.activos_por_tema.get(tema.pk, [])) < tema.cupos
+                and tema.carrera in libres
+            ),
+            self.temas[-1],
+        )
+        sin_tema = libres.get(tema_con_cupo.carrera) or next(iter(libres.values()), alumno)
+        entrega = next(e for e in self.entregas if e.evaluacion_id == evaluacion.pk)
+        pauta = self.evaluaciones_practica[alumno.carrera]
+        practica = next(
+            (e for e in self.entregas_practica if e.evaluacion_id == pauta.pk),
+            self.entregas_practica[0],
+        )
+        con_practica = {e.alumno_id for e in self.entregas_practica}
+        sin_practica = next(
+            (a for a in self.alumnos if a.pk not in con_practica and a.carrera == alumno.carrera),
+            alumno,
+        )
+        documento = next(d for d in self.documentos if d.carrera == alumno.carrera)
+        propuesta = next((p for p in self.propuestas if p.estado == "pendiente"), self.propuestas[0])
+        # Aprobar una solicitud exige que el docente sea el guía del alumno.
+        solicitud = next(
+            (
+                s
+                for s in self.solicitudes
+                if s.estado == "pendiente" and s.alumno.docente_guia_id == s.docente_id
+            ),
+            self.solicitudes[0],
+        )
+        reunion = next((r for r in self.reuniones if r.estado == "aprobada"), self.reuniones[0])
+        carta = next((c for c in self.cartas if c.estado == "pendiente"), self.cartas[0])
+        return Muestra(
+            carrera=alumno.carrera,
+            alumno=alumno.pk,
+            alumno_correo=alumno.correo,
+            alumno_rut=alumno.rut,
+            alumno_sin_tema=sin_tema.pk,
+            docente=evaluacion.docente_id,
+            coordinador=self.coordinadores[alumno.carrera].pk,
+            tema=evaluacion.tema_id,
+            tema_con_cupo=tema_con_cupo.pk,
+            propuesta=propuesta.pk,
+            propuesta_docente=propuesta.docente_id,
+            notificacion=self.notificacion.pk,
+            solicitud_reunion=solicitud.pk,
+            solicitud_reunion_alumno=solicitud.alumno_id,
+            solicitud_reunion_docente=solicitud.docente_id,
+            reunion=reunion.pk,
+            reunion_docente=reunion.docente_id,
+            carta=carta.pk,
+            evaluacion=evaluacion.pk,
+            entrega=entrega.pk,
+            evaluacion_practica=pauta.pk,
+            entrega_practica=practica.pk,
+            alumno_sin_practica=sin_practica.pk,
+            documento_practica=documento.pk,
+        )
+
+
+def generar_datos(escala: Escala, *, semilla: int = 7, lote: int = 2000) -> Muestra:
+    """Puebla la base (que se asume vacía) y devuelve la muestra de ids."""
+
+    generador = _Generador(escala, semilla, max(lote, 1))
+    with transaction.atomic():
+        generador.usuarios()
+        generador.temas()
+        generador.inscripciones()
+        generador.evaluaciones()
+        generador.propuestas()
+        generador.notificaciones()
+        generador.reuniones()
+        generador.practicas()
+
+    reconstruir_resumenes(lote=lote)
+    # Las cachés derivadas se apoyan en señales que `bulk_create` no emite.
+    cache.clear()
+    invalidar_cache_lecturas()
+    return generador.muestra()
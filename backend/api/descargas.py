@@ -0,0 +1,174 @@
+"""Entrega de archivos de `MEDIA_ROOT` con rangos, validadores y delegación.
+
+Reemplaza a `django.conf.urls.static`: responde `Range`/`If-Range` e
+`If-None-Match`, marca como inmutables las rutas que siempre llevan un sufijo
+único y, si `MEDIA_ENVIO` lo indica, delega la transferencia a nginx
+(`X-Accel-Redirect`) o Apache (`X-Sendfile`) en vez de ocupar un worker.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+
+
+TAMANO_BLOQUE = 64 * 1024
+
+CACHE_INMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDAR = "no-cache"
+
+RUTAS_INMUTABLES_DEFECTO = (
+    # `evaluacion_entrega_upload_to` y `evaluacion_rubrica_upload_to` agregan un uuid.
+    r"^evaluaciones/(entregas|rubricas)/",
+    # Las cartas subidas llevan fecha en la ruta y marca de tiempo en el nombre.
+    r"^practicas/cartas/\d{4}/\d{2}/\d{2}/",
+)
+
+_RANGO_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _es_inmutable(ruta: str) -> bool:
+    patrones = getattr(settings, "MEDIA_RUTAS_INMUTABLES", RUTAS_INMUTABLES_DEFECTO)
+    return any(re.match(patron, ruta) for patron in patrones)
+
+
+def _calcular_etag(info: os.stat_result) -> str:
+    return f'"{info.st_size:x}-{info.st_mtime_ns:x}"'
+
+
+def _parsear_rango(cabecera: str, tamano: int) -> tuple[int, int] | None:
+    """Interpreta un único rango `bytes=`; devuelve `(inicio, fin)` inclusivo.
+
+    Lanza `ValueError` si el rango es insatisfacible y devuelve `None` si la
+    cabecera no se reconoce (por ejemplo, rangos múltiples), en cuyo caso se
+    responde el archivo completo.
+    """
+
+    coincidencia = _RANGO_RE.match(cabecera.strip())
+    if not coincidencia:
+        return None
+
+    inicio_txt, fin_txt = coincidencia.groups()
+    if not inicio_txt and not fin_txt:
+        return None
+
+    if not inicio_txt:
+        sufijo = int(fin_txt)
+        if sufijo == 0 or tamano == 0:
+            raise ValueError("Rango vacío")
+        return max(tamano - sufijo, 0), tamano - 1
+
+    inicio = int(inicio_txt)
+    fin = int(fin_txt) if fin_txt else tamano - 1
+    if inicio >= tamano or fin < inicio:
+        raise ValueError("Rango fuera del archivo")
+    return inicio, min(fin, tamano - 1)
+
+
+def _leer_rango(ruta: str, inicio: int, longitud: int):
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        restante = longitud
+        while restante > 0:
+            bloque = archivo.read(min(TAMANO_BLOQUE, restante))
+            if not bloque:
+                break
+            restante -= len(bloque)
+            yield bloque
+
+
+def _respuesta_delegada(modo: str, ruta: str, ruta_completa: str, content_type: str):
+    response = HttpResponse(content_type=content_type)
+    if modo == "x-accel-redirect":
+        prefijo = getattr(settings, "MEDIA_ACCEL_PREFIJO", "/media-interna/")
+        response["X-Accel-Redirect"] = prefijo.rstrip("/") + "/" + quote(ruta)
+    else:
+        response["X-Sendfile"] = ruta_completa
+    return response
+
+
+@require_safe
+def servir_media(request, ruta: str):
+    ruta = ruta.lstrip("/")
+    # Las rutas ocultas (p. ej. `.parciales/`) son de uso interno.
+    if any(segmento.startswith(".") for segmento in ruta.split("/")):
+        raise Http404("Archivo no encontrado.")
+    try:
+        ruta_completa = safe_join(settings.MEDIA_ROOT, ruta)
+    except Exception:
+        raise Http404("Archivo no encontrado.")
+
+    try:
+        info = os.stat(ruta_completa)
+    except OSError:
+        raise Http404("Archivo no encontrado.")
+    if not os.path.isfile(ruta_completa):
+        raise Http404("Archivo no encontrado.")
+
+    etag = _calcular_etag(info)
+    content_type, encoding = mimetypes.guess_type(ruta_completa)
+    content_type = content_type or "application/octet-stream"
+
+    cabeceras = {
+        "ETag": etag,
+        "Last-Modified": http_date(info.st_mtime),
+        "Cache-Control": CACHE_INMUTABLE if _es_inmutable(ruta) else CACHE_REVALIDAR,
+        "Accept-Ranges": "bytes",
+    }
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        for clave, valor in cabeceras.items():
+            response[clave] = valor
+        return response
+
+    modo = (getattr(settings, "MEDIA_ENVIO", "") or "").strip().lower()
+    if modo in {"x-accel-redirect", "x-sendfile"}:
+        response = _respuesta_delegada(modo, ruta, ruta_completa, content_type)
+    else:
+        rango = None
+        cabecera_rango = request.headers.get("Range")
+        if_range = request.headers.get("If-Range")
+        if cabecera_rango and (not if_range or if_range == etag):
+            try:
+                rango = _parsear_rango(cabecera_rango, info.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{info.st_size}"
+                for clave, valor in cabeceras.items():
+                    response[clave] = valor
+                return response
+
+        if rango is not None:
+            inicio, fin = rango
+            longitud = fin - inicio + 1
+            response = StreamingHttpResponse(
+                _leer_rango(ruta_completa, inicio, longitud),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {inicio}-{fin}/{info.st_size}"
+            response["Content-Length"] = str(longitud)
+        else:
+            response = FileResponse(open(ruta_completa, "rb"), content_type=content_type)
+            response["Content-Length"] = str(info.st_size)
+
+    if encoding:
+        response["Content-Encoding"] = encoding
+    for clave, valor in cabeceras.items():
+        response[clave] = valor
+    return response
@@ -0,0 +1,161 @@
+"""Directorio en memoria con el resumen de cada usuario.
+
+Los serializadores anidan el mismo resumen (id, nombre, correo, carrera,
+teléfono y rol) en notificaciones, reuniones, propuestas y temas. En vez de
+un `select_related` o una carga perezosa por fila, lo leen de este
+directorio a partir del id de la FK; los ids que faltan se cargan juntos en
+una sola consulta.
+
+Cada proceso guarda a lo más `DIRECTORIO_USUARIOS_MAX` resúmenes (se
+descartan los menos usados). Guardar o eliminar un `Usuario` quita su entrada
+local e incrementa la versión de su espacio en `cache_lecturas`; los demás procesos la
+revisan cada `DIRECTORIO_USUARIOS_REVISION` segundos y vacían su copia al
+verla cambiar. Las escrituras masivas no emiten señales y deben llamar a
+`invalidar_directorio()`.
+
+La versión solo llega a los demás procesos si la caché es compartida
+(`CACHE_BACKEND=redis` o `archivo`); con la caché local por defecto cada
+proceso ve únicamente sus propias escrituras. Por eso cada resumen se
+descarta además a los `DIRECTORIO_USUARIOS_EDAD_MAXIMA` segundos de leído,
+lo que acota cuánto puede quedar desactualizado en cualquier configuración.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache_lecturas import espacio
+from .models import Usuario
+
+
+# Solo la versión vive en la caché compartida; los resúmenes quedan en el proceso.
+VERSIONES = espacio("directorio_usuarios")
+CLAVE_VERSION = VERSIONES.clave_version()
+CAMPOS = ("id", "nombre_completo", "correo", "carrera", "telefono", "rol")
+# Guardar solo la contraseña (al actualizar el hash en el login) no cambia el resumen.
+CAMPOS_SIN_RESUMEN = frozenset({"contrasena"})
+
+
+def _capacidad() -> int:
+    return max(int(getattr(settings, "DIRECTORIO_USUARIOS_MAX", 5000)), 1)
+
+
+def _intervalo_revision() -> float:
+    return float(getattr(settings, "DIRECTORIO_USUARIOS_REVISION", 1.0))
+
+
+def _edad_maxima() -> float:
+    return float(getattr(settings, "DIRECTORIO_USUARIOS_EDAD_MAXIMA", 300))
+
+
+def _resumen(fila) -> dict:
+    pk, nombre, correo, carrera, telefono, rol = fila
+    return {
+        "id": pk,
+        "nombre": nombre,
+        "correo": correo,
+        "carrera": carrera,
+        "telefono": telefono,
+        "rol": rol,
+    }
+
+
+class DirectorioUsuarios:
+    def __init__(self):
+        # id -> (momento de la lectura, resumen)
+        self._resumenes: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._revisado = 0.0
+
+    def __len__(self) -> int:
+        return len(self._resumenes)
+
+    def _revisar_version(self) -> None:
+        ahora = time.monotonic()
+        if self._version is not None and ahora - self._revisado < _intervalo_revision():
+            return
+        version = VERSIONES.version()
+        with self._lock:
+            if version != self._version:
+                self._resumenes.clear()
+                self._version = version
+            self._revisado = ahora
+
+    def obtener_muchos(self, ids: Iterable[int | None]) -> dict[int, dict]:
+        """Resúmenes de los ids pedidos; los que no existen no aparecen."""
+
+        self._revisar_version()
+        pendientes = {int(pk) for pk in ids if pk is not None}
+        encontrados: dict[int, dict] = {}
+        vigentes_desde = time.monotonic() - _edad_maxima()
+        with self._lock:
+            for pk in pendientes:
+                entrada = self._resumenes.get(pk)
+                if entrada is not None and entrada[0] >= vigentes_desde:
+                    self._resumenes.move_to_end(pk)
+                    encontrados[pk] = entrada[1]
+            version = self._version
+
+        faltantes = pendientes - encontrados.keys()
+        if faltantes:
+            nuevos = {
+                fila[0]: _resumen(fila)
+                for fila in Usuario.objects.filter(pk__in=faltantes).values_list(*CAMPOS)
+            }
+            encontrados.update(nuevos)
+            with self._lock:
+                # Si hubo una invalidación durante la consulta, no se guarda lo leído.
+                if version == self._version:
+                    leido = time.monotonic()
+                    for pk, resumen in nuevos.items():
+                        self._resumenes[pk] = (leido, resumen)
+                        self._resumenes.move_to_end(pk)
+                    while len(self._resumenes) > _capacidad():
+                        self._resumenes.popitem(last=False)
+
+        return {pk: dict(resumen) for pk, resumen in encontrados.items()}
+
+    def obtener(self, pk: int | None) -> dict | None:
+        if pk is None:
+            return None
+        return self.obtener_muchos([pk]).get(int(pk))
+
+    def olvidar(self, pk: int | None = None) -> None:
+        """Quita `pk` (o todo, sin argumento) y avisa a los demás procesos."""
+
+        nueva = VERSIONES.invalidar()
+        with self._lock:
+            if pk is not None and self._version is not None and nueva == self._version + 1:
+                # Nadie más invalidó desde la última revisión: basta con quitar la entrada.
+                self._resumenes.pop(pk, None)
+            else:
+                self._resumenes.clear()
+            self._version = nueva
+            self._revisado = time.monotonic()
+
+
+directorio = DirectorioUsuarios()
+
+
+def invalidar_directorio() -> None:
+    directorio.olvidar()
+
+
+@receiver(post_save, sender=Usuario, dispatch_uid="directorio_usuarios_guardado")
+def _usuario_guardado(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= CAMPOS_SIN_RESUMEN:
+        return
+    directorio.olvidar(instance.pk)
+
+
+@receiver(post_delete, sender=Usuario, dispatch_uid="directorio_usuarios_eliminado")
+def _usuario_eliminado(sender, instance, **kwargs):
+    directorio.olvidar(instance.pk)
@@ -0,0 +1,265 @@
+"""Estadísticas de notas para coordinación calculadas con NumPy.
+
+Cada fuente de notas se lee con una sola consulta `values_list` que ya
+devuelve la nota como número. Los grupos (carrera o docente) se resuelven
+ordenando una vez por clave de grupo y nota: los límites de cada grupo salen
+de los cambios de clave y todas las reducciones (`np.add.reduceat`,
+`np.bincount`) y los percentiles se calculan sobre esos tramos sin recorrer
+los grupos en Python.
+
+El resultado queda en caché hasta la siguiente escritura de notas
+(`invalidar_estadisticas_notas`), con `ESTADISTICAS_NOTAS_TTL` como límite
+para procesos que no comparten la caché.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from django.conf import settings
+from django.db.models import FloatField, Value
+from django.db.models.functions import Cast, Coalesce, Replace
+
+from .cache_lecturas import espacio
+from .models import EvaluacionEntregaAlumno, PracticaEvaluacionEntrega, Usuario
+
+
+ESTADISTICAS = espacio(
+    "estadisticas_notas",
+    ttl=lambda: int(getattr(settings, "ESTADISTICAS_NOTAS_TTL", 600)),
+)
+CLAVE_VERSION = ESTADISTICAS.clave_version()
+NOTA_MINIMA = 1.0
+NOTA_MAXIMA = 7.0
+ANCHO_INTERVALO = 0.5
+PERCENTILES = (25, 50, 75, 90)
+SIN_CARRERA = "Sin carrera"
+SIN_DOCENTE = -1
+
+
+def nota_aprobacion() -> float:
+    return float(getattr(settings, "NOTA_APROBACION", 4.0))
+
+
+def bordes_histograma() -> np.ndarray:
+    return np.arange(NOTA_MINIMA, NOTA_MAXIMA + ANCHO_INTERVALO, ANCHO_INTERVALO)
+
+
+# ----------------------------------------------------------------------
+# Cálculo vectorizado
+
+
+def estadisticas_por_grupo(
+    claves: np.ndarray,
+    notas: np.ndarray,
+    *,
+    bordes: np.ndarray,
+    aprobacion: float,
+) -> dict[str, np.ndarray]:
+    """Estadísticas de `notas` agrupadas por `claves` (enteros).
+
+    Devuelve arreglos alineados con `claves_grupo`, más la matriz
+    `histograma` de forma `(grupos, intervalos)`.
+    """
+
+    cantidad_intervalos = len(bordes) - 1
+    if notas.size == 0:
+        vacio = np.empty(0)
+        return {
+            "claves_grupo": np.empty(0, dtype=claves.dtype),
+            "cantidad": np.empty(0, dtype=np.int64),
+            "promedio": vacio,
+            "desviacion": vacio,
+            "minimo": vacio,
+            "maximo": vacio,
+            "aprobados": np.empty(0, dtype=np.int64),
+            "percentiles": np.empty((0, len(PERCENTILES))),
+            "histograma": np.empty((0, cantidad_intervalos), dtype=np.int64),
+        }
+
+    # Un solo `argsort` sobre clave y nota combinadas es varias veces más
+    # rápido que `np.lexsort` con dos columnas.
+    minima = notas.min()
+    combinadas = claves * (notas.max() - minima + 1) + (notas - minima)
+    orden = np.argsort(combinadas)
+    claves = claves[orden]
+    notas = notas[orden]
+
+    inicios = np.flatnonzero(np.r_[True, claves[1:] != claves[:-1]])
+    cantidad = np.diff(np.r_[inicios, notas.size])
+    finales = inicios + cantidad - 1
+    indice_grupo = np.repeat(np.arange(inicios.size), cantidad)
+
+    promedio = np.add.reduceat(notas, inicios) / cantidad
+    desvios = notas - promedio[indice_grupo]
+    desviacion = np.sqrt(np.add.reduceat(desvios * desvios, inicios) / cantidad)
+    aprobados = np.add.reduceat((notas >= aprobacion).astype(np.int64), inicios)
+
+    # Dentro de cada tramo las notas están ordenadas: el percentil es la
+    # interpolación lineal entre las dos posiciones vecinas, igual que
+    # `np.percentile` con el método por defecto.
+    fracciones = np.asarray(PERCENTILES, dtype=float) / 100
+    posiciones = (cantidad - 1)[:, None] * fracciones[None, :]
+    bajo = np.floor(posiciones).astype(np.int64)
+    alto = np.ceil(posiciones).astype(np.int64)
+    valor_bajo = notas[inicios[:, None] + bajo]
+    valor_alto = notas[inicios[:, None] + alto]
+    percentiles = valor_bajo + (valor_alto - valor_bajo) * (posiciones - bajo)
+
+    intervalo = np.clip(
+        np.searchsorted(bordes, notas, side="right") - 1, 0, cantidad_intervalos - 1
+    )
+    histograma = np.bincount(
+        indice_grupo * cantidad_intervalos + intervalo,
+        minlength=inicios.size * cantidad_intervalos,
+    ).reshape(inicios.size, cantidad_intervalos)
+
+    return {
+        "claves_grupo": claves[inicios],
+        "cantidad": cantidad,
+        "promedio": promedio,
+        "desviacion": desviacion,
+        "minimo": notas[inicios],
+        "maximo": notas[finales],
+        "aprobados": aprobados,
+        "percentiles": percentiles,
+        "histograma": histograma,
+    }
+
+
+def _filas_grupo(resultado: dict[str, np.ndarray], etiquetas) -> list[dict]:
+    filas = []
+    for posicion, clave in enumerate(resultado["claves_grupo"].tolist()):
+        cantidad = int(resultado["cantidad"][posicion])
+        fila = etiquetas(clave)
+        fila.update(
+            {
+                "cantidad": cantidad,
+                "promedio": round(float(resultado["promedio"][posicion]), 2),
+                "desviacion": round(float(resultado["desviacion"][posicion]), 2),
+                "minimo": round(float(resultado["minimo"][posicion]), 2),
+                "maximo": round(float(resultado["maximo"][posicion]), 2),
+                "percentiles": {
+                    f"p{percentil}": round(float(valor), 2)
+                    for percentil, valor in zip(PERCENTILES, resultado["percentiles"][posicion])
+                },
+                "tasaAprobacion": round(int(resultado["aprobados"][posicion]) / cantidad, 4),
+                "histograma": resultado["histograma"][posicion].tolist(),
+            }
+        )
+        filas.append(fila)
+    return filas
+
+
+def resumir_notas(
+    notas: np.ndarray,
+    carreras: np.ndarray,
+    nombres_carrera: list[str],
+    docentes: np.ndarray,
+    nombres_docentes: dict[int, str] | None = None,
+) -> dict:
+    """Estadísticas generales, por carrera y por docente de una fuente.
+
+    `carreras` trae el índice de cada nota en `nombres_carrera`.
+    """
+
+    nombres_docentes = nombres_docentes or {}
+    opciones = {"bordes": bordes_histograma(), "aprobacion": nota_aprobacion()}
+
+    general = estadisticas_por_grupo(np.zeros(notas.size, dtype=np.int64), notas, **opciones)
+    por_carrera = estadisticas_por_grupo(carreras, notas, **opciones)
+    por_docente = estadisticas_por_grupo(docentes, notas, **opciones)
+
+    return {
+        "general": (_filas_grupo(general, lambda clave: {}) or [None])[0],
+        "porCarrera": _filas_grupo(
+            por_carrera, lambda clave: {"carrera": nombres_carrera[clave]}
+        ),
+        "porDocente": _filas_grupo(
+            por_docente,
+            lambda clave: {
+                "docenteId": None if clave == SIN_DOCENTE else clave,
+                "docente": nombres_docentes.get(clave),
+            },
+        ),
+    }
+
+
+# ----------------------------------------------------------------------
+# Lectura desde la base de datos
+
+
+def _arreglos(filas):
+    """Convierte filas `(nota, carrera, docente)` en arreglos con códigos enteros."""
+
+    notas, carreras, docentes = zip(*filas) if filas else ((), (), ())
+    codigos: dict[str, int] = {}
+    codigos_carrera = [
+        codigos.setdefault((carrera or "").strip() or SIN_CARRERA, len(codigos))
+        for carrera in carreras
+    ]
+    return (
+        np.asarray(notas, dtype=float),
+        np.asarray(codigos_carrera, dtype=np.int64),
+        list(codigos),
+        np.asarray([SIN_DOCENTE if docente is None else docente for docente in docentes], dtype=np.int64),
+    )
+
+
+def notas_titulo():
+    filas = list(
+        EvaluacionEntregaAlumno.objects.filter(nota__isnull=False)
+        .order_by()
+        .values_list(
+            Cast("nota", FloatField()),
+            "evaluacion__tema__carrera",
+            "evaluacion__docente_id",
+        )
+    )
+    return _arreglos(filas)
+
+
+def notas_practica():
+    """Notas de práctica; se guardan como texto y solo cuentan las numéricas."""
+
+    filas = list(
+        PracticaEvaluacionEntrega.objects.filter(nota__regex=r"^[0-9]+([.,][0-9]+)?$")
+        .order_by()
+        .values_list(
+            Cast(Replace("nota", Value(","), Value(".")), FloatField()),
+            Coalesce("evaluacion__carrera", Value("")),
+            "evaluacion__uploaded_by_id",
+        )
+    )
+    return _arreglos(filas)
+
+
+def calcular_estadisticas_notas() -> dict:
+    titulo = notas_titulo()
+    practica = notas_practica()
+
+    ids_docentes = set(titulo[3].tolist()) | set(practica[3].tolist())
+    ids_docentes.discard(SIN_DOCENTE)
+    nombres = dict(
+        Usuario.objects.filter(pk__in=ids_docentes).values_list("pk", "nombre_completo")
+    )
+
+    return {
+        "bordesHistograma": bordes_histograma().tolist(),
+        "notaAprobacion": nota_aprobacion(),
+        "titulo": resumir_notas(*titulo, nombres),
+        "practica": resumir_notas(*practica, nombres),
+    }
+
+
+# ----------------------------------------------------------------------
+# Caché
+
+
+def obtener_estadisticas_notas() -> dict:
+    return ESTADISTICAS.obtener((), calcular_estadisticas_notas)
+
+
+def invalidar_estadisticas_notas() -> None:
+    """Descarta las estadísticas en caché; llamar después de escribir notas."""
+
+    ESTADISTICAS.invalidar()
@@ -0,0 +1,78 @@
+"""Refresco masivo de `EvaluacionGrupoDocente.estado`.
+
+El estado depende solo de la fecha de la evaluación y del día actual, así que
+cambia sin que nadie guarde la fila. `refrescar_estados` lo recalcula en la
+base de datos con un `UPDATE ... SET estado = CASE ...` por tramo de claves
+primarias, tocando solo las filas cuyo estado quedó desactualizado. Lo
+ejecuta el comando `refrescar_estados_evaluaciones` (pensado para cron) y,
+si se habilita, `RefrescoEstadosDiarioMiddleware` en el primer request del
+día.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Case, Max, Min, Q, Value, When
+from django.utils import timezone
+
+from .models import EvaluacionGrupoDocente
+
+
+PENDIENTE = "Pendiente"
+EN_PROGRESO = "En progreso"
+EVALUADA = "Evaluada"
+
+
+def _condiciones(hoy: date) -> list[tuple[Q, str]]:
+    return [
+        (Q(fecha__isnull=True) | Q(fecha__gt=hoy), PENDIENTE),
+        (Q(fecha=hoy), EN_PROGRESO),
+        (Q(fecha__lt=hoy), EVALUADA),
+    ]
+
+
+def expresion_estado(hoy: date) -> Case:
+    return Case(
+        *(When(condicion, then=Value(estado)) for condicion, estado in _condiciones(hoy)),
+        default=Value(PENDIENTE),
+    )
+
+
+def filtro_desactualizadas(hoy: date) -> Q:
+    filtro = Q()
+    for condicion, estado in _condiciones(hoy):
+        filtro |= condicion & ~Q(estado=estado)
+    return filtro
+
+
+def refrescar_estados(hoy: date | None = None, *, lote: int = 1000) -> int:
+    """Recalcula los estados y devuelve cuántas filas cambiaron."""
+
+    hoy = hoy or timezone.localdate()
+    limites = EvaluacionGrupoDocente.objects.aggregate(minimo=Min("pk"), maximo=Max("pk"))
+    if limites["minimo"] is None:
+        return 0
+
+    actualizadas = 0
+    desactualizadas = filtro_desactualizadas(hoy)
+    estado = expresion_estado(hoy)
+    for inicio in range(limites["minimo"], limites["maximo"] + 1, lote):
+        actualizadas += (
+            EvaluacionGrupoDocente.objects.filter(pk__gte=inicio, pk__lt=inicio + lote)
+            .filter(desactualizadas)
+            .update(estado=estado)
+        )
+    # Los dashboards derivan el estado de la fecha; no hace falta invalidarlos.
+    return actualizadas
+
+
+def refrescar_estados_si_corresponde(hoy: date | None = None) -> bool:
+    """Refresca una sola vez por día entre todos los procesos que comparten la caché."""
+
+    hoy = hoy or timezone.localdate()
+    if not cache.add(f"estados_evaluaciones:refrescados:{hoy.isoformat()}", True, 2 * 24 * 3600):
+        return False
+    refrescar_estados(hoy)
+    return True
@@ -0,0 +1,178 @@
+"""Exportación en ZIP de las entregas de una evaluación.
+
+El ZIP se arma con `zipfile` sobre un búfer no posicionable: cada bloque leído
+del almacenamiento se comprime y se entrega de inmediato al
+`StreamingHttpResponse`, por lo que la memoria usada no depende del tamaño de
+los informes y la descarga comienza sin esperar a que el archivo esté listo.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import zipfile
+from pathlib import PurePosixPath
+from typing import Iterable, Iterator
+
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .models import EvaluacionEntregaAlumno
+
+
+logger = logging.getLogger(__name__)
+
+
+TAMANO_BLOQUE = 64 * 1024
+
+# Formatos ya comprimidos: volver a comprimirlos solo gasta CPU.
+EXTENSIONES_SIN_COMPRESION = {
+    ".pdf", ".zip", ".rar", ".7z", ".gz", ".docx", ".xlsx", ".pptx",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".mp4", ".mp3",
+}
+
+COLUMNAS_MANIFIESTO = [
+    "entrega_id",
+    "alumno_id",
+    "alumno",
+    "correo",
+    "tipo",
+    "bitacora_indice",
+    "titulo",
+    "estado_revision",
+    "nota",
+    "creado_en",
+    "archivo_original",
+    "ruta_zip",
+    "tamano",
+]
+
+
+class _SalidaZip(io.RawIOBase):
+    """Búfer de escritura que `zipfile` ve como flujo no posicionable."""
+
+    def __init__(self) -> None:
+        self._partes: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, datos) -> int:
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def _carpeta_alumno(entrega: EvaluacionEntregaAlumno) -> str:
+    alumno = entrega.alumno
+    if alumno is None:
+        return "sin-alumno"
+    nombre = slugify(alumno.nombre_completo or "")[:60] or "alumno"
+    return f"{nombre}-{alumno.pk}"
+
+
+def _carpeta_tipo(entrega: EvaluacionEntregaAlumno) -> str:
+    if entrega.es_bitacora and entrega.bitacora_indice:
+        return f"bitacora-{entrega.bitacora_indice:02d}"
+    return "entrega"
+
+
+def _ruta_en_zip(entrega: EvaluacionEntregaAlumno, usadas: set[str]) -> str:
+    original = PurePosixPath(entrega.archivo.name).name
+    marca = timezone.localtime(entrega.creado_en).strftime("%Y%m%d-%H%M%S")
+    base = f"{_carpeta_alumno(entrega)}/{_carpeta_tipo(entrega)}/{marca}-{original}"
+
+    ruta = base
+    contador = 2
+    while ruta in usadas:
+        ruta_base = PurePosixPath(base)
+        ruta = str(ruta_base.with_name(f"{ruta_base.stem}-{contador}{ruta_base.suffix}"))
+        contador += 1
+    usadas.add(ruta)
+    return ruta
+
+
+def _fila_manifiesto(entrega: EvaluacionEntregaAlumno, ruta: str, tamano) -> list:
+    alumno = entrega.alumno
+    return [
+        entrega.pk,
+        alumno.pk if alumno else "",
+        alumno.nombre_completo if alumno else "",
+        alumno.correo if alumno else "",
+        "bitacora" if entrega.es_bitacora else "entrega",
+        entrega.bitacora_indice or "",
+        entrega.titulo,
+        entrega.estado_revision,
+        "" if entrega.nota is None else entrega.nota,
+        timezone.localtime(entrega.creado_en).isoformat(),
+        PurePosixPath(entrega.archivo.name).name,
+        ruta,
+        tamano,
+    ]
+
+
+def generar_zip_entregas(entregas: Iterable[EvaluacionEntregaAlumno]) -> Iterator[bytes]:
+    """Genera los bytes de un ZIP con cada archivo y un `manifiesto.csv`.
+
+    Los archivos que ya no existen en el almacenamiento se omiten del ZIP y
+    quedan en el manifiesto con la ruta vacía.
+    """
+
+    salida = _SalidaZip()
+    manifiesto = io.StringIO()
+    escritor = csv.writer(manifiesto)
+    escritor.writerow(COLUMNAS_MANIFIESTO)
+    usadas: set[str] = set()
+
+    with zipfile.ZipFile(salida, mode="w", allowZip64=True) as archivo_zip:
+        for entrega in entregas:
+            if not entrega.archivo:
+                continue
+
+            ruta = _ruta_en_zip(entrega, usadas)
+            try:
+                origen = entrega.archivo.open("rb")
+            except (FileNotFoundError, OSError):
+                logger.warning("Entrega %s sin archivo en el almacenamiento", entrega.pk)
+                escritor.writerow(_fila_manifiesto(entrega, "", ""))
+                continue
+
+            info = zipfile.ZipInfo(
+                ruta, date_time=timezone.localtime(entrega.creado_en).timetuple()[:6]
+            )
+            extension = PurePosixPath(ruta).suffix.lower()
+            if extension in EXTENSIONES_SIN_COMPRESION:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            try:
+                info.file_size = entrega.archivo.size
+            except OSError:
+                pass
+
+            tamano = 0
+            with origen, archivo_zip.open(info, mode="w") as destino:
+                for bloque in iter(lambda: origen.read(TAMANO_BLOQUE), b""):
+                    destino.write(bloque)
+                    tamano += len(bloque)
+                    datos = salida.vaciar()
+                    if datos:
+                        yield datos
+
+            escritor.writerow(_fila_manifiesto(entrega, ruta, tamano))
+            datos = salida.vaciar()
+            if datos:
+                yield datos
+
+        archivo_zip.writestr(
+            zipfile.ZipInfo("manifiesto.csv", date_time=timezone.localtime().timetuple()[:6]),
+            manifiesto.getvalue().encode("utf-8-sig"),
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+
+    yield salida.vaciar()
@@ -0,0 +1,367 @@
+"""Caché en memoria y disco para las firmas remotas del coordinador.
+
+`proxy_firma_coordinador` sirve imágenes alojadas fuera de la plataforma. Esta
+caché evita descargarlas en cada vista previa de carta: guarda el contenido por
+URL, revalida con `ETag`/`Last-Modified` cuando expira y agrupa las descargas
+concurrentes de una misma URL en una sola petición.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+from urllib import error as urllib_error
+from urllib import parse as urllib_parse
+from urllib import request as urllib_request
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+TAMANO_BLOQUE = 64 * 1024
+
+
+class FirmaRemotaError(Exception):
+    """No fue posible obtener la firma remota."""
+
+
+class _Descarga:
+    """Descarga en curso compartida por las peticiones concurrentes."""
+
+    def __init__(self) -> None:
+        self.evento = threading.Event()
+        self.resultado: dict[str, Any] | None = None
+        self.error: Exception | None = None
+
+
+def _parsear_max_age(cache_control: str | None) -> int | None:
+    if not cache_control:
+        return None
+    directivas = [parte.strip().lower() for parte in cache_control.split(",")]
+    if "no-store" in directivas or "no-cache" in directivas:
+        return 0
+    for directiva in directivas:
+        coincidencia = re.fullmatch(r"max-age=(\d+)", directiva)
+        if coincidencia:
+            return int(coincidencia.group(1))
+    return None
+
+
+class CacheFirmasRemotas:
+    def __init__(
+        self,
+        directorio: str | os.PathLike,
+        *,
+        ttl: int = 300,
+        max_bytes: int = 2 * 1024 * 1024,
+        max_memoria_bytes: int = 8 * 1024 * 1024,
+        max_disco_bytes: int = 64 * 1024 * 1024,
+        timeout: float = 10,
+    ) -> None:
+        self.directorio = Path(directorio)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_memoria_bytes = max_memoria_bytes
+        self.max_disco_bytes = max_disco_bytes
+        self.timeout = timeout
+
+        self._memoria: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._memoria_bytes = 0
+        self._lock = threading.Lock()
+        self._descargas: dict[str, _Descarga] = {}
+
+    # ------------------------------------------------------------------
+    # API pública
+
+    def obtener(self, url: str) -> dict[str, Any]:
+        """Devuelve la entrada de `url`, descargándola o revalidándola si hace falta.
+
+        La entrada es un diccionario con `contenido`, `content_type`, `hash`,
+        `etag`, `last_modified`, `obtenida_en` y `max_age`.
+        """
+
+        esquema = urllib_parse.urlsplit(url).scheme.lower()
+        if esquema not in {"http", "https"}:
+            raise FirmaRemotaError("Solo se permiten URLs http o https.")
+
+        entrada = self._leer(url)
+        if entrada and self._vigente(entrada):
+            return entrada
+
+        with self._lock:
+            descarga = self._descargas.get(url)
+            es_lider = descarga is None
+            if es_lider:
+                descarga = _Descarga()
+                self._descargas[url] = descarga
+
+        if not es_lider:
+            descarga.evento.wait(self.timeout * 2)
+            if descarga.error is not None:
+                raise descarga.error
+            if descarga.resultado is None:
+                raise FirmaRemotaError("La descarga de la firma no finalizó a tiempo.")
+            return descarga.resultado
+
+        try:
+            descarga.resultado = self._descargar(url, entrada)
+        except FirmaRemotaError as exc:
+            descarga.error = exc
+            raise
+        except Exception as exc:
+            descarga.error = FirmaRemotaError("No se pudo descargar la imagen de la firma.")
+            raise descarga.error from exc
+        finally:
+            with self._lock:
+                self._descargas.pop(url, None)
+            descarga.evento.set()
+
+        return descarga.resultado
+
+    def segundos_vigencia(self, entrada: dict[str, Any]) -> int:
+        restante = entrada["obtenida_en"] + entrada["max_age"] - time.time()
+        return max(int(restante), 0)
+
+    def limpiar_memoria(self) -> None:
+        with self._lock:
+            self._memoria.clear()
+            self._memoria_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Descarga y revalidación
+
+    def _vigente(self, entrada: dict[str, Any]) -> bool:
+        return time.time() < entrada["obtenida_en"] + entrada["max_age"]
+
+    def _descargar(self, url: str, previa: dict[str, Any] | None) -> dict[str, Any]:
+        cabeceras = {}
+        if previa:
+            if previa.get("etag"):
+                cabeceras["If-None-Match"] = previa["etag"]
+            if previa.get("last_modified"):
+                cabeceras["If-Modified-Since"] = previa["last_modified"]
+
+        peticion = urllib_request.Request(url, headers=cabeceras)
+        try:
+            with urllib_request.urlopen(peticion, timeout=self.timeout) as resp:
+                contenido = self._leer_cuerpo(resp)
+                return self._guardar(url, contenido, resp.headers)
+        except urllib_error.HTTPError as exc:
+            if exc.code == 304 and previa:
+                return self._renovar(url, previa, exc.headers)
+            if previa:
+                logger.warning(
+                    "Firma remota respondió %s; se usa la copia en caché", exc.code
+                )
+                return previa
+            raise FirmaRemotaError(f"La URL respondió con estado {exc.code}.") from exc
+        except (urllib_error.URLError, http.client.HTTPException, ValueError, OSError) as exc:
+            # Incluye cortes y `socket.timeout` mientras se lee el cuerpo.
+            if previa:
+                logger.warning("No se pudo revalidar la firma remota; se usa la copia en caché")
+                return previa
+            raise FirmaRemotaError("No se pudo descargar la imagen de la firma.") from exc
+
+    def _leer_cuerpo(self, resp) -> bytes:
+        try:
+            longitud = int(resp.headers.get("Content-Length"))
+        except (TypeError, ValueError):
+            longitud = None
+        if longitud is not None and longitud > self.max_bytes:
+            raise FirmaRemotaError("La imagen de la firma excede el tamaño permitido.")
+
+        partes: list[bytes] = []
+        total = 0
+        while True:
+            bloque = resp.read(TAMANO_BLOQUE)
+            if not bloque:
+                break
+            total += len(bloque)
+            if total > self.max_bytes:
+                raise FirmaRemotaError("La imagen de la firma excede el tamaño permitido.")
+            partes.append(bloque)
+        if longitud is not None and total < longitud:
+            # `read(n)` devuelve lo recibido sin avisar si la conexión se cortó.
+            raise http.client.IncompleteRead(b"".join(partes), longitud - total)
+        return b"".join(partes)
+
+    def _guardar(self, url: str, contenido: bytes, cabeceras) -> dict[str, Any]:
+        max_age = _parsear_max_age(cabeceras.get("Cache-Control"))
+        entrada = {
+            "contenido": contenido,
+            "content_type": (cabeceras.get("Content-Type") or "").split(";")[0].strip().lower(),
+            "hash": hashlib.sha256(contenido).hexdigest(),
+            "etag": cabeceras.get("ETag"),
+            "last_modified": cabeceras.get("Last-Modified"),
+            "obtenida_en": time.time(),
+            "max_age": self.ttl if max_age is None else max_age,
+        }
+        self._recordar(url, entrada)
+        self._escribir_disco(url, entrada)
+        return entrada
+
+    def _renovar(self, url: str, previa: dict[str, Any], cabeceras) -> dict[str, Any]:
+        max_age = _parsear_max_age(cabeceras.get("Cache-Control"))
+        entrada = dict(previa)
+        entrada["obtenida_en"] = time.time()
+        if max_age is not None:
+            entrada["max_age"] = max_age
+        if cabeceras.get("ETag"):
+            entrada["etag"] = cabeceras.get("ETag")
+        if cabeceras.get("Last-Modified"):
+            entrada["last_modified"] = cabeceras.get("Last-Modified")
+        self._recordar(url, entrada)
+        self._escribir_disco(url, entrada, solo_meta=True)
+        return entrada
+
+    # ------------------------------------------------------------------
+    # Almacenamiento en memoria (LRU)
+
+    def _leer(self, url: str) -> dict[str, Any] | None:
+        with self._lock:
+            entrada = self._memoria.get(url)
+            if entrada is not None:
+                self._memoria.move_to_end(url)
+                return entrada
+
+        entrada = self._leer_disco(url)
+        if entrada is not None:
+            self._recordar(url, entrada)
+        return entrada
+
+    def _recordar(self, url: str, entrada: dict[str, Any]) -> None:
+        tamano = len(entrada["contenido"])
+        if tamano > self.max_memoria_bytes:
+            return
+        with self._lock:
+            anterior = self._memoria.pop(url, None)
+            if anterior is not None:
+                self._memoria_bytes -= len(anterior["contenido"])
+            self._memoria[url] = entrada
+            self._memoria_bytes += tamano
+            while self._memoria_bytes > self.max_memoria_bytes and self._memoria:
+                _, expulsada = self._memoria.popitem(last=False)
+                self._memoria_bytes -= len(expulsada["contenido"])
+
+    # ------------------------------------------------------------------
+    # Almacenamiento en disco
+
+    def _rutas(self, url: str) -> tuple[Path, Path]:
+        clave = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directorio / f"{clave}.bin", self.directorio / f"{clave}.json"
+
+    def _leer_disco(self, url: str) -> dict[str, Any] | None:
+        ruta_contenido, ruta_meta = self._rutas(url)
+        try:
+            meta = json.loads(ruta_meta.read_text(encoding="utf-8"))
+            contenido = ruta_contenido.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("url") != url or meta.get("hash") != hashlib.sha256(contenido).hexdigest():
+            return None
+
+        try:
+            os.utime(ruta_contenido)
+        except OSError:
+            pass
+
+        meta.pop("url", None)
+        meta["contenido"] = contenido
+        return meta
+
+    def _escribir_disco(self, url: str, entrada: dict[str, Any], *, solo_meta: bool = False) -> None:
+        if len(entrada["contenido"]) > self.max_disco_bytes:
+            return
+
+        ruta_contenido, ruta_meta = self._rutas(url)
+        meta = {clave: valor for clave, valor in entrada.items() if clave != "contenido"}
+        meta["url"] = url
+
+        try:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            if not solo_meta or not ruta_contenido.exists():
+                self._escribir_atomico(ruta_contenido, entrada["contenido"])
+            self._escribir_atomico(ruta_meta, json.dumps(meta).encode("utf-8"))
+        except OSError:
+            logger.exception("No se pudo guardar la firma remota en disco")
+            return
+
+        self._podar_disco()
+
+    def _escribir_atomico(self, ruta: Path, datos: bytes) -> None:
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                archivo.write(datos)
+            os.replace(temporal, ruta)
+        except BaseException:
+            try:
+                os.unlink(temporal)
+            except OSError:
+                pass
+            raise
+
+    def _podar_disco(self) -> None:
+        try:
+            archivos = [
+                (ruta, ruta.stat())
+                for ruta in self.directorio.glob("*.bin")
+            ]
+        except OSError:
+            return
+
+        total = sum(info.st_size for _, info in archivos)
+        if total <= self.max_disco_bytes:
+            return
+
+        for ruta, info in sorted(archivos, key=lambda item: item[1].st_mtime):
+            if total <= self.max_disco_bytes:
+                break
+            for candidata in (ruta, ruta.with_suffix(".json")):
+                try:
+                    candidata.unlink()
+                except OSError:
+                    pass
+            total -= info.st_size
+
+
+_cache_firmas: CacheFirmasRemotas | None = None
+_cache_firmas_lock = threading.Lock()
+
+
+def obtener_cache_firmas() -> CacheFirmasRemotas:
+    """Devuelve la caché compartida del proceso, configurada desde settings."""
+
+    global _cache_firmas
+    if _cache_firmas is None:
+        with _cache_firmas_lock:
+            if _cache_firmas is None:
+                directorio = getattr(settings, "FIRMAS_REMOTAS_CACHE_DIR", None) or (
+                    Path(tempfile.gettempdir()) / "trabajo_titulo_firmas"
+                )
+                _cache_firmas = CacheFirmasRemotas(
+                    directorio,
+                    ttl=getattr(settings, "FIRMAS_REMOTAS_TTL", 300),
+                    max_bytes=getattr(settings, "FIRMAS_REMOTAS_MAX_BYTES", 2 * 1024 * 1024),
+                    max_memoria_bytes=getattr(
+                        settings, "FIRMAS_REMOTAS_MAX_MEMORIA_BYTES", 8 * 1024 * 1024
+                    ),
+                    max_disco_bytes=getattr(
+                        settings, "FIRMAS_REMOTAS_MAX_DISCO_BYTES", 64 * 1024 * 1024
+                    ),
+                    timeout=getattr(settings, "FIRMAS_REMOTAS_TIMEOUT", 10),
+                )
+    return _cache_firmas
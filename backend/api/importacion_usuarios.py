@@ -0,0 +1,361 @@
+"""Importación masiva de usuarios desde CSV o JSONL.
+
+El archivo se lee fila a fila; cada lote de filas válidas se resuelve con una
+consulta para conocer los usuarios existentes (por correo y por RUT), los
+hashes se calculan en varios procesos y se escribe con un solo `bulk_create`
+que actualiza por `correo` los usuarios que ya existían. Los docentes guía se
+enlazan al final, cuando todos los usuarios del archivo ya están en la base.
+
+Columnas: `nombre_completo` (o `nombre`), `correo`, `rol`, `rut`, `carrera`,
+`telefono`, `contrasena` (o `password`) y `docente_guia` (correo del
+docente).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Replace, Upper
+
+from .cache_lecturas import invalidar_todo as invalidar_cache_lecturas
+from .contrasenas import HasheadorParalelo
+from .dashboard import invalidar_dashboards
+from .directorio_usuarios import invalidar_directorio
+from .models import Usuario
+
+
+ALIAS_COLUMNAS = {"nombre": "nombre_completo", "password": "contrasena", "email": "correo"}
+CAMPOS_ACTUALIZABLES = ["nombre_completo", "rut", "rol", "carrera", "telefono"]
+ROLES = {codigo for codigo, _ in Usuario.ROL_CHOICES}
+
+
+class FilaInvalida(Exception):
+    pass
+
+
+@dataclass
+class UsuarioImportado:
+    linea: int
+    correo: str
+    nombre_completo: str
+    rol: str
+    contrasena: str
+    rut: str | None = None
+    carrera: str | None = None
+    telefono: str | None = None
+    docente_guia: str | None = None
+
+
+@dataclass
+class ResultadoImportacion:
+    leidas: int = 0
+    creados: int = 0
+    actualizados: int = 0
+    docentes_asignados: int = 0
+    errores: list[tuple[int, str]] = field(default_factory=list)
+
+
+# ----------------------------------------------------------------------
+# Lectura
+
+
+def leer_filas(ruta: Path, formato: str | None = None) -> Iterator[tuple[int, dict]]:
+    """Entrega `(línea, fila)` sin cargar el archivo completo."""
+
+    formato = (formato or ruta.suffix.lstrip(".")).lower()
+    with ruta.open(encoding="utf-8-sig", newline="") as archivo:
+        if formato == "csv":
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                yield lector.line_num, fila
+        elif formato in {"jsonl", "ndjson"}:
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except json.JSONDecodeError:
+                    fila = None
+                yield numero, fila if isinstance(fila, dict) else {"__invalida__": True}
+        else:
+            raise ValueError(f"Formato no soportado: {formato!r} (use csv o jsonl).")
+
+
+# ----------------------------------------------------------------------
+# Normalización
+
+
+def _sin_acentos(valor: str) -> str:
+    texto = unicodedata.normalize("NFKD", valor)
+    return "".join(char for char in texto if not unicodedata.combining(char))
+
+
+def _clave_carrera(valor: str) -> str:
+    texto = _sin_acentos(valor).casefold().replace(".", " ")
+    palabras = ["ing" if palabra == "ingenieria" else palabra for palabra in texto.split()]
+    return " ".join(palabras)
+
+
+CARRERAS = {_clave_carrera(codigo): codigo for codigo, _ in Usuario.CARRERA_CHOICES}
+
+
+def normalizar_carrera(valor: str | None) -> str | None:
+    if not valor or not valor.strip():
+        return None
+    carrera = CARRERAS.get(_clave_carrera(valor))
+    if carrera is None:
+        raise FilaInvalida(f"carrera desconocida: {valor.strip()!r}")
+    return carrera
+
+
+def digito_verificador(cuerpo: str) -> str:
+    suma, factor = 0, 2
+    for digito in reversed(cuerpo):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - suma % 11
+    return {11: "0", 10: "K"}.get(resto, str(resto))
+
+
+def rut_sin_formato(valor: str) -> str:
+    """RUT sin puntos ni guion, para comparar sin importar cómo se guardó."""
+
+    return re.sub(r"[^0-9kK]", "", valor).upper()
+
+
+def normalizar_rut(valor: str | None) -> str | None:
+    """Valida el dígito verificador y devuelve el RUT como `12.345.678-5`."""
+
+    if not valor or not valor.strip():
+        return None
+    limpio = rut_sin_formato(valor)
+    cuerpo, dv = limpio[:-1], limpio[-1:]
+    if not cuerpo.isdigit() or len(cuerpo) > 9:
+        raise FilaInvalida(f"RUT inválido: {valor.strip()!r}")
+    if digito_verificador(cuerpo) != dv:
+        raise FilaInvalida(f"dígito verificador incorrecto en el RUT {valor.strip()!r}")
+    return f"{int(cuerpo):,}".replace(",", ".") + f"-{dv}"
+
+
+def normalizar_correo(valor: str | None) -> str:
+    correo = (valor or "").strip().lower()
+    try:
+        validate_email(correo)
+    except ValidationError:
+        raise FilaInvalida(f"correo inválido: {correo!r}")
+    return correo
+
+
+def normalizar_fila(linea: int, fila: dict | None) -> UsuarioImportado:
+    if not fila or fila.get("__invalida__"):
+        raise FilaInvalida("la línea no es un objeto JSON")
+
+    datos = {
+        ALIAS_COLUMNAS.get(clave.strip().lower(), clave.strip().lower()): (
+            str(valor).strip() if valor is not None else ""
+        )
+        for clave, valor in fila.items()
+        if clave
+    }
+
+    nombre = " ".join(datos.get("nombre_completo", "").split())
+    if not nombre:
+        raise FilaInvalida("falta el nombre")
+    rol = datos.get("rol", "").lower()
+    if rol not in ROLES:
+        raise FilaInvalida(f"rol inválido: {datos.get('rol', '')!r}")
+    contrasena = datos.get("contrasena", "")
+    if not contrasena:
+        raise FilaInvalida("falta la contraseña")
+
+    docente_guia = datos.get("docente_guia") or None
+    return UsuarioImportado(
+        linea=linea,
+        correo=normalizar_correo(datos.get("correo")),
+        nombre_completo=nombre[: Usuario._meta.get_field("nombre_completo").max_length],
+        rol=rol,
+        contrasena=contrasena,
+        rut=normalizar_rut(datos.get("rut")),
+        carrera=normalizar_carrera(datos.get("carrera")),
+        telefono=datos.get("telefono") or None,
+        docente_guia=normalizar_correo(docente_guia) if docente_guia else None,
+    )
+
+
+# ----------------------------------------------------------------------
+# Escritura
+
+
+def lotes(filas, tamano: int):
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+class ImportadorUsuarios:
+    def __init__(
+        self,
+        *,
+        lote: int = 1000,
+        procesos: int | None = None,
+        actualizar_contrasenas: bool = False,
+        simular: bool = False,
+    ):
+        self.lote = max(lote, 1)
+        self.procesos = procesos
+        self.actualizar_contrasenas = actualizar_contrasenas
+        self.simular = simular
+        self.resultado = ResultadoImportacion()
+        self._ruts: dict[str, str] = {}
+        self._guias: list[tuple[str, str]] = []
+
+    def _validas(self, filas) -> Iterator[UsuarioImportado]:
+        for linea, fila in filas:
+            self.resultado.leidas += 1
+            try:
+                yield normalizar_fila(linea, fila)
+            except FilaInvalida as exc:
+                self.resultado.errores.append((linea, str(exc)))
+
+    def _depurar(self, usuarios: list[UsuarioImportado]) -> tuple[list[UsuarioImportado], set[str]]:
+        """Quita los conflictos de RUT y devuelve los correos que ya existían."""
+
+        # Si un correo se repite dentro del lote, vale la última fila.
+        por_correo = {usuario.correo: usuario for usuario in usuarios}
+        usuarios = list(por_correo.values())
+        # Los RUT guardados pueden tener o no puntos y guion: se comparan sin
+        # formato, como en las búsquedas por RUT de las vistas.
+        ruts = [rut_sin_formato(usuario.rut) for usuario in usuarios if usuario.rut]
+        existentes = (
+            Usuario.objects.annotate(
+                rut_sin_formato=Upper(
+                    Replace(Replace("rut", Value("."), Value("")), Value("-"), Value(""))
+                )
+            )
+            .filter(Q(correo__in=por_correo) | Q(rut_sin_formato__in=ruts))
+            .values_list("correo", "rut_sin_formato")
+        )
+
+        correos_existentes = set()
+        for correo, rut in existentes:
+            if correo in por_correo:
+                correos_existentes.add(correo)
+            if rut:
+                self._ruts.setdefault(rut, correo)
+
+        depurados = []
+        for usuario in usuarios:
+            if usuario.rut:
+                dueno = self._ruts.setdefault(rut_sin_formato(usuario.rut), usuario.correo)
+                if dueno != usuario.correo:
+                    self.resultado.errores.append(
+                        (usuario.linea, f"el RUT {usuario.rut} ya pertenece a {dueno}")
+                    )
+                    continue
+            depurados.append(usuario)
+        return depurados, correos_existentes
+
+    def _escribir(self, usuarios, existentes: set[str], hasheador: HasheadorParalelo) -> None:
+        por_hashear = [
+            usuario
+            for usuario in usuarios
+            if self.actualizar_contrasenas or usuario.correo not in existentes
+        ]
+        for usuario, hash_ in zip(
+            por_hashear, hasheador.hashear([usuario.contrasena for usuario in por_hashear])
+        ):
+            usuario.contrasena = hash_
+
+        for usuario in usuarios:
+            if usuario.docente_guia:
+                self._guias.append((usuario.correo, usuario.docente_guia))
+
+        nuevos = sum(1 for usuario in usuarios if usuario.correo not in existentes)
+        self.resultado.creados += nuevos
+        self.resultado.actualizados += len(usuarios) - nuevos
+        if self.simular:
+            return
+
+        campos = CAMPOS_ACTUALIZABLES + (["contrasena"] if self.actualizar_contrasenas else [])
+        Usuario.objects.bulk_create(
+            [
+                Usuario(
+                    correo=usuario.correo,
+                    nombre_completo=usuario.nombre_completo,
+                    rol=usuario.rol,
+                    rut=usuario.rut,
+                    carrera=usuario.carrera,
+                    telefono=usuario.telefono,
+                    # Para los existentes no se usa: `contrasena` no se actualiza.
+                    contrasena=usuario.contrasena,
+                )
+                for usuario in usuarios
+            ],
+            update_conflicts=True,
+            unique_fields=["correo"],
+            update_fields=campos,
+        )
+
+    def _asignar_docentes_guia(self) -> None:
+        if not self._guias:
+            return
+
+        correos_docentes = {docente for _, docente in self._guias}
+        docentes = dict(
+            Usuario.objects.filter(correo__in=correos_docentes, rol="docente").values_list(
+                "correo", "pk"
+            )
+        )
+        for correo, docente in self._guias:
+            if docente not in docentes:
+                self.resultado.errores.append((0, f"{correo}: docente guía {docente} no encontrado"))
+
+        asignaciones = [(correo, docentes[docente]) for correo, docente in self._guias if docente in docentes]
+        self.resultado.docentes_asignados = len(asignaciones)
+        if self.simular:
+            return
+
+        for lote in lotes(asignaciones, self.lote):
+            ids = dict(
+                Usuario.objects.filter(correo__in=[correo for correo, _ in lote]).values_list(
+                    "correo", "pk"
+                )
+            )
+            Usuario.objects.bulk_update(
+                [Usuario(pk=ids[correo], docente_guia_id=docente_id) for correo, docente_id in lote],
+                ["docente_guia"],
+            )
+
+    def importar(self, filas) -> ResultadoImportacion:
+        with HasheadorParalelo(self.procesos) as hasheador:
+            for lote in lotes(self._validas(filas), self.lote):
+                usuarios, existentes = self._depurar(lote)
+                if not usuarios:
+                    continue
+                with transaction.atomic():
+                    self._escribir(usuarios, existentes, hasheador)
+
+        with transaction.atomic():
+            self._asignar_docentes_guia()
+
+        if not self.simular and (self.resultado.creados or self.resultado.actualizados):
+            # `bulk_create` y `bulk_update` no emiten señales.
+            invalidar_dashboards(general=True)
+            invalidar_directorio()
+            invalidar_cache_lecturas()
+        return self.resultado
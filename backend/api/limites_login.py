@@ -0,0 +1,95 @@
+"""Límite de intentos de inicio de sesión por ventana fija.
+
+Cada intento incrementa dos contadores guardados en la caché: uno por IP y
+otro por correo. Cada contador admite `capacidad` intentos por ventana de
+`LOGIN_VENTANA` segundos. DRF evalúa los límites antes de llamar a la vista,
+así que un cliente que insiste recibe 429 sin que se calcule el hash de la
+contraseña.
+
+Los contadores se crean con `cache.add` y se incrementan con `cache.incr`,
+que son atómicos en Redis y Memcached, de modo que procesos concurrentes no
+pueden colar intentos de más. La IP sale de `get_ident`, que con
+`NUM_PROXIES=0` (el valor por defecto) usa REMOTE_ADDR e ignora
+X-Forwarded-For.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+
+def _ventana() -> float:
+    return float(getattr(settings, "LOGIN_VENTANA", 60))
+
+
+def consumir(clave: str, capacidad: int, ventana: float, ahora: float | None = None) -> float:
+    """Registra un intento en el contador de `clave` para la ventana actual.
+
+    Devuelve 0 si el intento está dentro de la capacidad o, si no, los
+    segundos que faltan para la siguiente ventana.
+    """
+
+    ahora = time.time() if ahora is None else ahora
+    ventana = max(ventana, 1.0)
+    numero = int(ahora // ventana)
+    contador = f"{clave}:{numero}"
+    cache.add(contador, 0, int(ventana) + 1)
+    try:
+        intentos = cache.incr(contador)
+    except ValueError:
+        # Expiró entre `add` e `incr`: este es el primer intento de la ventana.
+        cache.add(contador, 1, int(ventana) + 1)
+        intentos = 1
+
+    if intentos > max(capacidad, 1):
+        return (numero + 1) * ventana - ahora
+    return 0.0
+
+
+def clave_ip(ident: str) -> str:
+    return f"login:ip:{ident}"
+
+
+def clave_correo(correo: str) -> str:
+    # El correo va como digest para no dejarlo en las claves de la caché.
+    digest = hashlib.sha256(correo.strip().lower().encode("utf-8")).hexdigest()
+    return f"login:correo:{digest}"
+
+
+class LimiteIntentosLogin(BaseThrottle):
+    """Limita los intentos de login por IP (`LOGIN_INTENTOS_IP`) y por correo
+    (`LOGIN_INTENTOS_CORREO`)."""
+
+    def __init__(self):
+        self.espera: float | None = None
+
+    def cubetas(self, request) -> list[tuple[str, int]]:
+        cubetas = [
+            (clave_ip(self.get_ident(request)), int(getattr(settings, "LOGIN_INTENTOS_IP", 20)))
+        ]
+        correo = request.data.get("email") if hasattr(request.data, "get") else None
+        if isinstance(correo, str) and correo.strip():
+            cubetas.append(
+                (clave_correo(correo), int(getattr(settings, "LOGIN_INTENTOS_CORREO", 5)))
+            )
+        return cubetas
+
+    def allow_request(self, request, view) -> bool:
+        if not getattr(settings, "LOGIN_LIMITAR_INTENTOS", True):
+            return True
+
+        ventana = _ventana()
+        for clave, capacidad in self.cubetas(request):
+            espera = consumir(clave, capacidad, ventana)
+            if espera:
+                self.espera = espera
+                return False
+        return True
+
+    def wait(self) -> float | None:
+        return self.espera
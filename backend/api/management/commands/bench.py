@@ -0,0 +1,724 @@
+import hashlib
+import io
+import json
+import logging
+import math
+import statistics
+import tempfile
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test.utils import override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api import urls as api_urls
+from api.autenticacion import emitir_token
+from api.datos_sinteticos import CONTRASENA, Escala, Muestra, generar_datos
+from api.directorio_usuarios import invalidar_directorio
+from api.metricas import MedidorConsultas
+from api.models import EvaluacionEntregaAlumno, Usuario
+from api.subidas import escribir_fragmento, iniciar_subida
+
+
+# Caché propia del proceso: `--cache-frio` la vacía y no debe tocar la
+# caché compartida que use la aplicación.
+CACHE_LOCAL = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+# Puerto "discard": la conexión se rechaza de inmediato y el proxy responde 400.
+URL_FIRMA_INALCANZABLE = "http://127.0.0.1:9/firma.png"
+# Parámetros que nombran al usuario que actúa, en orden de prioridad: quien
+# crea una reunión es el docente aunque el cuerpo también traiga al alumno.
+PARAMETROS_ACTOR = ("coordinador", "docente", "usuario", "created_by", "alumno", "alumno_id")
+
+
+@dataclass(frozen=True)
+class Caso:
+    ruta: str
+    metodo: str
+    # Devuelve la URL y los argumentos del cliente; corre fuera de la medición.
+    construir: Callable[[Muestra], tuple[str, dict]]
+    variante: str = ""
+
+    @property
+    def nombre(self) -> str:
+        nombre = f"{self.metodo} {self.ruta}"
+        return f"{nombre} ({self.variante})" if self.variante else nombre
+
+    @property
+    def escribe(self) -> bool:
+        return self.metodo != "GET"
+
+
+def _url(ruta: str, parametros: dict | None = None, **kwargs) -> str:
+    url = reverse(ruta, kwargs=kwargs or None)
+    return f"{url}?{urlencode(parametros)}" if parametros else url
+
+
+def _actor(url: str, argumentos: dict) -> int | None:
+    """Id del usuario que actúa en el caso, según la URL o el cuerpo."""
+
+    valores = {clave: lista[0] for clave, lista in parse_qs(urlsplit(url).query).items()}
+    datos = argumentos.get("data")
+    if isinstance(datos, dict):
+        valores.update(datos)
+    for clave in PARAMETROS_ACTOR:
+        try:
+            return int(valores[clave])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def _pdf(nombre: str = "documento.pdf") -> SimpleUploadedFile:
+    return SimpleUploadedFile(nombre, PDF, content_type="application/pdf")
+
+
+def _json(datos: dict) -> dict:
+    return {"data": datos, "format": "json"}
+
+
+def _multipart(datos: dict) -> dict:
+    return {"data": datos, "format": "multipart"}
+
+
+def _subida(m: Muestra, *, completa: bool = False) -> str:
+    subida = iniciar_subida(
+        campo="informe_corregido",
+        evaluacion_id=m.evaluacion,
+        entrega_id=m.entrega,
+        alumno_id=m.alumno,
+        nombre_archivo="informe.pdf",
+        tamano_total=len(PDF),
+        sha256=hashlib.sha256(PDF).hexdigest(),
+    )
+    if completa:
+        escribir_fragmento(subida.token, 0, io.BytesIO(PDF), len(PDF))
+    return subida.token
+
+
+def _manana() -> str:
+    # Fuera del rango de fechas generado, para no chocar con otras reuniones.
+    return (timezone.localdate() + timedelta(days=400)).isoformat()
+
+
+def _solicitud_carta(m: Muestra) -> dict:
+    return _json(
+        {
+            "alumno": {
+                "rut": m.alumno_rut,
+                "nombres": "Alumno",
+                "apellidos": "Bench",
+                "carrera": m.carrera,
+            },
+            "practica": {
+                "jefeDirecto": "Jefatura",
+                "correoEncargado": "encargado@empresa.example.com",
+                "cargoAlumno": "Practicante",
+                "fechaInicio": _manana(),
+                "empresaRut": "76000000-0",
+                "sectorEmpresa": "Tecnología",
+                "duracionHoras": 320,
+            },
+            "destinatario": {
+                "nombres": "Nombre",
+                "apellidos": "Apellido",
+                "cargo": "Gerencia",
+                "empresa": "Empresa",
+            },
+            "escuela": {
+                "id": "1",
+                "nombre": "Escuela de Ingeniería",
+                "direccion": "Av. Siempre Viva 123",
+                "telefono": "+56 2 2222 2222",
+            },
+        }
+    )
+
+
+CASOS = [
+    # Lecturas
+    Caso("temas-disponibles", "GET", lambda m: (_url("temas-disponibles", {"alumno": m.alumno}), {}), "alumno"),
+    Caso("temas-disponibles", "GET", lambda m: (_url("temas-disponibles", {"usuario": m.docente}), {}), "docente"),
+    Caso(
+        "temas-disponibles",
+        "GET",
+        lambda m: (_url("temas-disponibles", {"usuario": m.coordinador}), {}),
+        "coordinación",
+    ),
+    Caso("tema-detalle", "GET", lambda m: (_url("tema-detalle", {"alumno": m.alumno}, pk=m.tema), {})),
+    Caso("lista-docentes", "GET", lambda m: (_url("lista-docentes", {"carrera": m.carrera}), {})),
+    Caso("propuestas", "GET", lambda m: (_url("propuestas", {"docente": m.propuesta_docente}), {}), "docente"),
+    Caso("propuestas", "GET", lambda m: (_url("propuestas", {"alumno": m.alumno}), {}), "alumno"),
+    Caso("detalle-propuesta", "GET", lambda m: (_url("detalle-propuesta", pk=m.propuesta), {})),
+    Caso("lista-notificaciones", "GET", lambda m: (_url("lista-notificaciones", {"usuario": m.alumno}), {})),
+    Caso(
+        "dashboard-usuario",
+        "GET",
+        lambda m: (_url("dashboard-usuario", {"usuario": m.alumno}, rol="alumno"), {}),
+        "alumno",
+    ),
+    Caso(
+        "dashboard-usuario",
+        "GET",
+        lambda m: (_url("dashboard-usuario", {"usuario": m.docente}, rol="docente"), {}),
+        "docente",
+    ),
+    Caso(
+        "dashboard-usuario",
+        "GET",
+        lambda m: (_url("dashboard-usuario", {"usuario": m.coordinador}, rol="coordinador"), {}),
+        "coordinación",
+    ),
+    Caso(
+        "listar-solicitudes-carta-practica-alumno",
+        "GET",
+        lambda m: (_url("listar-solicitudes-carta-practica-alumno", {"alumno_rut": m.alumno_rut}), {}),
+    ),
+    Caso(
+        "listar-solicitudes-carta-practica",
+        "GET",
+        lambda m: (_url("listar-solicitudes-carta-practica", {"coordinador": m.coordinador}), {}),
+    ),
+    Caso(
+        "gestionar-documentos-practica",
+        "GET",
+        lambda m: (_url("gestionar-documentos-practica", {"coordinador": m.coordinador}), {}),
+    ),
+    Caso(
+        "listar-documentos-practica",
+        "GET",
+        lambda m: (_url("listar-documentos-practica", {"carrera": m.carrera}), {}),
+    ),
+    Caso(
+        "gestionar-firma-coordinador-practica",
+        "GET",
+        lambda m: (_url("gestionar-firma-coordinador-practica", {"coordinador": m.coordinador}), {}),
+    ),
+    Caso(
+        "proxy-firma-coordinador",
+        "GET",
+        lambda m: (_url("proxy-firma-coordinador", {"url": URL_FIRMA_INALCANZABLE}), {}),
+    ),
+    Caso(
+        "gestionar-evaluacion-practica",
+        "GET",
+        lambda m: (_url("gestionar-evaluacion-practica", {"coordinador": m.coordinador}), {}),
+    ),
+    Caso(
+        "listar-evaluacion-practica",
+        "GET",
+        lambda m: (_url("listar-evaluacion-practica", {"carrera": m.carrera}), {}),
+    ),
+    Caso(
+        "entregas-evaluacion-practica",
+        "GET",
+        lambda m: (_url("entregas-evaluacion-practica", {"alumno": m.alumno}), {}),
+    ),
+    Caso(
+        "listar-entregas-evaluacion-practica",
+        "GET",
+        lambda m: (_url("listar-entregas-evaluacion-practica", {"coordinador": m.coordinador}), {}),
+    ),
+    Caso("coordinacion-promedios-titulo", "GET", lambda m: (_url("coordinacion-promedios-titulo"), {})),
+    Caso(
+        "coordinacion-promedios-titulo",
+        "GET",
+        lambda m: (_url("coordinacion-promedios-titulo", {"carrera": m.carrera}), {}),
+        "carrera",
+    ),
+    Caso("coordinacion-estadisticas-titulo", "GET", lambda m: (_url("coordinacion-estadisticas-titulo"), {})),
+    Caso(
+        "gestionar-solicitudes-reunion",
+        "GET",
+        lambda m: (_url("gestionar-solicitudes-reunion", {"docente": m.solicitud_reunion_docente}), {}),
+    ),
+    Caso(
+        "gestionar-reuniones",
+        "GET",
+        lambda m: (_url("gestionar-reuniones", {"docente": m.reunion_docente}), {}),
+    ),
+    Caso("docente-evaluaciones", "GET", lambda m: (_url("docente-evaluaciones", {"docente": m.docente}), {})),
+    Caso(
+        "docente-evaluacion-entregas-zip",
+        "GET",
+        lambda m: (
+            _url("docente-evaluacion-entregas-zip", {"docente": m.docente}, pk=m.evaluacion),
+            {},
+        ),
+    ),
+    Caso("docente-grupos-activos", "GET", lambda m: (_url("docente-grupos-activos", {"docente": m.docente}), {})),
+    Caso("alumno-evaluaciones", "GET", lambda m: (_url("alumno-evaluaciones", {"alumno": m.alumno}), {})),
+    Caso(
+        "alumno-evaluacion-entregas",
+        "GET",
+        lambda m: (_url("alumno-evaluacion-entregas", {"alumno": m.alumno}, pk=m.evaluacion), {}),
+    ),
+    Caso("subida-entrega", "GET", lambda m: (_url("subida-entrega", token=_subida(m)), {})),
+    # Escrituras (cada iteración se revierte)
+    Caso(
+        "login",
+        "POST",
+        lambda m: (_url("login"), _json({"email": m.alumno_correo, "password": CONTRASENA})),
+    ),
+    Caso(
+        "temas-disponibles",
+        "POST",
+        lambda m: (
+            _url("temas-disponibles"),
+            _json(
+                {
+                    "titulo": "Tema del benchmark",
+                    "carrera": m.carrera,
+                    "rama": "Desarrollo",
+                    "descripcion": "Descripción",
+                    "requisitos": ["Requisito"],
+                    "cupos": 2,
+                    "created_by": m.docente,
+                    "docente_responsable": m.docente,
+                }
+            ),
+        ),
+    ),
+    Caso("tema-detalle", "DELETE", lambda m: (_url("tema-detalle", pk=m.tema), {})),
+    Caso(
+        "tema-reservar",
+        "POST",
+        lambda m: (_url("tema-reservar", pk=m.tema_con_cupo), _json({"alumno": m.alumno_sin_tema})),
+    ),
+    Caso(
+        "tema-companeros",
+        "POST",
+        lambda m: (_url("tema-companeros", pk=m.tema), _json({"alumno": m.alumno, "correos": []})),
+    ),
+    Caso(
+        "propuestas",
+        "POST",
+        lambda m: (
+            _url("propuestas"),
+            _json(
+                {
+                    "alumno_id": m.alumno_sin_tema,
+                    "titulo": "Propuesta del benchmark",
+                    "objetivo": "Objetivo",
+                    "descripcion": "Descripción",
+                    "rama": "Desarrollo",
+                    "preferencias_docentes": [m.docente],
+                }
+            ),
+        ),
+    ),
+    Caso(
+        "detalle-propuesta",
+        "PATCH",
+        lambda m: (
+            _url("detalle-propuesta", pk=m.propuesta),
+            _json({"accion": "autorizar", "cupos_autorizados": 3, "docente_id": m.propuesta_docente}),
+        ),
+    ),
+    Caso(
+        "marcar-notificacion-leida",
+        "POST",
+        lambda m: (_url("marcar-notificacion-leida", pk=m.notificacion), {}),
+    ),
+    Caso("crear-solicitud-carta-practica", "POST", lambda m: (_url("crear-solicitud-carta-practica"), _solicitud_carta(m))),
+    Caso(
+        "aprobar-solicitud-carta-practica",
+        "POST",
+        lambda m: (
+            _url("aprobar-solicitud-carta-practica", pk=m.carta),
+            _multipart({"documento": _pdf("carta.pdf")}),
+        ),
+    ),
+    Caso(
+        "rechazar-solicitud-carta-practica",
+        "POST",
+        lambda m: (_url("rechazar-solicitud-carta-practica", pk=m.carta), _json({"motivo": "Faltan datos"})),
+    ),
+    Caso(
+        "gestionar-documentos-practica",
+        "POST",
+        lambda m: (
+            _url("gestionar-documentos-practica"),
+            _multipart({"coordinador": m.coordinador, "nombre": "Reglamento", "archivo": _pdf()}),
+        ),
+    ),
+    Caso(
+        "eliminar-documento-practica",
+        "DELETE",
+        lambda m: (
+            _url("eliminar-documento-practica", {"coordinador": m.coordinador}, pk=m.documento_practica),
+            {},
+        ),
+    ),
+    Caso(
+        "gestionar-firma-coordinador-practica",
+        "POST",
+        lambda m: (
+            _url("gestionar-firma-coordinador-practica", {"coordinador": m.coordinador}),
+            _multipart(
+                {
+                    "coordinador": m.coordinador,
+                    "archivo": SimpleUploadedFile("firma.png", PNG, content_type="image/png"),
+                }
+            ),
+        ),
+    ),
+    Caso(
+        "gestionar-evaluacion-practica",
+        "POST",
+        lambda m: (
+            _url("gestionar-evaluacion-practica"),
+            _multipart({"coordinador": m.coordinador, "nombre": "Pauta", "archivo": _pdf("pauta.pdf")}),
+        ),
+    ),
+    Caso(
+        "entregas-evaluacion-practica",
+        "POST",
+        lambda m: (
+            _url("entregas-evaluacion-practica", {"alumno": m.alumno_sin_practica}),
+            _multipart(
+                {"alumno": m.alumno_sin_practica, "evaluacion": m.evaluacion_practica, "archivo": _pdf()}
+            ),
+        ),
+    ),
+    Caso(
+        "actualizar-entrega-evaluacion-practica",
+        "PATCH",
+        lambda m: (
+            _url("actualizar-entrega-evaluacion-practica", entrega_id=m.entrega_practica),
+            _json({"coordinador": m.coordinador, "nota": "6.0"}),
+        ),
+    ),
+    Caso(
+        "gestionar-solicitudes-reunion",
+        "POST",
+        lambda m: (
+            _url("gestionar-solicitudes-reunion"),
+            _json(
+                {
+                    "alumno": m.solicitud_reunion_alumno,
+                    "motivo": "Revisión de avance",
+                    "disponibilidadSugerida": "Martes",
+                }
+            ),
+        ),
+    ),
+    Caso(
+        "aprobar-solicitud-reunion",
+        "POST",
+        lambda m: (
+            _url("aprobar-solicitud-reunion", pk=m.solicitud_reunion),
+            _json(
+                {
+                    "docente": m.solicitud_reunion_docente,
+                    "fecha": _manana(),
+                    "horaInicio": "08:00",
+                    "horaTermino": "08:45",
+                    "modalidad": "online",
+                }
+            ),
+        ),
+    ),
+    Caso(
+        "rechazar-solicitud-reunion",
+        "POST",
+        lambda m: (
+            _url("rechazar-solicitud-reunion", pk=m.solicitud_reunion),
+            _json({"docente": m.solicitud_reunion_docente, "comentario": "Sin disponibilidad"}),
+        ),
+    ),
+    Caso(
+        "gestionar-reuniones",
+        "POST",
+        lambda m: (
+            _url("gestionar-reuniones"),
+            _json(
+                {
+                    "alumno": m.solicitud_reunion_alumno,
+                    "docente": m.solicitud_reunion_docente,
+                    "fecha": _manana(),
+                    "horaInicio": "10:00",
+                    "horaTermino": "10:45",
+                    "modalidad": "presencial",
+                    "motivo": "Seguimiento",
+                }
+            ),
+        ),
+    ),
+    Caso(
+        "cerrar-reunion",
+        "POST",
+        lambda m: (
+            _url("cerrar-reunion", pk=m.reunion),
+            _json({"docente": m.reunion_docente, "estado": "finalizada"}),
+        ),
+    ),
+    Caso(
+        "docente-evaluaciones",
+        "POST",
+        lambda m: (
+            _url("docente-evaluaciones"),
+            _json(
+                {
+                    "docente": m.docente,
+                    "tema": m.tema,
+                    "grupo_nombre": "Grupo del benchmark",
+                    "titulo": "Evaluación del benchmark",
+                    "fecha": _manana(),
+                    "bitacora_comentario": "Bitácora semanal",
+                }
+            ),
+        ),
+    ),
+    Caso(
+        "alumno-evaluacion-entregas",
+        "POST",
+        lambda m: (
+            _url("alumno-evaluacion-entregas", pk=m.evaluacion),
+            _multipart({"alumno": m.alumno, "titulo": "Entrega", "archivo": _pdf("entrega.pdf")}),
+        ),
+    ),
+    Caso(
+        "docente-evaluacion-actualizar-entrega",
+        "PATCH",
+        lambda m: (_url("docente-evaluacion-actualizar-entrega", pk=m.entrega), _json({"nota": "6.5"})),
+    ),
+    Caso(
+        "alumno-evaluacion-subidas",
+        "POST",
+        lambda m: (
+            _url("alumno-evaluacion-subidas", pk=m.evaluacion),
+            _json(
+                {
+                    "alumno": m.alumno,
+                    "titulo": "Entrega",
+                    "nombre": "entrega.pdf",
+                    "tamano": len(PDF),
+                    "sha256": hashlib.sha256(PDF).hexdigest(),
+                }
+            ),
+        ),
+    ),
+    Caso(
+        "docente-evaluacion-entrega-subidas",
+        "POST",
+        lambda m: (
+            _url("docente-evaluacion-entrega-subidas", pk=m.entrega),
+            _json({"nombre": "informe.pdf", "tamano": len(PDF), "sha256": hashlib.sha256(PDF).hexdigest()}),
+        ),
+    ),
+    Caso(
+        "subida-entrega",
+        "PUT",
+        lambda m: (
+            _url("subida-entrega", token=_subida(m)),
+            {"data": PDF, "content_type": "application/offset+octet-stream", "HTTP_UPLOAD_OFFSET": "0"},
+        ),
+    ),
+    Caso("subida-entrega", "DELETE", lambda m: (_url("subida-entrega", token=_subida(m)), {})),
+    Caso(
+        "finalizar-subida-entrega",
+        "POST",
+        lambda m: (_url("finalizar-subida-entrega", token=_subida(m, completa=True)), {}),
+    ),
+]
+
+
+def _percentil(valores: list[float], fraccion: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[max(math.ceil(fraccion * len(ordenados)) - 1, 0)]
+
+
+def _tamano_cuerpo(respuesta) -> int:
+    if respuesta.streaming:
+        try:
+            return sum(len(parte) for parte in respuesta.streaming_content)
+        finally:
+            respuesta.close()
+    return len(respuesta.content)
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un conjunto de datos sintético en una base temporal y mide cada "
+        "ruta de api/urls.py con el cliente de pruebas: latencia p50/p95, consultas "
+        "SQL, tamaño de la respuesta y códigos de estado, en JSON. Las escrituras "
+        "se revierten después de cada iteración."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escala",
+            type=float,
+            default=1.0,
+            help="Factor sobre los volúmenes por defecto (1.0 = 20.000 alumnos).",
+        )
+        parser.add_argument("--repeticiones", type=int, default=20)
+        parser.add_argument("--calentamiento", type=int, default=2)
+        parser.add_argument("--semilla", type=int, default=7)
+        parser.add_argument("--lote", type=int, default=2000)
+        parser.add_argument(
+            "--rutas",
+            nargs="+",
+            help="Nombres de ruta (de api/urls.py) a medir; por defecto, todas.",
+        )
+        parser.add_argument(
+            "--cache-frio",
+            action="store_true",
+            help="Vacía la caché antes de cada solicitud.",
+        )
+        parser.add_argument("--salida", help="Escribe el JSON en este archivo.")
+        parser.add_argument(
+            "--base-actual",
+            action="store_true",
+            help="Usa la base configurada (que debe estar vacía) en vez de crear una temporal.",
+        )
+
+    def handle(self, *args, **options):
+        casos = CASOS
+        if options["rutas"]:
+            desconocidas = set(options["rutas"]) - {caso.ruta for caso in CASOS}
+            if desconocidas:
+                raise CommandError(f"Rutas sin caso: {', '.join(sorted(desconocidas))}")
+            casos = [caso for caso in CASOS if caso.ruta in options["rutas"]]
+
+        escala = Escala().escalada(options["escala"])
+        conexion = connections["default"]
+        nombre_original = conexion.settings_dict["NAME"]
+        if options["base_actual"]:
+            if Usuario.objects.exists():
+                raise CommandError(
+                    "--base-actual exige una base vacía: el benchmark genera datos y "
+                    "la configurada ya tiene usuarios."
+                )
+        else:
+            conexion.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            with tempfile.TemporaryDirectory() as media, override_settings(
+                CACHES=CACHE_LOCAL,
+                MEDIA_ROOT=media,
+                SUBIDAS_PARCIALES_DIR=str(Path(media) / ".parciales"),
+                EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                LOGIN_LIMITAR_INTENTOS=False,
+            ):
+                inicio = time.perf_counter()
+                muestra = generar_datos(escala, semilla=options["semilla"], lote=options["lote"])
+                generacion = time.perf_counter() - inicio
+                self._escribir_archivos_entregas(muestra, Path(media))
+                resultados = self._medir_casos(casos, muestra, options)
+        finally:
+            if not options["base_actual"]:
+                conexion.creation.destroy_test_db(nombre_original, verbosity=0)
+
+        cubiertas = {caso.ruta for caso in CASOS}
+        informe = {
+            "escala": asdict(escala),
+            "generacionSegundos": round(generacion, 2),
+            "repeticiones": options["repeticiones"],
+            "cacheFrio": options["cache_frio"],
+            "rutas": resultados,
+            "sinCaso": sorted(
+                patron.name
+                for patron in api_urls.urlpatterns
+                if isinstance(patron, URLPattern) and patron.name not in cubiertas
+            ),
+        }
+        salida = json.dumps(informe, indent=2, ensure_ascii=False)
+        if options["salida"]:
+            Path(options["salida"]).write_text(salida + "\n", encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Resultados en {options['salida']}"))
+        else:
+            self.stdout.write(salida)
+
+    def _escribir_archivos_entregas(self, muestra: Muestra, media: Path) -> None:
+        # El zip lee los archivos reales de la evaluación de la muestra.
+        for nombre in EvaluacionEntregaAlumno.objects.filter(evaluacion_id=muestra.evaluacion).values_list(
+            "archivo", flat=True
+        ):
+            ruta = media / nombre
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            ruta.write_bytes(PDF)
+
+    def _medir_casos(self, casos, muestra: Muestra, options) -> list[dict]:
+        cliente = APIClient(HTTP_HOST="localhost", raise_request_exception=False)
+        # Cada 4xx quedaría registrado en `django.request` (y el proxy de la
+        # firma avisa en `api.views` cada vez que no puede descargarla).
+        registros = [logging.getLogger(nombre) for nombre in ("django.request", "api.views")]
+        niveles = [registro.level for registro in registros]
+        for registro in registros:
+            registro.setLevel(logging.CRITICAL)
+        # Un token por usuario, emitido fuera de la medición como lo haría el login.
+        tokens: dict[int, str] = {}
+        try:
+            resultados = []
+            for caso in casos:
+                resultados.append(self._medir(cliente, caso, muestra, tokens, options))
+                if caso.escribe:
+                    # Lo que la escritura dejó en caché puede no existir tras revertirla.
+                    cache.clear()
+                    invalidar_directorio()
+            return resultados
+        finally:
+            for registro, nivel in zip(registros, niveles):
+                registro.setLevel(nivel)
+
+    def _medir(self, cliente, caso: Caso, muestra: Muestra, tokens: dict[int, str], options) -> dict:
+        latencias, consultas, tamanos = [], [], []
+        estados = Counter()
+        calentamiento = max(options["calentamiento"], 0)
+        for iteracion in range(calentamiento + max(options["repeticiones"], 1)):
+            with transaction.atomic():
+                url, argumentos = caso.construir(muestra)
+                actor = _actor(url, argumentos)
+                if actor is not None:
+                    if actor not in tokens:
+                        tokens[actor] = emitir_token(Usuario.objects.get(pk=actor))
+                    argumentos = {**argumentos, "HTTP_AUTHORIZATION": f"Bearer {tokens[actor]}"}
+                if options["cache_frio"]:
+                    cache.clear()
+                medidor = MedidorConsultas()
+                with ExitStack() as pila:
+                    for alias in connections:
+                        pila.enter_context(connections[alias].execute_wrapper(medidor))
+                    inicio = time.perf_counter()
+                    respuesta = getattr(cliente, caso.metodo.lower())(url, **argumentos)
+                    tamano = _tamano_cuerpo(respuesta)
+                    duracion = time.perf_counter() - inicio
+                transaction.set_rollback(True)
+
+            if iteracion < calentamiento:
+                continue
+            latencias.append(duracion)
+            consultas.append(medidor.consultas)
+            tamanos.append(tamano)
+            estados[respuesta.status_code] += 1
+
+        return {
+            "ruta": caso.ruta,
+            "metodo": caso.metodo,
+            "variante": caso.variante,
+            "p50Ms": round(_percentil(latencias, 0.5) * 1000, 2),
+            "p95Ms": round(_percentil(latencias, 0.95) * 1000, 2),
+            "consultas": statistics.median_low(consultas),
+            "consultasMax": max(consultas),
+            "bytes": statistics.median_low(tamanos),
+            "estados": {str(codigo): cantidad for codigo, cantidad in sorted(estados.items())},
+        }
@@ -0,0 +1,216 @@
+import statistics
+import time
+from contextlib import ExitStack
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.estadisticas import invalidar_estadisticas_notas, resumir_notas
+from api.metricas import MedidorConsultas
+from api.models import (
+    EvaluacionEntregaAlumno,
+    EvaluacionGrupoDocente,
+    PracticaEvaluacion,
+    PracticaEvaluacionEntrega,
+    TemaDisponible,
+    Usuario,
+)
+
+
+CACHE_LOCAL = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide las estadísticas de notas por carrera y docente: el cálculo con "
+        "NumPy sobre un conjunto sintético en memoria y GET "
+        "/api/coordinacion/titulo/estadisticas/ completo (con la consulta) sobre "
+        "una base temporal con la misma cantidad de notas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--notas", type=int, default=500_000)
+        parser.add_argument("--carreras", type=int, default=12)
+        parser.add_argument("--docentes", type=int, default=300)
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--semilla", type=int, default=7)
+        parser.add_argument("--lote", type=int, default=5000)
+        parser.add_argument(
+            "--solo-memoria",
+            action="store_true",
+            help="Mide solo el cálculo en memoria, sin base de datos.",
+        )
+        parser.add_argument(
+            "--fraccion-practica",
+            type=float,
+            default=0.1,
+            help="Parte de las notas sembradas que son de práctica (0 a 1).",
+        )
+
+    def handle(self, *args, **options):
+        generador = np.random.default_rng(options["semilla"])
+        cantidad = max(options["notas"], 1)
+        notas = np.round(np.clip(generador.normal(5.2, 1.1, cantidad), 1.0, 7.0), 1)
+        nombres = [f"Carrera {indice}" for indice in range(max(options["carreras"], 1))]
+        carreras = generador.integers(0, len(nombres), cantidad)
+        docentes = generador.integers(1, max(options["docentes"], 1) + 1, cantidad)
+
+        mejor = float("inf")
+        for _ in range(max(options["repeticiones"], 1)):
+            inicio = time.perf_counter()
+            resultado = resumir_notas(notas, carreras, nombres, docentes)
+            mejor = min(mejor, time.perf_counter() - inicio)
+
+        self.stdout.write(
+            f"{cantidad} notas, {len(resultado['porCarrera'])} carreras, "
+            f"{len(resultado['porDocente'])} docentes"
+        )
+        self.stdout.write(self.style.SUCCESS(f"  en memoria, mejor tiempo: {mejor * 1000:.1f} ms"))
+
+        if not options["solo_memoria"]:
+            self._medir_endpoint(notas, carreras, nombres, docentes, options)
+
+    def _medir_endpoint(self, notas, carreras, nombres, docentes, options) -> None:
+        conexion = connections["default"]
+        nombre_original = conexion.settings_dict["NAME"]
+        conexion.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # Caché propia del proceso: invalidar en cada repetición no debe
+            # tocar una caché compartida.
+            with override_settings(CACHES=CACHE_LOCAL):
+                inicio = time.perf_counter()
+                self._sembrar(notas, carreras, nombres, docentes, options)
+                self.stdout.write(f"  siembra: {time.perf_counter() - inicio:.1f} s")
+
+                cliente = APIClient(HTTP_HOST="localhost")
+                url = reverse("coordinacion-estadisticas-titulo")
+                totales, sql, consultas = [], [], []
+                for _ in range(max(options["repeticiones"], 1)):
+                    invalidar_estadisticas_notas()
+                    medidor = MedidorConsultas()
+                    with ExitStack() as envolturas:
+                        for alias in connections:
+                            envolturas.enter_context(connections[alias].execute_wrapper(medidor))
+                        inicio = time.perf_counter()
+                        respuesta = cliente.get(url)
+                        totales.append(time.perf_counter() - inicio)
+                    if respuesta.status_code != 200:
+                        self.stderr.write(f"  GET {url} respondió {respuesta.status_code}")
+                        return
+                    sql.append(medidor.segundos)
+                    consultas.append(medidor.consultas)
+
+                inicio = time.perf_counter()
+                cliente.get(url)
+                en_cache = time.perf_counter() - inicio
+        finally:
+            conexion.creation.destroy_test_db(nombre_original, verbosity=0)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  GET {url} sin caché: mejor {min(totales) * 1000:.1f} ms, "
+                f"mediana {statistics.median(totales) * 1000:.1f} ms "
+                f"(SQL {statistics.median(sql) * 1000:.1f} ms en {max(consultas)} consultas)"
+            )
+        )
+        self.stdout.write(f"  GET {url} desde la caché: {en_cache * 1000:.1f} ms")
+
+    def _sembrar(self, notas, carreras, nombres, docentes, options) -> None:
+        lote = max(options["lote"], 1)
+        cantidad_docentes = int(docentes.max())
+        usuarios = Usuario.objects.bulk_create(
+            [
+                Usuario(
+                    nombre_completo=f"Docente {indice}",
+                    correo=f"docente{indice}@bench.invalid",
+                    rol="docente",
+                    carrera=nombres[indice % len(nombres)],
+                    contrasena="-",
+                )
+                for indice in range(1, cantidad_docentes + 1)
+            ],
+            batch_size=lote,
+        )
+        temas = TemaDisponible.objects.bulk_create(
+            [
+                TemaDisponible(titulo=f"Tema {carrera}", carrera=carrera, descripcion="-")
+                for carrera in nombres
+            ]
+        )
+        # Una evaluación por combinación de docente y carrera presente en la muestra.
+        pares = sorted(set(zip(docentes.tolist(), carreras.tolist())))
+        evaluaciones = EvaluacionGrupoDocente.objects.bulk_create(
+            [
+                EvaluacionGrupoDocente(
+                    docente=usuarios[docente - 1],
+                    tema=temas[carrera],
+                    grupo_nombre=f"Grupo {docente}-{carrera}",
+                    titulo="Evaluación",
+                    fecha=date(2025, 5, 1),
+                )
+                for docente, carrera in pares
+            ],
+            batch_size=lote,
+        )
+        evaluacion_por_par = {par: evaluacion.pk for par, evaluacion in zip(pares, evaluaciones)}
+
+        practica = int(len(notas) * min(max(options["fraccion_practica"], 0.0), 1.0))
+        titulo = len(notas) - practica
+        for inicio in range(0, titulo, lote):
+            fin = min(inicio + lote, titulo)
+            EvaluacionEntregaAlumno.objects.bulk_create(
+                [
+                    EvaluacionEntregaAlumno(
+                        evaluacion_id=evaluacion_por_par[(int(docentes[i]), int(carreras[i]))],
+                        titulo="Entrega",
+                        archivo="evaluaciones/entregas/bench.pdf",
+                        nota=Decimal(str(notas[i])),
+                    )
+                    for i in range(inicio, fin)
+                ]
+            )
+
+        if not practica:
+            return
+        evaluaciones_practica = PracticaEvaluacion.objects.bulk_create(
+            [
+                PracticaEvaluacion(
+                    carrera=carrera,
+                    nombre="Pauta",
+                    archivo="practicas/evaluaciones/bench.pdf",
+                    uploaded_by=usuarios[indice % len(usuarios)],
+                )
+                for indice, carrera in enumerate(nombres)
+            ]
+        )
+        alumnos = Usuario.objects.bulk_create(
+            [
+                Usuario(
+                    nombre_completo=f"Alumno {indice}",
+                    correo=f"alumno{indice}@bench.invalid",
+                    rol="alumno",
+                    contrasena="-",
+                )
+                for indice in range(min(practica, 1000))
+            ],
+            batch_size=lote,
+        )
+        for inicio in range(titulo, len(notas), lote):
+            fin = min(inicio + lote, len(notas))
+            PracticaEvaluacionEntrega.objects.bulk_create(
+                [
+                    PracticaEvaluacionEntrega(
+                        evaluacion=evaluaciones_practica[int(carreras[i])],
+                        alumno=alumnos[i % len(alumnos)],
+                        archivo="practicas/entregas/bench.pdf",
+                        nota=f"{notas[i]:.1f}".replace(".", ","),
+                    )
+                    for i in range(inicio, fin)
+                ]
+            )
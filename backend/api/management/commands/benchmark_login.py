@@ -0,0 +1,106 @@
+import json
+import logging
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from api.limites_login import clave_correo, clave_ip
+from api.models import Usuario
+
+
+IP_CLIENTE = "127.0.0.1"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el login bajo una ráfaga concurrente: solicitudes por segundo y CPU "
+        "por solicitud, con y sin el límite de intentos. Crea un usuario temporal "
+        "y lo elimina al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--solicitudes", type=int, default=200)
+        parser.add_argument("--hilos", type=int, default=8)
+        parser.add_argument(
+            "--correos",
+            type=int,
+            default=1,
+            help="Correos distintos usados en la ráfaga (todos desde la misma IP).",
+        )
+        parser.add_argument(
+            "--correcta",
+            action="store_true",
+            help="Usa la contraseña correcta en vez de una errónea.",
+        )
+
+    def handle(self, *args, **options):
+        contrasena = "benchmark-login"
+        sufijo = uuid.uuid4().hex[:12]
+        usuario = Usuario.objects.create(
+            nombre_completo="Benchmark login",
+            correo=f"benchmark-{sufijo}@example.com",
+            rol="alumno",
+            contrasena=contrasena,
+        )
+        correos = [usuario.correo] + [
+            f"benchmark-{sufijo}-{indice}@example.com"
+            for indice in range(1, max(options["correos"], 1))
+        ]
+        intento = contrasena if options["correcta"] else "incorrecta"
+
+        try:
+            resultados = {
+                "sinLimite": self._rafaga(correos, intento, options, limitar=False),
+                "conLimite": self._rafaga(correos, intento, options, limitar=True),
+            }
+        finally:
+            usuario.delete()
+
+        self.stdout.write(json.dumps(resultados, indent=2))
+
+    def _rafaga(self, correos, contrasena, options, *, limitar: bool) -> dict:
+        # Cada ráfaga parte con las cubetas llenas.
+        cache.delete_many([clave_ip(IP_CLIENTE)] + [clave_correo(correo) for correo in correos])
+        total = max(options["solicitudes"], 1)
+
+        def enviar(indice: int) -> int:
+            cliente = APIClient(REMOTE_ADDR=IP_CLIENTE, HTTP_HOST="localhost")
+            try:
+                respuesta = cliente.post(
+                    "/api/login",
+                    {"email": correos[indice % len(correos)], "password": contrasena},
+                    format="json",
+                )
+                return respuesta.status_code
+            finally:
+                connections.close_all()
+
+        # Cada 401/429 quedaría registrado en `django.request`.
+        registro = logging.getLogger("django.request")
+        nivel = registro.level
+        registro.setLevel(logging.ERROR)
+        try:
+            with override_settings(LOGIN_LIMITAR_INTENTOS=limitar):
+                cpu_inicio = time.process_time()
+                inicio = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=max(options["hilos"], 1)) as ejecutor:
+                    estados = Counter(ejecutor.map(enviar, range(total)))
+                duracion = time.perf_counter() - inicio
+                cpu = time.process_time() - cpu_inicio
+        finally:
+            registro.setLevel(nivel)
+
+        return {
+            "solicitudes": total,
+            "segundos": round(duracion, 3),
+            "solicitudesPorSegundo": round(total / duracion, 1),
+            "cpuMsPorSolicitud": round(cpu * 1000 / total, 2),
+            "estados": {str(codigo): cantidad for codigo, cantidad in sorted(estados.items())},
+        }
@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import (
+    EvaluacionEntregaAlumno,
+    EvaluacionGrupoDocente,
+    TemaDisponible,
+    Usuario,
+)
+from api.serializers import EvaluacionEntregaAlumnoSerializer, EvaluacionGrupoDocenteSerializer
+
+
+class _SerializadorSinMemo(EvaluacionGrupoDocenteSerializer):
+    """Comportamiento previo: cada campo vuelve a serializar la entrega."""
+
+    def _serializar_entrega(self, entrega):
+        return EvaluacionEntregaAlumnoSerializer(entrega, context=self.context).data
+
+
+def _construir_evaluaciones(cantidad: int, entregas_por_evaluacion: int, bitacoras: int):
+    """Arma objetos en memoria equivalentes a lo que entrega el prefetch de la vista."""
+
+    ahora = timezone.now()
+    fecha = timezone.localdate() + timedelta(weeks=bitacoras + 1)
+    alumnos = [
+        Usuario(pk=indice + 1, nombre_completo=f"Alumno {indice}", correo=f"a{indice}@example.com")
+        for indice in range(entregas_por_evaluacion)
+    ]
+
+    evaluaciones = []
+    siguiente_pk = 1
+    for indice in range(cantidad):
+        tema = TemaDisponible(pk=indice + 1, titulo=f"Tema {indice}")
+        tema.inscripciones_activas = []
+        evaluacion = EvaluacionGrupoDocente(
+            pk=indice + 1,
+            tema=tema,
+            grupo_nombre=tema.titulo,
+            titulo=f"Evaluación {indice}",
+            fecha=fecha,
+            bitacoras_requeridas=bitacoras,
+            bitacora_comentario="Semanal",
+            created_at=ahora,
+            updated_at=ahora,
+        )
+
+        entregas = []
+        for posicion in range(entregas_por_evaluacion):
+            es_bitacora = posicion < bitacoras
+            entregas.append(
+                EvaluacionEntregaAlumno(
+                    pk=siguiente_pk,
+                    evaluacion=evaluacion,
+                    alumno=alumnos[posicion],
+                    titulo=f"Entrega {posicion}",
+                    archivo=f"evaluaciones/entregas/{evaluacion.pk}/{posicion}.pdf",
+                    archivo_tipo="application/pdf",
+                    archivo_nombre_original=f"entrega-{posicion}.pdf",
+                    nota=Decimal("5.50"),
+                    estado_revision="revisada" if posicion % 2 else "pendiente",
+                    es_bitacora=es_bitacora,
+                    bitacora_indice=posicion + 1 if es_bitacora else None,
+                    creado_en=ahora,
+                    actualizado_en=ahora,
+                )
+            )
+            siguiente_pk += 1
+        evaluacion.entregas_prefetch = entregas
+        evaluaciones.append(evaluacion)
+    return evaluaciones
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la serialización del listado de evaluaciones docentes con y sin "
+        "el memo de entregas por request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evaluaciones", type=int, default=200)
+        parser.add_argument("--entregas", type=int, default=30)
+        parser.add_argument("--bitacoras", type=int, default=10)
+        parser.add_argument("--repeticiones", type=int, default=3)
+
+    def handle(self, *args, **options):
+        evaluaciones = _construir_evaluaciones(
+            options["evaluaciones"], options["entregas"], options["bitacoras"]
+        )
+        fabrica = APIRequestFactory()
+
+        def medir(clase) -> float:
+            mejor = float("inf")
+            for _ in range(max(options["repeticiones"], 1)):
+                request = Request(fabrica.get("/api/docentes/evaluaciones/", HTTP_HOST="localhost"))
+                inicio = time.perf_counter()
+                clase(evaluaciones, many=True, context={"request": request}).data
+                mejor = min(mejor, time.perf_counter() - inicio)
+            return mejor
+
+        sin_memo = medir(_SerializadorSinMemo)
+        con_memo = medir(EvaluacionGrupoDocenteSerializer)
+
+        self.stdout.write(
+            f"{options['evaluaciones']} evaluaciones × {options['entregas']} entregas "
+            f"({options['bitacoras']} bitácoras por evaluación)"
+        )
+        self.stdout.write(f"  sin memo: {sin_memo * 1000:.1f} ms")
+        self.stdout.write(f"  con memo: {con_memo * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"  aceleración: {sin_memo / con_memo:.2f}x"))
@@ -0,0 +1,81 @@
+import hashlib
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api.archivos import TAMANO_BLOQUE, adivinar_tipo, campos_con_metadatos
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa tamaño, tipo MIME, nombre y SHA-256 de los archivos subidos "
+        "antes de que esos metadatos se guardaran en columnas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=200,
+            help="Cantidad de filas por cada bulk_update (por defecto 200).",
+        )
+        parser.add_argument(
+            "--forzar",
+            action="store_true",
+            help="Recalcula también las filas que ya tienen metadatos.",
+        )
+
+    def handle(self, *args, **options):
+        lote = max(options["lote"], 1)
+
+        for modelo, campo in campos_con_metadatos():
+            nombre = campo.name
+            columnas = [
+                f"{nombre}_tamano",
+                f"{nombre}_tipo",
+                f"{nombre}_nombre_original",
+                f"{nombre}_sha256",
+            ]
+            filtro = Q(**{f"{nombre}__isnull": False}) & ~Q(**{nombre: ""})
+            if not options["forzar"]:
+                filtro &= Q(**{f"{nombre}_sha256": ""})
+
+            queryset = modelo.objects.filter(filtro).only("pk", nombre).order_by("pk")
+            pendientes = []
+            actualizados = faltantes = 0
+
+            for instancia in queryset.iterator(chunk_size=lote):
+                archivo = getattr(instancia, nombre)
+                digest = hashlib.sha256()
+                tamano = 0
+                try:
+                    with archivo.storage.open(archivo.name, "rb") as contenido:
+                        for bloque in iter(lambda: contenido.read(TAMANO_BLOQUE), b""):
+                            digest.update(bloque)
+                            tamano += len(bloque)
+                except OSError:
+                    faltantes += 1
+                    continue
+
+                setattr(instancia, columnas[0], tamano)
+                setattr(instancia, columnas[1], adivinar_tipo(archivo.name))
+                setattr(instancia, columnas[2], Path(archivo.name).name[:255])
+                setattr(instancia, columnas[3], digest.hexdigest())
+                pendientes.append(instancia)
+
+                if len(pendientes) >= lote:
+                    modelo.objects.bulk_update(pendientes, columnas)
+                    actualizados += len(pendientes)
+                    pendientes = []
+
+            if pendientes:
+                modelo.objects.bulk_update(pendientes, columnas)
+                actualizados += len(pendientes)
+
+            self.stdout.write(
+                f"{modelo._meta.label}.{nombre}: {actualizados} actualizados, "
+                f"{faltantes} sin archivo en el almacenamiento."
+            )
+
+        self.stdout.write(self.style.SUCCESS("Metadatos de archivos completados."))
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from api.almacenamiento import AlmacenamientoDeduplicado, calcular_sha256
+
+
+class Command(BaseCommand):
+    help = (
+        "Deduplica los archivos existentes de MEDIA_ROOT enlazando cada nombre "
+        "al blob de su contenido y elimina los blobs sin referencias."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Informa lo que se haría sin modificar archivos.",
+        )
+
+    def handle(self, *args, **options):
+        simular = options["dry_run"]
+        almacenamiento = AlmacenamientoDeduplicado()
+        raiz = Path(almacenamiento.location)
+
+        vistos: set[str] = set()
+        enlazados = duplicados = ahorrados = 0
+
+        for directorio, subdirectorios, archivos in os.walk(raiz):
+            subdirectorios[:] = [nombre for nombre in subdirectorios if not nombre.startswith(".")]
+            for nombre in archivos:
+                if nombre.startswith("."):
+                    continue
+                ruta = Path(directorio) / nombre
+                info = ruta.stat()
+                if info.st_nlink > 1:
+                    continue
+
+                digest = calcular_sha256(ruta)
+                blob = almacenamiento.ruta_blob(digest)
+                if digest in vistos or blob.exists():
+                    duplicados += 1
+                    ahorrados += info.st_size
+                    if not simular:
+                        temporal = ruta.with_name(f".{nombre}.dedup")
+                        os.link(blob, temporal)
+                        os.replace(temporal, ruta)
+                else:
+                    enlazados += 1
+                    if not simular:
+                        almacenamiento._crear_directorio(blob.parent)
+                        os.link(ruta, blob)
+                vistos.add(digest)
+
+        huerfanos = 0
+        directorio_blobs = almacenamiento.directorio_blobs()
+        if directorio_blobs.is_dir():
+            for blob in directorio_blobs.glob("??/*"):
+                if blob.stat().st_nlink <= 1:
+                    huerfanos += 1
+                    if not simular:
+                        blob.unlink()
+
+        prefijo = "[simulación] " if simular else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefijo}Blobs nuevos: {enlazados}. Duplicados enlazados: {duplicados} "
+                f"({ahorrados} bytes liberados). Blobs huérfanos eliminados: {huerfanos}."
+            )
+        )
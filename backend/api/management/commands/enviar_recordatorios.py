@@ -0,0 +1,64 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.recordatorios import procesar_recordatorios
+
+
+class Command(BaseCommand):
+    help = (
+        "Notifica a los alumnos con entregas o bitácoras que vencen en los próximos "
+        "días y que aún no registran. Repetirlo no duplica los avisos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dias",
+            type=int,
+            default=3,
+            help="Ventana de vencimiento en días desde hoy (por defecto 3).",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=200,
+            help="Evaluaciones procesadas por lote (por defecto 200).",
+        )
+        parser.add_argument(
+            "--fecha",
+            help="Fecha de referencia AAAA-MM-DD en lugar de hoy.",
+        )
+        parser.add_argument(
+            "--correo",
+            action="store_true",
+            help="Además de la notificación, envía un correo a cada alumno.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa cuántos recordatorios se enviarían.",
+        )
+
+    def handle(self, *args, **options):
+        if options["fecha"]:
+            try:
+                hoy = date.fromisoformat(options["fecha"])
+            except ValueError as exc:
+                raise CommandError("La fecha debe tener el formato AAAA-MM-DD.") from exc
+        else:
+            hoy = timezone.localdate()
+
+        resultado = procesar_recordatorios(
+            hoy=hoy,
+            dias=max(options["dias"], 0),
+            lote=max(options["lote"], 1),
+            correo=options["correo"],
+            simular=options["dry_run"],
+        )
+
+        verbo = "por enviar" if options["dry_run"] else "enviados"
+        self.stdout.write(f"Evaluaciones revisadas: {resultado['evaluaciones']}")
+        self.stdout.write(self.style.SUCCESS(f"Recordatorios {verbo}: {resultado['recordatorios']}"))
+        if options["correo"] and not options["dry_run"]:
+            self.stdout.write(f"Correos enviados: {resultado['correos']}")
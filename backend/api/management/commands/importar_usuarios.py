@@ -0,0 +1,77 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importacion_usuarios import ImportadorUsuarios, leer_filas
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa usuarios desde un archivo CSV o JSONL. Crea los correos nuevos y "
+        "actualiza los existentes; las contraseñas se hashean en varios procesos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta del archivo .csv o .jsonl.")
+        parser.add_argument(
+            "--formato",
+            choices=["csv", "jsonl"],
+            help="Formato del archivo si la extensión no lo indica.",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1000,
+            help="Filas por bulk_create (por defecto 1000).",
+        )
+        parser.add_argument(
+            "--procesos",
+            type=int,
+            help="Procesos para hashear contraseñas (por defecto, uno por CPU; 0 = sin procesos hijos).",
+        )
+        parser.add_argument(
+            "--actualizar-contrasenas",
+            action="store_true",
+            help="Reemplaza también la contraseña de los usuarios existentes.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Valida y cuenta sin escribir en la base.",
+        )
+
+    def handle(self, *args, **options):
+        ruta = Path(options["archivo"])
+        if not ruta.is_file():
+            raise CommandError(f"No existe el archivo {ruta}.")
+        if options["procesos"] is not None and options["procesos"] < 0:
+            raise CommandError("--procesos no puede ser negativo.")
+
+        importador = ImportadorUsuarios(
+            lote=options["lote"],
+            procesos=options["procesos"],
+            actualizar_contrasenas=options["actualizar_contrasenas"],
+            simular=options["dry_run"],
+        )
+        inicio = time.perf_counter()
+        try:
+            resultado = importador.importar(leer_filas(ruta, options["formato"]))
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        duracion = time.perf_counter() - inicio
+
+        for linea, mensaje in resultado.errores:
+            prefijo = f"Línea {linea}: " if linea else ""
+            self.stderr.write(f"{prefijo}{mensaje}")
+
+        estilo = self.style.WARNING if resultado.errores else self.style.SUCCESS
+        simulado = " (simulación)" if options["dry_run"] else ""
+        self.stdout.write(
+            estilo(
+                f"Filas leídas: {resultado.leidas}; creados: {resultado.creados}; "
+                f"actualizados: {resultado.actualizados}; docentes guía asignados: "
+                f"{resultado.docentes_asignados}; errores: {len(resultado.errores)}; "
+                f"{duracion:.2f} s{simulado}"
+            )
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.subidas import limpiar_subidas_expiradas
+
+
+class Command(BaseCommand):
+    help = "Elimina las cargas por fragmentos expiradas y sus archivos parciales."
+
+    def handle(self, *args, **options):
+        eliminadas = limpiar_subidas_expiradas()
+        self.stdout.write(self.style.SUCCESS(f"Cargas parciales eliminadas: {eliminadas}"))
@@ -0,0 +1,70 @@
+import io
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.perfilado import ENCABEZADO, directorio_perfiles, firmar_perfilado, listar_perfiles
+
+
+class Command(BaseCommand):
+    help = (
+        "Lista los perfiles guardados por PerfiladoMiddleware y resume las "
+        "funciones con más tiempo acumulado. Con --firmar imprime un valor para "
+        "el encabezado X-Perfilar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ruta", help="Solo los perfiles de esta ruta (nombre en urls.py).")
+        parser.add_argument("--metodo", help="Solo los perfiles de este método HTTP.")
+        parser.add_argument(
+            "--ultimos",
+            type=int,
+            default=20,
+            help="Cantidad de perfiles, del más reciente hacia atrás.",
+        )
+        parser.add_argument(
+            "--resumen",
+            type=int,
+            default=0,
+            metavar="N",
+            help="Suma los perfiles elegidos y muestra las N funciones principales.",
+        )
+        parser.add_argument(
+            "--orden",
+            choices=["cumulative", "tottime", "ncalls"],
+            default="cumulative",
+        )
+        parser.add_argument("--firmar", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["firmar"]:
+            self.stdout.write(f"{ENCABEZADO}: {firmar_perfilado()}")
+            return
+
+        directorio = directorio_perfiles()
+        if directorio is None:
+            raise CommandError("PERFILADO_DIRECTORIO no está configurado.")
+
+        perfiles = [
+            perfil
+            for perfil in listar_perfiles(directorio)
+            if (not options["ruta"] or perfil.ruta == options["ruta"])
+            and (not options["metodo"] or perfil.metodo == options["metodo"].upper())
+        ][: max(options["ultimos"], 1)]
+        if not perfiles:
+            self.stdout.write(f"No hay perfiles en {directorio}.")
+            return
+
+        for perfil in perfiles:
+            self.stdout.write(
+                f"{perfil.fecha:%Y-%m-%d %H:%M:%S}  {perfil.metodo:<6} {perfil.ruta:<40} "
+                f"{perfil.consultas:>5} consultas {perfil.milisegundos:>7} ms  {perfil.archivo.name}"
+            )
+
+        if options["resumen"] > 0:
+            salida = io.StringIO()
+            estadisticas = pstats.Stats(*(str(perfil.archivo) for perfil in perfiles), stream=salida)
+            estadisticas.sort_stats(options["orden"]).print_stats(options["resumen"])
+            self.stdout.write("")
+            self.stdout.write(f"Resumen de {len(perfiles)} perfiles, orden {options['orden']}:")
+            self.stdout.write(salida.getvalue())
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api.resumen_notas import reconstruir_resumenes
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla de resúmenes de notas desde las entregas calificadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1000,
+            help="Cantidad de filas por inserción (por defecto 1000).",
+        )
+
+    def handle(self, *args, **options):
+        total = reconstruir_resumenes(lote=max(options["lote"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Resúmenes de notas reconstruidos: {total}"))
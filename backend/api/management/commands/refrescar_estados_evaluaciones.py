@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.estados_evaluaciones import refrescar_estados
+
+
+class Command(BaseCommand):
+    help = "Recalcula el estado de todas las evaluaciones según su fecha."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1000,
+            help="Tamaño del tramo de claves por UPDATE (por defecto 1000).",
+        )
+        parser.add_argument(
+            "--fecha",
+            help="Fecha de referencia AAAA-MM-DD en lugar de hoy.",
+        )
+
+    def handle(self, *args, **options):
+        hoy = None
+        if options["fecha"]:
+            try:
+                hoy = date.fromisoformat(options["fecha"])
+            except ValueError as exc:
+                raise CommandError("La fecha debe tener el formato AAAA-MM-DD.") from exc
+
+        actualizadas = refrescar_estados(hoy, lote=max(options["lote"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Evaluaciones actualizadas: {actualizadas}"))
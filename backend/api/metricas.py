@@ -0,0 +1,253 @@
+"""Métricas por ruta en formato de texto de Prometheus.
+
+`MetricasMiddleware` (en `api/middleware.py`) registra por cada solicitud la
+latencia, la cantidad y el tiempo de las consultas SQL y el tamaño de la
+respuesta, etiquetados con el método y el nombre de la ruta de `urls.py`.
+También se publican los aciertos y fallos de `api/cache_lecturas.py`.
+
+Cada hilo acumula en su propio diccionario, así que registrar no toma ningún
+lock; al exportar se suman los fragmentos de todos los hilos y se
+consolidan los de hilos ya terminados. Los valores son por proceso: con
+varios workers, Prometheus debe consultar cada uno o sumarlos.
+"""
+
+from __future__ import annotations
+
+import hmac
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_safe
+
+from . import cache_lecturas
+
+
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RUTA_DESCONOCIDA = "desconocida"
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+# Sobre este número de fragmentos se consolidan los de hilos terminados
+# (el servidor de desarrollo crea un hilo por solicitud).
+MAXIMO_FRAGMENTOS = 64
+
+
+class RegistroRuta:
+    __slots__ = ("estados", "buckets", "latencia", "consultas", "segundos_sql", "bytes")
+
+    def __init__(self):
+        self.estados: dict[int, int] = {}
+        self.buckets = [0] * (len(LIMITES_LATENCIA) + 1)
+        self.latencia = 0.0
+        self.consultas = 0
+        self.segundos_sql = 0.0
+        self.bytes = 0
+
+    @property
+    def solicitudes(self) -> int:
+        return sum(self.estados.values())
+
+    def sumar(self, otro: "RegistroRuta") -> None:
+        for estado, cantidad in list(otro.estados.items()):
+            self.estados[estado] = self.estados.get(estado, 0) + cantidad
+        for indice, cantidad in enumerate(otro.buckets):
+            self.buckets[indice] += cantidad
+        self.latencia += otro.latencia
+        self.consultas += otro.consultas
+        self.segundos_sql += otro.segundos_sql
+        self.bytes += otro.bytes
+
+
+_local = threading.local()
+# (hilo, registros) de cada hilo que registró algo; solo su hilo los modifica.
+_fragmentos: list[tuple[threading.Thread, dict]] = []
+_consolidados: dict[tuple[str, str], RegistroRuta] = {}
+_lock_exportacion = threading.Lock()
+
+
+def _registros_del_hilo() -> dict[tuple[str, str], RegistroRuta]:
+    registros = getattr(_local, "registros", None)
+    if registros is None:
+        registros = _local.registros = {}
+        _fragmentos.append((threading.current_thread(), registros))
+        if len(_fragmentos) > MAXIMO_FRAGMENTOS:
+            _consolidar_terminados()
+    return registros
+
+
+def _consolidar_terminados() -> None:
+    with _lock_exportacion:
+        for fragmento in list(_fragmentos):
+            hilo, registros = fragmento
+            if hilo.is_alive():
+                continue
+            _fragmentos.remove(fragmento)
+            for clave, registro in registros.items():
+                _consolidados.setdefault(clave, RegistroRuta()).sumar(registro)
+
+
+def registrar(
+    metodo: str,
+    ruta: str,
+    estado: int,
+    duracion: float,
+    *,
+    consultas: int = 0,
+    segundos_sql: float = 0.0,
+    bytes_respuesta: int = 0,
+) -> None:
+    registros = _registros_del_hilo()
+    registro = registros.get((metodo, ruta))
+    if registro is None:
+        registro = registros[(metodo, ruta)] = RegistroRuta()
+    registro.estados[estado] = registro.estados.get(estado, 0) + 1
+    registro.buckets[bisect_left(LIMITES_LATENCIA, duracion)] += 1
+    registro.latencia += duracion
+    registro.consultas += consultas
+    registro.segundos_sql += segundos_sql
+    registro.bytes += bytes_respuesta
+
+
+def instantanea() -> dict[tuple[str, str], RegistroRuta]:
+    """Suma de todos los hilos, por `(método, ruta)`."""
+
+    _consolidar_terminados()
+    total: dict[tuple[str, str], RegistroRuta] = {}
+    with _lock_exportacion:
+        fuentes = [_consolidados] + [registros for _, registros in list(_fragmentos)]
+        for registros in fuentes:
+            for clave, registro in list(registros.items()):
+                total.setdefault(clave, RegistroRuta()).sumar(registro)
+    return total
+
+
+def reiniciar() -> None:
+    """Pone los contadores en cero (para pruebas)."""
+
+    with _lock_exportacion:
+        _consolidados.clear()
+        for _, registros in list(_fragmentos):
+            registros.clear()
+
+
+class MedidorConsultas:
+    """`execute_wrapper` que cuenta y cronometra las consultas."""
+
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.segundos += perf_counter() - inicio
+            self.consultas += 1
+
+
+# ----------------------------------------------------------------------
+# Exportación
+
+
+def _etiquetas(**valores) -> str:
+    partes = []
+    for nombre, valor in valores.items():
+        texto = str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        partes.append(f'{nombre}="{texto}"')
+    return "{" + ",".join(partes) + "}"
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def exportar_prometheus() -> str:
+    registros = sorted(instantanea().items())
+    lineas: list[str] = []
+
+    def metrica(nombre: str, tipo: str, ayuda: str, muestras) -> None:
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        lineas.extend(muestras)
+
+    metrica(
+        "api_solicitudes_total",
+        "counter",
+        "Solicitudes atendidas por ruta, método y estado.",
+        (
+            f"api_solicitudes_total{_etiquetas(ruta=ruta, metodo=metodo, estado=estado)} {cantidad}"
+            for (metodo, ruta), registro in registros
+            for estado, cantidad in sorted(registro.estados.items())
+        ),
+    )
+
+    muestras = []
+    for (metodo, ruta), registro in registros:
+        acumulado = 0
+        for limite, cantidad in zip(LIMITES_LATENCIA, registro.buckets):
+            acumulado += cantidad
+            etiquetas = _etiquetas(ruta=ruta, metodo=metodo, le=limite)
+            muestras.append(f"api_latencia_segundos_bucket{etiquetas} {acumulado}")
+        etiquetas = _etiquetas(ruta=ruta, metodo=metodo, le="+Inf")
+        muestras.append(f"api_latencia_segundos_bucket{etiquetas} {registro.solicitudes}")
+        etiquetas = _etiquetas(ruta=ruta, metodo=metodo)
+        muestras.append(f"api_latencia_segundos_sum{etiquetas} {_numero(registro.latencia)}")
+        muestras.append(f"api_latencia_segundos_count{etiquetas} {registro.solicitudes}")
+    metrica(
+        "api_latencia_segundos",
+        "histogram",
+        "Duración de las solicitudes en segundos.",
+        muestras,
+    )
+
+    for nombre, campo, ayuda in (
+        ("api_consultas_sql_total", "consultas", "Consultas SQL ejecutadas."),
+        ("api_consultas_sql_segundos_total", "segundos_sql", "Tiempo en consultas SQL, en segundos."),
+        ("api_respuesta_bytes_total", "bytes", "Bytes enviados en el cuerpo de las respuestas."),
+    ):
+        metrica(
+            nombre,
+            "counter",
+            ayuda,
+            (
+                f"{nombre}{_etiquetas(ruta=ruta, metodo=metodo)} {_numero(getattr(registro, campo))}"
+                for (metodo, ruta), registro in registros
+            ),
+        )
+
+    contadores_cache = sorted(cache_lecturas.contadores().items())
+    for nombre, indice, ayuda in (
+        ("api_cache_aciertos_total", 0, "Lecturas servidas desde la caché, por espacio."),
+        ("api_cache_fallos_total", 1, "Lecturas que hubo que calcular, por espacio."),
+    ):
+        metrica(
+            nombre,
+            "counter",
+            ayuda,
+            (
+                f"{nombre}{_etiquetas(espacio=espacio)} {valores[indice]}"
+                for espacio, valores in contadores_cache
+            ),
+        )
+
+    return "\n".join(lineas) + "\n"
+
+
+@require_safe
+def vista_metricas(request):
+    """`/metrics`; exige `Authorization: Bearer <METRICAS_TOKEN>`.
+
+    Sin token configurado solo responde con `DEBUG` o si `METRICAS_PUBLICAS`
+    lo permite explícitamente.
+    """
+
+    token = getattr(settings, "METRICAS_TOKEN", "")
+    if token:
+        esperado = f"Bearer {token}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), esperado):
+            return HttpResponseForbidden()
+    elif not (settings.DEBUG or getattr(settings, "METRICAS_PUBLICAS", False)):
+        return HttpResponseForbidden()
+    return HttpResponse(exportar_prometheus(), content_type=TIPO_CONTENIDO)
@@ -0,0 +1,156 @@
+import cProfile
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+from . import consultas_lentas
+from .estados_evaluaciones import refrescar_estados_si_corresponde
+from .metricas import RUTA_DESCONOCIDA, MedidorConsultas, registrar
+from .perfilado import ENCABEZADO_RESPUESTA, debe_perfilar, directorio_perfiles, guardar_perfil
+
+
+class RefrescoEstadosDiarioMiddleware:
+    """Refresca los estados de las evaluaciones en el primer request del día.
+
+    Se activa con `REFRESCAR_ESTADOS_EN_PRIMER_REQUEST = True`; sin esa opción
+    Django lo descarta al iniciar y el refresco queda a cargo del comando.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REFRESCAR_ESTADOS_EN_PRIMER_REQUEST", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self._ultimo_dia = None
+
+    def __call__(self, request):
+        hoy = timezone.localdate()
+        if hoy != self._ultimo_dia:
+            refrescar_estados_si_corresponde(hoy)
+            self._ultimo_dia = hoy
+        return self.get_response(request)
+
+
+def _ruta(request) -> str:
+    coincidencia = getattr(request, "resolver_match", None)
+    return (coincidencia.url_name if coincidencia else None) or RUTA_DESCONOCIDA
+
+
+def _bytes_respuesta(response) -> int:
+    if response.streaming:
+        return int(response.get("Content-Length") or 0)
+    return len(response.content)
+
+
+class MetricasMiddleware:
+    """Mide cada solicitud para `/metrics` (ver `api/metricas.py`).
+
+    Con `METRICAS_ENCABEZADOS` (por defecto igual a `DEBUG`) agrega además
+    `X-Query-Count` y `Server-Timing` a la respuesta. Se desactiva con
+    `METRICAS_HABILITADAS = False`.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICAS_HABILITADAS", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        medidor = MedidorConsultas()
+        inicio = time.perf_counter()
+        with ExitStack() as envolturas:
+            for conexion in connections.all():
+                envolturas.enter_context(conexion.execute_wrapper(medidor))
+            response = self.get_response(request)
+        duracion = time.perf_counter() - inicio
+
+        registrar(
+            request.method,
+            _ruta(request),
+            response.status_code,
+            duracion,
+            consultas=medidor.consultas,
+            segundos_sql=medidor.segundos,
+            bytes_respuesta=_bytes_respuesta(response),
+        )
+
+        encabezados = getattr(settings, "METRICAS_ENCABEZADOS", None)
+        if settings.DEBUG if encabezados is None else encabezados:
+            response["X-Query-Count"] = str(medidor.consultas)
+            response["Server-Timing"] = (
+                f'db;dur={medidor.segundos * 1000:.1f};desc="{medidor.consultas} consultas", '
+                f"total;dur={duracion * 1000:.1f}"
+            )
+        return response
+
+
+class PerfiladoMiddleware:
+    """Perfila con cProfile las solicitudes elegidas (ver `api/perfilado.py`).
+
+    Sin `PERFILADO_DIRECTORIO` Django lo descarta al iniciar. La respuesta
+    perfilada lleva en `X-Perfil` el nombre del archivo generado.
+    """
+
+    def __init__(self, get_response):
+        if directorio_perfiles() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not debe_perfilar(request):
+            return self.get_response(request)
+
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            # Ya hay otro perfilador activo en este hilo.
+            return self.get_response(request)
+
+        medidor = MedidorConsultas()
+        inicio = time.perf_counter()
+        try:
+            with ExitStack() as envolturas:
+                for conexion in connections.all():
+                    envolturas.enter_context(conexion.execute_wrapper(medidor))
+                response = self.get_response(request)
+        finally:
+            perfil.disable()
+        duracion = time.perf_counter() - inicio
+
+        archivo = guardar_perfil(perfil, request.method, _ruta(request), medidor.consultas, duracion)
+        response[ENCABEZADO_RESPUESTA] = archivo.name
+        return response
+
+
+class ConsultasLentasMiddleware:
+    """Registra las consultas SQL lentas (ver `api/consultas_lentas.py`).
+
+    Se descarta al iniciar si `CONSULTAS_LENTAS_UMBRAL_MS` no es positivo.
+    """
+
+    def __init__(self, get_response):
+        if consultas_lentas.umbral_ms() <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        registro = consultas_lentas.RegistroConsultasLentas()
+        token = consultas_lentas.vista_actual.set(None)
+        try:
+            with ExitStack() as envolturas:
+                for conexion in connections.all():
+                    envolturas.enter_context(conexion.execute_wrapper(registro))
+                return self.get_response(request)
+        finally:
+            consultas_lentas.vista_actual.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        vista = getattr(view_func, "view_class", view_func)
+        consultas_lentas.vista_actual.set(
+            f"{request.method} {request.path} ({vista.__module__}.{vista.__qualname__})"
+        )
+        return None
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:16
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0039_practicafirmacoordinador_url_firma_digital_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubidaEntregaParcial",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "token",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    "campo",
+                    models.CharField(
+                        choices=[
+                            ("archivo", "Archivo de la entrega"),
+                            ("informe_corregido", "Informe corregido"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("titulo", models.CharField(blank=True, max_length=180)),
+                ("comentario", models.TextField(blank=True, null=True)),
+                (
+                    "bitacora_indice",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                ("nombre_archivo", models.CharField(max_length=255)),
+                ("tamano_total", models.PositiveBigIntegerField()),
+                ("recibido", models.PositiveBigIntegerField(default=0)),
+                ("sha256", models.CharField(max_length=64)),
+                ("creado_en", models.DateTimeField(auto_now_add=True)),
+                ("actualizado_en", models.DateTimeField(auto_now=True)),
+                ("expira_en", models.DateTimeField(db_index=True)),
+                (
+                    "alumno",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subidas_parciales",
+                        to="api.usuario",
+                    ),
+                ),
+                (
+                    "entrega",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subidas_parciales",
+                        to="api.evaluacionentregaalumno",
+                    ),
+                ),
+                (
+                    "evaluacion",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subidas_parciales",
+                        to="api.evaluaciongrupodocente",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "evaluaciones_subidas_parciales",
+                "ordering": ["-creado_en"],
+            },
+        ),
+    ]
@@ -0,0 +1,243 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:26
+
+import api.archivos
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0040_subidaentregaparcial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="archivo_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="archivo_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="archivo_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="archivo_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="informe_corregido_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="informe_corregido_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="informe_corregido_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="informe_corregido_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="rubrica_docente_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="rubrica_docente_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="rubrica_docente_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="evaluacionentregaalumno",
+            name="rubrica_docente_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="evaluaciongrupodocente",
+            name="rubrica_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="evaluaciongrupodocente",
+            name="rubrica_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="evaluaciongrupodocente",
+            name="rubrica_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="evaluaciongrupodocente",
+            name="rubrica_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="practicadocumento",
+            name="archivo_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="practicadocumento",
+            name="archivo_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="practicadocumento",
+            name="archivo_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="practicadocumento",
+            name="archivo_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacion",
+            name="archivo_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacion",
+            name="archivo_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacion",
+            name="archivo_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacion",
+            name="archivo_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacionentrega",
+            name="archivo_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacionentrega",
+            name="archivo_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacionentrega",
+            name="archivo_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="practicaevaluacionentrega",
+            name="archivo_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AddField(
+            model_name="practicafirmacoordinador",
+            name="archivo_nombre_original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="practicafirmacoordinador",
+            name="archivo_sha256",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="practicafirmacoordinador",
+            name="archivo_tamano",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="practicafirmacoordinador",
+            name="archivo_tipo",
+            field=models.CharField(blank=True, default="", max_length=120),
+        ),
+        migrations.AlterField(
+            model_name="evaluacionentregaalumno",
+            name="archivo",
+            field=api.archivos.ArchivoConMetadatosField(
+                max_length=255, upload_to=api.models.evaluacion_entrega_upload_to
+            ),
+        ),
+        migrations.AlterField(
+            model_name="evaluacionentregaalumno",
+            name="informe_corregido",
+            field=api.archivos.ArchivoConMetadatosField(
+                blank=True,
+                max_length=255,
+                null=True,
+                upload_to=api.models.evaluacion_entrega_upload_to,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="evaluacionentregaalumno",
+            name="rubrica_docente",
+            field=api.archivos.ArchivoConMetadatosField(
+                blank=True,
+                max_length=255,
+                null=True,
+                upload_to=api.models.evaluacion_entrega_upload_to,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="evaluaciongrupodocente",
+            name="rubrica",
+            field=api.archivos.ArchivoConMetadatosField(
+                blank=True,
+                max_length=255,
+                null=True,
+                upload_to=api.models.evaluacion_rubrica_upload_to,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="practicadocumento",
+            name="archivo",
+            field=api.archivos.ArchivoConMetadatosField(
+                max_length=255, upload_to="practicas/documentos/%Y/%m/%d"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="practicaevaluacion",
+            name="archivo",
+            field=api.archivos.ArchivoConMetadatosField(
+                max_length=255, upload_to="practicas/evaluaciones/%Y/%m/%d"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="practicaevaluacionentrega",
+            name="archivo",
+            field=api.archivos.ArchivoConMetadatosField(
+                max_length=255, upload_to="practicas/evaluaciones/entregas/%Y/%m/%d"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="practicafirmacoordinador",
+            name="archivo",
+            field=api.archivos.ArchivoConMetadatosField(
+                blank=True,
+                max_length=255,
+                null=True,
+                upload_to="practicas/firmas/%Y/%m/%d",
+            ),
+        ),
+    ]
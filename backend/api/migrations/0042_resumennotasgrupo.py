@@ -0,0 +1,87 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def poblar_resumenes(apps, schema_editor):
+    EvaluacionEntregaAlumno = apps.get_model("api", "EvaluacionEntregaAlumno")
+    ResumenNotasGrupo = apps.get_model("api", "ResumenNotasGrupo")
+
+    filas = (
+        EvaluacionEntregaAlumno.objects.exclude(nota__isnull=True)
+        .values("evaluacion_id")
+        .annotate(
+            suma=Sum("nota"),
+            cantidad=Count("nota"),
+            minima=Min("nota"),
+            maxima=Max("nota"),
+        )
+        .order_by("evaluacion_id")
+    )
+    ResumenNotasGrupo.objects.bulk_create(
+        [
+            ResumenNotasGrupo(
+                evaluacion_id=fila["evaluacion_id"],
+                suma_notas=fila["suma"],
+                cantidad_notas=fila["cantidad"],
+                nota_minima=fila["minima"],
+                nota_maxima=fila["maxima"],
+            )
+            for fila in filas
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0041_metadatos_archivos"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumenNotasGrupo",
+            fields=[
+                (
+                    "evaluacion",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="resumen_notas",
+                        serialize=False,
+                        to="api.evaluaciongrupodocente",
+                    ),
+                ),
+                (
+                    "suma_notas",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("cantidad_notas", models.PositiveIntegerField(default=0)),
+                (
+                    "nota_minima",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=4, null=True
+                    ),
+                ),
+                (
+                    "nota_maxima",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=4, null=True
+                    ),
+                ),
+                ("actualizado_en", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "evaluaciones_resumen_notas",
+                "indexes": [
+                    models.Index(
+                        fields=["cantidad_notas"], name="evaluacione_cantida_253a96_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(poblar_resumenes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0042_resumennotasgrupo"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notificacion",
+            name="tipo",
+            field=models.CharField(
+                choices=[
+                    ("propuesta", "Propuesta"),
+                    ("general", "General"),
+                    ("tema", "Tema"),
+                    ("reunion", "Reunión"),
+                    ("inscripcion", "Inscripción"),
+                    ("recordatorio", "Recordatorio"),
+                ],
+                default="general",
+                max_length=40,
+            ),
+        ),
+        migrations.CreateModel(
+            name="RecordatorioEnviado",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bitacora_indice", models.PositiveSmallIntegerField(default=0)),
+                ("fecha_limite", models.DateField()),
+                ("creado_en", models.DateTimeField(auto_now_add=True)),
+                (
+                    "alumno",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recordatorios_recibidos",
+                        to="api.usuario",
+                    ),
+                ),
+                (
+                    "evaluacion",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recordatorios",
+                        to="api.evaluaciongrupodocente",
+                    ),
+                ),
+                (
+                    "notificacion",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="api.notificacion",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "recordatorios_enviados",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "alumno",
+                            "evaluacion",
+                            "bitacora_indice",
+                            "fecha_limite",
+                        ),
+                        name="recordatorio_unico_por_plazo",
+                    )
+                ],
+            },
+        ),
+    ]
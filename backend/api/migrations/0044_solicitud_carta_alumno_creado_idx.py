@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0043_recordatorioenviado"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="solicitudcartapractica",
+            index=models.Index(
+                fields=["alumno", "-creado_en"], name="solicitudes_alumno__433a0f_idx"
+            ),
+        ),
+    ]
@@ -1,11 +1,26 @@
+from datetime import date, timedelta
 from pathlib import Path
 import uuid
 
-from django.contrib.auth.hashers import make_password, check_password as auth_check_password
+from django.contrib.auth.hashers import (
+    check_password as auth_check_password,
+    identify_hasher,
+    make_password,
+)
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
 
+from .archivos import ArchivoConMetadatosField, nombre_archivo
+
+
+def _es_hash_conocido(valor: str) -> bool:
+    try:
+        identify_hasher(valor)
+    except ValueError:
+        return False
+    return True
+
 
 def evaluacion_entrega_upload_to(instance, filename: str) -> str:
     """Genera una ruta predecible y única para los archivos de entregas."""
@@ -99,18 +114,35 @@ class Usuario(models.Model):
     class Meta:
         db_table = "usuarios"
 
+    @property
+    def is_authenticated(self) -> bool:
+        # Lo consultan DRF y Django al usarlo como `request.user`.
+        return True
+
+    @property
+    def is_anonymous(self) -> bool:
+        return False
+
     def set_password(self, raw_password: str) -> None:
         self.contrasena = make_password(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
-        return auth_check_password(raw_password, self.contrasena)
+        def actualizar_hash(raw_password: str) -> None:
+            # El hasher preferido o sus iteraciones cambiaron: se aprovecha
+            # que la contraseña es correcta para guardar el hash nuevo.
+            self.set_password(raw_password)
+            if self.pk:
+                self.save(update_fields=["contrasena"])
+
+        return auth_check_password(raw_password, self.contrasena, setter=actualizar_hash)
 
     def save(self, *args, **kwargs):
         """
-        Si 'contrasena' viene en texto plano (no empieza con 'pbkdf2_sha256$'),
-        la hasheamos antes de guardar. Si ya es hash, no la tocamos.
+        Si 'contrasena' viene en texto plano (no corresponde a ningún hasher de
+        PASSWORD_HASHERS), la hasheamos antes de guardar. Si ya es hash, no la
+        tocamos.
         """
-        if self.contrasena and not str(self.contrasena).startswith('pbkdf2_sha256$'):
+        if self.contrasena and not _es_hash_conocido(self.contrasena):
             self.set_password(self.contrasena)
         super().save(*args, **kwargs)
 
@@ -253,6 +285,7 @@ class SolicitudCartaPractica(models.Model):
     class Meta:
         db_table = "solicitudes_carta_practica"
         ordering = ["-creado_en"]
+        indexes = [models.Index(fields=["alumno", "-creado_en"])]
 
     def __str__(self) -> str:
         return f"Carta práctica de {self.alumno_nombres} {self.alumno_apellidos}"
@@ -408,6 +441,28 @@ class TrazabilidadReunion(models.Model):
         return f"Registro de {referencia} ({self.tipo})"
 
 
+def calcular_fechas_bitacoras(fecha_limite: date | None, total: int | None) -> list[tuple[int, date]]:
+    """Pares `(indice, fecha)` de las bitácoras semanales previas a la evaluación."""
+
+    total = total or 0
+    if not fecha_limite or total <= 0:
+        return []
+    return [
+        (indice, fecha_limite - timedelta(weeks=total - indice + 1))
+        for indice in range(1, total + 1)
+    ]
+
+
+def calcular_estado_evaluacion(fecha: date | None, hoy: date) -> str:
+    """Estado de una evaluación según su fecha; ver `api.estados_evaluaciones`."""
+
+    if not fecha or fecha > hoy:
+        return "Pendiente"
+    if fecha == hoy:
+        return "En progreso"
+    return "Evaluada"
+
+
 class EvaluacionGrupoDocente(models.Model):
     ESTADOS = [
         ("Pendiente", "Pendiente"),
@@ -433,12 +488,16 @@ class EvaluacionGrupoDocente(models.Model):
     grupo_nombre = models.CharField(max_length=160)
     titulo = models.CharField(max_length=200)
     comentario = models.TextField(blank=True, null=True)
-    rubrica = models.FileField(
+    rubrica = ArchivoConMetadatosField(
         upload_to=evaluacion_rubrica_upload_to,
         blank=True,
         null=True,
         max_length=255,
     )
+    rubrica_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    rubrica_tipo = models.CharField(max_length=120, blank=True, default="")
+    rubrica_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    rubrica_sha256 = models.CharField(max_length=64, blank=True, default="")
     bitacoras_requeridas = models.PositiveSmallIntegerField(default=0)
     bitacora_comentario = models.TextField(blank=True, null=True)
     fecha = models.DateField(null=True, blank=True)
@@ -458,18 +517,7 @@ class EvaluacionGrupoDocente(models.Model):
         return f"{self.grupo_nombre} - {self.titulo} ({self.estado})"
 
     def sincronizar_estado(self) -> None:
-        hoy = timezone.localdate()
-
-        if not self.fecha:
-            self.estado = "Pendiente"
-            return
-
-        if self.fecha > hoy:
-            self.estado = "Pendiente"
-        elif self.fecha == hoy:
-            self.estado = "En progreso"
-        else:
-            self.estado = "Evaluada"
+        self.estado = calcular_estado_evaluacion(self.fecha, timezone.localdate())
 
     def save(self, *args, **kwargs):
         if self.tema:
@@ -479,9 +527,10 @@ class EvaluacionGrupoDocente(models.Model):
 
     @property
     def rubrica_nombre(self) -> str:
-        if not self.rubrica:
-            return ""
-        return Path(self.rubrica.name).name
+        return nombre_archivo(self, "rubrica")
+
+    def fechas_bitacoras(self) -> list[tuple[int, date]]:
+        return calcular_fechas_bitacoras(self.fecha, self.bitacoras_requeridas)
 
 
 class EvaluacionEntregaAlumno(models.Model):
@@ -505,19 +554,33 @@ class EvaluacionEntregaAlumno(models.Model):
     )
     titulo = models.CharField(max_length=180)
     comentario = models.TextField(blank=True, null=True)
-    archivo = models.FileField(upload_to=evaluacion_entrega_upload_to, max_length=255)
-    rubrica_docente = models.FileField(
+    archivo = ArchivoConMetadatosField(upload_to=evaluacion_entrega_upload_to, max_length=255)
+    rubrica_docente = ArchivoConMetadatosField(
         upload_to=evaluacion_entrega_upload_to,
         blank=True,
         null=True,
         max_length=255,
     )
-    informe_corregido = models.FileField(
+    informe_corregido = ArchivoConMetadatosField(
         upload_to=evaluacion_entrega_upload_to,
         blank=True,
         null=True,
         max_length=255,
     )
+    # Las columnas de metadatos van después de los archivos: se completan al
+    # guardar cada archivo (ver `api.archivos`).
+    archivo_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    archivo_tipo = models.CharField(max_length=120, blank=True, default="")
+    archivo_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    archivo_sha256 = models.CharField(max_length=64, blank=True, default="")
+    rubrica_docente_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    rubrica_docente_tipo = models.CharField(max_length=120, blank=True, default="")
+    rubrica_docente_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    rubrica_docente_sha256 = models.CharField(max_length=64, blank=True, default="")
+    informe_corregido_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    informe_corregido_tipo = models.CharField(max_length=120, blank=True, default="")
+    informe_corregido_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    informe_corregido_sha256 = models.CharField(max_length=64, blank=True, default="")
     nota = models.DecimalField(max_digits=4, decimal_places=2, blank=True, null=True)
     estado_revision = models.CharField(
         max_length=20,
@@ -549,21 +612,100 @@ class EvaluacionEntregaAlumno(models.Model):
 
     @property
     def archivo_nombre(self) -> str:
-        if not self.archivo:
-            return ""
-        return Path(self.archivo.name).name
+        return nombre_archivo(self, "archivo")
 
     @property
     def rubrica_docente_nombre(self) -> str:
-        if not self.rubrica_docente:
-            return ""
-        return Path(self.rubrica_docente.name).name
+        return nombre_archivo(self, "rubrica_docente")
 
     @property
     def informe_corregido_nombre(self) -> str:
-        if not self.informe_corregido:
-            return ""
-        return Path(self.informe_corregido.name).name
+        return nombre_archivo(self, "informe_corregido")
+
+
+class SubidaEntregaParcial(models.Model):
+    """Carga por fragmentos de un archivo de entrega que aún no se finaliza."""
+
+    CAMPOS = [
+        ("archivo", "Archivo de la entrega"),
+        ("informe_corregido", "Informe corregido"),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    campo = models.CharField(max_length=20, choices=CAMPOS)
+    evaluacion = models.ForeignKey(
+        EvaluacionGrupoDocente,
+        on_delete=models.CASCADE,
+        related_name="subidas_parciales",
+    )
+    entrega = models.ForeignKey(
+        EvaluacionEntregaAlumno,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="subidas_parciales",
+    )
+    alumno = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="subidas_parciales",
+    )
+    titulo = models.CharField(max_length=180, blank=True)
+    comentario = models.TextField(blank=True, null=True)
+    bitacora_indice = models.PositiveSmallIntegerField(blank=True, null=True)
+    nombre_archivo = models.CharField(max_length=255)
+    tamano_total = models.PositiveBigIntegerField()
+    recibido = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64)
+    creado_en = models.DateTimeField(auto_now_add=True)
+    actualizado_en = models.DateTimeField(auto_now=True)
+    expira_en = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "evaluaciones_subidas_parciales"
+        ordering = ["-creado_en"]
+
+    def __str__(self) -> str:
+        return f"Subida {self.token} ({self.recibido}/{self.tamano_total})"
+
+    @property
+    def completa(self) -> bool:
+        return self.recibido >= self.tamano_total
+
+
+class ResumenNotasGrupo(models.Model):
+    """Acumulado de notas de una evaluación, mantenido en cada calificación.
+
+    El tema y el docente se leen a través de la evaluación, así que un cambio
+    de grupo o de docente no deja el resumen desactualizado.
+    """
+
+    evaluacion = models.OneToOneField(
+        EvaluacionGrupoDocente,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="resumen_notas",
+    )
+    suma_notas = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    cantidad_notas = models.PositiveIntegerField(default=0)
+    nota_minima = models.DecimalField(max_digits=4, decimal_places=2, blank=True, null=True)
+    nota_maxima = models.DecimalField(max_digits=4, decimal_places=2, blank=True, null=True)
+    actualizado_en = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "evaluaciones_resumen_notas"
+        indexes = [models.Index(fields=["cantidad_notas"])]
+
+    def __str__(self) -> str:
+        return f"Resumen de notas {self.evaluacion_id} ({self.cantidad_notas})"
+
+    @property
+    def promedio(self):
+        if not self.cantidad_notas:
+            return None
+        return self.suma_notas / self.cantidad_notas
 
 
 class PropuestaTema(models.Model):
@@ -628,6 +770,7 @@ class Notificacion(models.Model):
         ("tema", "Tema"),
         ("reunion", "Reunión"),
         ("inscripcion", "Inscripción"),
+        ("recordatorio", "Recordatorio"),
     ]
 
     usuario = models.ForeignKey(
@@ -650,6 +793,47 @@ class Notificacion(models.Model):
         return f"{self.titulo} -> {self.usuario.nombre_completo}"
 
 
+class RecordatorioEnviado(models.Model):
+    """Registro de cada recordatorio de entrega enviado a un alumno.
+
+    `bitacora_indice` es 0 para la entrega final de la evaluación. Incluir la
+    fecha límite permite volver a avisar si el docente cambia el plazo.
+    """
+
+    alumno = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name="recordatorios_recibidos",
+    )
+    evaluacion = models.ForeignKey(
+        EvaluacionGrupoDocente,
+        on_delete=models.CASCADE,
+        related_name="recordatorios",
+    )
+    bitacora_indice = models.PositiveSmallIntegerField(default=0)
+    fecha_limite = models.DateField()
+    notificacion = models.ForeignKey(
+        Notificacion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    creado_en = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "recordatorios_enviados"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["alumno", "evaluacion", "bitacora_indice", "fecha_limite"],
+                name="recordatorio_unico_por_plazo",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"Recordatorio {self.evaluacion_id}/{self.bitacora_indice} -> {self.alumno_id}"
+
+
 class PracticaDocumento(models.Model):
     """Documento oficial compartido para estudiantes de práctica."""
 
@@ -659,7 +843,11 @@ class PracticaDocumento(models.Model):
     )
     nombre = models.CharField(max_length=255)
     descripcion = models.TextField(blank=True, null=True)
-    archivo = models.FileField(upload_to="practicas/documentos/%Y/%m/%d", max_length=255)
+    archivo = ArchivoConMetadatosField(upload_to="practicas/documentos/%Y/%m/%d", max_length=255)
+    archivo_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    archivo_tipo = models.CharField(max_length=120, blank=True, default="")
+    archivo_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    archivo_sha256 = models.CharField(max_length=64, blank=True, default="")
     uploaded_by = models.ForeignKey(
         Usuario,
         on_delete=models.SET_NULL,
@@ -685,9 +873,13 @@ class PracticaFirmaCoordinador(models.Model):
         choices=Usuario.CARRERA_CHOICES,
         unique=True,
     )
-    archivo = models.FileField(
+    archivo = ArchivoConMetadatosField(
         upload_to="practicas/firmas/%Y/%m/%d", max_length=255, blank=True, null=True
     )
+    archivo_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    archivo_tipo = models.CharField(max_length=120, blank=True, default="")
+    archivo_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    archivo_sha256 = models.CharField(max_length=64, blank=True, default="")
     url_firma_digital = models.URLField(blank=True, null=True)
     uploaded_by = models.ForeignKey(
         Usuario,
@@ -707,7 +899,11 @@ class PracticaEvaluacion(models.Model):
     carrera = models.CharField(max_length=160)
     nombre = models.CharField(max_length=160)
     descripcion = models.TextField(blank=True)
-    archivo = models.FileField(upload_to="practicas/evaluaciones/%Y/%m/%d", max_length=255)
+    archivo = ArchivoConMetadatosField(upload_to="practicas/evaluaciones/%Y/%m/%d", max_length=255)
+    archivo_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    archivo_tipo = models.CharField(max_length=120, blank=True, default="")
+    archivo_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    archivo_sha256 = models.CharField(max_length=64, blank=True, default="")
     uploaded_by = models.ForeignKey(
         Usuario, related_name="evaluaciones_practica", on_delete=models.CASCADE
     )
@@ -732,9 +928,13 @@ class PracticaEvaluacionEntrega(models.Model):
     alumno = models.ForeignKey(
         Usuario, related_name="entregas_practica", on_delete=models.CASCADE
     )
-    archivo = models.FileField(
+    archivo = ArchivoConMetadatosField(
         upload_to="practicas/evaluaciones/entregas/%Y/%m/%d", max_length=255
     )
+    archivo_tamano = models.PositiveBigIntegerField(blank=True, null=True)
+    archivo_tipo = models.CharField(max_length=120, blank=True, default="")
+    archivo_nombre_original = models.CharField(max_length=255, blank=True, default="")
+    archivo_sha256 = models.CharField(max_length=64, blank=True, default="")
     nota = models.CharField(max_length=10, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -744,4 +944,4 @@ class PracticaEvaluacionEntrega(models.Model):
 
     def __str__(self) -> str:
         alumno_nombre = self.alumno.nombre_completo if self.alumno_id else ""
-        return f"Entrega evaluación {alumno_nombre}"
\ No newline at end of file
+        return f"Entrega evaluación {alumno_nombre}"
\ No newline at end of file
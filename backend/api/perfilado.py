@@ -0,0 +1,110 @@
+"""Perfilado con `cProfile` de solicitudes puntuales.
+
+`PerfiladoMiddleware` (en `api/middleware.py`) ejecuta bajo `cProfile` las
+solicitudes que traen el encabezado `X-Perfilar` con un valor firmado con
+`SECRET_KEY` (ver `firmar_perfilado` o `manage.py perfiles --firmar`) y,
+además, una fracción `PERFILADO_MUESTREO` de las demás. Cada perfil se guarda
+en `PERFILADO_DIRECTORIO` como un `.prof` de `pstats` cuyo nombre indica la
+fecha, el método, la ruta, las consultas SQL y la duración; `manage.py
+perfiles` los lista y resume. Sin directorio configurado no se perfila nada.
+
+En las respuestas en streaming el perfil cubre solo la vista, no el envío
+del cuerpo.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import random
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+
+SAL_FIRMA = "api.perfilado"
+ENCABEZADO = "X-Perfilar"
+ENCABEZADO_RESPUESTA = "X-Perfil"
+FORMATO_FECHA = "%Y%m%dT%H%M%S%f"
+_NOMBRE = re.compile(
+    r"^(?P<fecha>\d{8}T\d{12})_(?P<metodo>[A-Z]+)_(?P<ruta>[\w-]+)_"
+    r"(?P<consultas>\d+)q_(?P<milisegundos>\d+)ms\.prof$"
+)
+
+
+@dataclass(frozen=True)
+class Perfil:
+    archivo: Path
+    fecha: datetime
+    metodo: str
+    ruta: str
+    consultas: int
+    milisegundos: int
+
+
+def directorio_perfiles() -> Path | None:
+    directorio = getattr(settings, "PERFILADO_DIRECTORIO", "")
+    return Path(directorio) if directorio else None
+
+
+def firmar_perfilado() -> str:
+    """Valor para `X-Perfilar`; vale `PERFILADO_FIRMA_DURACION` segundos."""
+
+    return signing.dumps("perfilar", salt=SAL_FIRMA)
+
+
+def _firma_valida(valor: str) -> bool:
+    duracion = int(getattr(settings, "PERFILADO_FIRMA_DURACION", 3600))
+    try:
+        return signing.loads(valor, salt=SAL_FIRMA, max_age=duracion) == "perfilar"
+    except signing.BadSignature:
+        return False
+
+
+def debe_perfilar(request) -> bool:
+    valor = request.headers.get(ENCABEZADO)
+    if valor:
+        return _firma_valida(valor)
+    muestreo = float(getattr(settings, "PERFILADO_MUESTREO", 0.0))
+    return muestreo > 0 and random.random() < muestreo
+
+
+def guardar_perfil(
+    perfil: cProfile.Profile, metodo: str, ruta: str, consultas: int, duracion: float
+) -> Path:
+    directorio = directorio_perfiles()
+    directorio.mkdir(parents=True, exist_ok=True)
+    ruta = re.sub(r"[^\w-]", "-", ruta)
+    fecha = timezone.now().strftime(FORMATO_FECHA)
+    archivo = directorio / f"{fecha}_{metodo}_{ruta}_{consultas}q_{round(duracion * 1000)}ms.prof"
+    perfil.dump_stats(archivo)
+    return archivo
+
+
+def listar_perfiles(directorio: Path | None = None) -> list[Perfil]:
+    """Perfiles del directorio, del más reciente al más antiguo."""
+
+    directorio = directorio or directorio_perfiles()
+    if directorio is None or not directorio.is_dir():
+        return []
+
+    perfiles = []
+    for archivo in directorio.glob("*.prof"):
+        coincidencia = _NOMBRE.match(archivo.name)
+        if not coincidencia:
+            continue
+        perfiles.append(
+            Perfil(
+                archivo=archivo,
+                fecha=datetime.strptime(coincidencia["fecha"], FORMATO_FECHA),
+                metodo=coincidencia["metodo"],
+                ruta=coincidencia["ruta"],
+                consultas=int(coincidencia["consultas"]),
+                milisegundos=int(coincidencia["milisegundos"]),
+            )
+        )
+    return sorted(perfiles, key=lambda perfil: perfil.fecha, reverse=True)
@@ -0,0 +1,259 @@
+"""Recordatorios de entregas y bitácoras próximas a vencer.
+
+Por cada lote de evaluaciones se hacen tres lecturas, sin importar cuántos
+alumnos haya: los pares (inscripción activa, evaluación) con plazos en la
+ventana, las entregas ya hechas de esas evaluaciones y los recordatorios ya
+registrados. Con eso se calcula en memoria qué alumnos no han entregado, y
+las notificaciones y sus registros se insertan con `bulk_create`, bajo un
+bloqueo de las evaluaciones del lote. El registro `RecordatorioEnviado` es
+único por alumno, evaluación, bitácora y fecha límite, lo que hace que repetir
+el comando (o ejecutarlo dos veces a la vez) no duplique avisos.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Max
+
+from .dashboard import invalidar_dashboards
+from .models import (
+    EvaluacionEntregaAlumno,
+    EvaluacionGrupoDocente,
+    InscripcionTema,
+    Notificacion,
+    RecordatorioEnviado,
+    calcular_fechas_bitacoras,
+)
+
+
+ENTREGA_FINAL = 0
+
+
+@dataclass(frozen=True)
+class Recordatorio:
+    alumno_id: int
+    correo: str | None
+    evaluacion_id: int
+    evaluacion_titulo: str
+    grupo_nombre: str
+    bitacora_indice: int
+    fecha_limite: date
+
+    @property
+    def clave(self) -> tuple[int, int, int, date]:
+        return (self.alumno_id, self.evaluacion_id, self.bitacora_indice, self.fecha_limite)
+
+    def titulo(self) -> str:
+        if self.bitacora_indice == ENTREGA_FINAL:
+            return f"Recordatorio: entrega de {self.evaluacion_titulo}"
+        return f"Recordatorio: Bitácora {self.bitacora_indice} de {self.evaluacion_titulo}"
+
+    def mensaje(self) -> str:
+        que = (
+            "la entrega"
+            if self.bitacora_indice == ENTREGA_FINAL
+            else f"la bitácora {self.bitacora_indice}"
+        )
+        return (
+            f"Aún no registras {que} de la evaluación \"{self.evaluacion_titulo}\" "
+            f"del grupo {self.grupo_nombre}. El plazo vence el "
+            f"{self.fecha_limite.strftime('%d/%m/%Y')}."
+        )
+
+    def notificacion(self) -> Notificacion:
+        return Notificacion(
+            usuario_id=self.alumno_id,
+            titulo=self.titulo()[:160],
+            mensaje=self.mensaje(),
+            tipo="recordatorio",
+            meta={
+                "evento": "recordatorio_entrega",
+                "evaluacion_id": self.evaluacion_id,
+                "bitacora_indice": self.bitacora_indice or None,
+                "fecha_limite": self.fecha_limite.isoformat(),
+            },
+        )
+
+
+def _plazos_en_ventana(fecha, bitacoras, desde: date, hasta: date) -> list[tuple[int, date]]:
+    plazos = [(ENTREGA_FINAL, fecha)] + calcular_fechas_bitacoras(fecha, bitacoras)
+    return [(indice, limite) for indice, limite in plazos if desde <= limite <= hasta]
+
+
+def _evaluaciones_candidatas(desde: date, hasta: date):
+    """Evaluaciones con la entrega final o alguna bitácora dentro de la ventana.
+
+    La bitácora más temprana vence `bitacoras_requeridas` semanas antes de la
+    fecha de la evaluación, así que basta acotar por la mayor cantidad de
+    bitácoras registrada.
+    """
+
+    maximo = (
+        EvaluacionGrupoDocente.objects.filter(fecha__gte=desde)
+        .aggregate(maximo=Max("bitacoras_requeridas"))["maximo"]
+        or 0
+    )
+    return (
+        EvaluacionGrupoDocente.objects.filter(
+            fecha__gte=desde,
+            fecha__lte=hasta + timedelta(weeks=maximo),
+            tema__isnull=False,
+        )
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def calcular_recordatorios(evaluacion_ids, desde: date, hasta: date) -> list[Recordatorio]:
+    """Recordatorios pendientes para un lote de evaluaciones."""
+
+    filas = (
+        InscripcionTema.objects.filter(
+            activo=True,
+            tema__evaluaciones_docente__in=evaluacion_ids,
+            alumno__rol="alumno",
+        )
+        .annotate(
+            evaluacion_id=F("tema__evaluaciones_docente__id"),
+            evaluacion_titulo=F("tema__evaluaciones_docente__titulo"),
+            evaluacion_grupo=F("tema__evaluaciones_docente__grupo_nombre"),
+            evaluacion_fecha=F("tema__evaluaciones_docente__fecha"),
+            evaluacion_bitacoras=F("tema__evaluaciones_docente__bitacoras_requeridas"),
+        )
+        .values_list(
+            "alumno_id",
+            "alumno__correo",
+            "evaluacion_id",
+            "evaluacion_titulo",
+            "evaluacion_grupo",
+            "evaluacion_fecha",
+            "evaluacion_bitacoras",
+        )
+    )
+
+    candidatos: list[Recordatorio] = []
+    for alumno_id, correo, evaluacion_id, titulo, grupo, fecha, bitacoras in filas:
+        for indice, limite in _plazos_en_ventana(fecha, bitacoras, desde, hasta):
+            candidatos.append(
+                Recordatorio(alumno_id, correo, evaluacion_id, titulo, grupo, indice, limite)
+            )
+    if not candidatos:
+        return []
+
+    entregadas = {
+        (alumno_id, evaluacion_id, indice if es_bitacora else ENTREGA_FINAL)
+        for alumno_id, evaluacion_id, es_bitacora, indice in EvaluacionEntregaAlumno.objects.filter(
+            evaluacion_id__in=evaluacion_ids, alumno__isnull=False
+        ).values_list("alumno_id", "evaluacion_id", "es_bitacora", "bitacora_indice")
+    }
+    enviados = set(
+        RecordatorioEnviado.objects.filter(
+            evaluacion_id__in=evaluacion_ids,
+            fecha_limite__gte=desde,
+            fecha_limite__lte=hasta,
+        ).values_list("alumno_id", "evaluacion_id", "bitacora_indice", "fecha_limite")
+    )
+
+    pendientes = {}
+    for recordatorio in candidatos:
+        if recordatorio.clave[:3] in entregadas or recordatorio.clave in enviados:
+            continue
+        pendientes.setdefault(recordatorio.clave, recordatorio)
+    return list(pendientes.values())
+
+
+def registrar_recordatorios(evaluacion_ids, desde: date, hasta: date) -> list[Recordatorio]:
+    """Calcula e inserta los recordatorios pendientes de un lote en una transacción.
+
+    Las evaluaciones del lote se bloquean antes de leer los registros ya
+    enviados, de modo que dos ejecuciones simultáneas no avisen dos veces; la
+    restricción única sigue siendo la última barrera. Devuelve los
+    recordatorios registrados.
+    """
+
+    with transaction.atomic():
+        list(
+            EvaluacionGrupoDocente.objects.select_for_update()
+            .filter(pk__in=evaluacion_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        recordatorios = calcular_recordatorios(evaluacion_ids, desde, hasta)
+        if not recordatorios:
+            return []
+        notificaciones = Notificacion.objects.bulk_create(
+            [recordatorio.notificacion() for recordatorio in recordatorios]
+        )
+        RecordatorioEnviado.objects.bulk_create(
+            [
+                RecordatorioEnviado(
+                    alumno_id=recordatorio.alumno_id,
+                    evaluacion_id=recordatorio.evaluacion_id,
+                    bitacora_indice=recordatorio.bitacora_indice,
+                    fecha_limite=recordatorio.fecha_limite,
+                    notificacion=notificacion,
+                )
+                for recordatorio, notificacion in zip(recordatorios, notificaciones)
+            ],
+            ignore_conflicts=True,
+        )
+    # `bulk_create` no emite señales.
+    invalidar_dashboards(*(recordatorio.alumno_id for recordatorio in recordatorios))
+    return recordatorios
+
+
+def enviar_correos(recordatorios: list[Recordatorio]) -> int:
+    """Envía los correos de un lote reutilizando una sola conexión SMTP."""
+
+    remitente = getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@trabajo-titulo.local")
+    mensajes = [
+        EmailMessage(recordatorio.titulo(), recordatorio.mensaje(), remitente, [recordatorio.correo])
+        for recordatorio in recordatorios
+        if recordatorio.correo
+    ]
+    if not mensajes:
+        return 0
+    with get_connection(fail_silently=True) as conexion:
+        return conexion.send_messages(mensajes) or 0
+
+
+def lotes(iterable, tamano: int):
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def procesar_recordatorios(
+    *,
+    hoy: date,
+    dias: int,
+    lote: int = 200,
+    correo: bool = False,
+    simular: bool = False,
+) -> dict[str, int]:
+    hasta = hoy + timedelta(days=dias)
+    resultado = {"evaluaciones": 0, "recordatorios": 0, "correos": 0}
+
+    for evaluacion_ids in lotes(list(_evaluaciones_candidatas(hoy, hasta)), lote):
+        resultado["evaluaciones"] += len(evaluacion_ids)
+        if simular:
+            recordatorios = calcular_recordatorios(evaluacion_ids, hoy, hasta)
+        else:
+            recordatorios = registrar_recordatorios(evaluacion_ids, hoy, hasta)
+        resultado["recordatorios"] += len(recordatorios)
+        if simular or not recordatorios:
+            continue
+        if correo:
+            resultado["correos"] += enviar_correos(recordatorios)
+
+    return resultado
@@ -0,0 +1,185 @@
+"""Mantenimiento de `ResumenNotasGrupo`.
+
+Cada calificación ajusta el acumulado de su evaluación (suma, cantidad,
+mínimo y máximo) en vez de recalcular los promedios de todas las entregas.
+Solo cuando se retira o cambia una nota que era el mínimo o el máximo hace
+falta volver a consultar las entregas de esa evaluación. El comando
+`reconstruir_resumen_notas` recalcula la tabla completa ante cualquier deriva.
+
+El ajuste se hace con señales de `EvaluacionEntregaAlumno`, así que cubre la
+vista de calificación, el admin y cualquier otro `save()`/`delete()`. La nota
+anterior se lee de la base en `pre_save`, bloqueando la fila si hay una
+transacción abierta: dos calificaciones simultáneas de la misma entrega no
+restan la misma nota dos veces. Las escrituras masivas (`update`,
+`bulk_create`) no emiten señales y deben ir seguidas de
+`reconstruir_resumenes()`.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .estadisticas import invalidar_estadisticas_notas
+from .models import EvaluacionEntregaAlumno, ResumenNotasGrupo
+
+
+# Marca de `pre_save` para los guardados que no tocan la nota ni la evaluación.
+_SIN_CAMBIOS = object()
+CAMPOS_RESUMEN = frozenset({"nota", "evaluacion", "evaluacion_id"})
+
+
+def _agregados(queryset):
+    return queryset.exclude(nota__isnull=True).aggregate(
+        suma=Sum("nota"),
+        cantidad=Count("nota"),
+        minima=Min("nota"),
+        maxima=Max("nota"),
+    )
+
+
+def recalcular_resumen(evaluacion_id: int) -> ResumenNotasGrupo:
+    """Recalcula desde cero el resumen de una evaluación."""
+
+    datos = _agregados(EvaluacionEntregaAlumno.objects.filter(evaluacion_id=evaluacion_id))
+    resumen, _ = ResumenNotasGrupo.objects.update_or_create(
+        evaluacion_id=evaluacion_id,
+        defaults={
+            "suma_notas": datos["suma"] or Decimal("0"),
+            "cantidad_notas": datos["cantidad"],
+            "nota_minima": datos["minima"],
+            "nota_maxima": datos["maxima"],
+        },
+    )
+    return resumen
+
+
+def _normalizar(nota) -> Decimal | None:
+    return EvaluacionEntregaAlumno._meta.get_field("nota").to_python(nota)
+
+
+def _aplicar_cambio(
+    evaluacion_id: int,
+    nota_anterior: Decimal | None,
+    nota_nueva: Decimal | None,
+    *,
+    crear: bool = True,
+) -> bool:
+    """Aplica al resumen de la evaluación el paso de una nota a otra.
+
+    Con `crear=False` (al retirar notas) no se crea un resumen que no existía.
+    Devuelve si hubo cambio.
+    """
+
+    nota_anterior, nota_nueva = _normalizar(nota_anterior), _normalizar(nota_nueva)
+    if nota_anterior == nota_nueva:
+        return False
+
+    with transaction.atomic():
+        resumen = (
+            ResumenNotasGrupo.objects.select_for_update()
+            .filter(evaluacion_id=evaluacion_id)
+            .first()
+        )
+        if resumen is None:
+            if crear:
+                # Primera nota de la evaluación (o tabla sin reconstruir): el
+                # agregado completo ya incluye la entrega recién guardada.
+                recalcular_resumen(evaluacion_id)
+            return True
+
+        if nota_anterior is not None and nota_anterior in (
+            resumen.nota_minima,
+            resumen.nota_maxima,
+        ):
+            recalcular_resumen(evaluacion_id)
+            return True
+
+        if nota_anterior is not None:
+            resumen.suma_notas -= nota_anterior
+            resumen.cantidad_notas -= 1
+        if nota_nueva is not None:
+            resumen.suma_notas += nota_nueva
+            resumen.cantidad_notas += 1
+            if resumen.nota_minima is None or nota_nueva < resumen.nota_minima:
+                resumen.nota_minima = nota_nueva
+            if resumen.nota_maxima is None or nota_nueva > resumen.nota_maxima:
+                resumen.nota_maxima = nota_nueva
+        resumen.save()
+    return True
+
+
+@receiver(pre_save, sender=EvaluacionEntregaAlumno, dispatch_uid="resumen_notas_pre_save")
+def _leer_nota_guardada(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not CAMPOS_RESUMEN & set(update_fields):
+        instance._nota_guardada = _SIN_CAMBIOS
+        return
+    if instance.pk is None:
+        instance._nota_guardada = None
+        return
+
+    filas = sender._default_manager.using(using).filter(pk=instance.pk)
+    if transaction.get_connection(using).in_atomic_block:
+        filas = filas.select_for_update()
+    instance._nota_guardada = filas.values_list("evaluacion_id", "nota").first()
+
+
+@receiver(post_save, sender=EvaluacionEntregaAlumno, dispatch_uid="resumen_notas_post_save")
+def _registrar_nota(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    guardada = instance.__dict__.pop("_nota_guardada", None)
+    if guardada is _SIN_CAMBIOS:
+        return
+
+    evaluacion_anterior, nota_anterior = guardada or (instance.evaluacion_id, None)
+    cambio = False
+    if evaluacion_anterior != instance.evaluacion_id:
+        # La entrega cambió de evaluación: su nota sale del resumen anterior.
+        cambio = _aplicar_cambio(evaluacion_anterior, nota_anterior, None, crear=False)
+        nota_anterior = None
+    if _aplicar_cambio(instance.evaluacion_id, nota_anterior, instance.nota) or cambio:
+        transaction.on_commit(invalidar_estadisticas_notas)
+
+
+@receiver(post_delete, sender=EvaluacionEntregaAlumno, dispatch_uid="resumen_notas_post_delete")
+def _retirar_nota(sender, instance, **kwargs):
+    if _aplicar_cambio(instance.evaluacion_id, instance.nota, None, crear=False):
+        transaction.on_commit(invalidar_estadisticas_notas)
+
+
+def reconstruir_resumenes(*, lote: int = 1000) -> int:
+    """Reemplaza la tabla con los agregados actuales; devuelve las filas creadas."""
+
+    filas = (
+        EvaluacionEntregaAlumno.objects.exclude(nota__isnull=True)
+        .values("evaluacion_id")
+        .annotate(
+            suma=Sum("nota"),
+            cantidad=Count("nota"),
+            minima=Min("nota"),
+            maxima=Max("nota"),
+        )
+        .order_by("evaluacion_id")
+    )
+    resumenes = [
+        ResumenNotasGrupo(
+            evaluacion_id=fila["evaluacion_id"],
+            suma_notas=fila["suma"],
+            cantidad_notas=fila["cantidad"],
+            nota_minima=fila["minima"],
+            nota_maxima=fila["maxima"],
+        )
+        for fila in filas.iterator()
+    ]
+
+    with transaction.atomic():
+        ResumenNotasGrupo.objects.all().delete()
+        ResumenNotasGrupo.objects.bulk_create(resumenes, batch_size=lote)
+    return len(resumenes)
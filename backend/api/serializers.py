@@ -1,10 +1,14 @@
 from math import ceil
-from datetime import timedelta
 from pathlib import Path
 from rest_framework import serializers
-import mimetypes
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import QuerySet
 from django.utils import timezone
 
+from .archivos import base_absoluta, nombre_archivo, tipo_archivo, url_archivo
+from .campos_dinamicos import CamposDinamicosMixin
+from .directorio_usuarios import directorio
 from .models import (
     Usuario,
     TemaDisponible,
@@ -21,6 +25,8 @@ from .models import (
     TrazabilidadReunion,
     EvaluacionGrupoDocente,
     EvaluacionEntregaAlumno,
+    SubidaEntregaParcial,
+    calcular_estado_evaluacion,
 )
 
 
@@ -72,32 +78,119 @@ def _procesar_correos_companeros(
     return correos_limpios
 
 
-def _obtener_proyecto_alumno(alumno: Usuario | None) -> str | None:
+def _obtener_proyectos_alumnos(alumno_ids) -> dict[int, str]:
+    """Título del proyecto/tema activo de cada alumno, en una sola consulta."""
+
+    alumnos = [
+        pk for pk, usuario in directorio.obtener_muchos(alumno_ids).items() if usuario["rol"] == "alumno"
+    ]
+    if not alumnos:
+        return {}
+
+    proyectos: dict[int, str] = {}
+    for alumno_id, titulo in (
+        InscripcionTema.objects.filter(alumno_id__in=alumnos, activo=True)
+        .order_by("alumno_id", "-created_at")
+        .values_list("alumno_id", "tema__titulo")
+    ):
+        # Si hay más de una inscripción activa, vale la más reciente.
+        proyectos.setdefault(alumno_id, titulo)
+    return proyectos
+
+
+def _obtener_proyecto_alumno(alumno_id: int | None) -> str | None:
     """Devuelve el título del proyecto/tema activo del alumno, si existe."""
 
-    if not alumno or alumno.rol != "alumno":
+    if alumno_id is None:
         return None
+    return _obtener_proyectos_alumnos([alumno_id]).get(alumno_id)
 
-    inscripcion = (
-        InscripcionTema.objects.filter(alumno=alumno, activo=True)
-        .select_related("tema")
-        .order_by("-created_at")
-        .first()
-    )
 
-    if inscripcion and getattr(inscripcion, "tema", None):
-        return inscripcion.tema.titulo
+def _proyecto_alumno_en_listado(serializer, instance) -> str | None:
+    """Como `_obtener_proyecto_alumno`, pero en un listado carga todas las filas juntas."""
 
-    return None
+    raiz = serializer.root
+    filas = getattr(raiz, "instance", None)
+    if raiz is serializer or not isinstance(filas, (list, QuerySet)):
+        return _obtener_proyecto_alumno(instance.alumno_id)
+
+    proyectos = raiz.__dict__.get("_proyectos_alumnos")
+    if proyectos is None:
+        proyectos = raiz.__dict__["_proyectos_alumnos"] = _obtener_proyectos_alumnos(
+            fila.alumno_id for fila in filas if isinstance(fila, type(instance))
+        )
+    return proyectos.get(instance.alumno_id)
+
+
+def _usuario_en_listado(serializer, instance, columna: str, *otras: str) -> dict | None:
+    """Resumen del usuario de `columna`; en un listado, la primera fila resuelve
+    juntos los ids de `columna` y `otras` de todas las filas."""
+
+    raiz = serializer.root
+    filas = getattr(raiz, "instance", None)
+    if raiz is not serializer and isinstance(filas, (list, QuerySet)):
+        precargadas = raiz.__dict__.setdefault("_usuarios_precargados", set())
+        if (type(instance), columna) not in precargadas:
+            columnas = (columna, *otras)
+            precargadas.update((type(instance), nombre) for nombre in columnas)
+            directorio.obtener_muchos(
+                getattr(fila, nombre)
+                for fila in filas
+                if isinstance(fila, type(instance))
+                for nombre in columnas
+            )
+    return directorio.obtener(getattr(instance, columna))
 
 
 class UsuarioResumenSerializer(serializers.ModelSerializer):
+    """Resumen de un usuario anidado por su FK.
+
+    Lee el id de la FK (sin cargar la relación) y toma el resumen de
+    `directorio_usuarios`; en un listado, los ids de todas las filas se
+    resuelven juntos la primera vez.
+    """
+
     nombre = serializers.CharField(source="nombre_completo")
 
     class Meta:
         model = Usuario
         fields = ["id", "nombre", "correo", "carrera", "telefono", "rol"]
 
+    def _columna_fk(self, instance) -> str | None:
+        if len(self.source_attrs) != 1 or not isinstance(instance, models.Model):
+            return None
+        try:
+            campo = instance._meta.get_field(self.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        return campo.attname if campo.many_to_one else None
+
+    def _precargar(self, instance, columna: str) -> None:
+        raiz = self.root
+        filas = getattr(raiz, "instance", None)
+        if raiz is self or not isinstance(filas, (list, QuerySet)):
+            return
+        precargadas = raiz.__dict__.setdefault("_usuarios_precargados", set())
+        clave = (type(instance), columna)
+        if clave in precargadas:
+            return
+        precargadas.add(clave)
+        directorio.obtener_muchos(
+            getattr(fila, columna) for fila in filas if isinstance(fila, type(instance))
+        )
+
+    def get_attribute(self, instance):
+        columna = self._columna_fk(instance)
+        if columna is None:
+            return super().get_attribute(instance)
+        self._precargar(instance, columna)
+        return getattr(instance, columna)
+
+    def to_representation(self, instance):
+        if isinstance(instance, Usuario):
+            return super().to_representation(instance)
+        return directorio.obtener(instance)
+
 
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -119,7 +212,7 @@ class LoginSerializer(serializers.Serializer):
         return attrs
 
 
-class TemaDisponibleSerializer(serializers.ModelSerializer):
+class TemaDisponibleSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(
         queryset=Usuario.objects.all(), required=False, allow_null=True
     )
@@ -159,46 +252,68 @@ class TemaDisponibleSerializer(serializers.ModelSerializer):
             "inscripcionesActivas",
         ]
         read_only_fields = ["id", "created_at"]
+        campos_resumen = [
+            "titulo",
+            "carrera",
+            "rama",
+            "cupos",
+            "docente_responsable",
+        ]
+        relaciones_campos = {
+            "created_by": ("creadoPor", "docenteACargo"),
+            "docente_responsable": ("docenteACargo",),
+            "inscripciones": ("cuposDisponibles", "tieneCupoPropio", "inscripcionesActivas"),
+        }
 
     def get_creado_por(self, obj):
-        usuario = obj.created_by
+        usuario = _usuario_en_listado(self, obj, "created_by_id", "docente_responsable_id")
         if not usuario:
             return None
 
         return {
-            "nombre": usuario.nombre_completo,
-            "rol": usuario.rol,
-            "carrera": usuario.carrera,
+            "nombre": usuario["nombre"],
+            "rol": usuario["rol"],
+            "carrera": usuario["carrera"],
         }
 
     def get_docente_a_cargo(self, obj):
-        docente = obj.docente_responsable
+        docente = _usuario_en_listado(self, obj, "docente_responsable_id", "created_by_id")
         if not docente:
-            docente = obj.created_by if obj.created_by and obj.created_by.rol == "docente" else None
+            creador = _usuario_en_listado(self, obj, "created_by_id", "docente_responsable_id")
+            docente = creador if creador and creador["rol"] == "docente" else None
         if not docente:
             return None
 
         return {
-            "nombre": docente.nombre_completo,
-            "rol": docente.rol,
-            "carrera": docente.carrera,
+            "nombre": docente["nombre"],
+            "rol": docente["rol"],
+            "carrera": docente["carrera"],
         }
 
     def get_cuposDisponibles(self, obj) -> int:
-        return obj.cupos_disponibles
+        activas = getattr(obj, "inscripciones_activas", None)
+        if activas is None:
+            return obj.cupos_disponibles
+        return max(obj.cupos - len(activas), 0)
 
     def get_tieneCupoPropio(self, obj) -> bool:
         alumno_id = self.context.get("alumno_id")
         if not alumno_id:
             return False
+        activas = getattr(obj, "inscripciones_activas", None)
+        if activas is not None:
+            return any(inscripcion.alumno_id == alumno_id for inscripcion in activas)
         return obj.inscripciones.filter(alumno_id=alumno_id, activo=True).exists()
 
     def get_inscripcionesActivas(self, obj):
-        activos = (
-            obj.inscripciones.filter(activo=True)
-            .select_related("alumno")
-            .order_by("created_at")
-        )
+        # El listado las precarga en `inscripciones_activas`.
+        activos = getattr(obj, "inscripciones_activas", None)
+        if activos is None:
+            activos = (
+                obj.inscripciones.filter(activo=True)
+                .select_related("alumno")
+                .order_by("created_at")
+            )
         resultado = []
         for inscripcion in activos:
             alumno = inscripcion.alumno
@@ -278,7 +393,7 @@ class SolicitudCartaPracticaCreateSerializer(serializers.Serializer):
         return attrs
 
 
-class SolicitudCartaPracticaSerializer(serializers.ModelSerializer):
+class SolicitudCartaPracticaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = SolicitudCartaPractica
         fields = [
@@ -309,20 +424,20 @@ class SolicitudCartaPracticaSerializer(serializers.ModelSerializer):
             "escuela_telefono",
             "meta",
         ]
+        campos_resumen = ["creadoEn", "estado", "url", "alumno"]
 
-    def to_representation(self, instance):
-        base = super().to_representation(instance)
+    def representar(self, instance):
+        base = super().representar(instance)
         request = self.context.get("request") if isinstance(self.context, dict) else None
 
         document_url = None
         if instance.documento:
-            url = instance.documento.url
-            document_url = request.build_absolute_uri(url) if request else url
+            document_url = url_archivo(instance.documento, request)
         else:
             url_documento = base.get("url_documento")
             if url_documento:
                 if request and str(url_documento).startswith("/"):
-                    document_url = request.build_absolute_uri(url_documento)
+                    document_url = base_absoluta(request) + str(url_documento)
                 else:
                     document_url = url_documento
 
@@ -382,11 +497,7 @@ class PracticaDocumentoSerializer(serializers.ModelSerializer):
 
     def get_url(self, obj: PracticaDocumento) -> str | None:
         request = self.context.get("request") if isinstance(self.context, dict) else None
-        if obj.archivo and hasattr(obj.archivo, "url"):
-            if request:
-                return request.build_absolute_uri(obj.archivo.url)
-            return obj.archivo.url
-        return None
+        return url_archivo(obj.archivo, request)
 
     def get_uploadedBy(self, obj: PracticaDocumento) -> dict | None:
         usuario = obj.uploaded_by
@@ -425,11 +536,7 @@ class PracticaFirmaCoordinadorSerializer(serializers.ModelSerializer):
 
     def get_url(self, obj: PracticaFirmaCoordinador) -> str | None:
         request = self.context.get("request") if isinstance(self.context, dict) else None
-        if obj.archivo and hasattr(obj.archivo, "url"):
-            if request:
-                return request.build_absolute_uri(obj.archivo.url)
-            return obj.archivo.url
-        return None
+        return url_archivo(obj.archivo, request)
 
     def get_uploadedBy(self, obj: PracticaFirmaCoordinador) -> dict | None:
         usuario = obj.uploaded_by
@@ -461,11 +568,7 @@ class PracticaEvaluacionSerializer(serializers.ModelSerializer):
 
     def get_url(self, obj: PracticaEvaluacion) -> str | None:
         request = self.context.get("request") if isinstance(self.context, dict) else None
-        if obj.archivo and hasattr(obj.archivo, "url"):
-            if request:
-                return request.build_absolute_uri(obj.archivo.url)
-            return obj.archivo.url
-        return None
+        return url_archivo(obj.archivo, request)
 
     def get_uploadedBy(self, obj: PracticaEvaluacion) -> dict | None:
         usuario = obj.uploaded_by
@@ -498,16 +601,10 @@ class PracticaEvaluacionEntregaSerializer(serializers.ModelSerializer):
 
     def get_archivo_url(self, obj: PracticaEvaluacionEntrega) -> str | None:
         request = self.context.get("request") if isinstance(self.context, dict) else None
-        if obj.archivo and hasattr(obj.archivo, "url"):
-            if request:
-                return request.build_absolute_uri(obj.archivo.url)
-            return obj.archivo.url
-        return None
+        return url_archivo(obj.archivo, request)
 
     def get_archivo_nombre(self, obj: PracticaEvaluacionEntrega) -> str:
-        if not obj.archivo:
-            return ""
-        return Path(obj.archivo.name).name
+        return nombre_archivo(obj, "archivo")
 
 
 class PracticaEvaluacionEntregaCoordinacionSerializer(serializers.ModelSerializer):
@@ -533,30 +630,15 @@ class PracticaEvaluacionEntregaCoordinacionSerializer(serializers.ModelSerialize
 
     def get_archivo_url(self, obj: PracticaEvaluacionEntrega) -> str | None:
         request = self.context.get("request") if isinstance(self.context, dict) else None
-        if obj.archivo and hasattr(obj.archivo, "url"):
-            if request:
-                return request.build_absolute_uri(obj.archivo.url)
-            return obj.archivo.url
-        return None
+        return url_archivo(obj.archivo, request)
 
     def get_archivo_nombre(self, obj: PracticaEvaluacionEntrega) -> str:
-        if not obj.archivo:
-            return ""
-        return Path(obj.archivo.name).name
+        return nombre_archivo(obj, "archivo")
 
     def get_empresa(self, obj: PracticaEvaluacionEntrega) -> str:
-        empresa = getattr(obj, "empresa", "") or ""
-        if empresa:
-            return empresa
-        ultima_solicitud = (
-            SolicitudCartaPractica.objects.filter(alumno=obj.alumno)
-            .order_by("-creado_en")
-            .only("dest_empresa")
-            .first()
-        )
-        if ultima_solicitud and ultima_solicitud.dest_empresa:
-            return ultima_solicitud.dest_empresa
-        return ""
+        # La vista asigna `empresa` para todas las entregas en una consulta.
+        return getattr(obj, "empresa", "") or ""
+
 class TrazabilidadReunionSerializer(serializers.ModelSerializer):
     usuario = UsuarioResumenSerializer(read_only=True)
 
@@ -614,7 +696,7 @@ class SolicitudReunionSerializer(serializers.ModelSerializer):
             "estado": base["estado"],
             "motivo": base["motivo"],
             "disponibilidadSugerida": base.get("disponibilidad_sugerida"),
-            "proyectoNombre": _obtener_proyecto_alumno(instance.alumno),
+            "proyectoNombre": _proyecto_alumno_en_listado(self, instance),
             "creadoEn": instance.creado_en.isoformat(),
             "actualizadoEn": instance.actualizado_en.isoformat(),
             "alumno": base.get("alumno"),
@@ -645,7 +727,7 @@ class RechazarSolicitudReunionSerializer(serializers.Serializer):
     comentario = serializers.CharField(required=False, allow_blank=True, allow_null=True)
 
 
-class ReunionSerializer(serializers.ModelSerializer):
+class ReunionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     alumno = UsuarioResumenSerializer(read_only=True)
     docente = UsuarioResumenSerializer(read_only=True)
     trazabilidad = TrazabilidadReunionSerializer(many=True, read_only=True)
@@ -668,9 +750,27 @@ class ReunionSerializer(serializers.ModelSerializer):
             "actualizado_en",
             "trazabilidad",
         ]
+        campos_resumen = [
+            "estado",
+            "fecha",
+            "horaInicio",
+            "horaTermino",
+            "modalidad",
+            "alumno",
+            "docente",
+        ]
+        relaciones_campos = {
+            "alumno": ("alumno", "proyectoNombre"),
+            "docente": ("docente",),
+            "solicitud": ("solicitudId",),
+            "trazabilidad": ("trazabilidad",),
+        }
 
-    def to_representation(self, instance):
-        base = super().to_representation(instance)
+    def representar(self, instance):
+        base = super().representar(instance)
+        proyecto = None
+        if self.incluye_campo("proyectoNombre"):
+            proyecto = _proyecto_alumno_en_listado(self, instance)
         return {
             "id": base["id"],
             "estado": base["estado"],
@@ -680,7 +780,7 @@ class ReunionSerializer(serializers.ModelSerializer):
             "horaInicio": instance.hora_inicio.isoformat(),
             "horaTermino": instance.hora_termino.isoformat(),
             "modalidad": base["modalidad"],
-            "proyectoNombre": _obtener_proyecto_alumno(instance.alumno),
+            "proyectoNombre": proyecto,
             "creadoEn": instance.creado_en.isoformat(),
             "actualizadoEn": instance.actualizado_en.isoformat(),
             "alumno": base.get("alumno"),
@@ -1119,56 +1219,45 @@ class EvaluacionEntregaAlumnoSerializer(serializers.ModelSerializer):
         return value
 
     def get_alumno(self, obj: EvaluacionEntregaAlumno):
-        alumno = obj.alumno
+        if EvaluacionEntregaAlumno.alumno.is_cached(obj):
+            # Los listados ya traen al alumno con `select_related`.
+            usuario = obj.alumno
+            alumno = usuario and {
+                "id": usuario.id,
+                "nombre": usuario.nombre_completo,
+                "correo": usuario.correo,
+            }
+        else:
+            alumno = _usuario_en_listado(self, obj, "alumno_id")
         if not alumno:
             return None
         return {
-            "id": alumno.id,
-            "nombre": alumno.nombre_completo,
-            "correo": alumno.correo,
+            "id": alumno["id"],
+            "nombre": alumno["nombre"],
+            "correo": alumno["correo"],
         }
 
     def get_archivo_url(self, obj: EvaluacionEntregaAlumno) -> str | None:
-        if not obj.archivo:
-            return None
-        request = self.context.get("request") if isinstance(self.context, dict) else None
-        url = obj.archivo.url
-        if request:
-            return request.build_absolute_uri(url)
-        return url
+        return self._get_file_url(obj.archivo)
 
     def get_archivo_tipo(self, obj: EvaluacionEntregaAlumno) -> str | None:
-        if not obj.archivo:
-            return None
-        tipo, _ = mimetypes.guess_type(obj.archivo.name)
-        return tipo or "application/octet-stream"
+        return tipo_archivo(obj, "archivo")
 
     def get_rubrica_docente_url(self, obj: EvaluacionEntregaAlumno) -> str | None:
         return self._get_file_url(obj.rubrica_docente)
 
     def get_rubrica_docente_tipo(self, obj: EvaluacionEntregaAlumno) -> str | None:
-        return self._get_file_tipo(obj.rubrica_docente)
+        return tipo_archivo(obj, "rubrica_docente")
 
     def get_informe_corregido_url(self, obj: EvaluacionEntregaAlumno) -> str | None:
         return self._get_file_url(obj.informe_corregido)
 
     def get_informe_corregido_tipo(self, obj: EvaluacionEntregaAlumno) -> str | None:
-        return self._get_file_tipo(obj.informe_corregido)
+        return tipo_archivo(obj, "informe_corregido")
 
     def _get_file_url(self, archivo) -> str | None:
-        if not archivo:
-            return None
         request = self.context.get("request") if isinstance(self.context, dict) else None
-        url = archivo.url
-        if request:
-            return request.build_absolute_uri(url)
-        return url
-
-    def _get_file_tipo(self, archivo) -> str | None:
-        if not archivo:
-            return None
-        tipo, _ = mimetypes.guess_type(archivo.name)
-        return tipo or "application/octet-stream"
+        return url_archivo(archivo, request)
 
 
 class DocenteEvaluacionEntregaUpdateSerializer(EvaluacionEntregaAlumnoSerializer):
@@ -1207,7 +1296,47 @@ class DocenteEvaluacionEntregaUpdateSerializer(EvaluacionEntregaAlumnoSerializer
         ]
 
 
-class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
+class SubidaEntregaParcialCreateSerializer(serializers.Serializer):
+    nombre = serializers.CharField(max_length=255)
+    tamano = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$")
+    titulo = serializers.CharField(max_length=180, required=False, allow_blank=True)
+    comentario = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    bitacora_indice = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_nombre(self, value: str) -> str:
+        nombre = Path(value).name.strip()
+        if not nombre:
+            raise serializers.ValidationError("Debes indicar el nombre del archivo.")
+        return nombre
+
+    def validate_tamano(self, value: int) -> int:
+        limite_mb = EvaluacionEntregaAlumnoSerializer.MAX_ARCHIVO_MB
+        if value > limite_mb * 1024 * 1024:
+            raise serializers.ValidationError(
+                f"El archivo supera el tamaño máximo permitido de {limite_mb} MB."
+            )
+        return value
+
+    def validate_sha256(self, value: str) -> str:
+        return value.lower()
+
+
+class SubidaEntregaParcialSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SubidaEntregaParcial
+        fields = [
+            "token",
+            "campo",
+            "nombre_archivo",
+            "tamano_total",
+            "recibido",
+            "expira_en",
+        ]
+        read_only_fields = fields
+
+
+class EvaluacionGrupoDocenteSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     docente = serializers.PrimaryKeyRelatedField(
         queryset=Usuario.objects.filter(rol="docente"),
         required=False,
@@ -1219,6 +1348,7 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
         allow_null=False,
     )
     fecha = serializers.DateField(required=False, allow_null=True)
+    estado = serializers.SerializerMethodField()
     grupo = serializers.SerializerMethodField()
     entregas = serializers.SerializerMethodField()
     ultima_entrega = serializers.SerializerMethodField()
@@ -1264,6 +1394,18 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
             "ultima_entrega",
             "bitacoras_programadas",
         ]
+        campos_resumen = [
+            "docente",
+            "tema",
+            "grupo_nombre",
+            "titulo",
+            "fecha",
+            "estado",
+        ]
+        relaciones_campos = {
+            "tema": ("grupo",),
+            "entregas": ("entregas", "ultima_entrega", "bitacoras_programadas"),
+        }
 
     def validate_docente(self, docente: Usuario | None) -> Usuario | None:
         if docente and docente.rol != "docente":
@@ -1378,10 +1520,8 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
         return max(semanas - 1, 0)
 
     def get_bitacoras_programadas(self, obj: EvaluacionGrupoDocente):
-        fecha_limite = obj.fecha
-        total = obj.bitacoras_requeridas or 0
-
-        if not fecha_limite or total <= 0:
+        fechas = obj.fechas_bitacoras()
+        if not fechas:
             return []
 
         bitacoras = []
@@ -1395,20 +1535,14 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
             if indice not in entregas_bitacora:
                 entregas_bitacora[indice] = entrega
 
-        for indice in range(1, total + 1):
-            semanas_restantes = total - indice + 1
-            fecha = fecha_limite - timedelta(weeks=semanas_restantes)
-
+        for indice, fecha in fechas:
             entrega = entregas_bitacora.get(indice)
             estado = "pendiente"
             entrega_data = None
 
             if entrega:
                 estado = "calificada" if entrega.estado_revision == "revisada" else "entregada"
-                entrega_serializer = EvaluacionEntregaAlumnoSerializer(
-                    entrega, context=self.context
-                )
-                entrega_data = entrega_serializer.data
+                entrega_data = self._serializar_entrega(entrega)
 
             bitacoras.append(
                 {
@@ -1423,6 +1557,14 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
 
         return bitacoras
 
+    def get_estado(self, obj: EvaluacionGrupoDocente) -> str:
+        # El estado guardado solo se recalcula al guardar o en el refresco
+        # diario; la respuesta lo deriva de la fecha para no depender de eso.
+        hoy = timezone.localdate()
+        if isinstance(self.context, dict):
+            hoy = self.context.setdefault("_hoy", hoy)
+        return calcular_estado_evaluacion(obj.fecha, hoy)
+
     def get_grupo(self, obj):
         tema = obj.tema
         if not tema:
@@ -1450,34 +1592,18 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
 
     def get_entregas(self, obj):
         entregas = self._obtener_entregas_prefetch(obj)
-        if not entregas:
-            return []
-        serializer = EvaluacionEntregaAlumnoSerializer(
-            entregas,
-            many=True,
-            context=self.context,
-        )
-        return serializer.data
+        return [self._serializar_entrega(entrega) for entrega in entregas]
 
     def get_ultima_entrega(self, obj):
         entregas = self._obtener_entregas_prefetch(obj)
-        entregas_formales = [e for e in entregas if not getattr(e, "es_bitacora", False)]
-        if not entregas_formales:
-            return None
-        serializer = EvaluacionEntregaAlumnoSerializer(
-            entregas_formales[0],
-            context=self.context,
-        )
-        return serializer.data
+        for entrega in entregas:
+            if not getattr(entrega, "es_bitacora", False):
+                return self._serializar_entrega(entrega)
+        return None
 
     def get_rubrica_url(self, obj: EvaluacionGrupoDocente) -> str | None:
-        if not obj.rubrica:
-            return None
         request = self.context.get("request") if isinstance(self.context, dict) else None
-        url = obj.rubrica.url
-        if request:
-            return request.build_absolute_uri(url)
-        return url
+        return url_archivo(obj.rubrica, request)
 
     def get_rubrica_nombre(self, obj: EvaluacionGrupoDocente) -> str | None:
         if not obj.rubrica:
@@ -1485,10 +1611,7 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
         return obj.rubrica_nombre or None
 
     def get_rubrica_tipo(self, obj: EvaluacionGrupoDocente) -> str | None:
-        if not obj.rubrica:
-            return None
-        tipo, _ = mimetypes.guess_type(obj.rubrica.name)
-        return tipo or "application/octet-stream"
+        return tipo_archivo(obj, "rubrica")
 
     def _obtener_entregas_prefetch(self, obj):
         entregas = getattr(obj, "entregas_prefetch", None)
@@ -1498,8 +1621,32 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
             entregas = list(
                 obj.entregas.select_related("alumno").order_by("-creado_en")
             )
+            # Sin prefetch, los tres campos de entregas comparten la misma consulta.
+            obj.entregas_prefetch = entregas
         return entregas
 
+    def _serializar_entrega(self, entrega: EvaluacionEntregaAlumno) -> dict:
+        """Serializa cada entrega una sola vez por request.
+
+        `entregas`, `ultima_entrega` y `bitacoras_programadas` devuelven el
+        mismo diccionario para una entrega; el memo vive en el contexto, que
+        comparten todas las evaluaciones de un listado.
+        """
+
+        if not isinstance(self.context, dict):
+            return EvaluacionEntregaAlumnoSerializer(entrega, context=self.context).data
+
+        memo = self.context.setdefault("_entregas_serializadas", {})
+        datos = memo.get(entrega.pk)
+        if datos is None:
+            serializador = self.context.get("_serializador_entregas")
+            if serializador is None:
+                serializador = EvaluacionEntregaAlumnoSerializer(context=self.context)
+                self.context["_serializador_entregas"] = serializador
+            datos = serializador.to_representation(entrega)
+            memo[entrega.pk] = datos
+        return datos
+
     def _tema_pertenece_a_docente(self, tema: TemaDisponible, docente: Usuario) -> bool:
         return (
             tema.docente_responsable_id == docente.id
@@ -1508,9 +1655,17 @@ class EvaluacionGrupoDocenteSerializer(serializers.ModelSerializer):
 
 class PromedioGrupoTituloSerializer(serializers.ModelSerializer):
     promedio = serializers.DecimalField(
-        source="promedio_nota", max_digits=4, decimal_places=2, read_only=True
+        source="resumen_notas.promedio", max_digits=4, decimal_places=2, read_only=True
+    )
+    cantidad_entregas = serializers.IntegerField(
+        source="resumen_notas.cantidad_notas", read_only=True
+    )
+    nota_minima = serializers.DecimalField(
+        source="resumen_notas.nota_minima", max_digits=4, decimal_places=2, read_only=True
+    )
+    nota_maxima = serializers.DecimalField(
+        source="resumen_notas.nota_maxima", max_digits=4, decimal_places=2, read_only=True
     )
-    cantidad_entregas = serializers.IntegerField(read_only=True)
     docente_nombre = serializers.SerializerMethodField()
     grupo = serializers.SerializerMethodField()
 
@@ -1524,6 +1679,8 @@ class PromedioGrupoTituloSerializer(serializers.ModelSerializer):
             "docente_nombre",
             "promedio",
             "cantidad_entregas",
+            "nota_minima",
+            "nota_maxima",
             "grupo",
         ]
         read_only_fields = fields
@@ -0,0 +1,211 @@
+"""Cargas reanudables por fragmentos para los archivos de entregas.
+
+El cliente inicia una sesión declarando nombre, tamaño y SHA-256 del archivo,
+envía fragmentos con `PUT` indicando el desplazamiento y, al finalizar, el
+archivo armado se verifica y se mueve al almacenamiento del `FileField`
+correspondiente sin volver a copiarlo. Si la conexión se corta, la sesión
+informa cuántos bytes llegaron para continuar desde ahí.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import SubidaEntregaParcial
+
+
+logger = logging.getLogger(__name__)
+
+
+TAMANO_BLOQUE = 64 * 1024
+
+
+class SubidaError(Exception):
+    """Error de protocolo en una carga por fragmentos."""
+
+    def __init__(self, mensaje: str, *, codigo: int = 400) -> None:
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+        self.codigo = codigo
+
+
+class _ArchivoParcial(File):
+    """Permite que `FileSystemStorage` mueva el archivo en vez de copiarlo."""
+
+    def __init__(self, ruta: Path, nombre: str, sha256: str) -> None:
+        super().__init__(open(ruta, "rb"), name=nombre)
+        self._ruta = ruta
+        # Ya verificado; `ArchivoConMetadatosField` no necesita recalcularlo.
+        self.sha256 = sha256
+
+    def temporary_file_path(self) -> str:
+        return str(self._ruta)
+
+
+def expiracion() -> timedelta:
+    return timedelta(hours=getattr(settings, "SUBIDAS_EXPIRACION_HORAS", 24))
+
+
+def tamano_maximo_fragmento() -> int:
+    return getattr(settings, "SUBIDAS_FRAGMENTO_MAX_BYTES", 8 * 1024 * 1024)
+
+
+def directorio_parciales() -> Path:
+    # Por defecto junto a MEDIA_ROOT para que finalizar sea un simple rename;
+    # `servir_media` no expone rutas que comiencen con punto.
+    directorio = getattr(settings, "SUBIDAS_PARCIALES_DIR", None)
+    return Path(directorio or Path(settings.MEDIA_ROOT) / ".parciales")
+
+
+def ruta_parcial(subida: SubidaEntregaParcial) -> Path:
+    return directorio_parciales() / f"{subida.token.hex}.part"
+
+
+def iniciar_subida(**campos) -> SubidaEntregaParcial:
+    subida = SubidaEntregaParcial.objects.create(
+        expira_en=timezone.now() + expiracion(),
+        **campos,
+    )
+    ruta = ruta_parcial(subida)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.touch()
+    return subida
+
+
+def escribir_fragmento(token, desplazamiento: int, origen, longitud: int) -> SubidaEntregaParcial:
+    """Escribe `longitud` bytes leídos de `origen` a partir de `desplazamiento`.
+
+    Solo se acepta el desplazamiento igual a lo ya recibido, de modo que los
+    reintentos de un fragmento confirmado responden 409 con el valor actual.
+    Si la lectura se interrumpe, se registra lo que alcanzó a escribirse.
+    """
+
+    if longitud <= 0:
+        raise SubidaError("El fragmento está vacío.")
+    if longitud > tamano_maximo_fragmento():
+        raise SubidaError("El fragmento excede el tamaño permitido.", codigo=413)
+
+    with transaction.atomic():
+        subida = SubidaEntregaParcial.objects.select_for_update().filter(token=token).first()
+        if subida is None or subida.expira_en <= timezone.now():
+            raise SubidaError("La carga no existe o expiró.", codigo=404)
+        if desplazamiento != subida.recibido:
+            raise SubidaError(
+                f"El desplazamiento esperado es {subida.recibido}.", codigo=409
+            )
+        if desplazamiento + longitud > subida.tamano_total:
+            raise SubidaError("El fragmento excede el tamaño declarado del archivo.")
+
+        escritos = 0
+        interrumpida = False
+        try:
+            with open(ruta_parcial(subida), "r+b") as destino:
+                destino.seek(desplazamiento)
+                destino.truncate()
+                while escritos < longitud:
+                    try:
+                        bloque = origen.read(min(TAMANO_BLOQUE, longitud - escritos))
+                    except OSError:
+                        # `UnreadablePostError`: el cliente cortó la conexión.
+                        interrumpida = True
+                        break
+                    if not bloque:
+                        break
+                    destino.write(bloque)
+                    escritos += len(bloque)
+        except FileNotFoundError as exc:
+            raise SubidaError("La carga no existe o expiró.", codigo=404) from exc
+
+        if escritos:
+            subida.recibido = desplazamiento + escritos
+            subida.expira_en = timezone.now() + expiracion()
+            subida.save(update_fields=["recibido", "expira_en", "actualizado_en"])
+
+    if interrumpida:
+        raise SubidaError(
+            f"El fragmento llegó incompleto; continúa desde {subida.recibido}."
+        )
+    return subida
+
+
+def calcular_sha256(ruta: Path) -> str:
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def abrir_archivo_finalizado(subida: SubidaEntregaParcial) -> File:
+    """Verifica la carga completa y devuelve el archivo listo para `FieldFile.save`.
+
+    Una suma que no coincide invalida la sesión completa: no hay forma de saber
+    qué fragmento se corrompió, así que el cliente debe comenzar de nuevo.
+    """
+
+    if not subida.completa:
+        raise SubidaError(
+            f"Faltan bytes por recibir ({subida.recibido}/{subida.tamano_total}).",
+            codigo=409,
+        )
+
+    ruta = ruta_parcial(subida)
+    try:
+        coincide = calcular_sha256(ruta) == subida.sha256
+    except FileNotFoundError as exc:
+        raise SubidaError("La carga no existe o expiró.", codigo=404) from exc
+
+    if not coincide:
+        descartar_subida(subida)
+        raise SubidaError("La suma SHA-256 del archivo no coincide con la declarada.")
+
+    return _ArchivoParcial(ruta, subida.nombre_archivo, subida.sha256)
+
+
+def descartar_subida(subida: SubidaEntregaParcial) -> None:
+    try:
+        ruta_parcial(subida).unlink()
+    except FileNotFoundError:
+        pass
+    if subida.pk:
+        subida.delete()
+
+
+def limpiar_subidas_expiradas(ahora=None) -> int:
+    """Elimina las sesiones vencidas y los parciales huérfanos en disco."""
+
+    ahora = ahora or timezone.now()
+    eliminadas = 0
+    for subida in SubidaEntregaParcial.objects.filter(expira_en__lte=ahora).iterator():
+        descartar_subida(subida)
+        eliminadas += 1
+
+    directorio = directorio_parciales()
+    if not directorio.is_dir():
+        return eliminadas
+
+    limite = time.time() - expiracion().total_seconds()
+    vigentes = {
+        token.hex
+        for token in SubidaEntregaParcial.objects.values_list("token", flat=True)
+    }
+    for ruta in directorio.glob("*.part"):
+        if ruta.stem in vigentes:
+            continue
+        try:
+            if ruta.stat().st_mtime < limite:
+                os.unlink(ruta)
+                eliminadas += 1
+        except OSError:
+            logger.warning("No se pudo eliminar el parcial huérfano %s", ruta)
+    return eliminadas
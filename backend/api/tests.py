@@ -1,9 +1,56 @@
+import hashlib
+import io
 import json
+import os
+import re
+import tempfile
+import zipfile
+import numpy as np
+import threading
+import time
+from collections import Counter
 from datetime import date, timedelta
-
+from decimal import Decimal
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import HttpRequest
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.utils import timezone
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from rest_framework.request import Request
+
+from . import (
+    archivos,
+    cache_lecturas,
+    consultas_lentas,
+    conteos,
+    estadisticas,
+    limites_login,
+    metricas,
+    perfilado,
+)
+from .almacenamiento import AlmacenamientoDeduplicado
+from .autenticacion import emitir_token
+from .directorio_usuarios import CLAVE_VERSION, DirectorioUsuarios, directorio
+from .estadisticas import bordes_histograma, estadisticas_por_grupo
+from .serializers import (
+    EvaluacionEntregaAlumnoSerializer,
+    EvaluacionGrupoDocenteSerializer,
+    ReunionSerializer,
+    TemaDisponibleSerializer,
+)
+from .firmas_remotas import CacheFirmasRemotas, FirmaRemotaError
 
 from .models import (
     PropuestaTema,
@@ -12,9 +59,26 @@ from .models import (
     Notificacion,
     InscripcionTema,
     SolicitudReunion,
+    SolicitudCartaPractica,
+    Reunion,
+    EvaluacionGrupoDocente,
+    EvaluacionEntregaAlumno,
+    SubidaEntregaParcial,
+    ResumenNotasGrupo,
+    PracticaEvaluacion,
+    PracticaEvaluacionEntrega,
+    PracticaDocumento,
+    RecordatorioEnviado,
+    TrazabilidadReunion,
 )
 
 
+def _autenticar(cliente, usuario) -> None:
+    """Envía el token firmado de `usuario` en los siguientes requests del cliente."""
+
+    cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {emitir_token(usuario)}")
+
+
 class TemaDisponibleAPITestCase(APITestCase):
     def setUp(self):
         self.list_url = reverse("temas-disponibles")
@@ -69,6 +133,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             "created_by": self.usuario.pk,
         }
 
+        _autenticar(self.client, self.usuario)
         response = self.client.post(self.list_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -100,6 +165,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             "objetivo": "Objetivo docente",
         }
 
+        _autenticar(self.client, self.usuario)
         response = self.client.post(self.list_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -143,6 +209,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             "created_by": alumno.pk,
         }
 
+        _autenticar(self.client, alumno)
         response = self.client.post(self.list_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -219,6 +286,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             created_by=self.usuario,
         )
 
+        _autenticar(self.client, self.usuario)
         response = self.client.get(self.list_url, {"usuario": self.usuario.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -278,6 +346,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             contrasena="clave",
         )
 
+        _autenticar(self.client, alumno)
         response = self.client.get(self.list_url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -303,6 +372,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             contrasena="clave",
         )
 
+        _autenticar(self.client, alumno)
         response = self.client.get(self.list_url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -382,6 +452,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             contrasena="clave",
         )
 
+        _autenticar(self.client, alumno)
         response = self.client.get(self.list_url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -403,6 +474,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             cupos=2,
         )
 
+        _autenticar(self.client, self.usuario)
         response = self.client.get(
             self.list_url, {"usuario": self.usuario.pk}, format="json"
         )
@@ -428,6 +500,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             contrasena="clave",
         )
 
+        _autenticar(self.client, alumno)
         response = self.client.get(self.list_url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -451,6 +524,7 @@ class TemaDisponibleAPITestCase(APITestCase):
             contrasena="clave",
         )
 
+        _autenticar(self.client, docente)
         response = self.client.get(self.list_url, {"usuario": docente.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -467,6 +541,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
 
         detail_url = reverse("tema-detalle", args=[tema.pk])
+        _autenticar(self.client, self.usuario)
         response = self.client.get(detail_url, {"usuario": self.usuario.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -494,6 +569,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
 
         detail_url = reverse("tema-detalle", args=[tema.pk])
+        _autenticar(self.client, usuario)
         response = self.client.get(detail_url, {"usuario": usuario.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -521,6 +597,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
 
         detail_url = reverse("tema-detalle", args=[tema.pk])
+        _autenticar(self.client, otro)
         response = self.client.get(detail_url, {"usuario": otro.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -566,6 +643,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         InscripcionTema.objects.create(tema=tema, alumno=alumno)
 
         detail_url = reverse("tema-detalle", args=[tema.pk])
+        _autenticar(self.client, self.usuario)
         response = self.client.get(detail_url, {"usuario": self.usuario.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -584,6 +662,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
 
         url = reverse("tema-reservar", args=[tema.pk])
+        _autenticar(self.client, alumno)
         response = self.client.post(url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -612,6 +691,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
 
         url = reverse("tema-reservar", args=[tema.pk])
+        _autenticar(self.client, alumno)
         response = self.client.post(url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -640,6 +720,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
 
         url = reverse("tema-reservar", args=[tema.pk])
+        _autenticar(self.client, alumno)
         response = self.client.post(url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -661,6 +742,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         InscripcionTema.objects.create(tema=tema, alumno=alumno)
 
         url = reverse("tema-reservar", args=[tema.pk])
+        _autenticar(self.client, otro)
         response = self.client.post(url, {"alumno": otro.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -676,6 +758,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
         InscripcionTema.objects.create(tema=tema, alumno=alumno)
 
+        _autenticar(self.client, alumno)
         response = self.client.get(self.list_url, {"alumno": alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -721,6 +804,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         )
 
         url = reverse("tema-companeros", args=[tema.pk])
+        _autenticar(self.client, alumno)
         self.client.post(reverse("tema-reservar", args=[tema.pk]), {"alumno": alumno.pk}, format="json")
 
         payload = {"alumno": alumno.pk, "correos": [companero1.correo, companero2.correo]}
@@ -744,6 +828,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         InscripcionTema.objects.create(tema=tema, alumno=alumno, es_responsable=True)
 
         url = reverse("tema-companeros", args=[tema.pk])
+        _autenticar(self.client, alumno)
         response = self.client.post(url, {"alumno": alumno.pk, "correos": ["no-existe@example.com"]}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -769,6 +854,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         InscripcionTema.objects.create(tema=tema, alumno=alumno, es_responsable=True)
 
         url = reverse("tema-companeros", args=[tema.pk])
+        _autenticar(self.client, alumno)
         response = self.client.post(
             url,
             {"alumno": alumno.pk, "correos": [companero1.correo, companero2.correo]},
@@ -794,6 +880,7 @@ class TemaDisponibleAPITestCase(APITestCase):
         InscripcionTema.objects.create(tema=tema, alumno=otro, es_responsable=False)
 
         url = reverse("tema-companeros", args=[tema.pk])
+        _autenticar(self.client, otro)
         response = self.client.post(url, {"alumno": otro.pk, "correos": []}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -934,6 +1021,7 @@ class PropuestaTemaListViewTests(APITestCase):
             preferencias_docentes=[self.docente_principal.id, self.docente_aux.id],
         )
 
+        _autenticar(self.client, self.docente_principal)
         response = self.client.get(self.url, {"docente": self.docente_principal.id})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -951,6 +1039,7 @@ class PropuestaTemaListViewTests(APITestCase):
             preferencias_docentes=[{"id": self.docente_principal.id}],
         )
 
+        _autenticar(self.client, self.docente_principal)
         response = self.client.get(self.url, {"docente": self.docente_principal.id})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -967,6 +1056,7 @@ class PropuestaTemaListViewTests(APITestCase):
             preferencias_docentes=json.dumps([{ "id": self.docente_principal.id }]),
         )
 
+        _autenticar(self.client, self.docente_principal)
         response = self.client.get(self.url, {"docente": self.docente_principal.id})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1248,6 +1338,7 @@ class ReservaTemaNotificationTests(APITestCase):
         self.url = reverse("tema-reservar", args=[self.tema.pk])
 
     def test_notifica_docente_y_alumno_al_reservar(self):
+        _autenticar(self.client, self.alumno)
         response = self.client.post(self.url, {"alumno": self.alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1276,6 +1367,7 @@ class ReservaTemaNotificationTests(APITestCase):
         )
         url = reverse("tema-reservar", args=[tema.pk])
 
+        _autenticar(self.client, self.alumno)
         response = self.client.post(url, {"alumno": self.alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1302,6 +1394,7 @@ class ReservaTemaNotificationTests(APITestCase):
         )
         url = reverse("tema-reservar", args=[tema.pk])
 
+        _autenticar(self.client, self.alumno)
         response = self.client.post(url, {"alumno": self.alumno.pk}, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1432,6 +1525,7 @@ class ReunionesAPITestCase(APITestCase):
             "disponibilidadSugerida": "Lunes 10:00",
         }
 
+        _autenticar(self.client, alumno)
         response = self.client.post(self.solicitudes_url, payload, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -1462,6 +1556,7 @@ class ReunionesAPITestCase(APITestCase):
             motivo="Dudas",
         )
 
+        _autenticar(self.client, self.docente)
         response = self.client.get(self.solicitudes_url, {"docente": self.docente.pk})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1474,6 +1569,7 @@ class ReunionesAPITestCase(APITestCase):
         alumno = self._crear_alumno(3)
 
         payload = {"alumno": alumno.pk, "motivo": "Necesito ayuda"}
+        _autenticar(self.client, alumno)
         response = self.client.post(self.solicitudes_url, payload, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1502,6 +1598,7 @@ class ReunionesAPITestCase(APITestCase):
             "comentario": "Revisión rápida",
         }
 
+        _autenticar(self.client, self.docente)
         response = self.client.post(
             reverse("aprobar-solicitud-reunion", args=[solicitud.pk]),
             payload,
@@ -1534,6 +1631,7 @@ class ReunionesAPITestCase(APITestCase):
 
         payload = {"docente": self.docente.pk, "comentario": "No disponible"}
 
+        _autenticar(self.client, self.docente)
         response = self.client.post(
             reverse("rechazar-solicitud-reunion", args=[solicitud.pk]),
             payload,
@@ -1549,4 +1647,2593 @@ class ReunionesAPITestCase(APITestCase):
         ) for notif in Notificacion.objects.all()}
 
         self.assertIn((alumno.id, "solicitud_rechazada"), eventos)
-        self.assertIn((self.docente.id, "solicitud_rechazada_docente"), eventos)
\ No newline at end of file
+        self.assertIn((self.docente.id, "solicitud_rechazada_docente"), eventos)
+
+
+class ConteoSolicitudesCartaTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("listar-solicitudes-carta-practica")
+        for indice in range(3):
+            self._crear_solicitud(indice)
+
+    def _crear_solicitud(self, indice: int, estado: str = "pendiente") -> SolicitudCartaPractica:
+        return SolicitudCartaPractica.objects.create(
+            alumno_rut=f"1111111{indice}-1",
+            alumno_nombres=f"Alumno {indice}",
+            alumno_apellidos="Prueba",
+            alumno_carrera="Computación",
+            practica_jefe_directo="Jefe",
+            practica_cargo_alumno="Practicante",
+            practica_fecha_inicio=date.today(),
+            practica_empresa_rut="76543210-9",
+            practica_sector="Tecnología",
+            practica_duracion_horas=320,
+            dest_nombres="Destinatario",
+            dest_apellidos="Empresa",
+            dest_cargo="Gerente",
+            dest_empresa="Empresa SpA",
+            escuela_id="inf",
+            escuela_nombre="Escuela de Informática",
+            escuela_direccion="Dirección",
+            escuela_telefono="123",
+            estado=estado,
+        )
+
+    def _consultas_count(self, contexto) -> list[str]:
+        return [q["sql"] for q in contexto.captured_queries if "COUNT(" in q["sql"].upper()]
+
+    def test_total_se_reutiliza_entre_paginas(self):
+        response = self.client.get(self.url, {"page": 1, "size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 3)
+        self.assertTrue(response.data["totalExacto"])
+
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(self.url, {"page": 2, "size": 2})
+
+        self.assertEqual(response.data["total"], 3)
+        self.assertEqual(len(response.data["items"]), 1)
+        self.assertEqual(self._consultas_count(contexto), [])
+
+    def test_total_se_invalida_al_escribir(self):
+        self.client.get(self.url, {"estado": "pendiente"})
+        self._crear_solicitud(9)
+
+        response = self.client.get(self.url, {"estado": "pendiente", "page": 2})
+
+        self.assertEqual(response.data["total"], 4)
+
+    def test_total_distingue_filtros(self):
+        self._crear_solicitud(8, estado="aprobado")
+
+        pendientes = self.client.get(self.url, {"estado": "pendiente"})
+        aprobadas = self.client.get(self.url, {"estado": "aprobado"})
+        todas = self.client.get(self.url, {"q": "  "})
+
+        self.assertEqual(pendientes.data["total"], 3)
+        self.assertEqual(aprobadas.data["total"], 1)
+        self.assertEqual(todas.data["total"], 4)
+
+    def test_busqueda_por_termino_cachea_su_propio_total(self):
+        solicitud = self._crear_solicitud(7)
+        solicitud.alumno_nombres = "Juan"
+        solicitud.save()
+
+        juan = self.client.get(self.url, {"q": "juan"})
+        rut = self.client.get(self.url, {"q": "11.111.117", "alumno_rut": "11111117-1"})
+        alumno = self.client.get(self.url, {"q": "alumno"})
+
+        self.assertEqual(juan.status_code, status.HTTP_200_OK)
+        self.assertEqual(juan.data["total"], 1)
+        self.assertEqual(juan.data["items"][0]["alumno"]["nombres"], "Juan")
+        self.assertEqual(rut.status_code, status.HTTP_200_OK)
+        self.assertEqual(rut.data["total"], 1)
+        self.assertEqual(alumno.data["total"], 3)
+
+
+class _ServidorFirmas:
+    """Servidor HTTP local que simula el origen de las firmas remotas."""
+
+    contenido = b"\x89PNG\r\n\x1a\n" + b"firma" * 100
+    etag = '"firma-v1"'
+
+    def __init__(self, demora: float = 0.0):
+        self.peticiones: list[dict] = []
+        self.demora = demora
+        self.cortar = False
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                servidor.peticiones.append(dict(self.headers))
+                if servidor.demora:
+                    time.sleep(servidor.demora)
+                if self.path == "/grande.png":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.end_headers()
+                    self.wfile.write(b"x" * 4096)
+                    return
+                if self.path == "/cortada.png" or servidor.cortar:
+                    # Anuncia el cuerpo completo pero cierra la conexión a la mitad.
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(servidor.contenido)))
+                    self.end_headers()
+                    self.wfile.write(servidor.contenido[:100])
+                    return
+                if self.headers.get("If-None-Match") == servidor.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", servidor.etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(servidor.contenido)))
+                self.send_header("ETag", servidor.etag)
+                self.end_headers()
+                self.wfile.write(servidor.contenido)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.hilo = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.hilo.start()
+
+    def url(self, ruta: str = "/firma.png") -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{ruta}"
+
+    def detener(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class CacheFirmasRemotasTests(APITestCase):
+    def setUp(self):
+        self.servidor = _ServidorFirmas()
+        self.addCleanup(self.servidor.detener)
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.directorio = directorio.name
+
+    def _cache(self, **kwargs) -> CacheFirmasRemotas:
+        return CacheFirmasRemotas(self.directorio, **kwargs)
+
+    def test_reutiliza_la_copia_vigente(self):
+        cache_firmas = self._cache(ttl=60)
+
+        primera = cache_firmas.obtener(self.servidor.url())
+        segunda = cache_firmas.obtener(self.servidor.url())
+
+        self.assertEqual(primera["contenido"], _ServidorFirmas.contenido)
+        self.assertEqual(segunda["contenido"], _ServidorFirmas.contenido)
+        self.assertEqual(len(self.servidor.peticiones), 1)
+
+    def test_revalida_con_etag_al_expirar(self):
+        cache_firmas = self._cache(ttl=0)
+
+        cache_firmas.obtener(self.servidor.url())
+        entrada = cache_firmas.obtener(self.servidor.url())
+
+        self.assertEqual(len(self.servidor.peticiones), 2)
+        self.assertEqual(self.servidor.peticiones[1].get("If-None-Match"), '"firma-v1"')
+        self.assertEqual(entrada["contenido"], _ServidorFirmas.contenido)
+
+    def test_persiste_en_disco_entre_instancias(self):
+        self._cache(ttl=60).obtener(self.servidor.url())
+
+        entrada = self._cache(ttl=60).obtener(self.servidor.url())
+
+        self.assertEqual(entrada["contenido"], _ServidorFirmas.contenido)
+        self.assertEqual(len(self.servidor.peticiones), 1)
+
+    def test_agrupa_descargas_concurrentes(self):
+        self.servidor.demora = 0.3
+        cache_firmas = self._cache(ttl=60)
+        resultados: list[bytes] = []
+
+        def descargar():
+            resultados.append(cache_firmas.obtener(self.servidor.url())["contenido"])
+
+        hilos = [threading.Thread(target=descargar) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len(resultados), 8)
+        self.assertEqual(len(self.servidor.peticiones), 1)
+
+    def test_rechaza_cuerpos_que_exceden_el_limite(self):
+        cache_firmas = self._cache(max_bytes=1024)
+
+        with self.assertRaises(FirmaRemotaError):
+            cache_firmas.obtener(self.servidor.url("/grande.png"))
+
+    def test_cuerpo_incompleto_es_error_de_firma(self):
+        with self.assertRaises(FirmaRemotaError):
+            self._cache().obtener(self.servidor.url("/cortada.png"))
+
+    def test_cuerpo_incompleto_usa_la_copia_en_cache(self):
+        cache_firmas = self._cache(ttl=0)
+        previa = cache_firmas.obtener(self.servidor.url())
+
+        self.servidor.cortar = True
+        entrada = cache_firmas.obtener(self.servidor.url())
+
+        self.assertEqual(entrada["contenido"], previa["contenido"])
+
+    def test_rechaza_esquemas_no_http(self):
+        with self.assertRaises(FirmaRemotaError):
+            self._cache().obtener("file:///etc/passwd")
+
+    def test_proxy_responde_con_cabeceras_de_cache(self):
+        cache_firmas = self._cache(ttl=120)
+        url = reverse("proxy-firma-coordinador")
+
+        with mock.patch("api.views.obtener_cache_firmas", return_value=cache_firmas):
+            response = self.client.get(url, {"url": self.servidor.url()})
+            etag = response["ETag"]
+            revalidada = self.client.get(
+                url, {"url": self.servidor.url()}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(response["Cache-Control"].startswith("private, max-age="))
+        self.assertEqual(revalidada.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(self.servidor.peticiones), 1)
+
+
+class ServirMediaTests(APITestCase):
+    contenido = b"0123456789" * 100
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name, MEDIA_ENVIO="")
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        self.ruta = "evaluaciones/entregas/2025/01/01/informe-abc123.pdf"
+        self._escribir(self.ruta, self.contenido)
+        self.url = reverse("media", kwargs={"ruta": self.ruta})
+
+    def _escribir(self, ruta, datos):
+        destino = Path(self.directorio.name) / ruta
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_bytes(datos)
+
+    def test_sirve_archivo_completo_como_inmutable(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.contenido)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertTrue(response["ETag"])
+
+    def test_rutas_reescribibles_se_revalidan(self):
+        ruta = "practicas/cartas/2025/carta-alumno.pdf"
+        self._escribir(ruta, b"%PDF")
+
+        response = self.client.get(reverse("media", kwargs={"ruta": ruta}))
+
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_responde_rangos_parciales(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), self.contenido[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.contenido)}")
+        self.assertEqual(response["Content-Length"], "10")
+
+        sufijo = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(sufijo.streaming_content), self.contenido[-5:])
+
+    def test_rango_insatisfacible(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5000-")
+
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.contenido)}")
+
+    def test_if_range_desactualizado_entrega_archivo_completo(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"otro"')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_none_match_responde_304(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_rechaza_rutas_fuera_de_media(self):
+        response = self.client.get("/media/../settings.py")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(reverse("media", kwargs={"ruta": "no-existe.pdf"}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delegacion_x_accel_redirect(self):
+        with override_settings(MEDIA_ENVIO="x-accel-redirect", MEDIA_ACCEL_PREFIJO="/interna/"):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/interna/{self.ruta}")
+        self.assertEqual(response.content, b"")
+
+    def test_delegacion_x_sendfile(self):
+        with override_settings(MEDIA_ENVIO="x-sendfile"):
+            response = self.client.get(self.url)
+
+        self.assertTrue(response["X-Sendfile"].endswith(self.ruta))
+        self.assertEqual(response.content, b"")
+
+
+class SubidasEntregaFragmentadasTests(APITestCase):
+    contenido = bytes(range(256)) * 40
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        self.alumno = Usuario.objects.create(
+            nombre_completo="Alumno Fragmentos",
+            correo="alumno.fragmentos@example.com",
+            carrera="Computación",
+            rut="33333333-3",
+            telefono="",
+            rol="alumno",
+            contrasena="clave",
+        )
+        tema = TemaDisponible.objects.create(
+            titulo="Tema con entregas",
+            carrera="Computación",
+            descripcion="Descripción",
+            cupos=1,
+        )
+        InscripcionTema.objects.create(tema=tema, alumno=self.alumno, activo=True)
+        self.evaluacion = EvaluacionGrupoDocente.objects.create(
+            tema=tema,
+            grupo_nombre="Grupo 1",
+            titulo="Avance",
+        )
+        _autenticar(self.client, self.alumno)
+
+    def _iniciar(self, contenido=None, **extra):
+        contenido = self.contenido if contenido is None else contenido
+        datos = {
+            "alumno": self.alumno.id,
+            "titulo": "Informe final",
+            "nombre": "informe final.pdf",
+            "tamano": len(contenido),
+            "sha256": hashlib.sha256(contenido).hexdigest(),
+            **extra,
+        }
+        url = reverse("alumno-evaluacion-subidas", kwargs={"pk": self.evaluacion.pk})
+        return self.client.post(url, datos, format="json")
+
+    def _enviar(self, token, desplazamiento, datos):
+        return self.client.put(
+            reverse("subida-entrega", kwargs={"token": token}),
+            data=datos,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(desplazamiento),
+        )
+
+    def test_flujo_completo_reanudable(self):
+        inicio = self._iniciar()
+        self.assertEqual(inicio.status_code, status.HTTP_201_CREATED)
+        token = inicio.data["token"]
+
+        mitad = len(self.contenido) // 2
+        primero = self._enviar(token, 0, self.contenido[:mitad])
+        self.assertEqual(primero.status_code, status.HTTP_200_OK)
+        self.assertEqual(primero["Upload-Offset"], str(mitad))
+
+        # Reintento de un fragmento ya confirmado.
+        repetido = self._enviar(token, 0, self.contenido[:mitad])
+        self.assertEqual(repetido.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(repetido.data["recibido"], mitad)
+
+        estado = self.client.get(reverse("subida-entrega", kwargs={"token": token}))
+        self.assertEqual(estado.data["recibido"], mitad)
+
+        segundo = self._enviar(token, mitad, self.contenido[mitad:])
+        self.assertEqual(segundo.data["recibido"], len(self.contenido))
+
+        final = self.client.post(reverse("finalizar-subida-entrega", kwargs={"token": token}))
+
+        self.assertEqual(final.status_code, status.HTTP_201_CREATED)
+        entrega = EvaluacionEntregaAlumno.objects.get(pk=final.data["id"])
+        self.assertEqual(entrega.alumno_id, self.alumno.id)
+        self.assertEqual(entrega.titulo, "Informe final")
+        with entrega.archivo.open("rb") as archivo:
+            self.assertEqual(archivo.read(), self.contenido)
+        self.assertFalse(SubidaEntregaParcial.objects.exists())
+        self.assertEqual(list((Path(self.directorio.name) / ".parciales").iterdir()), [])
+
+    def test_finalizar_incompleta_responde_conflicto(self):
+        token = self._iniciar().data["token"]
+        self._enviar(token, 0, self.contenido[:10])
+
+        final = self.client.post(reverse("finalizar-subida-entrega", kwargs={"token": token}))
+
+        self.assertEqual(final.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(final.data["recibido"], 10)
+
+    def test_suma_incorrecta_descarta_la_carga(self):
+        token = self._iniciar(sha256="0" * 64).data["token"]
+        self._enviar(token, 0, self.contenido)
+
+        final = self.client.post(reverse("finalizar-subida-entrega", kwargs={"token": token}))
+
+        self.assertEqual(final.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SubidaEntregaParcial.objects.exists())
+        self.assertFalse(EvaluacionEntregaAlumno.objects.exists())
+
+    def test_rechaza_alumno_fuera_del_grupo(self):
+        otro = Usuario.objects.create(
+            nombre_completo="Alumno Externo",
+            correo="alumno.externo@example.com",
+            carrera="Computación",
+            rut="44444444-4",
+            telefono="",
+            rol="alumno",
+            contrasena="clave",
+        )
+
+        _autenticar(self.client, otro)
+        response = self._iniciar(alumno=otro.id)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("evaluacion", response.data)
+
+    def test_informe_corregido_se_adjunta_a_la_entrega(self):
+        entrega = EvaluacionEntregaAlumno.objects.create(
+            evaluacion=self.evaluacion,
+            alumno=self.alumno,
+            titulo="Entrega",
+            archivo="evaluaciones/entregas/original.pdf",
+        )
+        contenido = b"%PDF-1.4 corregido"
+        inicio = self.client.post(
+            reverse("docente-evaluacion-entrega-subidas", kwargs={"pk": entrega.pk}),
+            {
+                "nombre": "corregido.pdf",
+                "tamano": len(contenido),
+                "sha256": hashlib.sha256(contenido).hexdigest(),
+            },
+            format="json",
+        )
+        token = inicio.data["token"]
+        self._enviar(token, 0, contenido)
+
+        final = self.client.post(reverse("finalizar-subida-entrega", kwargs={"token": token}))
+
+        self.assertEqual(final.status_code, status.HTTP_200_OK)
+        entrega.refresh_from_db()
+        with entrega.informe_corregido.open("rb") as archivo:
+            self.assertEqual(archivo.read(), contenido)
+
+    def test_comando_elimina_cargas_expiradas(self):
+        token = self._iniciar().data["token"]
+        SubidaEntregaParcial.objects.filter(token=token).update(
+            expira_en=timezone.now() - timedelta(minutes=1)
+        )
+
+        call_command("limpiar_subidas_parciales", stdout=io.StringIO())
+
+        self.assertFalse(SubidaEntregaParcial.objects.exists())
+        self.assertEqual(list((Path(self.directorio.name) / ".parciales").iterdir()), [])
+        estado = self.client.get(reverse("subida-entrega", kwargs={"token": token}))
+        self.assertEqual(estado.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AlmacenamientoDeduplicadoTests(APITestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.almacenamiento = AlmacenamientoDeduplicado(location=self.directorio.name)
+
+    def _blobs(self):
+        return [ruta for ruta in self.almacenamiento.directorio_blobs().glob("??/*")]
+
+    def test_contenido_repetido_se_guarda_una_vez(self):
+        primero = self.almacenamiento.save(
+            "evaluaciones/rubricas/1/rubrica.pdf", ContentFile(b"%PDF rubrica")
+        )
+        segundo = self.almacenamiento.save(
+            "evaluaciones/rubricas/2/rubrica.pdf", ContentFile(b"%PDF rubrica")
+        )
+        distinto = self.almacenamiento.save(
+            "evaluaciones/rubricas/2/otra.pdf", ContentFile(b"%PDF otra")
+        )
+
+        self.assertEqual(len(self._blobs()), 2)
+        self.assertEqual(self.almacenamiento.referencias(primero), 2)
+        self.assertEqual(self.almacenamiento.referencias(distinto), 1)
+        self.assertEqual(
+            os.stat(self.almacenamiento.path(primero)).st_ino,
+            os.stat(self.almacenamiento.path(segundo)).st_ino,
+        )
+        with self.almacenamiento.open(segundo) as archivo:
+            self.assertEqual(archivo.read(), b"%PDF rubrica")
+
+    def test_nombres_repetidos_reciben_sufijo(self):
+        nombre = "practicas/documentos/reglamento.pdf"
+        primero = self.almacenamiento.save(nombre, ContentFile(b"uno"))
+        segundo = self.almacenamiento.save(nombre, ContentFile(b"uno"))
+
+        self.assertEqual(primero, nombre)
+        self.assertNotEqual(segundo, nombre)
+
+    def test_eliminar_la_ultima_referencia_libera_el_blob(self):
+        primero = self.almacenamiento.save("a/doc.pdf", ContentFile(b"contenido"))
+        segundo = self.almacenamiento.save("b/doc.pdf", ContentFile(b"contenido"))
+
+        self.almacenamiento.delete(primero)
+        self.assertEqual(len(self._blobs()), 1)
+        self.assertEqual(self.almacenamiento.referencias(segundo), 1)
+
+        self.almacenamiento.delete(segundo)
+        self.assertEqual(self._blobs(), [])
+
+    def test_comando_deduplica_media_existente(self):
+        raiz = Path(self.directorio.name)
+        for ruta in ("evaluaciones/rubricas/1/a.pdf", "evaluaciones/rubricas/2/b.pdf"):
+            destino = raiz / ruta
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            destino.write_bytes(b"%PDF misma rubrica")
+        (raiz / "practicas").mkdir()
+        (raiz / "practicas" / "unico.pdf").write_bytes(b"%PDF unico")
+
+        salida = io.StringIO()
+        with override_settings(MEDIA_ROOT=self.directorio.name):
+            call_command("deduplicar_media", stdout=salida)
+
+        self.assertIn("Duplicados enlazados: 1", salida.getvalue())
+        self.assertEqual(len(self._blobs()), 2)
+        self.assertEqual(
+            (raiz / "evaluaciones/rubricas/1/a.pdf").stat().st_ino,
+            (raiz / "evaluaciones/rubricas/2/b.pdf").stat().st_ino,
+        )
+        self.assertEqual((raiz / "evaluaciones/rubricas/2/b.pdf").read_bytes(), b"%PDF misma rubrica")
+
+
+class ExportacionZipEntregasTests(APITestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        self.alumno = Usuario.objects.create(
+            nombre_completo="Ana Pérez",
+            correo="ana.perez@example.com",
+            carrera="Computación",
+            rut="55555555-5",
+            telefono="",
+            rol="alumno",
+            contrasena="clave",
+        )
+        self.docente = Usuario.objects.create(
+            nombre_completo="Docente Zip",
+            correo="docente.zip@example.com",
+            rol="docente",
+            contrasena="clave",
+        )
+        self.evaluacion = EvaluacionGrupoDocente.objects.create(
+            docente=self.docente,
+            grupo_nombre="Grupo 1",
+            titulo="Informe final",
+            bitacoras_requeridas=2,
+        )
+        self.url = reverse("docente-evaluacion-entregas-zip", kwargs={"pk": self.evaluacion.pk})
+        _autenticar(self.client, self.docente)
+
+    def _crear_entrega(self, nombre, contenido, **extra):
+        entrega = EvaluacionEntregaAlumno(
+            evaluacion=self.evaluacion,
+            alumno=self.alumno,
+            titulo=nombre,
+            **extra,
+        )
+        entrega.archivo.save(nombre, ContentFile(contenido), save=False)
+        entrega.save()
+        return entrega
+
+    def test_zip_incluye_archivos_por_alumno_y_manifiesto(self):
+        informe = self._crear_entrega("informe.pdf", b"%PDF informe" * 1000)
+        self._crear_entrega("bitacora.txt", b"notas de avance", es_bitacora=True, bitacora_indice=2)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/zip")
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as archivo_zip:
+            nombres = archivo_zip.namelist()
+            carpeta = f"ana-perez-{self.alumno.pk}"
+            ruta_informe = next(n for n in nombres if n.startswith(f"{carpeta}/entrega/"))
+            ruta_bitacora = next(n for n in nombres if n.startswith(f"{carpeta}/bitacora-02/"))
+
+            self.assertEqual(archivo_zip.read(ruta_informe), b"%PDF informe" * 1000)
+            self.assertEqual(archivo_zip.read(ruta_bitacora), b"notas de avance")
+
+            manifiesto = archivo_zip.read("manifiesto.csv").decode("utf-8-sig").splitlines()
+            self.assertEqual(len(manifiesto), 3)
+            self.assertIn(str(informe.pk), manifiesto[1] + manifiesto[2])
+            self.assertIn(ruta_informe, "\n".join(manifiesto))
+
+    def test_archivo_faltante_queda_en_el_manifiesto(self):
+        entrega = self._crear_entrega("perdido.pdf", b"%PDF")
+        entrega.archivo.storage.delete(entrega.archivo.name)
+
+        with self.assertLogs("api.exportaciones", level="WARNING"):
+            contenido = b"".join(self.client.get(self.url).streaming_content)
+
+        with zipfile.ZipFile(io.BytesIO(contenido)) as archivo_zip:
+            self.assertEqual(archivo_zip.namelist(), ["manifiesto.csv"])
+            self.assertIn("perdido", archivo_zip.read("manifiesto.csv").decode("utf-8-sig"))
+
+    @override_settings(PERMITIR_USUARIO_POR_PARAMETRO=False)
+    def test_sin_token_no_descarga(self):
+        self._crear_entrega("informe.pdf", b"%PDF")
+        self.client.credentials()
+
+        response = self.client.get(self.url, {"docente": self.docente.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_otro_docente_no_descarga(self):
+        otro = Usuario.objects.create(
+            nombre_completo="Otro Docente",
+            correo="otro.zip@example.com",
+            rol="docente",
+            contrasena="clave",
+        )
+        _autenticar(self.client, otro)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        # Tampoco sirve indicar el id del docente dueño.
+        response = self.client.get(self.url, {"docente": self.docente.pk})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_coordinacion_descarga_cualquier_evaluacion(self):
+        coordinador = Usuario.objects.create(
+            nombre_completo="Coordinación Zip",
+            correo="coordinacion.zip@example.com",
+            rol="coordinador",
+            contrasena="clave",
+        )
+        _autenticar(self.client, coordinador)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+
+class MetadatosArchivosTests(APITestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        self.alumno = Usuario.objects.create(
+            nombre_completo="Alumno Metadatos",
+            correo="alumno.metadatos@example.com",
+            carrera="Computación",
+            rut="66666666-6",
+            telefono="",
+            rol="alumno",
+            contrasena="clave",
+        )
+        tema = TemaDisponible.objects.create(
+            titulo="Tema metadatos",
+            carrera="Computación",
+            descripcion="Descripción",
+        )
+        InscripcionTema.objects.create(tema=tema, alumno=self.alumno, activo=True)
+        self.evaluacion = EvaluacionGrupoDocente.objects.create(
+            tema=tema,
+            grupo_nombre="Grupo",
+            titulo="Avance",
+        )
+
+    def test_subida_guarda_metadatos_del_archivo(self):
+        contenido = b"%PDF-1.4 informe de avance"
+        url = reverse("alumno-evaluacion-entregas", kwargs={"pk": self.evaluacion.pk})
+        _autenticar(self.client, self.alumno)
+        response = self.client.post(
+            url,
+            {
+                "alumno": self.alumno.id,
+                "titulo": "Avance 1",
+                "archivo": SimpleUploadedFile(
+                    "Informe Avance.pdf", contenido, content_type="application/pdf"
+                ),
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        entrega = EvaluacionEntregaAlumno.objects.get(pk=response.data["id"])
+        self.assertEqual(entrega.archivo_tamano, len(contenido))
+        self.assertEqual(entrega.archivo_tipo, "application/pdf")
+        self.assertEqual(entrega.archivo_nombre_original, "Informe Avance.pdf")
+        self.assertEqual(entrega.archivo_sha256, hashlib.sha256(contenido).hexdigest())
+        self.assertEqual(response.data["archivo_nombre"], "Informe Avance.pdf")
+
+    def test_tipo_declarado_no_prima_sobre_la_extension_y_hash_una_vez(self):
+        contenido = b"%PDF-1.4 informe"
+        url = reverse("alumno-evaluacion-entregas", kwargs={"pk": self.evaluacion.pk})
+        with mock.patch(
+            "api.archivos.calcular_sha256_contenido", wraps=archivos.calcular_sha256_contenido
+        ) as calcular, mock.patch("api.almacenamiento.calcular_sha256") as recalcular:
+            _autenticar(self.client, self.alumno)
+            response = self.client.post(
+                url,
+                {
+                    "alumno": self.alumno.id,
+                    "titulo": "Avance",
+                    "archivo": SimpleUploadedFile(
+                        "informe.pdf", contenido, content_type="text/html"
+                    ),
+                },
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        entrega = EvaluacionEntregaAlumno.objects.get(pk=response.data["id"])
+        self.assertEqual(entrega.archivo_tipo, "application/pdf")
+        self.assertEqual(calcular.call_count, 1)
+        recalcular.assert_not_called()
+        almacenamiento = entrega.archivo.storage
+        self.assertTrue(almacenamiento.ruta_blob(hashlib.sha256(contenido).hexdigest()).exists())
+
+        self.assertEqual(archivos.tipo_de_contenido("datos", "text/html; charset=utf-8"), "text/html")
+        self.assertEqual(
+            archivos.tipo_de_contenido("datos", "text/html\r\nX-Otro: 1"),
+            "application/octet-stream",
+        )
+        self.assertEqual(
+            archivos.tipo_de_contenido("datos", "application/x-inventado"),
+            "application/octet-stream",
+        )
+
+    def test_serializar_entregas_no_consulta_el_almacenamiento(self):
+        EvaluacionEntregaAlumno.objects.bulk_create(
+            [
+                EvaluacionEntregaAlumno(
+                    evaluacion=self.evaluacion,
+                    alumno=self.alumno,
+                    titulo=f"Entrega {indice}",
+                    archivo=f"evaluaciones/entregas/{indice}.pdf",
+                    archivo_tamano=10,
+                    archivo_tipo="application/pdf",
+                    archivo_nombre_original=f"Entrega {indice}.pdf",
+                    archivo_sha256="0" * 64,
+                )
+                for indice in range(1000)
+            ]
+        )
+        entregas = list(EvaluacionEntregaAlumno.objects.select_related("alumno"))
+        request = Request(APIRequestFactory().get("/api/alumnos/evaluaciones/"))
+
+        prohibido = mock.Mock(side_effect=AssertionError("E/S de almacenamiento"))
+        construir = mock.Mock(wraps=HttpRequest.build_absolute_uri)
+        with (
+            mock.patch.object(AlmacenamientoDeduplicado, "open", prohibido),
+            mock.patch.object(AlmacenamientoDeduplicado, "size", prohibido),
+            mock.patch.object(AlmacenamientoDeduplicado, "exists", prohibido),
+            mock.patch.object(AlmacenamientoDeduplicado, "url", prohibido),
+            mock.patch("api.archivos.mimetypes.guess_type", prohibido),
+            mock.patch.object(HttpRequest, "build_absolute_uri", lambda *args: construir(*args)),
+        ):
+            datos = EvaluacionEntregaAlumnoSerializer(
+                entregas, many=True, context={"request": request}
+            ).data
+
+        self.assertEqual(len(datos), 1000)
+        self.assertEqual(construir.call_count, 1)
+        self.assertTrue(datos[0]["archivo_url"].startswith("http://testserver/media/"))
+        self.assertEqual(datos[0]["archivo_tipo"], "application/pdf")
+
+    def test_comando_completa_metadatos_existentes(self):
+        contenido = b"contenido previo"
+        nombre = AlmacenamientoDeduplicado().save(
+            "evaluaciones/entregas/previo.txt", ContentFile(contenido)
+        )
+        entrega = EvaluacionEntregaAlumno.objects.create(
+            evaluacion=self.evaluacion,
+            alumno=self.alumno,
+            titulo="Previa",
+            archivo=nombre,
+        )
+        self.assertEqual(entrega.archivo_sha256, "")
+
+        call_command("completar_metadatos_archivos", stdout=io.StringIO())
+
+        entrega.refresh_from_db()
+        self.assertEqual(entrega.archivo_tamano, len(contenido))
+        self.assertEqual(entrega.archivo_tipo, "text/plain")
+        self.assertEqual(entrega.archivo_nombre_original, "previo.txt")
+        self.assertEqual(entrega.archivo_sha256, hashlib.sha256(contenido).hexdigest())
+
+
+class MemoEntregasEvaluacionTests(APITestCase):
+    def test_cada_entrega_se_serializa_una_vez(self):
+        alumno = Usuario.objects.create(
+            nombre_completo="Alumno Memo",
+            correo="alumno.memo@example.com",
+            rut="77777777-7",
+            rol="alumno",
+            contrasena="clave",
+        )
+        evaluacion = EvaluacionGrupoDocente.objects.create(
+            grupo_nombre="Grupo",
+            titulo="Evaluación",
+            fecha=timezone.localdate() + timedelta(weeks=3),
+            bitacoras_requeridas=2,
+        )
+        for indice in (1, 2):
+            EvaluacionEntregaAlumno.objects.create(
+                evaluacion=evaluacion,
+                alumno=alumno,
+                titulo=f"Bitácora {indice}",
+                archivo=f"evaluaciones/entregas/bitacora-{indice}.pdf",
+                es_bitacora=True,
+                bitacora_indice=indice,
+            )
+        EvaluacionEntregaAlumno.objects.create(
+            evaluacion=evaluacion,
+            alumno=alumno,
+            titulo="Informe",
+            archivo="evaluaciones/entregas/informe.pdf",
+        )
+
+        original = EvaluacionEntregaAlumnoSerializer.to_representation
+        with mock.patch.object(
+            EvaluacionEntregaAlumnoSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=original,
+        ) as representar, CaptureQueriesContext(connection) as consultas:
+            datos = EvaluacionGrupoDocenteSerializer(evaluacion, context={}).data
+
+        self.assertEqual(representar.call_count, 3)
+        self.assertEqual(len(datos["entregas"]), 3)
+        self.assertEqual(datos["ultima_entrega"]["titulo"], "Informe")
+        self.assertIs(datos["ultima_entrega"], datos["entregas"][0])
+        por_pk = {entrega["id"]: entrega for entrega in datos["entregas"]}
+        for bitacora in datos["bitacoras_programadas"]:
+            self.assertIs(bitacora["entrega"], por_pk[bitacora["entrega"]["id"]])
+        # Sin prefetch, las entregas se consultan una sola vez por evaluación.
+        consultas_entregas = [
+            consulta for consulta in consultas.captured_queries
+            if "evaluaciones_entregas_alumno" in consulta["sql"]
+        ]
+        self.assertEqual(len(consultas_entregas), 1)
+
+
+class CamposDinamicosTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("docente-evaluaciones")
+        self.docente = Usuario.objects.create(
+            nombre_completo="Docente Campos",
+            correo="docente.campos@example.com",
+            carrera="Computación",
+            rut="12121212-1",
+            rol="docente",
+            contrasena="clave",
+        )
+        alumno = Usuario.objects.create(
+            nombre_completo="Alumno Campos",
+            correo="alumno.campos@example.com",
+            carrera="Computación",
+            rut="13131313-1",
+            rol="alumno",
+            contrasena="clave",
+        )
+        self.tema = TemaDisponible.objects.create(
+            titulo="Tema Campos",
+            carrera="Computación",
+            rama="Investigación",
+            descripcion="Descripción",
+            requisitos=[],
+            cupos=1,
+            docente_responsable=self.docente,
+            created_by=self.docente,
+        )
+        InscripcionTema.objects.create(tema=self.tema, alumno=alumno, activo=True)
+        evaluacion = EvaluacionGrupoDocente.objects.create(
+            docente=self.docente,
+            tema=self.tema,
+            grupo_nombre="Grupo",
+            titulo="Evaluación",
+            fecha=timezone.localdate() + timedelta(weeks=2),
+            bitacoras_requeridas=1,
+        )
+        EvaluacionEntregaAlumno.objects.create(
+            evaluacion=evaluacion,
+            alumno=alumno,
+            titulo="Informe",
+            archivo="evaluaciones/entregas/informe.pdf",
+        )
+
+    def _consultas_a(self, consultas, tabla):
+        return [c for c in consultas.captured_queries if tabla in c["sql"]]
+
+    def test_fields_limita_claves_y_evita_consultas_de_relaciones(self):
+        with CaptureQueriesContext(connection) as consultas:
+            _autenticar(self.client, self.docente)
+            response = self.client.get(
+                self.url, {"docente": self.docente.pk, "fields": "titulo,estado"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "titulo", "estado"})
+        self.assertEqual(self._consultas_a(consultas, "evaluaciones_entregas_alumno"), [])
+        self.assertEqual(self._consultas_a(consultas, "inscripcion"), [])
+
+    def test_vista_resumen_y_omit(self):
+        _autenticar(self.client, self.docente)
+        response = self.client.get(self.url, {"docente": self.docente.pk, "vista": "resumen"})
+        esperado = {"id", *EvaluacionGrupoDocenteSerializer.Meta.campos_resumen}
+        self.assertEqual(set(response.data[0]), esperado)
+
+        completo = self.client.get(self.url, {"docente": self.docente.pk}).data[0]
+        sin_entregas = self.client.get(
+            self.url, {"docente": self.docente.pk, "omit": "entregas,grupo"}
+        ).data[0]
+        self.assertEqual(set(completo) - set(sin_entregas), {"entregas", "grupo"})
+        self.assertEqual(sin_entregas["ultima_entrega"]["titulo"], "Informe")
+
+    def test_temas_resumen_no_calcula_campos_omitidos(self):
+        url = reverse("temas-disponibles")
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url, {"vista": "resumen"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("inscripcionesActivas", response.data[0])
+        self.assertNotIn("cuposDisponibles", response.data[0])
+        self.assertEqual(self._consultas_a(consultas, "inscripcion"), [])
+
+    def test_optimizar_queryset_descarta_relaciones_no_pedidas(self):
+        request = Request(APIRequestFactory().get("/", {"fields": "estado,docente"}))
+        queryset = Reunion.objects.select_related(
+            "alumno", "docente", "solicitud"
+        ).prefetch_related("trazabilidad__usuario")
+
+        optimizado = ReunionSerializer.optimizar_queryset(queryset, request)
+
+        self.assertEqual(optimizado.query.select_related, {"docente": {}})
+        self.assertEqual(optimizado._prefetch_related_lookups, ())
+        # Las escrituras no se ven afectadas por los parámetros.
+        escritura = Request(APIRequestFactory().post("/?fields=estado"))
+        self.assertIs(ReunionSerializer.optimizar_queryset(queryset, escritura), queryset)
+
+
+class ResumenNotasGrupoTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("coordinacion-promedios-titulo")
+        self.docente = Usuario.objects.create(
+            nombre_completo="Docente Notas",
+            correo="docente.notas@example.com",
+            carrera="Computación",
+            rut="14141414-1",
+            rol="docente",
+            contrasena="clave",
+        )
+        self.evaluacion = EvaluacionGrupoDocente.objects.create(
+            docente=self.docente,
+            grupo_nombre="Grupo Notas",
+            titulo="Evaluación",
+            fecha=date(2025, 5, 10),
+        )
+        self.entregas = [
+            EvaluacionEntregaAlumno.objects.create(
+                evaluacion=self.evaluacion,
+                titulo=f"Entrega {indice}",
+                archivo=f"evaluaciones/entregas/notas-{indice}.pdf",
+            )
+            for indice in range(3)
+        ]
+
+    def _calificar(self, entrega, nota):
+        url = reverse("docente-evaluacion-actualizar-entrega", args=[entrega.pk])
+        response = self.client.patch(url, {"nota": nota}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_calificar_actualiza_resumen_incrementalmente(self):
+        self._calificar(self.entregas[0], "5.00")
+        self._calificar(self.entregas[1], "7.00")
+        self._calificar(self.entregas[2], "6.00")
+
+        resumen = ResumenNotasGrupo.objects.get(evaluacion=self.evaluacion)
+        self.assertEqual(resumen.cantidad_notas, 3)
+        self.assertEqual(resumen.suma_notas, Decimal("18.00"))
+        self.assertEqual((resumen.nota_minima, resumen.nota_maxima), (Decimal("5"), Decimal("7")))
+
+        # Cambiar la nota mínima obliga a recalcular el mínimo.
+        self._calificar(self.entregas[0], "6.50")
+        self._calificar(self.entregas[1], None)
+        resumen.refresh_from_db()
+        self.assertEqual(resumen.cantidad_notas, 2)
+        self.assertEqual(resumen.suma_notas, Decimal("12.50"))
+        self.assertEqual((resumen.nota_minima, resumen.nota_maxima), (Decimal("6"), Decimal("6.5")))
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["promedio"], "6.25")
+        self.assertEqual(response.data[0]["cantidad_entregas"], 2)
+        self.assertFalse(
+            any("evaluaciones_entregas_alumno" in c["sql"] for c in consultas.captured_queries)
+        )
+
+    def test_filtros_por_docente_y_periodo(self):
+        self._calificar(self.entregas[0], "6.00")
+
+        _autenticar(self.client, self.docente)
+        self.assertEqual(len(self.client.get(self.url, {"docente": self.docente.pk}).data), 1)
+        self.assertEqual(len(self.client.get(self.url, {"docente": self.docente.pk + 1}).data), 0)
+        self.assertEqual(len(self.client.get(self.url, {"periodo": "2025-1"}).data), 1)
+        self.assertEqual(len(self.client.get(self.url, {"periodo": "2025-2"}).data), 0)
+        self.assertEqual(len(self.client.get(self.url, {"desde": "2025-05-11"}).data), 0)
+        response = self.client.get(self.url, {"periodo": "2025"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_guardar_y_eliminar_fuera_de_la_vista_ajustan_el_resumen(self):
+        # Lo mismo que hace el admin: save() y delete() del modelo.
+        self._calificar(self.entregas[0], "5.00")
+        self._calificar(self.entregas[1], "6.00")
+
+        with transaction.atomic():
+            entrega = EvaluacionEntregaAlumno.objects.get(pk=self.entregas[2].pk)
+            entrega.nota = "7.00"
+            entrega.save()
+        EvaluacionEntregaAlumno.objects.get(pk=self.entregas[0].pk).delete()
+
+        resumen = ResumenNotasGrupo.objects.get(evaluacion=self.evaluacion)
+        self.assertEqual(resumen.cantidad_notas, 2)
+        self.assertEqual(resumen.suma_notas, Decimal("13.00"))
+        self.assertEqual((resumen.nota_minima, resumen.nota_maxima), (Decimal("6"), Decimal("7")))
+
+        # Una instancia con la nota antigua en memoria no resta esa nota: se
+        # usa la guardada en la base.
+        obsoleta = EvaluacionEntregaAlumno.objects.get(pk=self.entregas[1].pk)
+        self._calificar(self.entregas[1], "4.00")
+        obsoleta.nota = Decimal("6.50")
+        obsoleta.save()
+        resumen.refresh_from_db()
+        self.assertEqual(resumen.suma_notas, Decimal("13.50"))
+        self.assertEqual(resumen.cantidad_notas, 2)
+
+        otra = EvaluacionGrupoDocente.objects.create(
+            docente=self.docente, grupo_nombre="Otro grupo", titulo="Otra", fecha=date(2025, 5, 11)
+        )
+        obsoleta.evaluacion = otra
+        obsoleta.save()
+        resumen.refresh_from_db()
+        self.assertEqual((resumen.cantidad_notas, resumen.suma_notas), (1, Decimal("7.00")))
+        self.assertEqual(ResumenNotasGrupo.objects.get(evaluacion=otra).suma_notas, Decimal("6.50"))
+
+        otra_id = otra.pk
+        otra.delete()
+        self.assertFalse(ResumenNotasGrupo.objects.filter(evaluacion_id=otra_id).exists())
+
+    def test_comando_reconstruye_resumen(self):
+        EvaluacionEntregaAlumno.objects.filter(pk=self.entregas[0].pk).update(nota=Decimal("4.00"))
+        EvaluacionEntregaAlumno.objects.filter(pk=self.entregas[1].pk).update(nota=Decimal("5.00"))
+        ResumenNotasGrupo.objects.create(evaluacion=self.evaluacion, cantidad_notas=9)
+
+        call_command("reconstruir_resumen_notas", stdout=io.StringIO())
+
+        resumen = ResumenNotasGrupo.objects.get(evaluacion=self.evaluacion)
+        self.assertEqual(resumen.cantidad_notas, 2)
+        self.assertEqual(resumen.promedio, Decimal("4.5"))
+
+
+class EstadisticasNotasTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("coordinacion-estadisticas-titulo")
+        self.docente = Usuario.objects.create(
+            nombre_completo="Docente Estadísticas",
+            correo="docente.estadisticas@example.com",
+            carrera="Computación",
+            rut="15151515-1",
+            rol="docente",
+            contrasena="clave",
+        )
+        tema = TemaDisponible.objects.create(
+            titulo="Tema Estadísticas",
+            carrera="Computación",
+            rama="Investigación",
+            descripcion="Descripción",
+            requisitos=[],
+            cupos=3,
+        )
+        self.evaluacion = EvaluacionGrupoDocente.objects.create(
+            docente=self.docente, tema=tema, grupo_nombre="Grupo", titulo="Evaluación"
+        )
+        self.entregas = [
+            EvaluacionEntregaAlumno.objects.create(
+                evaluacion=self.evaluacion,
+                titulo=f"Entrega {indice}",
+                archivo=f"evaluaciones/entregas/estadisticas-{indice}.pdf",
+                nota=nota,
+            )
+            for indice, nota in enumerate([Decimal("3.50"), Decimal("5.00"), Decimal("6.50")])
+        ]
+
+    def test_reducciones_por_grupo_coinciden_con_numpy(self):
+        generador = np.random.default_rng(3)
+        claves = generador.integers(0, 5, 400)
+        notas = np.round(generador.uniform(1, 7, 400), 1)
+
+        resultado = estadisticas_por_grupo(
+            claves, notas, bordes=bordes_histograma(), aprobacion=4.0
+        )
+
+        for posicion, clave in enumerate(resultado["claves_grupo"]):
+            grupo = notas[claves == clave]
+            self.assertEqual(resultado["cantidad"][posicion], grupo.size)
+            self.assertAlmostEqual(resultado["promedio"][posicion], grupo.mean())
+            self.assertAlmostEqual(resultado["desviacion"][posicion], grupo.std())
+            np.testing.assert_allclose(
+                resultado["percentiles"][posicion], np.percentile(grupo, [25, 50, 75, 90])
+            )
+            self.assertEqual(resultado["aprobados"][posicion], (grupo >= 4.0).sum())
+            self.assertEqual(resultado["histograma"][posicion].sum(), grupo.size)
+
+    def test_endpoint_cachea_hasta_la_siguiente_nota(self):
+        datos = self.client.get(self.url).json()
+        general = datos["titulo"]["general"]
+        self.assertEqual(general["cantidad"], 3)
+        self.assertEqual(general["promedio"], 5.0)
+        self.assertEqual(general["percentiles"]["p50"], 5.0)
+        self.assertEqual(general["tasaAprobacion"], round(2 / 3, 4))
+        self.assertEqual(datos["titulo"]["porCarrera"][0]["carrera"], "Computación")
+        self.assertEqual(datos["titulo"]["porDocente"][0]["docente"], "Docente Estadísticas")
+        self.assertIsNone(datos["practica"]["general"])
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        url_nota = reverse("docente-evaluacion-actualizar-entrega", args=[self.entregas[0].pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url_nota, {"nota": "6.50"}, format="json")
+
+        general = self.client.get(self.url).json()["titulo"]["general"]
+        self.assertEqual(general["promedio"], 6.0)
+        self.assertEqual(general["tasaAprobacion"], 1.0)
+
+    def test_version_desalojada_no_reutiliza_estadisticas_antiguas(self):
+        self.assertEqual(self.client.get(self.url).json()["titulo"]["general"]["cantidad"], 3)
+        EvaluacionEntregaAlumno.objects.filter(pk=self.entregas[0].pk).update(nota=None)
+        cache.delete(estadisticas.CLAVE_VERSION)
+
+        self.assertEqual(self.client.get(self.url).json()["titulo"]["general"]["cantidad"], 2)
+
+    def test_notas_de_practica_se_interpretan_como_numeros(self):
+        evaluacion = PracticaEvaluacion.objects.create(
+            carrera="Computación",
+            nombre="Pauta",
+            archivo="practicas/evaluaciones/pauta.pdf",
+            uploaded_by=self.docente,
+        )
+        for indice, nota in enumerate(["5,5", "6.5", "sin nota", ""]):
+            alumno = Usuario.objects.create(
+                nombre_completo=f"Alumno Práctica {indice}",
+                correo=f"alumno.practica{indice}@example.com",
+                rut=f"1616161{indice}-1",
+                rol="alumno",
+                contrasena="clave",
+            )
+            PracticaEvaluacionEntrega.objects.create(
+                evaluacion=evaluacion,
+                alumno=alumno,
+                archivo=f"practicas/evaluaciones/entregas/{indice}.pdf",
+                nota=nota,
+            )
+
+        practica = self.client.get(self.url).json()["practica"]
+        self.assertEqual(practica["general"]["cantidad"], 2)
+        self.assertEqual(practica["general"]["promedio"], 6.0)
+        self.assertEqual(practica["porCarrera"][0]["carrera"], "Computación")
+
+
+class EnviarRecordatoriosTests(APITestCase):
+    def setUp(self):
+        self.hoy = date(2030, 3, 4)
+        docente = Usuario.objects.create(
+            nombre_completo="Docente Recordatorios",
+            correo="docente.recordatorios@example.com",
+            rut="17171717-1",
+            rol="docente",
+            contrasena="clave",
+        )
+        tema = TemaDisponible.objects.create(
+            titulo="Tema Recordatorios",
+            carrera="Computación",
+            rama="Investigación",
+            descripcion="Descripción",
+            requisitos=[],
+            cupos=5,
+            docente_responsable=docente,
+        )
+        self.alumnos = []
+        for indice in range(4):
+            alumno = Usuario.objects.create(
+                nombre_completo=f"Alumno Recordatorio {indice}",
+                correo=f"alumno.recordatorio{indice}@example.com",
+                rut=f"1818181{indice}-1",
+                rol="alumno",
+                contrasena="clave",
+            )
+            InscripcionTema.objects.create(tema=tema, alumno=alumno, activo=True)
+            self.alumnos.append(alumno)
+        # Bitácora 1 vence hoy, bitácora 2 en una semana y la entrega final en dos.
+        self.evaluacion = EvaluacionGrupoDocente.objects.create(
+            docente=docente,
+            tema=tema,
+            grupo_nombre=tema.titulo,
+            titulo="Avance",
+            fecha=self.hoy + timedelta(weeks=2),
+            bitacoras_requeridas=2,
+        )
+        EvaluacionEntregaAlumno.objects.create(
+            evaluacion=self.evaluacion,
+            alumno=self.alumnos[0],
+            titulo="Bitácora 1",
+            archivo="evaluaciones/entregas/bitacora.pdf",
+            es_bitacora=True,
+            bitacora_indice=1,
+        )
+
+    def _ejecutar(self, dias=3):
+        salida = io.StringIO()
+        call_command("enviar_recordatorios", fecha=self.hoy.isoformat(), dias=dias, stdout=salida)
+        return salida.getvalue()
+
+    def test_notifica_solo_a_pendientes_y_es_idempotente(self):
+        with CaptureQueriesContext(connection) as consultas:
+            salida = self._ejecutar()
+        self.assertIn("Recordatorios enviados: 3", salida)
+        # Lecturas y escrituras por lote, sin depender de la cantidad de alumnos.
+        self.assertLessEqual(len(consultas.captured_queries), 10)
+
+        notificados = set(
+            Notificacion.objects.filter(tipo="recordatorio").values_list("usuario_id", flat=True)
+        )
+        self.assertEqual(notificados, {alumno.pk for alumno in self.alumnos[1:]})
+        registro = RecordatorioEnviado.objects.get(alumno=self.alumnos[1])
+        self.assertEqual(registro.bitacora_indice, 1)
+        self.assertEqual(registro.fecha_limite, self.hoy)
+
+        self.assertIn("Recordatorios enviados: 0", self._ejecutar())
+        self.assertEqual(Notificacion.objects.filter(tipo="recordatorio").count(), 3)
+
+    def test_ventana_amplia_incluye_entrega_final(self):
+        self._ejecutar(dias=14)
+        indices = sorted(
+            RecordatorioEnviado.objects.filter(alumno=self.alumnos[0]).values_list(
+                "bitacora_indice", flat=True
+            )
+        )
+        self.assertEqual(indices, [0, 2])
+
+
+class RefrescoEstadosEvaluacionesTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        hoy = timezone.localdate()
+        self.evaluaciones = {
+            esperado: EvaluacionGrupoDocente.objects.create(
+                grupo_nombre=f"Grupo {esperado}", titulo="Evaluación", fecha=fecha
+            )
+            for esperado, fecha in (
+                ("Pendiente", hoy + timedelta(days=3)),
+                ("En progreso", hoy),
+                ("Evaluada", hoy - timedelta(days=1)),
+            )
+        }
+        # Simula filas guardadas días atrás: todas quedaron en "Pendiente".
+        EvaluacionGrupoDocente.objects.update(estado="Pendiente")
+
+    def _estados(self):
+        return {
+            esperado: EvaluacionGrupoDocente.objects.get(pk=evaluacion.pk).estado
+            for esperado, evaluacion in self.evaluaciones.items()
+        }
+
+    def test_comando_actualiza_solo_filas_desactualizadas(self):
+        salida = io.StringIO()
+        with CaptureQueriesContext(connection) as consultas:
+            call_command("refrescar_estados_evaluaciones", lote=2, stdout=salida)
+
+        self.assertIn("Evaluaciones actualizadas: 2", salida.getvalue())
+        self.assertEqual(self._estados(), {estado: estado for estado in self.evaluaciones})
+        updates = [c for c in consultas.captured_queries if c["sql"].startswith("UPDATE")]
+        self.assertTrue(all("CASE WHEN" in c["sql"] for c in updates))
+
+        salida = io.StringIO()
+        call_command("refrescar_estados_evaluaciones", stdout=salida)
+        self.assertIn("Evaluaciones actualizadas: 0", salida.getvalue())
+
+    def test_serializador_deriva_estado_de_la_fecha(self):
+        evaluacion = EvaluacionGrupoDocente.objects.get(pk=self.evaluaciones["Evaluada"].pk)
+        self.assertEqual(evaluacion.estado, "Pendiente")
+        datos = EvaluacionGrupoDocenteSerializer(evaluacion, context={}).data
+        self.assertEqual(datos["estado"], "Evaluada")
+
+    @override_settings(REFRESCAR_ESTADOS_EN_PRIMER_REQUEST=True)
+    def test_primer_request_del_dia_refresca_estados(self):
+        cliente = APIClient()
+        cliente.get(reverse("temas-disponibles"))
+        self.assertEqual(self._estados(), {estado: estado for estado in self.evaluaciones})
+
+        EvaluacionGrupoDocente.objects.update(estado="Pendiente")
+        cliente.get(reverse("temas-disponibles"))
+        self.assertEqual(self._estados()["Evaluada"], "Pendiente")
+
+
+class DashboardUsuarioTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.hoy = timezone.localdate()
+        self.docente = Usuario.objects.create(
+            nombre_completo="Docente Panel",
+            correo="docente.panel@example.com",
+            rol="docente",
+            contrasena="clave",
+        )
+        self.alumno = Usuario.objects.create(
+            nombre_completo="Alumno Panel",
+            correo="alumno.panel@example.com",
+            rol="alumno",
+            carrera="Ingeniería Civil Informática",
+            contrasena="clave",
+        )
+        self.tema = TemaDisponible.objects.create(
+            titulo="Tema del panel",
+            carrera="Ingeniería Civil Informática",
+            descripcion="Descripción",
+            cupos=2,
+            created_by=self.docente,
+            docente_responsable=self.docente,
+        )
+        InscripcionTema.objects.create(tema=self.tema, alumno=self.alumno)
+        self.evaluacion = EvaluacionGrupoDocente.objects.create(
+            docente=self.docente,
+            tema=self.tema,
+            grupo_nombre="Grupo panel",
+            titulo="Avance 1",
+            fecha=self.hoy + timedelta(days=5),
+        )
+        Reunion.objects.create(
+            alumno=self.alumno,
+            docente=self.docente,
+            fecha=self.hoy + timedelta(days=1),
+            hora_inicio="10:00",
+            hora_termino="11:00",
+            modalidad="online",
+            motivo="Revisión",
+        )
+        SolicitudReunion.objects.create(alumno=self.alumno, docente=self.docente, motivo="Dudas")
+        Notificacion.objects.create(usuario=self.alumno, titulo="Aviso", mensaje="Mensaje")
+        self.url = reverse("dashboard-usuario", args=["alumno"])
+
+    def test_resumen_alumno_reune_las_secciones(self):
+        _autenticar(self.client, self.alumno)
+        response = self.client.get(self.url, {"usuario": self.alumno.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        datos = response.data
+        self.assertEqual(datos["tema"]["id"], self.tema.pk)
+        self.assertEqual(datos["temas"]["disponibles"], 1)
+        self.assertEqual(datos["evaluaciones"]["porEntregar"], 1)
+        self.assertEqual(datos["evaluaciones"]["items"][0]["id"], self.evaluacion.pk)
+        self.assertEqual(datos["reuniones"]["aprobada"], 1)
+        self.assertEqual(len(datos["reuniones"]["items"]), 1)
+        self.assertEqual(datos["solicitudesReunion"]["pendiente"], 1)
+        self.assertEqual(datos["notificaciones"]["noLeidas"], 1)
+
+        _autenticar(self.client, self.docente)
+        docente = self.client.get(
+            reverse("dashboard-usuario", args=["docente"]), {"usuario": self.docente.pk}
+        )
+        self.assertEqual(docente.status_code, status.HTTP_200_OK)
+        self.assertEqual(docente.data["evaluaciones"]["pendientes"], 1)
+        self.assertEqual(docente.data["temas"]["conInscritos"], 1)
+
+    def test_resumen_en_cache_se_invalida_al_escribir(self):
+        _autenticar(self.client, self.alumno)
+        self.client.get(self.url, {"usuario": self.alumno.pk})
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.get(self.url, {"usuario": self.alumno.pk})
+        # El token identifica al usuario y el resumen sale de la caché.
+        self.assertEqual(len(consultas.captured_queries), 0)
+
+        Notificacion.objects.create(usuario=self.alumno, titulo="Otro", mensaje="Mensaje")
+        EvaluacionEntregaAlumno.objects.create(
+            evaluacion=self.evaluacion, alumno=self.alumno, titulo="Entrega"
+        )
+        response = self.client.get(self.url, {"usuario": self.alumno.pk})
+        self.assertEqual(response.data["notificaciones"]["noLeidas"], 2)
+        self.assertEqual(response.data["evaluaciones"]["porEntregar"], 0)
+
+    def test_estado_de_evaluaciones_sale_de_la_fecha(self):
+        for grupo, dias in (("Grupo hoy", 0), ("Grupo pasado", -1)):
+            EvaluacionGrupoDocente.objects.create(
+                docente=self.docente,
+                tema=self.tema,
+                grupo_nombre=grupo,
+                titulo="Avance",
+                fecha=self.hoy + timedelta(days=dias),
+            )
+        # Como si el refresco diario aún no corriera.
+        EvaluacionGrupoDocente.objects.update(estado="Pendiente")
+
+        _autenticar(self.client, self.docente)
+        response = self.client.get(
+            reverse("dashboard-usuario", args=["docente"]), {"usuario": self.docente.pk}
+        )
+
+        evaluaciones = response.data["evaluaciones"]
+        self.assertEqual(
+            (evaluaciones["pendientes"], evaluaciones["enProgreso"], evaluaciones["evaluadas"]),
+            (1, 1, 1),
+        )
+        self.assertEqual(
+            [item["estado"] for item in evaluaciones["items"]], ["En progreso", "Pendiente"]
+        )
+
+    def test_rol_distinto_al_del_usuario(self):
+        _autenticar(self.client, self.docente)
+        response = self.client.get(self.url, {"usuario": self.docente.pk})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            reverse("dashboard-usuario", args=["invitado"]), {"usuario": self.docente.pk}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EntregasPracticaCoordinacionTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("listar-entregas-evaluacion-practica")
+        self.coordinador = Usuario.objects.create(
+            nombre_completo="Coordinación Práctica",
+            correo="coordinacion.practica@example.com",
+            rol="coordinador",
+            carrera="Química y Farmacia",
+            contrasena="clave",
+        )
+        evaluacion = PracticaEvaluacion.objects.create(
+            carrera="Química y Farmacia",
+            nombre="Pauta",
+            archivo="practicas/evaluaciones/pauta.pdf",
+            uploaded_by=self.coordinador,
+        )
+        otra_carrera = Usuario.objects.create(
+            nombre_completo="Alumno otra carrera",
+            correo="otra.carrera@example.com",
+            rol="alumno",
+            carrera="Dibujante Proyectista",
+            contrasena="clave",
+        )
+        PracticaEvaluacionEntrega.objects.create(
+            evaluacion=evaluacion, alumno=otra_carrera, archivo="practicas/otra.pdf"
+        )
+        self.alumnos = []
+        for indice in range(5):
+            alumno = Usuario.objects.create(
+                nombre_completo=f"Alumno Farmacia {indice}",
+                correo=f"farmacia{indice}@example.com",
+                rol="alumno",
+                carrera="Química y Farmacia",
+                contrasena="clave",
+            )
+            self.alumnos.append(alumno)
+            PracticaEvaluacionEntrega.objects.create(
+                evaluacion=evaluacion, alumno=alumno, archivo=f"practicas/{indice}.pdf"
+            )
+            for empresa in ("Antigua SpA", f"Empresa {indice}"):
+                SolicitudCartaPractica.objects.create(
+                    alumno=alumno,
+                    alumno_rut=f"2222222{indice}-2",
+                    alumno_nombres=alumno.nombre_completo,
+                    alumno_apellidos="Prueba",
+                    alumno_carrera=alumno.carrera,
+                    practica_jefe_directo="Jefe",
+                    practica_cargo_alumno="Practicante",
+                    practica_fecha_inicio=date.today(),
+                    practica_empresa_rut="76543210-9",
+                    practica_sector="Salud",
+                    practica_duracion_horas=320,
+                    dest_nombres="Destinatario",
+                    dest_apellidos="Empresa",
+                    dest_cargo="Gerente",
+                    dest_empresa=empresa,
+                    escuela_id="qyf",
+                    escuela_nombre="Escuela",
+                    escuela_direccion="Dirección",
+                    escuela_telefono="123",
+                )
+
+    def test_lista_paginada_con_empresa_de_la_ultima_carta(self):
+        _autenticar(self.client, self.coordinador)
+        response = self.client.get(
+            self.url, {"coordinador": self.coordinador.pk, "page": 1, "size": 3}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 5)
+        self.assertEqual(len(response.data["items"]), 3)
+        empresas = {item["alumno"]["id"]: item["empresa"] for item in response.data["items"]}
+        for alumno in self.alumnos[-3:]:
+            self.assertEqual(empresas[alumno.pk], f"Empresa {self.alumnos.index(alumno)}")
+
+        segunda = self.client.get(
+            self.url, {"coordinador": self.coordinador.pk, "page": 2, "size": 3}
+        )
+        self.assertEqual(len(segunda.data["items"]), 2)
+
+    def test_consultas_no_dependen_de_la_cantidad_de_entregas(self):
+        # La primera solicitud llena la caché de lecturas (ver api/cache_lecturas.py).
+        _autenticar(self.client, self.coordinador)
+        self.client.get(self.url, {"coordinador": self.coordinador.pk, "size": 1})
+        with CaptureQueriesContext(connection) as pocas:
+            self.client.get(self.url, {"coordinador": self.coordinador.pk, "size": 2})
+        with CaptureQueriesContext(connection) as muchas:
+            self.client.get(self.url, {"coordinador": self.coordinador.pk, "size": 50})
+
+        self.assertEqual(len(pocas.captured_queries), len(muchas.captured_queries))
+
+
+class TokenFirmadoTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.alumno = Usuario.objects.create(
+            nombre_completo="Alumno Token",
+            correo="alumno.token@example.com",
+            rol="alumno",
+            carrera="Computación",
+            contrasena="clave-segura",
+        )
+        self.otro = Usuario.objects.create(
+            nombre_completo="Otro Alumno",
+            correo="otro.token@example.com",
+            rol="alumno",
+            contrasena="clave-segura",
+        )
+        Notificacion.objects.create(usuario=self.alumno, titulo="Propia", mensaje="Mensaje")
+        Notificacion.objects.create(usuario=self.otro, titulo="Ajena", mensaje="Mensaje")
+
+    def _token(self) -> str:
+        response = self.client.post(
+            reverse("login"),
+            {"email": "alumno.token@example.com", "password": "clave-segura"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["token"]
+
+    def test_token_identifica_sin_consultar_usuarios(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._token()}")
+        url = reverse("gestionar-reuniones")
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url, {"alumno": self.alumno.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any('FROM "usuarios"' in c["sql"] for c in consultas.captured_queries)
+        )
+
+        response = self.client.get(reverse("lista-notificaciones"))
+        self.assertEqual([item["titulo"] for item in response.data], ["Propia"])
+
+    def test_token_no_permite_suplantar_a_otro_usuario(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._token()}")
+
+        response = self.client.get(reverse("gestionar-reuniones"), {"alumno": self.otro.pk})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(reverse("lista-notificaciones"), {"usuario": self.otro.pk})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_token_alterado_o_expirado(self):
+        token = self._token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token[:-2]}xx")
+        response = self.client.get(reverse("lista-notificaciones"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with override_settings(AUTH_TOKEN_DURACION=-1):
+            response = self.client.get(reverse("lista-notificaciones"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(PERMITIR_USUARIO_POR_PARAMETRO=False)
+    def test_sin_token_no_se_identifica_por_parametro(self):
+        url = reverse("gestionar-solicitudes-reunion")
+
+        response = self.client.post(
+            url, {"alumno": self.alumno.pk, "motivo": "Revisión"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("alumno", response.data)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self._token()}")
+        response = self.client.post(
+            url, {"alumno": self.otro.pk, "motivo": "Revisión"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PERMITIR_USUARIO_POR_PARAMETRO=True)
+    def test_parametro_identifica_sin_token_si_se_permite(self):
+        response = self.client.get(reverse("lista-notificaciones"), {"usuario": self.alumno.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["titulo"] for item in response.data], ["Propia"])
+
+    def test_login_ignora_un_token_vencido(self):
+        token = self._token()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token[:-2]}xx")
+
+        response = self.client.post(
+            reverse("login"),
+            {"email": "alumno.token@example.com", "password": "clave-segura"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class LimiteIntentosLoginTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("login")
+        self.usuario = Usuario.objects.create(
+            nombre_completo="Alumno Login",
+            correo="alumno.login@example.com",
+            rol="alumno",
+            contrasena="clave-segura",
+        )
+
+    def _login(self, correo="alumno.login@example.com", contrasena="incorrecta", ip="10.0.0.1"):
+        return self.client.post(
+            self.url, {"email": correo, "password": contrasena}, format="json", REMOTE_ADDR=ip
+        )
+
+    @override_settings(LOGIN_INTENTOS_CORREO=3, LOGIN_INTENTOS_IP=100)
+    def test_limite_por_correo_corta_antes_de_verificar_la_contrasena(self):
+        for _ in range(3):
+            self.assertEqual(self._login().status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with mock.patch("api.models.auth_check_password") as verificar:
+            response = self._login(contrasena="clave-segura", ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        verificar.assert_not_called()
+
+        otro = self._login(correo="otro@example.com", ip="10.0.0.2")
+        self.assertEqual(otro.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(LOGIN_INTENTOS_CORREO=100, LOGIN_INTENTOS_IP=2)
+    def test_limite_por_ip(self):
+        self._login(correo="a@example.com")
+        self._login(correo="b@example.com")
+        self.assertEqual(
+            self._login(correo="c@example.com").status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        self.assertEqual(
+            self._login(correo="c@example.com", ip="10.0.0.9").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    @override_settings(LOGIN_INTENTOS_CORREO=100, LOGIN_INTENTOS_IP=2)
+    def test_x_forwarded_for_no_evita_el_limite_por_ip(self):
+        for indice in range(2):
+            self.client.post(
+                self.url,
+                {"email": f"{indice}@example.com", "password": "x"},
+                format="json",
+                REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=f"203.0.113.{indice}",
+            )
+        response = self.client.post(
+            self.url,
+            {"email": "z@example.com", "password": "x"},
+            format="json",
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR="203.0.113.99",
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_contador_por_ventana(self):
+        self.assertEqual(limites_login.consumir("prueba", 2, 60, ahora=120.0), 0.0)
+        self.assertEqual(limites_login.consumir("prueba", 2, 60, ahora=150.0), 0.0)
+        self.assertEqual(limites_login.consumir("prueba", 2, 60, ahora=170.0), 10.0)
+        self.assertEqual(limites_login.consumir("prueba", 2, 60, ahora=180.0), 0.0)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+    )
+    def test_login_actualiza_hash_de_hasher_anterior(self):
+        Usuario.objects.filter(pk=self.usuario.pk).update(
+            contrasena=make_password("clave-segura", hasher="md5")
+        )
+        # Un hash de otro hasher configurado no se vuelve a hashear al guardar.
+        usuario = Usuario.objects.get(pk=self.usuario.pk)
+        usuario.save()
+        self.assertTrue(Usuario.objects.get(pk=usuario.pk).contrasena.startswith("md5$"))
+
+        response = self._login(contrasena="clave-segura")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contrasena = Usuario.objects.get(pk=usuario.pk).contrasena
+        self.assertTrue(contrasena.startswith("pbkdf2_sha256$"))
+        self.assertTrue(Usuario.objects.get(pk=usuario.pk).check_password("clave-segura"))
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ImportarUsuariosTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.existente = Usuario.objects.create(
+            nombre_completo="Alumno Existente",
+            correo="existente@example.com",
+            rut="11111111-1",
+            rol="alumno",
+            contrasena="original",
+        )
+
+    def _archivo(self, nombre, contenido):
+        ruta = Path(self.directorio.name) / nombre
+        ruta.write_text(contenido, encoding="utf-8")
+        return str(ruta)
+
+    def _importar(self, ruta, **opciones):
+        salida, errores = io.StringIO(), io.StringIO()
+        opciones.setdefault("procesos", 0)
+        call_command("importar_usuarios", ruta, stdout=salida, stderr=errores, **opciones)
+        return salida.getvalue(), errores.getvalue()
+
+    def test_importa_csv_normalizando_y_actualizando_por_correo(self):
+        ruta = self._archivo(
+            "usuarios.csv",
+            "nombre,correo,rut,rol,carrera,contrasena,docente_guia\n"
+            "Docente Guía,DOCENTE.GUIA@example.com,12.345.678-5,docente,,clave1,\n"
+            "Alumno Nuevo,alumno.nuevo@example.com,7.654.321-6,alumno,"
+            "ingeniería civil industrial,clave2,docente.guia@example.com\n"
+            "Alumno Renombrado,existente@example.com,11.111.111-1,alumno,,otra,\n"
+            "Sin Correo,,,alumno,,clave3,\n"
+            "RUT Malo,rut.malo@example.com,12.345.678-9,alumno,,clave4,\n"
+            "RUT Repetido,repetido@example.com,12345678-5,alumno,,clave5,\n",
+        )
+
+        with CaptureQueriesContext(connection) as consultas:
+            salida, errores = self._importar(ruta, lote=2)
+
+        self.assertIn("Filas leídas: 6; creados: 2; actualizados: 1", salida)
+        self.assertIn("Línea 5: correo inválido", errores)
+        self.assertIn("Línea 6: dígito verificador incorrecto", errores)
+        self.assertIn("Línea 7: el RUT 12.345.678-5 ya pertenece a docente.guia@example.com", errores)
+        # Consultas por lote, no por fila.
+        self.assertLessEqual(len(consultas.captured_queries), 20)
+
+        docente = Usuario.objects.get(correo="docente.guia@example.com")
+        self.assertEqual(docente.rut, "12.345.678-5")
+        self.assertTrue(docente.contrasena.startswith("md5$"))
+        self.assertTrue(docente.check_password("clave1"))
+
+        alumno = Usuario.objects.get(correo="alumno.nuevo@example.com")
+        self.assertEqual(alumno.carrera, "Ing. Civil Industrial")
+        self.assertEqual(alumno.docente_guia_id, docente.pk)
+
+        self.existente.refresh_from_db()
+        self.assertEqual(self.existente.nombre_completo, "Alumno Renombrado")
+        # Sin --actualizar-contrasenas se conserva la contraseña existente.
+        self.assertTrue(self.existente.check_password("original"))
+        self.assertFalse(Usuario.objects.filter(correo="repetido@example.com").exists())
+
+    def test_rut_existente_se_compara_sin_formato(self):
+        ruta = self._archivo(
+            "usuarios.csv",
+            "nombre,correo,rut,rol,contrasena\n"
+            "Otro Alumno,otro@example.com,11.111.111-1,alumno,clave\n",
+        )
+
+        _, errores = self._importar(ruta)
+
+        self.assertIn("el RUT 11.111.111-1 ya pertenece a existente@example.com", errores)
+        self.assertFalse(Usuario.objects.filter(correo="otro@example.com").exists())
+
+    def test_jsonl_en_procesos_y_simulacion(self):
+        filas = [
+            {"nombre_completo": f"Alumno {indice}", "correo": f"jsonl{indice}@example.com",
+             "rol": "alumno", "password": f"clave{indice}"}
+            for indice in range(4)
+        ]
+        contenido = "\n".join(json.dumps(fila) for fila in filas) + "\nno es json\n"
+        ruta = self._archivo("usuarios.jsonl", contenido)
+
+        salida, _ = self._importar(ruta, dry_run=True)
+        self.assertIn("creados: 4", salida)
+        self.assertFalse(Usuario.objects.filter(correo__startswith="jsonl").exists())
+
+        salida, errores = self._importar(ruta, procesos=2, lote=3)
+        self.assertIn("creados: 4", salida)
+        self.assertIn("Línea 5: la línea no es un objeto JSON", errores)
+        for indice in range(4):
+            usuario = Usuario.objects.get(correo=f"jsonl{indice}@example.com")
+            self.assertTrue(usuario.check_password(f"clave{indice}"))
+
+
+class DirectorioUsuariosTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        directorio.olvidar()
+        self.coordinador = Usuario.objects.create(
+            nombre_completo="Coordinación Directorio",
+            correo="coordinacion.directorio@example.com",
+            rol="coordinador",
+            contrasena="clave",
+        )
+        self.usuarios = [
+            Usuario.objects.create(
+                nombre_completo=f"Alumno Directorio {indice}",
+                correo=f"alumno.directorio{indice}@example.com",
+                rol="alumno",
+                carrera="Computación",
+                contrasena="clave",
+            )
+            for indice in range(5)
+        ]
+        Notificacion.objects.bulk_create(
+            Notificacion(usuario=usuario, titulo="Aviso", mensaje="Mensaje", tipo="general")
+            for usuario in self.usuarios
+        )
+        self.url = reverse("lista-notificaciones")
+
+    def _listar(self):
+        _autenticar(self.client, self.coordinador)
+        return self.client.get(self.url, {"coordinador": self.coordinador.pk})
+
+    def test_resumenes_sin_join_y_con_una_consulta_por_listado(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self._listar()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sql = [consulta["sql"] for consulta in consultas.captured_queries]
+        self.assertFalse(any("JOIN" in sentencia for sentencia in sql))
+        # Notificaciones + todos los resúmenes en una sola consulta.
+        self.assertEqual(len(sql), 2)
+        resumen = next(
+            item["usuario"] for item in response.data if item["usuario"]["id"] == self.usuarios[0].pk
+        )
+        self.assertEqual(
+            resumen,
+            {
+                "id": self.usuarios[0].pk,
+                "nombre": "Alumno Directorio 0",
+                "correo": "alumno.directorio0@example.com",
+                "carrera": "Computación",
+                "telefono": None,
+                "rol": "alumno",
+            },
+        )
+
+        with CaptureQueriesContext(connection) as consultas:
+            self._listar()
+        self.assertEqual(len(consultas.captured_queries), 1)
+
+    def test_listado_de_temas_resuelve_creadores_y_responsables_juntos(self):
+        docentes = [
+            Usuario.objects.create(
+                nombre_completo=f"Docente Directorio {indice}",
+                correo=f"docente.directorio{indice}@example.com",
+                rol="docente",
+                contrasena="clave",
+            )
+            for indice in range(6)
+        ]
+        for indice, docente in enumerate(docentes):
+            TemaDisponible.objects.create(
+                titulo=f"Tema Directorio {indice}",
+                carrera="Computación",
+                descripcion="Descripción",
+                requisitos=[],
+                cupos=2,
+                created_by=self.coordinador if indice % 2 else docente,
+                docente_responsable=docente if indice % 2 else None,
+            )
+        temas = list(TemaDisponible.objects.order_by("pk"))
+        directorio.olvidar()
+
+        with CaptureQueriesContext(connection) as consultas:
+            datos = TemaDisponibleSerializer(temas, many=True).data
+
+        sql = [consulta["sql"] for consulta in consultas.captured_queries]
+        self.assertEqual(sum('FROM "usuarios"' in sentencia for sentencia in sql), 1)
+        self.assertEqual(
+            [tema["docenteACargo"]["nombre"] for tema in datos],
+            [docente.nombre_completo for docente in docentes],
+        )
+
+    def test_guardar_usuario_invalida_su_resumen(self):
+        self._listar()
+        usuario = self.usuarios[1]
+        usuario.nombre_completo = "Nombre Nuevo"
+        usuario.save()
+
+        response = self._listar()
+        nombres = {item["usuario"]["id"]: item["usuario"]["nombre"] for item in response.data}
+        self.assertEqual(nombres[usuario.pk], "Nombre Nuevo")
+
+        # Actualizar solo el hash de la contraseña no descarta el resumen.
+        usuario.contrasena = "otra"
+        usuario.save(update_fields=["contrasena"])
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertIsNotNone(directorio.obtener(usuario.pk))
+        self.assertEqual(len(consultas.captured_queries), 0)
+
+    @override_settings(DIRECTORIO_USUARIOS_REVISION=0, DIRECTORIO_USUARIOS_MAX=3)
+    def test_version_compartida_y_capacidad(self):
+        local = DirectorioUsuarios()
+        ids = [usuario.pk for usuario in self.usuarios]
+        self.assertEqual(set(local.obtener_muchos(ids)), set(ids))
+        self.assertEqual(len(local), 3)
+
+        # Otro proceso modificó un usuario: la versión de la caché cambió.
+        Usuario.objects.filter(pk=ids[-1]).update(nombre_completo="Cambiado en otro proceso")
+        cache.incr(CLAVE_VERSION)
+        self.assertEqual(local.obtener(ids[-1])["nombre"], "Cambiado en otro proceso")
+        self.assertEqual(len(local), 1)
+
+    def test_resumenes_vencen_aunque_la_cache_no_sea_compartida(self):
+        local = DirectorioUsuarios()
+        usuario = self.usuarios[0]
+        local.obtener(usuario.pk)
+        # Un cambio que no movió la versión (otro proceso con caché local).
+        Usuario.objects.filter(pk=usuario.pk).update(nombre_completo="Sin aviso")
+        self.assertEqual(local.obtener(usuario.pk)["nombre"], "Alumno Directorio 0")
+
+        with override_settings(DIRECTORIO_USUARIOS_EDAD_MAXIMA=0):
+            self.assertEqual(local.obtener(usuario.pk)["nombre"], "Sin aviso")
+
+
+class MetricasTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        metricas.reiniciar()
+        self.coordinador = Usuario.objects.create(
+            nombre_completo="Coordinación Métricas",
+            correo="coordinacion.metricas@example.com",
+            rol="coordinador",
+            contrasena="clave",
+        )
+
+    @override_settings(METRICAS_ENCABEZADOS=True, METRICAS_PUBLICAS=True)
+    def test_encabezados_y_exportacion_por_ruta(self):
+        url = reverse("lista-notificaciones")
+        with CaptureQueriesContext(connection) as consultas:
+            _autenticar(self.client, self.coordinador)
+            response = self.client.get(url, {"coordinador": self.coordinador.pk})
+        # El log de consultas se reinicia con cada solicitud: se cuenta antes.
+        cantidad = len(consultas.captured_queries)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Query-Count"], str(cantidad))
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.client.get(url, {"coordinador": self.coordinador.pk})
+
+        metrics = self.client.get("/metrics")
+        self.assertEqual(metrics.status_code, status.HTTP_200_OK)
+        self.assertTrue(metrics["Content-Type"].startswith("text/plain; version=0.0.4"))
+        texto = metrics.content.decode()
+        self.assertIn(
+            'api_solicitudes_total{ruta="lista-notificaciones",metodo="GET",estado="200"} 2',
+            texto,
+        )
+        self.assertIn(
+            'api_latencia_segundos_bucket{ruta="lista-notificaciones",metodo="GET",le="+Inf"} 2',
+            texto,
+        )
+        self.assertIn(
+            f'api_consultas_sql_total{{ruta="lista-notificaciones",metodo="GET"}} {2 * cantidad}',
+            texto,
+        )
+
+    @override_settings(METRICAS_ENCABEZADOS=False, METRICAS_TOKEN="secreto")
+    def test_sin_encabezados_y_token_requerido(self):
+        _autenticar(self.client, self.coordinador)
+        response = self.client.get(reverse("lista-notificaciones"), {"coordinador": self.coordinador.pk})
+        self.assertNotIn("X-Query-Count", response)
+
+        self.client.credentials()
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN)
+        autorizado = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secreto")
+        self.assertEqual(autorizado.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICAS_TOKEN="")
+    def test_sin_token_metrics_no_es_publico_por_defecto(self):
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(METRICAS_PUBLICAS=True):
+            self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_200_OK)
+
+    def test_hilos_terminados_se_consolidan(self):
+        hilos = [
+            threading.Thread(target=metricas.registrar, args=("GET", "prueba", 200, 0.02))
+            for _ in range(3)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        registro = metricas.instantanea()[("GET", "prueba")]
+        self.assertEqual(registro.solicitudes, 3)
+        self.assertEqual(registro.buckets[metricas.LIMITES_LATENCIA.index(0.025)], 3)
+
+
+# El comando usa `localhost` como host, igual que `benchmark_login`.
+@override_settings(
+    ALLOWED_HOSTS=["localhost"],
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class BenchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_mide_todas_las_rutas_con_datos_sinteticos(self):
+        salida = io.StringIO()
+        call_command(
+            "bench",
+            escala=0.002,
+            repeticiones=2,
+            calentamiento=0,
+            base_actual=True,
+            stdout=salida,
+        )
+        informe = json.loads(salida.getvalue())
+
+        self.assertEqual(informe["sinCaso"], [])
+        self.assertEqual(informe["escala"]["alumnos"], 40)
+        medidas = {(fila["metodo"], fila["ruta"], fila["variante"]): fila for fila in informe["rutas"]}
+        self.assertEqual(medidas[("POST", "login", "")]["estados"], {"200": 2})
+        self.assertEqual(medidas[("GET", "docente-evaluacion-entregas-zip", "")]["estados"], {"200": 2})
+        # El proxy de la firma apunta a una URL inalcanzable a propósito.
+        self.assertEqual(medidas[("GET", "proxy-firma-coordinador", "")]["estados"], {"400": 2})
+        for fila in informe["rutas"]:
+            if fila["ruta"] == "proxy-firma-coordinador":
+                continue
+            for codigo in fila["estados"]:
+                self.assertLess(int(codigo), 400, fila)
+            self.assertGreaterEqual(fila["p95Ms"], fila["p50Ms"])
+
+        # Las escrituras se revierten: la base queda como la dejó la generación.
+        self.assertFalse(TemaDisponible.objects.filter(titulo="Tema del benchmark").exists())
+        self.assertEqual(Usuario.objects.filter(rol="alumno").count(), 40)
+
+    def test_base_actual_con_datos_se_rechaza(self):
+        Usuario.objects.create(
+            nombre_completo="Usuario Real",
+            correo="usuario.real@example.com",
+            rol="alumno",
+            contrasena="clave",
+        )
+        with mock.patch("api.management.commands.bench.generar_datos") as generar:
+            with self.assertRaises(CommandError):
+                call_command("bench", base_actual=True, stdout=io.StringIO())
+        generar.assert_not_called()
+
+
+# Consultas adicionales permitidas al pasar de 1 a 50 filas en un listado.
+# Un listado sin N+1 no necesita entrada: el presupuesto por defecto es 0.
+PRESUPUESTO_CONSULTAS: dict[str, int] = {}
+
+
+def _sql_normalizado(sql: str) -> str:
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    return re.sub(r"\(\?(?:, \?)*\)", "(...)", sql)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class PresupuestoConsultasTests(APITestCase):
+    """Cada listado hace las mismas consultas con 1 fila que con 50."""
+
+    carrera = "Ingeniería Civil en Computación"
+
+    def setUp(self):
+        cache.clear()
+        self.indice = 0
+        self.coordinador = Usuario.objects.create(
+            nombre_completo="Coordinación Presupuesto",
+            correo="coordinacion.presupuesto@example.com",
+            rol="coordinador",
+            carrera=self.carrera,
+            contrasena="clave",
+        )
+        self.docente = Usuario.objects.create(
+            nombre_completo="Docente Presupuesto",
+            correo="docente.presupuesto@example.com",
+            rol="docente",
+            carrera=self.carrera,
+            contrasena="clave",
+        )
+        self.alumno = self._alumno()
+
+    # -- Datos ----------------------------------------------------------
+
+    def _siguiente(self) -> int:
+        self.indice += 1
+        return self.indice
+
+    def _alumno(self) -> Usuario:
+        indice = self._siguiente()
+        return Usuario.objects.create(
+            nombre_completo=f"Alumno Presupuesto {indice}",
+            correo=f"alumno.presupuesto{indice}@example.com",
+            rut=f"{20_000_000 + indice}-0",
+            rol="alumno",
+            carrera=self.carrera,
+            docente_guia=self.docente,
+            contrasena="clave",
+        )
+
+    def _docente(self) -> Usuario:
+        indice = self._siguiente()
+        return Usuario.objects.create(
+            nombre_completo=f"Docente Presupuesto {indice}",
+            correo=f"docente.presupuesto{indice}@example.com",
+            rol="docente",
+            carrera=self.carrera,
+            contrasena="clave",
+        )
+
+    def _tema(
+        self, alumno: Usuario | None = None, docente: Usuario | None = None
+    ) -> TemaDisponible:
+        # Creador y responsable distintos en cada tema: si los usuarios se
+        # resolvieran por fila, las consultas crecerían con el listado.
+        tema = TemaDisponible.objects.create(
+            titulo=f"Tema Presupuesto {self._siguiente()}",
+            carrera=self.carrera,
+            descripcion="Descripción",
+            cupos=2,
+            created_by=self._docente(),
+            docente_responsable=docente or self._docente(),
+        )
+        InscripcionTema.objects.create(
+            tema=tema, alumno=alumno or self._alumno(), activo=True, es_responsable=True
+        )
+        return tema
+
+    def _carta(self, alumno: Usuario) -> SolicitudCartaPractica:
+        return SolicitudCartaPractica.objects.create(
+            alumno=alumno,
+            coordinador=self.coordinador,
+            alumno_rut=alumno.rut,
+            alumno_nombres=alumno.nombre_completo,
+            alumno_apellidos="Prueba",
+            alumno_carrera=alumno.carrera,
+            practica_jefe_directo="Jefe",
+            practica_cargo_alumno="Practicante",
+            practica_fecha_inicio=date.today(),
+            practica_empresa_rut="76543210-9",
+            practica_sector="Tecnología",
+            practica_duracion_horas=320,
+            dest_nombres="Destinatario",
+            dest_apellidos="Empresa",
+            dest_cargo="Gerente",
+            dest_empresa=f"Empresa {alumno.pk}",
+            escuela_id="1",
+            escuela_nombre="Escuela",
+            escuela_direccion="Dirección",
+            escuela_telefono="123",
+        )
+
+    def _evaluacion(self, tema: TemaDisponible) -> EvaluacionGrupoDocente:
+        evaluacion = EvaluacionGrupoDocente.objects.create(
+            docente=self.docente,
+            tema=tema,
+            grupo_nombre=tema.titulo,
+            titulo=f"Evaluación {self._siguiente()}",
+            fecha=date.today() + timedelta(days=7),
+        )
+        for inscripcion in tema.inscripciones.filter(activo=True):
+            EvaluacionEntregaAlumno.objects.create(
+                evaluacion=evaluacion,
+                alumno_id=inscripcion.alumno_id,
+                titulo="Entrega",
+                archivo="evaluaciones/entregas/presupuesto.pdf",
+                nota=Decimal("5.5"),
+                estado_revision="revisada",
+            )
+        return evaluacion
+
+    # -- Medición -------------------------------------------------------
+
+    def _consultas(self, url: str, parametros: dict) -> list[dict]:
+        # Cada medición parte sin resúmenes de usuarios ni cachés.
+        cache.clear()
+        directorio.olvidar()
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(url, parametros)
+        consultas = list(contexto.captured_queries)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content[:300])
+        return consultas
+
+    def _verificar(self, ruta: str, sembrar, parametros: dict, **kwargs) -> None:
+        url = reverse(ruta, kwargs=kwargs or None)
+        actor = next(
+            (parametros[clave] for clave in ("usuario", "alumno", "docente", "coordinador") if clave in parametros),
+            None,
+        )
+        if actor is not None:
+            _autenticar(self.client, Usuario.objects.get(pk=actor))
+        sembrar()
+        una = self._consultas(url, parametros)
+        for _ in range(49):
+            sembrar()
+        cincuenta = self._consultas(url, parametros)
+
+        extra = len(cincuenta) - len(una)
+        presupuesto = PRESUPUESTO_CONSULTAS.get(ruta, 0)
+        if extra <= presupuesto:
+            return
+
+        antes = Counter(_sql_normalizado(consulta["sql"]) for consulta in una)
+        despues = Counter(_sql_normalizado(consulta["sql"]) for consulta in cincuenta)
+        repetidas = [
+            f"  {cantidad - antes[sql]:+d}x {sql[:400]}"
+            for sql, cantidad in despues.most_common()
+            if cantidad > antes[sql]
+        ]
+        self.fail(
+            f"{ruta}: {len(una)} consultas con 1 fila y {len(cincuenta)} con 50 "
+            f"(presupuesto: +{presupuesto}). Consultas que crecen con las filas:\n"
+            + "\n".join(repetidas[:10])
+        )
+
+    # -- Listados -------------------------------------------------------
+
+    def test_temas_disponibles(self):
+        self._verificar("temas-disponibles", self._tema, {"usuario": self.coordinador.pk})
+
+    def test_temas_disponibles_para_alumno(self):
+        self._verificar("temas-disponibles", self._tema, {"alumno": self.alumno.pk})
+
+    def test_docentes(self):
+        def sembrar():
+            indice = self._siguiente()
+            Usuario.objects.create(
+                nombre_completo=f"Docente {indice}",
+                correo=f"docente{indice}@example.com",
+                rol="docente",
+                carrera=self.carrera,
+                contrasena="clave",
+            )
+
+        self._verificar("lista-docentes", sembrar, {"carrera": self.carrera})
+
+    def test_propuestas(self):
+        def sembrar():
+            PropuestaTema.objects.create(
+                alumno=self._alumno(),
+                docente=self.docente,
+                titulo="Propuesta",
+                objetivo="Objetivo",
+                descripcion="Descripción",
+                rama="Desarrollo",
+                preferencias_docentes=[self.docente.pk],
+            )
+
+        self._verificar("propuestas", sembrar, {"docente": self.docente.pk})
+
+    def test_notificaciones(self):
+        def sembrar():
+            Notificacion.objects.create(usuario=self.alumno, titulo="Aviso", mensaje="Mensaje")
+
+        self._verificar("lista-notificaciones", sembrar, {"usuario": self.alumno.pk})
+
+    def test_solicitudes_carta(self):
+        self._verificar(
+            "listar-solicitudes-carta-practica",
+            lambda: self._carta(self._alumno()),
+            {"coordinador": self.coordinador.pk},
+        )
+
+    def test_documentos_practica(self):
+        def sembrar():
+            PracticaDocumento.objects.create(
+                carrera=self.carrera,
+                nombre="Reglamento",
+                archivo=f"practicas/documentos/{self._siguiente()}.pdf",
+                uploaded_by=self.coordinador,
+            )
+
+        self._verificar("gestionar-documentos-practica", sembrar, {"coordinador": self.coordinador.pk})
+
+    def test_entregas_evaluacion_practica(self):
+        pauta = PracticaEvaluacion.objects.create(
+            carrera=self.carrera,
+            nombre="Pauta",
+            archivo="practicas/evaluaciones/pauta.pdf",
+            uploaded_by=self.coordinador,
+        )
+
+        def sembrar():
+            alumno = self._alumno()
+            self._carta(alumno)
+            PracticaEvaluacionEntrega.objects.create(
+                evaluacion=pauta, alumno=alumno, archivo=f"practicas/{alumno.pk}.pdf"
+            )
+
+        self._verificar(
+            "listar-entregas-evaluacion-practica", sembrar, {"coordinador": self.coordinador.pk}
+        )
+
+    def test_solicitudes_reunion(self):
+        def sembrar():
+            alumno = self._alumno()
+            self._tema(alumno)
+            solicitud = SolicitudReunion.objects.create(
+                alumno=alumno, docente=self.docente, motivo="Avance"
+            )
+            TrazabilidadReunion.objects.create(
+                solicitud=solicitud,
+                usuario=alumno,
+                tipo="creacion_solicitud",
+                estado_nuevo="pendiente",
+            )
+
+        self._verificar("gestionar-solicitudes-reunion", sembrar, {"docente": self.docente.pk})
+
+    def test_reuniones(self):
+        def sembrar():
+            alumno = self._alumno()
+            self._tema(alumno)
+            Reunion.objects.create(
+                alumno=alumno,
+                docente=self.docente,
+                fecha=date.today(),
+                hora_inicio="10:00",
+                hora_termino="10:30",
+                modalidad="online",
+                creado_por=self.docente,
+            )
+
+        self._verificar("gestionar-reuniones", sembrar, {"docente": self.docente.pk})
+
+    def test_evaluaciones_docente(self):
+        self._verificar(
+            "docente-evaluaciones",
+            lambda: self._evaluacion(self._tema()),
+            {"docente": self.docente.pk},
+        )
+
+    def test_grupos_activos_docente(self):
+        self._verificar(
+            "docente-grupos-activos",
+            lambda: self._tema(docente=self.docente),
+            {"docente": self.docente.pk},
+        )
+
+    def test_promedios_titulo(self):
+        self._verificar("coordinacion-promedios-titulo", lambda: self._evaluacion(self._tema()), {})
+
+    def test_evaluaciones_alumno(self):
+        tema = self._tema(self.alumno)
+        self._verificar(
+            "alumno-evaluaciones", lambda: self._evaluacion(tema), {"alumno": self.alumno.pk}
+        )
+
+
+class PerfiladoTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.alumno = Usuario.objects.create(
+            nombre_completo="Alumno Perfilado",
+            correo="alumno.perfilado@example.com",
+            rol="alumno",
+            contrasena="clave",
+        )
+        self.url = reverse("lista-notificaciones")
+
+    def test_solo_perfila_con_encabezado_firmado(self):
+        with override_settings(PERFILADO_DIRECTORIO=self.directorio.name, PERFILADO_MUESTREO=0):
+            _autenticar(self.client, self.alumno)
+            sin_firma = self.client.get(self.url, {"usuario": self.alumno.pk})
+            falsa = self.client.get(self.url, {"usuario": self.alumno.pk}, HTTP_X_PERFILAR="falsa")
+            firmada = self.client.get(
+                self.url, {"usuario": self.alumno.pk}, HTTP_X_PERFILAR=perfilado.firmar_perfilado()
+            )
+
+            self.assertNotIn("X-Perfil", sin_firma)
+            self.assertNotIn("X-Perfil", falsa)
+            self.assertEqual(firmada.status_code, status.HTTP_200_OK)
+            perfiles = perfilado.listar_perfiles()
+            self.assertEqual([perfil.archivo.name for perfil in perfiles], [firmada["X-Perfil"]])
+            self.assertEqual(perfiles[0].ruta, "lista-notificaciones")
+            self.assertEqual(perfiles[0].metodo, "GET")
+            self.assertGreater(perfiles[0].consultas, 0)
+
+            salida = io.StringIO()
+            call_command("perfiles", resumen=10, stdout=salida)
+        texto = salida.getvalue()
+        self.assertIn("lista-notificaciones", texto)
+        self.assertIn("Resumen de 1 perfiles", texto)
+        self.assertIn("views.py", texto)
+
+    def test_muestreo_y_desactivado_sin_directorio(self):
+        with override_settings(PERFILADO_DIRECTORIO=self.directorio.name, PERFILADO_MUESTREO=1.0):
+            _autenticar(self.client, self.alumno)
+            response = self.client.get(self.url, {"usuario": self.alumno.pk})
+        self.assertIn("X-Perfil", response)
+
+        self.client = APIClient()
+        with override_settings(PERFILADO_DIRECTORIO="", PERFILADO_MUESTREO=1.0):
+            response = self.client.get(self.url, {"usuario": self.alumno.pk})
+        self.assertNotIn("X-Perfil", response)
+        self.assertEqual(len(list(Path(self.directorio.name).glob("*.prof"))), 1)
+
+
+class ConsultasLentasTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        consultas_lentas.reiniciar()
+        self.addCleanup(consultas_lentas.reiniciar)
+        self.alumno = Usuario.objects.create(
+            nombre_completo="Alumno Consultas",
+            correo="alumno.consultas@example.com",
+            rol="alumno",
+            contrasena="clave",
+        )
+        self.url = reverse("lista-notificaciones")
+
+    def test_registra_vista_y_plan_una_vez_por_huella(self):
+        with override_settings(CONSULTAS_LENTAS_UMBRAL_MS=0.001, CONSULTAS_LENTAS_MAX_POR_MINUTO=1000):
+            with self.assertLogs("api.consultas_lentas", "WARNING") as registros:
+                _autenticar(self.client, self.alumno)
+                response = self.client.get(self.url, {"usuario": self.alumno.pk})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            texto = "\n".join(registros.output)
+            self.assertIn("NotificacionListView", texto)
+            self.assertIn('FROM "notificaciones"', texto)
+            self.assertRegex(texto, r"Plan:\n\s*(SCAN|SEARCH)")
+
+            with self.assertNoLogs("api.consultas_lentas", "WARNING"):
+                self.client.get(self.url, {"usuario": self.alumno.pk})
+
+    def test_huella_ignora_literales_y_listas(self):
+        self.assertEqual(
+            consultas_lentas.huella_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s) AND "n" = \'a\''),
+            consultas_lentas.huella_sql('SELECT *  FROM "t" WHERE "id" IN (%s) AND "n" = \'b\''),
+        )
+        self.assertNotEqual(
+            consultas_lentas.huella_sql('SELECT * FROM "t"'),
+            consultas_lentas.huella_sql('SELECT * FROM "u"'),
+        )
+
+    def test_apagado_con_umbral_cero(self):
+        with override_settings(CONSULTAS_LENTAS_UMBRAL_MS=0):
+            with self.assertNoLogs("api.consultas_lentas", "WARNING"):
+                _autenticar(self.client, self.alumno)
+                self.client.get(self.url, {"usuario": self.alumno.pk})
+
+
+class CacheLecturasTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        cache_lecturas.reiniciar_contadores()
+        self.coordinador = Usuario.objects.create(
+            nombre_completo="Coordinación Caché",
+            correo="coordinacion.cache@example.com",
+            rol="coordinador",
+            carrera="Computación",
+            contrasena="clave",
+        )
+        self.docente = Usuario.objects.create(
+            nombre_completo="Ana Docente",
+            correo="ana.cache@example.com",
+            rol="docente",
+            carrera="Computación",
+            contrasena="clave",
+        )
+
+    def test_docentes_se_cachean_hasta_la_siguiente_escritura(self):
+        url = reverse("lista-docentes")
+        primera = self.client.get(url, {"carrera": "Computación"})
+        with CaptureQueriesContext(connection) as consultas:
+            segunda = self.client.get(url, {"carrera": "Computación"})
+
+        self.assertEqual(segunda.json(), primera.json())
+        self.assertEqual(len(consultas.captured_queries), 0)
+        self.assertEqual(cache_lecturas.contadores()["docentes"], (1, 1))
+
+        # Actualizar solo la contraseña no cambia el listado.
+        self.docente.contrasena = "otra"
+        self.docente.save(update_fields=["contrasena"])
+        self.client.get(url, {"carrera": "Computación"})
+        self.assertEqual(cache_lecturas.contadores()["docentes"], (2, 1))
+
+        Usuario.objects.create(
+            nombre_completo="Bruno Docente",
+            correo="bruno.cache@example.com",
+            rol="docente",
+            carrera="Computación",
+            contrasena="clave",
+        )
+        tercera = self.client.get(url, {"carrera": "Computación"})
+        self.assertEqual(
+            [docente["nombre"] for docente in tercera.json()], ["Ana Docente", "Bruno Docente"]
+        )
+        self.assertEqual(cache_lecturas.contadores()["docentes"], (2, 2))
+
+    @override_settings(METRICAS_PUBLICAS=True)
+    def test_evaluacion_practica_vigente_y_contadores_en_metrics(self):
+        url = reverse("listar-evaluacion-practica")
+        self.assertIsNone(self.client.get(url, {"carrera": "Computación"}).json()["item"])
+        # Una búsqueda sin resultado también queda en caché.
+        self.assertIsNone(self.client.get(url, {"carrera": "Computación"}).json()["item"])
+
+        PracticaEvaluacion.objects.create(
+            carrera="Computación",
+            nombre="Pauta",
+            archivo="practicas/evaluaciones/pauta.pdf",
+            uploaded_by=self.coordinador,
+        )
+        item = self.client.get(url, {"carrera": "Computación"}).json()["item"]
+        self.assertEqual(item["nombre"], "Pauta")
+        self.assertEqual(item["uploadedBy"]["id"], self.coordinador.pk)
+        self.assertEqual(self.client.get(url, {"carrera": "Computación"}).json()["item"], item)
+
+        texto = self.client.get("/metrics").content.decode()
+        self.assertIn('api_cache_aciertos_total{espacio="evaluacion_practica"} 2', texto)
+        # La primera búsqueda también calcula las carreras y los ids compatibles.
+        self.assertIn('api_cache_fallos_total{espacio="evaluacion_practica"} 4', texto)
+
+    def test_conteos_se_invalidan_por_modelo(self):
+        calculos = iter(range(1, 10))
+
+        def total(etiqueta):
+            return conteos.CONTEOS.obtener(
+                (etiqueta, {}), lambda: next(calculos), ambitos=(etiqueta,)
+            )
+
+        self.assertEqual(total("api.practicadocumento"), 1)
+        self.assertEqual(total("api.solicitudcartapractica"), 2)
+
+        conteos.CONTEOS.invalidar("api.practicadocumento")
+        self.assertEqual(total("api.practicadocumento"), 3)
+        self.assertEqual(total("api.solicitudcartapractica"), 2)
+
+        # Sin ámbitos se invalida el espacio completo.
+        conteos.CONTEOS.invalidar()
+        self.assertEqual(total("api.solicitudcartapractica"), 4)
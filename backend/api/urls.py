@@ -20,6 +20,7 @@ from .views import (
     DocenteListView,
     NotificacionListView,
     marcar_notificacion_leida,
+    dashboard_usuario,
     gestionar_documentos_practica,
     eliminar_documento_practica,
     proxy_firma_coordinador,
@@ -31,10 +32,16 @@ from .views import (
     actualizar_nota_entrega_practica,
     DocenteEvaluacionListCreateView,
     DocenteEvaluacionEntregaUpdateView,
+    descargar_entregas_evaluacion_zip,
     DocenteGruposActivosListView,
     CoordinacionPromediosTituloView,
+    estadisticas_notas_titulo,
     AlumnoEvaluacionListView,
     AlumnoEvaluacionEntregaListCreateView,
+    iniciar_subida_entrega_alumno,
+    iniciar_subida_informe_corregido,
+    gestionar_subida_entrega,
+    finalizar_subida_entrega,
 )
 
 urlpatterns = [
@@ -72,6 +79,7 @@ urlpatterns = [
         marcar_notificacion_leida,
         name="marcar-notificacion-leida",
     ),
+    path("dashboard/<str:rol>/", dashboard_usuario, name="dashboard-usuario"),
     re_path(
         r"^practicas/solicitudes-carta/?$",
         crear_solicitud_carta_practica,
@@ -147,6 +155,11 @@ urlpatterns = [
         CoordinacionPromediosTituloView.as_view(),
         name="coordinacion-promedios-titulo",
     ),
+    path(
+        "coordinacion/titulo/estadisticas/",
+        estadisticas_notas_titulo,
+        name="coordinacion-estadisticas-titulo",
+    ),
     path(
         "practicas/documentos/",
         gestionar_documentos_practica,
@@ -182,6 +195,11 @@ urlpatterns = [
         DocenteEvaluacionListCreateView.as_view(),
         name="docente-evaluaciones",
     ),
+    path(
+        "docentes/evaluaciones/<int:pk>/entregas.zip",
+        descargar_entregas_evaluacion_zip,
+        name="docente-evaluacion-entregas-zip",
+    ),
     path(
         "docentes/grupos/activos/",
         DocenteGruposActivosListView.as_view(),
@@ -202,4 +220,24 @@ urlpatterns = [
         DocenteEvaluacionEntregaUpdateView.as_view(),
         name="docente-evaluacion-actualizar-entrega",
     ),
-]
\ No newline at end of file
+    path(
+        "alumnos/evaluaciones/<int:pk>/entregas/subidas/",
+        iniciar_subida_entrega_alumno,
+        name="alumno-evaluacion-subidas",
+    ),
+    path(
+        "docentes/evaluaciones/entregas/<int:pk>/subidas/",
+        iniciar_subida_informe_corregido,
+        name="docente-evaluacion-entrega-subidas",
+    ),
+    path(
+        "evaluaciones/subidas/<uuid:token>/",
+        gestionar_subida_entrega,
+        name="subida-entrega",
+    ),
+    path(
+        "evaluaciones/subidas/<uuid:token>/finalizar/",
+        finalizar_subida_entrega,
+        name="finalizar-subida-entrega",
+    ),
+]
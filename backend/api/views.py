@@ -7,29 +7,36 @@ import re
 import textwrap
 import unicodedata
 import zlib
+from datetime import date
 from typing import Any
-from urllib import error as urllib_error
-from urllib import request as urllib_request
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.core.mail import EmailMessage
 
-from django.db import IntegrityError, transaction
-from django.db.models import Q, Value, Prefetch, Count, Avg, OuterRef, Subquery
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q, Value, Prefetch
 from django.db.models.functions import Replace
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.http import parse_etags
 from django.utils.text import slugify
 from django.http import QueryDict
 
 
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    parser_classes,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.parsers import FormParser, MultiPartParser, JSONParser
 from rest_framework.permissions import AllowAny
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 try:  # pragma: no cover - dependencia opcional en tiempo de ejecución
     Image = importlib.import_module("PIL.Image")
@@ -53,6 +60,23 @@ from .models import (
     Usuario,
     EvaluacionGrupoDocente,
     EvaluacionEntregaAlumno,
+    SubidaEntregaParcial,
+)
+from . import cache_lecturas
+from .archivos import base_absoluta
+from .autenticacion import emitir_token
+from .conteos import contar_total
+from .dashboard import ROLES as ROLES_DASHBOARD, obtener_dashboard
+from .estadisticas import invalidar_estadisticas_notas, obtener_estadisticas_notas
+from .exportaciones import generar_zip_entregas
+from .limites_login import LimiteIntentosLogin
+from .firmas_remotas import FirmaRemotaError, obtener_cache_firmas
+from .subidas import (
+    SubidaError,
+    abrir_archivo_finalizado,
+    descartar_subida,
+    escribir_fragmento,
+    iniciar_subida,
 )
 from .notifications import (
     notificar_cupos_completados,
@@ -88,6 +112,8 @@ from .serializers import (
     EvaluacionEntregaAlumnoSerializer,
     DocenteGrupoActivoSerializer,
     PromedioGrupoTituloSerializer,
+    SubidaEntregaParcialCreateSerializer,
+    SubidaEntregaParcialSerializer,
 )
 
 
@@ -382,28 +408,59 @@ def _filtrar_queryset_por_carrera(
     if not carrera:
         return queryset
 
+    if queryset.model is TemaDisponible:
+        # Los valores compatibles de toda la tabla sirven para cualquier
+        # queryset de temas: el filtro final los recorta igual.
+        carreras = cache_lecturas.CARRERAS_TEMAS.obtener(
+            (carrera, permitir_equivalencias),
+            lambda: _carreras_compatibles_en(
+                TemaDisponible.objects.all(),
+                carrera,
+                permitir_equivalencias=permitir_equivalencias,
+            ),
+        )
+    else:
+        carreras = _carreras_compatibles_en(
+            queryset, carrera, permitir_equivalencias=permitir_equivalencias
+        )
+    if carreras is None:
+        return queryset
+    if not carreras:
+        return queryset.none()
+
+    return queryset.filter(carrera__in=carreras)
+
+
+def _carreras_compatibles_en(
+    queryset,
+    carrera: str,
+    *,
+    permitir_equivalencias: bool = True,
+) -> list[str] | None:
+    """Valores distintos de `carrera` en `queryset` compatibles con `carrera`.
+
+    Las carreras distintas son pocas: compararlas en Python y filtrar con
+    `carrera__in` evita recorrer todas las filas. Devuelve `None` si `carrera`
+    no tiene términos con qué comparar.
+    """
+
     tokens_objetivo = _tokenizar_carrera(carrera)
     if not tokens_objetivo:
-        return queryset
+        return None
 
-    matching_ids = [
-        pk
-        for pk, carrera_tema in queryset.values_list("pk", "carrera")
+    return [
+        carrera_fila
+        for carrera_fila in queryset.order_by().values_list("carrera", flat=True).distinct()
         if (
-            _carreras_coinciden(carrera_tema, carrera)
+            _carreras_coinciden(carrera_fila, carrera)
             or (
                 permitir_equivalencias
-                and _carreras_equivalentes(carrera_tema, carrera)
+                and _carreras_equivalentes(carrera_fila, carrera)
             )
-            or _tokenizar_carrera(carrera_tema) == tokens_objetivo
+            or _tokenizar_carrera(carrera_fila) == tokens_objetivo
         )
     ]
 
-    if not matching_ids:
-        return queryset.none()
-
-    return queryset.filter(pk__in=matching_ids)
-
 
 def _sincronizar_propuestas_docentes() -> None:
     propuestas = (
@@ -461,11 +518,42 @@ def _obtener_usuario_por_id(valor: str | None) -> Usuario | None:
         return None
 
 
+def _usuario_autenticado(request) -> Usuario | None:
+    usuario = getattr(request, "user", None)
+    return usuario if isinstance(usuario, Usuario) else None
+
+
+def _obtener_solicitante(request, valor, *, rol: str | None = None) -> Usuario | None:
+    """Usuario que hace la solicitud, indicado por el parámetro `valor`.
+
+    Con token el usuario sale de `request.user` sin consultar la base: se usa
+    cuando `valor` es su propio id o, si no viene `valor`, cuando tiene el
+    `rol` pedido. Solo coordinación puede indicar el id de otro usuario. Sin
+    token se busca por `valor` mientras `PERMITIR_USUARIO_POR_PARAMETRO` esté
+    activo.
+    """
+
+    autenticado = _usuario_autenticado(request)
+    if autenticado is None:
+        if not getattr(settings, "PERMITIR_USUARIO_POR_PARAMETRO", False):
+            return None
+        return _obtener_usuario_por_id(valor)
+
+    usuario_id = _parse_int(valor)
+    if usuario_id is None:
+        return autenticado if rol in (None, autenticado.rol) else None
+    if usuario_id == autenticado.pk:
+        return autenticado
+    if autenticado.rol == "coordinador":
+        return _obtener_usuario_por_id(valor)
+    raise PermissionDenied("El usuario indicado no corresponde a la sesión.")
+
+
 def _obtener_usuario_para_temas(request) -> Usuario | None:
-    usuario = _obtener_usuario_por_id(request.query_params.get("usuario"))
+    usuario = _obtener_solicitante(request, request.query_params.get("usuario"))
     if usuario:
         return usuario
-    return _obtener_usuario_por_id(request.query_params.get("alumno"))
+    return _obtener_solicitante(request, request.query_params.get("alumno"), rol="alumno")
 
 
 def _validar_docente_asignado(alumno: Usuario | None, docente: Usuario | None) -> bool:
@@ -1246,7 +1334,9 @@ def _enviar_correo_carta_generada(solicitud: SolicitudCartaPractica) -> None:
     mensaje.send(fail_silently=False)
 
 @api_view(["POST"])
+@authentication_classes([])
 @permission_classes([AllowAny])
+@throttle_classes([LimiteIntentosLogin])
 def login_view(request):
     serializer = LoginSerializer(data=request.data)
     if not serializer.is_valid():
@@ -1265,9 +1355,11 @@ def login_view(request):
         "carrera": usuario.carrera,
         "id": usuario.id,
         "telefono": usuario.telefono,
+        "token": emitir_token(usuario),
     }, status=status.HTTP_200_OK)
 
 class TemaDisponibleListCreateView(generics.ListCreateAPIView):
+    # El creador y el docente responsable salen del directorio de usuarios.
     queryset = TemaDisponible.objects.all()
     serializer_class = TemaDisponibleSerializer
     permission_classes = [AllowAny]
@@ -1288,8 +1380,9 @@ class TemaDisponibleListCreateView(generics.ListCreateAPIView):
         responsable = serializer.validated_data.get("docente_responsable")
         objetivo = serializer.validated_data.pop("objetivo", None)
 
-        if not creador:
-            creador = _obtener_usuario_por_id(self.request.data.get("created_by"))
+        creador = _obtener_solicitante(
+            self.request, creador.pk if creador else self.request.data.get("created_by")
+        )
 
         if not creador:
             potencial = _obtener_usuario_para_temas(self.request)
@@ -1329,7 +1422,16 @@ class TemaDisponibleListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         _sincronizar_propuestas_docentes()
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().prefetch_related(
+            Prefetch(
+                "inscripciones",
+                queryset=InscripcionTema.objects.filter(activo=True)
+                .select_related("alumno")
+                .order_by("created_at"),
+                to_attr="inscripciones_activas",
+            )
+        )
+        queryset = TemaDisponibleSerializer.optimizar_queryset(queryset, self.request)
         usuario = _obtener_usuario_para_temas(self.request)
 
         if usuario:
@@ -1750,9 +1852,17 @@ class DocenteListView(generics.ListAPIView):
             queryset = queryset.filter(carrera__icontains=carrera)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        carrera = request.query_params.get("carrera") or ""
+        datos = cache_lecturas.DOCENTES.obtener(
+            (carrera,),
+            lambda: self.get_serializer(self.get_queryset(), many=True).data,
+        )
+        return Response(datos)
+
 
 class PropuestaTemaListCreateView(generics.ListCreateAPIView):
-    queryset = PropuestaTema.objects.select_related("alumno", "docente")
+    queryset = PropuestaTema.objects.all()
     permission_classes = [AllowAny]
 
     def get_serializer_class(self):
@@ -1855,8 +1965,13 @@ class NotificacionListView(generics.ListAPIView):
     permission_classes = [AllowAny]
 
     def get_queryset(self):
-        queryset = Notificacion.objects.select_related("usuario")
+        queryset = Notificacion.objects.all()
         usuario_id = self.request.query_params.get("usuario")
+        autenticado = _usuario_autenticado(self.request)
+        if autenticado and autenticado.rol != "coordinador":
+            if usuario_id and _parse_int(usuario_id) != autenticado.pk:
+                raise PermissionDenied("El usuario indicado no corresponde a la sesión.")
+            usuario_id = autenticado.pk
         if usuario_id:
             try:
                 usuario_id_int = int(usuario_id)
@@ -1877,12 +1992,45 @@ class NotificacionListView(generics.ListAPIView):
 @permission_classes([AllowAny])
 def marcar_notificacion_leida(request, pk: int):
     notificacion = get_object_or_404(Notificacion, pk=pk)
+    autenticado = _usuario_autenticado(request)
+    if autenticado and notificacion.usuario_id != autenticado.pk:
+        raise PermissionDenied("La notificación pertenece a otro usuario.")
     notificacion.leida = True
     notificacion.save(update_fields=["leida"])
     serializer = NotificacionSerializer(notificacion)
     return Response(serializer.data)
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def dashboard_usuario(request, rol: str):
+    if rol not in ROLES_DASHBOARD:
+        return Response(
+            {"detail": "Rol no reconocido."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    usuario = _obtener_solicitante(request, request.query_params.get("usuario"))
+    if not usuario:
+        return Response(
+            {"usuario": "Debe indicar un usuario válido."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if usuario.rol != rol:
+        return Response(
+            {"usuario": "El usuario no corresponde al rol solicitado."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def catalogo_temas():
+        temas = TemaDisponible.objects.all()
+        if usuario.rol == "alumno":
+            temas = _filtrar_queryset_por_carrera(temas, usuario.carrera)
+        return temas
+
+    return Response(obtener_dashboard(usuario, catalogo_temas))
+
+
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def crear_solicitud_carta_practica(request):
@@ -1949,6 +2097,7 @@ def crear_solicitud_carta_practica(request):
 @permission_classes([AllowAny])
 def listar_solicitudes_carta_practica(request):
     queryset = SolicitudCartaPractica.objects.all()
+    filtros: dict[str, Any] = {}
 
     coordinador_param = request.query_params.get("coordinador")
     if coordinador_param not in (None, ""):
@@ -1960,9 +2109,11 @@ def listar_solicitudes_carta_practica(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         queryset = queryset.filter(coordinador_id=coordinador_id)
+        filtros["coordinador"] = coordinador_id
 
     alumno_rut = (request.query_params.get("alumno_rut") or "").strip()
     if alumno_rut:
+        filtros["alumno_rut"] = alumno_rut
         rut_limpio = _limpiar_rut(alumno_rut)
         filtro_rut = Q(alumno_rut__iexact=alumno_rut)
         if rut_limpio:
@@ -1977,27 +2128,29 @@ def listar_solicitudes_carta_practica(request):
     estado = request.query_params.get("estado")
     if estado in {"pendiente", "aprobado", "rechazado"}:
         queryset = queryset.filter(estado=estado)
+        filtros["estado"] = estado
 
     termino = (request.query_params.get("q") or "").strip()
     if termino:
+        filtros["q"] = termino
         termino_normalizado = unicodedata.normalize("NFKD", termino)
         termino_ascii = termino_normalizado.encode("ascii", "ignore").decode("ascii")
-        filtros = Q(alumno_nombres__icontains=termino) | Q(alumno_apellidos__icontains=termino)
-        filtros |= Q(alumno_carrera__icontains=termino) | Q(dest_empresa__icontains=termino)
-        filtros |= Q(dest_nombres__icontains=termino) | Q(dest_apellidos__icontains=termino)
-        filtros |= Q(practica_jefe_directo__icontains=termino) | Q(practica_empresa_rut__icontains=termino)
-        filtros |= Q(alumno_rut__icontains=termino)
+        busqueda = Q(alumno_nombres__icontains=termino) | Q(alumno_apellidos__icontains=termino)
+        busqueda |= Q(alumno_carrera__icontains=termino) | Q(dest_empresa__icontains=termino)
+        busqueda |= Q(dest_nombres__icontains=termino) | Q(dest_apellidos__icontains=termino)
+        busqueda |= Q(practica_jefe_directo__icontains=termino) | Q(practica_empresa_rut__icontains=termino)
+        busqueda |= Q(alumno_rut__icontains=termino)
 
         if termino_ascii and termino_ascii != termino:
-            filtros |= Q(alumno_nombres__icontains=termino_ascii)
-            filtros |= Q(alumno_apellidos__icontains=termino_ascii)
-            filtros |= Q(alumno_carrera__icontains=termino_ascii)
-            filtros |= Q(dest_empresa__icontains=termino_ascii)
-            filtros |= Q(dest_nombres__icontains=termino_ascii)
-            filtros |= Q(dest_apellidos__icontains=termino_ascii)
-            filtros |= Q(practica_jefe_directo__icontains=termino_ascii)
-            filtros |= Q(practica_empresa_rut__icontains=termino_ascii)
-            filtros |= Q(alumno_rut__icontains=termino_ascii)
+            busqueda |= Q(alumno_nombres__icontains=termino_ascii)
+            busqueda |= Q(alumno_apellidos__icontains=termino_ascii)
+            busqueda |= Q(alumno_carrera__icontains=termino_ascii)
+            busqueda |= Q(dest_empresa__icontains=termino_ascii)
+            busqueda |= Q(dest_nombres__icontains=termino_ascii)
+            busqueda |= Q(dest_apellidos__icontains=termino_ascii)
+            busqueda |= Q(practica_jefe_directo__icontains=termino_ascii)
+            busqueda |= Q(practica_empresa_rut__icontains=termino_ascii)
+            busqueda |= Q(alumno_rut__icontains=termino_ascii)
 
         rut_termino = _limpiar_rut(termino)
         if rut_termino:
@@ -2006,9 +2159,9 @@ def listar_solicitudes_carta_practica(request):
                     Replace("alumno_rut", Value("."), Value("")), Value("-"), Value("")
                 )
             )
-            filtros |= Q(rut_sin_formato__icontains=rut_termino)
+            busqueda |= Q(rut_sin_formato__icontains=rut_termino)
 
-        queryset = queryset.filter(filtros)
+        queryset = queryset.filter(busqueda)
 
     try:
         page = int(request.query_params.get("page", 1))
@@ -2022,14 +2175,16 @@ def listar_solicitudes_carta_practica(request):
         size = 20
     size = max(1, min(size, 200))
 
-    total = queryset.count()
+    total, total_exacto = contar_total(queryset, filtros, estimar=True)
     offset = (page - 1) * size
     items = queryset[offset : offset + size]
 
     serializer = SolicitudCartaPracticaSerializer(
         items, many=True, context={"request": request}
     )
-    return Response({"items": serializer.data, "total": total})
+    return Response(
+        {"items": serializer.data, "total": total, "totalExacto": total_exacto}
+    )
 
 
 @api_view(["GET", "POST"])
@@ -2037,14 +2192,17 @@ def listar_solicitudes_carta_practica(request):
 def gestionar_solicitudes_reunion(request):
     if request.method == "GET":
         queryset = (
-            SolicitudReunion.objects.select_related("alumno", "docente")
-            .prefetch_related("trazabilidad__usuario")
+            SolicitudReunion.objects.prefetch_related("trazabilidad")
             .order_by("-creado_en")
         )
 
-        alumno = _obtener_usuario_por_id(request.query_params.get("alumno"))
-        docente = _obtener_usuario_por_id(request.query_params.get("docente"))
-        coordinador = _obtener_usuario_por_id(request.query_params.get("coordinador"))
+        alumno = _obtener_solicitante(request, request.query_params.get("alumno"), rol="alumno")
+        docente = _obtener_solicitante(
+            request, request.query_params.get("docente"), rol="docente"
+        )
+        coordinador = _obtener_solicitante(
+            request, request.query_params.get("coordinador"), rol="coordinador"
+        )
 
         if alumno:
             if alumno.rol != "alumno":
@@ -2082,7 +2240,9 @@ def gestionar_solicitudes_reunion(request):
     serializer = SolicitudReunionCreateSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    alumno = _obtener_usuario_por_id(serializer.validated_data.get("alumno"))
+    alumno = _obtener_solicitante(
+        request, serializer.validated_data.get("alumno"), rol="alumno"
+    )
     if not alumno or alumno.rol != "alumno":
         return Response(
             {"alumno": "El identificador de alumno no es válido."},
@@ -2143,7 +2303,9 @@ def aprobar_solicitud_reunion(request, pk: int):
     serializer = AprobarSolicitudReunionSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    docente = _obtener_usuario_por_id(serializer.validated_data.get("docente"))
+    docente = _obtener_solicitante(
+        request, serializer.validated_data.get("docente"), rol="docente"
+    )
     if not docente or docente.rol != "docente":
         return Response(
             {"docente": "El identificador del docente no es válido."},
@@ -2246,7 +2408,9 @@ def rechazar_solicitud_reunion(request, pk: int):
     serializer = RechazarSolicitudReunionSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    docente = _obtener_usuario_por_id(serializer.validated_data.get("docente"))
+    docente = _obtener_solicitante(
+        request, serializer.validated_data.get("docente"), rol="docente"
+    )
     if not docente or docente.rol != "docente":
         return Response(
             {"docente": "El identificador del docente no es válido."},
@@ -2291,14 +2455,18 @@ def rechazar_solicitud_reunion(request, pk: int):
 def gestionar_reuniones(request):
     if request.method == "GET":
         queryset = (
-            Reunion.objects.select_related("alumno", "docente", "solicitud")
-            .prefetch_related("trazabilidad__usuario")
+            Reunion.objects.select_related("solicitud")
+            .prefetch_related("trazabilidad")
             .order_by("-fecha", "-hora_inicio")
         )
 
-        alumno = _obtener_usuario_por_id(request.query_params.get("alumno"))
-        docente = _obtener_usuario_por_id(request.query_params.get("docente"))
-        coordinador = _obtener_usuario_por_id(request.query_params.get("coordinador"))
+        alumno = _obtener_solicitante(request, request.query_params.get("alumno"), rol="alumno")
+        docente = _obtener_solicitante(
+            request, request.query_params.get("docente"), rol="docente"
+        )
+        coordinador = _obtener_solicitante(
+            request, request.query_params.get("coordinador"), rol="coordinador"
+        )
 
         if alumno:
             if alumno.rol != "alumno":
@@ -2330,23 +2498,28 @@ def gestionar_reuniones(request):
         if estado in {"aprobada", "finalizada", "no_realizada", "reprogramada"}:
             queryset = queryset.filter(estado=estado)
 
-        serializer = ReunionSerializer(queryset, many=True)
+        queryset = ReunionSerializer.optimizar_queryset(queryset, request)
+        serializer = ReunionSerializer(queryset, many=True, context={"request": request})
         return Response(serializer.data)
 
     serializer = ReunionCreateSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    alumno = _obtener_usuario_por_id(serializer.validated_data.get("alumno"))
-    if not alumno or alumno.rol != "alumno":
+    docente = _obtener_solicitante(
+        request, serializer.validated_data.get("docente"), rol="docente"
+    )
+    if not docente or docente.rol != "docente":
         return Response(
-            {"alumno": "El identificador del alumno no es válido."},
+            {"docente": "El identificador del docente no es válido."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    docente = _obtener_usuario_por_id(serializer.validated_data.get("docente"))
-    if not docente or docente.rol != "docente":
+    # El alumno no es quien hace la solicitud: basta con que el docente
+    # (ya identificado) sea su guía, lo que se valida a continuación.
+    alumno = _obtener_usuario_por_id(serializer.validated_data.get("alumno"))
+    if not alumno or alumno.rol != "alumno":
         return Response(
-            {"docente": "El identificador del docente no es válido."},
+            {"alumno": "El identificador del alumno no es válido."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
@@ -2425,7 +2598,9 @@ def cerrar_reunion(request, pk: int):
     serializer = ReunionCerrarSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    docente = _obtener_usuario_por_id(serializer.validated_data.get("docente"))
+    docente = _obtener_solicitante(
+        request, serializer.validated_data.get("docente"), rol="docente"
+    )
     if not docente or docente.rol != "docente":
         return Response(
             {"docente": "El identificador del docente no es válido."},
@@ -2532,6 +2707,7 @@ class DocenteEvaluacionListCreateView(generics.ListCreateAPIView):
             )
             .order_by("grupo_nombre", "-fecha", "-created_at")
         )
+        queryset = EvaluacionGrupoDocenteSerializer.optimizar_queryset(queryset, self.request)
         docente_id = self.request.query_params.get("docente")
         if docente_id in (None, "", "null"):
             return queryset
@@ -2581,12 +2757,56 @@ class DocenteEvaluacionListCreateView(generics.ListCreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def descargar_entregas_evaluacion_zip(request, pk: int):
+    docente = _obtener_solicitante(
+        request, request.query_params.get("docente"), rol="docente"
+    ) or _obtener_solicitante(request, None, rol="coordinador")
+    if not docente or docente.rol not in {"docente", "coordinador"}:
+        return Response(
+            {"detail": "Debes identificarte como el docente de la evaluación."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    evaluacion = get_object_or_404(EvaluacionGrupoDocente, pk=pk)
+    # Coordinación puede descargar las entregas de cualquier evaluación.
+    if docente.rol != "coordinador" and evaluacion.docente_id != docente.pk:
+        return Response(
+            {"detail": "La evaluación no pertenece al docente indicado."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    entregas = list(
+        EvaluacionEntregaAlumno.objects.filter(evaluacion=evaluacion)
+        .select_related("alumno")
+        .order_by("alumno__nombre_completo", "alumno_id", "bitacora_indice", "creado_en")
+    )
+
+    nombre = slugify(f"{evaluacion.grupo_nombre}-{evaluacion.titulo}")[:80] or "entregas"
+    response = StreamingHttpResponse(
+        generar_zip_entregas(entregas),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{nombre}.zip"'
+    response["Cache-Control"] = "no-store"
+    return response
+
+
 class CoordinacionPromediosTituloView(generics.ListAPIView):
+    """Promedios por grupo leídos desde `ResumenNotasGrupo`.
+
+    Filtros opcionales: `docente`, `carrera` y el periodo de la evaluación,
+    ya sea con `periodo=AAAA-1|AAAA-2` (primer o segundo semestre) o con
+    `desde`/`hasta` en formato ISO.
+    """
+
     serializer_class = PromedioGrupoTituloSerializer
 
     def get_queryset(self):
-        return (
-            EvaluacionGrupoDocente.objects.select_related("docente", "tema")
+        queryset = (
+            EvaluacionGrupoDocente.objects.filter(resumen_notas__cantidad_notas__gt=0)
+            .select_related("docente", "tema", "resumen_notas")
             .prefetch_related(
                 Prefetch(
                     "tema__inscripciones",
@@ -2596,14 +2816,62 @@ class CoordinacionPromediosTituloView(generics.ListAPIView):
                     to_attr="inscripciones_activas",
                 )
             )
-            .annotate(
-                promedio_nota=Avg("entregas__nota"),
-                entregas_con_nota=Count("entregas__nota"),
-            )
-            .filter(entregas_con_nota__gt=0)
             .order_by("grupo_nombre")
         )
 
+        params = self.request.query_params
+        docente_param = params.get("docente")
+        if docente_param not in (None, ""):
+            docente_id = _parse_int(docente_param)
+            if docente_id is None:
+                raise ValidationError({"docente": "Identificador de docente inválido."})
+            queryset = queryset.filter(docente_id=docente_id)
+
+        carrera = (params.get("carrera") or "").strip()
+        if carrera:
+            temas = _filtrar_queryset_por_carrera(TemaDisponible.objects.all(), carrera)
+            queryset = queryset.filter(tema__in=temas)
+
+        desde, hasta = _parse_periodo_evaluaciones(params)
+        if desde:
+            queryset = queryset.filter(fecha__gte=desde)
+        if hasta:
+            queryset = queryset.filter(fecha__lte=hasta)
+
+        return queryset
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def estadisticas_notas_titulo(request):
+    return Response(obtener_estadisticas_notas())
+
+
+def _parse_periodo_evaluaciones(params) -> tuple[date | None, date | None]:
+    periodo = (params.get("periodo") or "").strip()
+    if periodo:
+        coincidencia = re.fullmatch(r"(\d{4})-([12])", periodo)
+        if not coincidencia:
+            raise ValidationError(
+                {"periodo": "Usa el formato AAAA-1 o AAAA-2 para el semestre."}
+            )
+        anio = int(coincidencia.group(1))
+        if coincidencia.group(2) == "1":
+            return date(anio, 1, 1), date(anio, 6, 30)
+        return date(anio, 7, 1), date(anio, 12, 31)
+
+    limites = []
+    for nombre in ("desde", "hasta"):
+        valor = (params.get(nombre) or "").strip()
+        if not valor:
+            limites.append(None)
+            continue
+        try:
+            limites.append(date.fromisoformat(valor))
+        except ValueError:
+            raise ValidationError({nombre: "Fecha inválida, usa el formato AAAA-MM-DD."})
+    return limites[0], limites[1]
+
 
 class AlumnoEvaluacionListView(generics.ListAPIView):
     serializer_class = EvaluacionGrupoDocenteSerializer
@@ -2644,6 +2912,50 @@ class AlumnoEvaluacionListView(generics.ListAPIView):
         return queryset
 
 
+def _parse_bitacora_indice(data) -> int | None:
+    if not data:
+        return None
+    indice_param = data.get("bitacora_indice")
+    try:
+        indice = int(indice_param)
+    except (TypeError, ValueError):
+        return None
+    if indice <= 0:
+        return None
+    return indice
+
+
+def _validar_entrega_alumno(
+    evaluacion: EvaluacionGrupoDocente,
+    alumno_id: int | None,
+    indice_bitacora: int | None,
+) -> None:
+    if not alumno_id:
+        raise ValidationError({"alumno": ["Debes indicar el alumno que realiza la entrega."]})
+
+    if not evaluacion.tema or not evaluacion.tema.inscripciones.filter(
+        alumno_id=alumno_id, activo=True
+    ).exists():
+        raise ValidationError(
+            {
+                "evaluacion": [
+                    "La evaluación seleccionada no pertenece a tu grupo activo."
+                ]
+            }
+        )
+
+    if indice_bitacora:
+        total_requeridas = evaluacion.bitacoras_requeridas or 0
+        if indice_bitacora > total_requeridas:
+            raise ValidationError(
+                {
+                    "bitacora_indice": [
+                        "La bitácora seleccionada no corresponde al plan de esta evaluación.",
+                    ]
+                }
+            )
+
+
 class AlumnoEvaluacionEntregaListCreateView(generics.ListCreateAPIView):
     serializer_class = EvaluacionEntregaAlumnoSerializer
     parser_classes = (MultiPartParser, FormParser)
@@ -2671,31 +2983,8 @@ class AlumnoEvaluacionEntregaListCreateView(generics.ListCreateAPIView):
             pk=self.kwargs.get("pk"),
         )
         alumno_id = self._obtener_alumno_id(usar_post=True)
-        if not alumno_id:
-            raise ValidationError({"alumno": ["Debes indicar el alumno que realiza la entrega."]})
-
-        if not evaluacion.tema or not evaluacion.tema.inscripciones.filter(
-            alumno_id=alumno_id, activo=True
-        ).exists():
-            raise ValidationError(
-                {
-                    "evaluacion": [
-                        "La evaluación seleccionada no pertenece a tu grupo activo."
-                    ]
-                }
-            )
-
-        indice_bitacora = self._obtener_bitacora_indice(serializer.initial_data)
-        if indice_bitacora:
-            total_requeridas = evaluacion.bitacoras_requeridas or 0
-            if indice_bitacora > total_requeridas:
-                raise ValidationError(
-                    {
-                        "bitacora_indice": [
-                            "La bitácora seleccionada no corresponde al plan de esta evaluación.",
-                        ]
-                    }
-                )
+        indice_bitacora = _parse_bitacora_indice(serializer.initial_data)
+        _validar_entrega_alumno(evaluacion, alumno_id, indice_bitacora)
 
         serializer.save(
             evaluacion=evaluacion,
@@ -2704,18 +2993,6 @@ class AlumnoEvaluacionEntregaListCreateView(generics.ListCreateAPIView):
             bitacora_indice=indice_bitacora,
         )
 
-    def _obtener_bitacora_indice(self, data) -> int | None:
-        if not data:
-            return None
-        indice_param = data.get("bitacora_indice")
-        try:
-            indice = int(indice_param)
-        except (TypeError, ValueError):
-            return None
-        if indice <= 0:
-            return None
-        return indice
-
     def _obtener_alumno_id(self, usar_post: bool = False) -> int | None:
         if usar_post:
             fuente = self.request.data
@@ -2741,6 +3018,186 @@ class DocenteEvaluacionEntregaUpdateView(generics.UpdateAPIView):
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     queryset = EvaluacionEntregaAlumno.objects.select_related("evaluacion", "alumno")
 
+    def perform_update(self, serializer):
+        # Dentro de la transacción, `resumen_notas` bloquea la fila antes de
+        # leer la nota anterior y ajusta el resumen de la evaluación.
+        with transaction.atomic():
+            serializer.save()
+
+
+def _respuesta_subida(subida: SubidaEntregaParcial, codigo: int = status.HTTP_200_OK) -> Response:
+    response = Response(SubidaEntregaParcialSerializer(subida).data, status=codigo)
+    response["Upload-Offset"] = str(subida.recibido)
+    return response
+
+
+def _respuesta_error_subida(token, exc: SubidaError) -> Response:
+    recibido = (
+        SubidaEntregaParcial.objects.filter(token=token)
+        .values_list("recibido", flat=True)
+        .first()
+    )
+    response = Response({"detail": exc.mensaje, "recibido": recibido}, status=exc.codigo)
+    if recibido is not None:
+        response["Upload-Offset"] = str(recibido)
+    return response
+
+
+def _obtener_subida_vigente(token):
+    return (
+        SubidaEntregaParcial.objects.filter(token=token, expira_en__gt=timezone.now())
+        .first()
+    )
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+@parser_classes([JSONParser, MultiPartParser, FormParser])
+def iniciar_subida_entrega_alumno(request, pk: int):
+    evaluacion = get_object_or_404(
+        EvaluacionGrupoDocente.objects.select_related("tema"),
+        pk=pk,
+    )
+    serializer = SubidaEntregaParcialCreateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    datos = serializer.validated_data
+
+    titulo = (datos.get("titulo") or "").strip()
+    if not titulo:
+        raise ValidationError({"titulo": ["Este campo es obligatorio."]})
+
+    alumno = _obtener_solicitante(request, request.data.get("alumno"), rol="alumno")
+    alumno_id = alumno.pk if alumno else None
+    indice_bitacora = _parse_bitacora_indice(request.data)
+    _validar_entrega_alumno(evaluacion, alumno_id, indice_bitacora)
+
+    subida = iniciar_subida(
+        campo="archivo",
+        evaluacion=evaluacion,
+        alumno_id=alumno_id,
+        titulo=titulo,
+        comentario=datos.get("comentario"),
+        bitacora_indice=indice_bitacora,
+        nombre_archivo=datos["nombre"],
+        tamano_total=datos["tamano"],
+        sha256=datos["sha256"],
+    )
+    return _respuesta_subida(subida, status.HTTP_201_CREATED)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+@parser_classes([JSONParser, MultiPartParser, FormParser])
+def iniciar_subida_informe_corregido(request, pk: int):
+    entrega = get_object_or_404(
+        EvaluacionEntregaAlumno.objects.select_related("evaluacion"),
+        pk=pk,
+    )
+    serializer = SubidaEntregaParcialCreateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    datos = serializer.validated_data
+
+    subida = iniciar_subida(
+        campo="informe_corregido",
+        evaluacion=entrega.evaluacion,
+        entrega=entrega,
+        alumno_id=entrega.alumno_id,
+        nombre_archivo=datos["nombre"],
+        tamano_total=datos["tamano"],
+        sha256=datos["sha256"],
+    )
+    return _respuesta_subida(subida, status.HTTP_201_CREATED)
+
+
+@api_view(["GET", "PUT", "DELETE"])
+@permission_classes([AllowAny])
+def gestionar_subida_entrega(request, token):
+    subida = _obtener_subida_vigente(token)
+    if subida is None:
+        return Response(
+            {"detail": "La carga no existe o expiró."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    if request.method == "GET":
+        return _respuesta_subida(subida)
+
+    if request.method == "DELETE":
+        descartar_subida(subida)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    desplazamiento = _parse_int(
+        request.headers.get("Upload-Offset") or request.query_params.get("offset")
+    )
+    if desplazamiento is None or desplazamiento < 0:
+        return Response(
+            {"detail": "Debes indicar el desplazamiento del fragmento (Upload-Offset)."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    longitud = _parse_int(request.META.get("CONTENT_LENGTH"))
+    if longitud is None:
+        return Response(
+            {"detail": "Debes indicar el largo del fragmento (Content-Length)."},
+            status=status.HTTP_411_LENGTH_REQUIRED,
+        )
+
+    try:
+        # Se lee el cuerpo directamente; `request.data` lo cargaría completo.
+        subida = escribir_fragmento(token, desplazamiento, request.stream, longitud)
+    except SubidaError as exc:
+        return _respuesta_error_subida(token, exc)
+    return _respuesta_subida(subida)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def finalizar_subida_entrega(request, token):
+    with transaction.atomic():
+        subida = (
+            SubidaEntregaParcial.objects.select_for_update()
+            .filter(token=token, expira_en__gt=timezone.now())
+            .first()
+        )
+        if subida is None:
+            return Response(
+                {"detail": "La carga no existe o expiró."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        try:
+            archivo = abrir_archivo_finalizado(subida)
+        except SubidaError as exc:
+            return _respuesta_error_subida(token, exc)
+
+        with archivo:
+            if subida.campo == "informe_corregido":
+                entrega = subida.entrega
+                entrega.informe_corregido.save(archivo.name, archivo, save=True)
+                serializer = DocenteEvaluacionEntregaUpdateSerializer(
+                    entrega, context={"request": request}
+                )
+                codigo = status.HTTP_200_OK
+            else:
+                entrega = EvaluacionEntregaAlumno(
+                    evaluacion_id=subida.evaluacion_id,
+                    alumno_id=subida.alumno_id,
+                    titulo=subida.titulo,
+                    comentario=subida.comentario,
+                    es_bitacora=bool(subida.bitacora_indice),
+                    bitacora_indice=subida.bitacora_indice,
+                )
+                entrega.archivo.save(archivo.name, archivo, save=False)
+                entrega.save()
+                serializer = EvaluacionEntregaAlumnoSerializer(
+                    entrega, context={"request": request}
+                )
+                codigo = status.HTTP_201_CREATED
+
+        subida.delete()
+
+    return Response(serializer.data, status=codigo)
+
 
 def _docente_en_preferencias(docente_id: int, preferencias) -> bool:
     """Verifica si un docente aparece en el campo `preferencias_docentes`.
@@ -3006,6 +3463,12 @@ def _buscar_coordinador_por_carrera(carrera: str):
     if not carrera:
         return None
 
+    return cache_lecturas.COORDINADORES.obtener(
+        (carrera,), lambda: _consultar_coordinador_por_carrera(carrera)
+    )
+
+
+def _consultar_coordinador_por_carrera(carrera: str):
     qs = Usuario.objects.filter(rol="coordinador")
 
     exacto = qs.filter(carrera__iexact=carrera).order_by("id").first()
@@ -3019,15 +3482,75 @@ def _buscar_coordinador_por_carrera(carrera: str):
 
 
 def _evaluaciones_ids_por_carrera(carrera: str) -> list[int]:
-    evaluaciones = PracticaEvaluacion.objects.only("id", "carrera")
-    return [
-        ev.pk
-        for ev in evaluaciones
-        if _carreras_compatibles(ev.carrera, carrera)
-    ]
+    return cache_lecturas.EVALUACION_PRACTICA.obtener(
+        ("ids", carrera), lambda: _consultar_evaluaciones_ids_por_carrera(carrera)
+    )
+
+
+def _carreras_evaluaciones_practica(carrera: str) -> list[str] | None:
+    return cache_lecturas.EVALUACION_PRACTICA.obtener(
+        ("carreras", carrera),
+        lambda: _carreras_compatibles_en(PracticaEvaluacion.objects.all(), carrera),
+    )
+
+
+def _consultar_evaluaciones_ids_por_carrera(carrera: str) -> list[int]:
+    carreras = _carreras_evaluaciones_practica(carrera)
+    if not carreras:
+        return []
+    return list(
+        PracticaEvaluacion.objects.filter(carrera__in=carreras).values_list("pk", flat=True)
+    )
+
+
+def _filtro_entregas_practica_por_carrera(carrera: str) -> Q:
+    """Entregas de práctica cuya evaluación corresponde a `carrera` (o no tiene)."""
+
+    carreras = _carreras_evaluaciones_practica(carrera) or []
+    return (
+        Q(evaluacion__carrera__iexact=carrera)
+        | Q(evaluacion__carrera__in=carreras)
+        | Q(evaluacion__isnull=True)
+    )
+
+
+def _asignar_empresas_practica(entregas) -> None:
+    """Asigna `empresa` desde la última carta de práctica de cada alumno.
+
+    Una sola consulta para todas las entregas: en PostgreSQL con
+    `DISTINCT ON (alumno_id)`, en otros motores quedándose con la carta más
+    reciente por alumno.
+    """
+
+    alumnos_ids = {entrega.alumno_id for entrega in entregas}
+    if not alumnos_ids:
+        return
+
+    cartas = SolicitudCartaPractica.objects.filter(alumno_id__in=alumnos_ids)
+    if connection.vendor == "postgresql":
+        empresas = dict(
+            cartas.order_by("alumno_id", "-creado_en", "-pk")
+            .distinct("alumno_id")
+            .values_list("alumno_id", "dest_empresa")
+        )
+    else:
+        empresas = {}
+        for alumno_id, empresa in cartas.order_by("alumno_id", "-creado_en", "-pk").values_list(
+            "alumno_id", "dest_empresa"
+        ):
+            empresas.setdefault(alumno_id, empresa)
+
+    for entrega in entregas:
+        entrega.empresa = empresas.get(entrega.alumno_id) or ""
 
 
 def _buscar_evaluacion_practica_por_carrera(carrera: str):
+    return cache_lecturas.EVALUACION_PRACTICA.obtener(
+        ("vigente", carrera), lambda: _consultar_evaluacion_practica_por_carrera(carrera)
+    )
+
+
+def _consultar_evaluacion_practica_por_carrera(carrera: str):
     evaluacion = (
         PracticaEvaluacion.objects.select_related("uploaded_by")
         .filter(carrera__iexact=carrera)
@@ -3131,17 +3654,20 @@ def gestionar_documentos_practica(request):
     if request.method == "GET":
         coordinador_param = request.query_params.get("coordinador")
         carrera_param = request.query_params.get("carrera")
+        filtros: dict[str, Any] | None = None
 
         if coordinador_param:
-            coordinador = _obtener_usuario_por_id(coordinador_param)
+            coordinador = _obtener_solicitante(request, coordinador_param, rol="coordinador")
             if not coordinador or coordinador.rol != "coordinador":
                 return Response(
                     {"detail": "Coordinador no válido."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             queryset = queryset.filter(uploaded_by=coordinador)
+            filtros = {"coordinador": coordinador.pk}
         elif carrera_param:
             queryset = _filtrar_queryset_por_carrera(queryset, carrera_param)
+            filtros = {"carrera": _normalizar_texto(carrera_param)}
         else:
             queryset = queryset.none()
 
@@ -3157,18 +3683,33 @@ def gestionar_documentos_practica(request):
             size = 20
         size = max(1, min(size, 200))
 
-        total = queryset.count()
-        offset = (page - 1) * size
-        items = queryset[offset : offset + size]
+        def pagina():
+            if filtros is None:
+                total, total_exacto = 0, True
+            else:
+                total, total_exacto = contar_total(queryset, filtros)
+            offset = (page - 1) * size
+            items = queryset[offset : offset + size]
+
+            serializer = PracticaDocumentoSerializer(
+                items,
+                many=True,
+                context={"request": request},
+            )
+            return {"items": serializer.data, "total": total, "totalExacto": total_exacto}
 
-        serializer = PracticaDocumentoSerializer(
-            items,
-            many=True,
-            context={"request": request},
-        )
-        return Response({"items": serializer.data, "total": total})
+        if filtros and "carrera" in filtros:
+            # Las URL de los archivos son absolutas: el host forma parte de la clave.
+            datos = cache_lecturas.DOCUMENTOS_PRACTICA.obtener(
+                (filtros["carrera"], page, size, base_absoluta(request)), pagina
+            )
+        else:
+            datos = pagina()
+        return Response(datos)
 
-    coordinador = _obtener_usuario_por_id(request.data.get("coordinador"))
+    coordinador = _obtener_solicitante(
+        request, request.data.get("coordinador"), rol="coordinador"
+    )
     if not coordinador or coordinador.rol != "coordinador":
         return Response(
             {"detail": "Coordinador no válido."},
@@ -3228,7 +3769,7 @@ def eliminar_documento_practica(request, pk: int):
     coordinador_param = request.query_params.get("coordinador") or request.data.get(
         "coordinador"
     )
-    coordinador = _obtener_usuario_por_id(coordinador_param)
+    coordinador = _obtener_solicitante(request, coordinador_param, rol="coordinador")
     if not coordinador or coordinador.rol != "coordinador":
         return Response(
             {"detail": "Coordinador no válido."},
@@ -3257,18 +3798,18 @@ def proxy_firma_coordinador(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cache_firmas = obtener_cache_firmas()
     try:
-        with urllib_request.urlopen(url, timeout=10) as resp:
-            content_type = (resp.headers.get("Content-Type") or "").split(";")[0].lower()
-            data = resp.read()
-    except (urllib_error.URLError, ValueError):  # pragma: no cover - fallo de red externo
-        logger.exception("No se pudo descargar la firma remota")
+        firma = cache_firmas.obtener(url)
+    except FirmaRemotaError as exc:
+        logger.warning("No se pudo descargar la firma remota: %s", exc)
         return Response(
             {"detail": "No se pudo descargar la imagen de la firma."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    detected_type = content_type or ""
+    data = firma["contenido"]
+    detected_type = firma["content_type"] or ""
     if not detected_type.startswith("image/"):
         kind = imghdr.what(None, h=data)
         if kind:
@@ -3279,8 +3820,18 @@ def proxy_firma_coordinador(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-    response = HttpResponse(data, content_type=detected_type)
-    response["Cache-Control"] = "no-store"
+    etag = f'"{firma["hash"]}"'
+    max_age = cache_firmas.segundos_vigencia(firma)
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(data, content_type=detected_type)
+
+    response["ETag"] = etag
+    response["Cache-Control"] = f"private, max-age={max_age}"
+    if firma.get("last_modified"):
+        response["Last-Modified"] = firma["last_modified"]
     return response
 
 
@@ -3291,7 +3842,7 @@ def gestionar_firma_coordinador_practica(request):
     coordinador_param = request.query_params.get("coordinador") or request.data.get(
         "coordinador"
     )
-    coordinador = _obtener_usuario_por_id(coordinador_param)
+    coordinador = _obtener_solicitante(request, coordinador_param, rol="coordinador")
     if not coordinador or coordinador.rol != "coordinador":
         return Response(
             {"detail": "Coordinador no válido."},
@@ -3381,7 +3932,7 @@ def gestionar_evaluacion_practica(request):
     coordinador_param = request.query_params.get("coordinador") or request.data.get(
         "coordinador"
     )
-    coordinador = _obtener_usuario_por_id(coordinador_param)
+    coordinador = _obtener_solicitante(request, coordinador_param, rol="coordinador")
     if not coordinador or coordinador.rol != "coordinador":
         return Response(
             {"detail": "Coordinador no válido."},
@@ -3463,7 +4014,7 @@ def obtener_evaluacion_practica(request):
 @parser_classes([MultiPartParser, FormParser])
 def gestionar_entrega_evaluacion_practica(request):
     alumno_param = request.query_params.get("alumno") or request.data.get("alumno")
-    alumno = _obtener_usuario_por_id(alumno_param)
+    alumno = _obtener_solicitante(request, alumno_param, rol="alumno")
     if not alumno or alumno.rol != "alumno":
         return Response(
             {"detail": "Alumno no válido."},
@@ -3477,17 +4028,10 @@ def gestionar_entrega_evaluacion_practica(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    evaluaciones_ids = _evaluaciones_ids_por_carrera(carrera)
-
     if request.method == "GET":
         entrega = (
             PracticaEvaluacionEntrega.objects.select_related("evaluacion")
-            .filter(
-                Q(evaluacion__carrera__iexact=carrera)
-                | Q(evaluacion_id__in=evaluaciones_ids)
-                | Q(evaluacion__isnull=True),
-                alumno=alumno,
-            )
+            .filter(_filtro_entregas_practica_por_carrera(carrera), alumno=alumno)
             .order_by("-created_at")
             .first()
         )
@@ -3505,6 +4049,7 @@ def gestionar_entrega_evaluacion_practica(request):
     evaluacion: PracticaEvaluacion | None = None
 
     if evaluacion_id:
+        evaluaciones_ids = _evaluaciones_ids_por_carrera(carrera)
         evaluacion = (
             PracticaEvaluacion.objects.filter(pk=evaluacion_id)
             .filter(Q(carrera__iexact=carrera) | Q(pk__in=evaluaciones_ids))
@@ -3562,7 +4107,7 @@ def gestionar_entrega_evaluacion_practica(request):
 @permission_classes([AllowAny])
 def listar_entregas_evaluacion_practica(request):
     coordinador_param = request.query_params.get("coordinador")
-    coordinador = _obtener_usuario_por_id(coordinador_param)
+    coordinador = _obtener_solicitante(request, coordinador_param, rol="coordinador")
     if not coordinador or coordinador.rol != "coordinador":
         return Response(
             {"detail": "Coordinador no válido."},
@@ -3576,33 +4121,34 @@ def listar_entregas_evaluacion_practica(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    evaluaciones_ids = _evaluaciones_ids_por_carrera(carrera)
-    alumnos_ids = _filtrar_queryset_por_carrera(
-        Usuario.objects.filter(rol="alumno"), carrera
-    ).values_list("pk", flat=True)
+    entregas = PracticaEvaluacionEntrega.objects.select_related(
+        "alumno", "evaluacion__uploaded_by"
+    ).filter(_filtro_entregas_practica_por_carrera(carrera), alumno__rol="alumno")
+    carreras_alumnos = _carreras_compatibles_en(Usuario.objects.filter(rol="alumno"), carrera)
+    if carreras_alumnos is not None:
+        entregas = entregas.filter(alumno__carrera__in=carreras_alumnos)
 
-    ultima_empresa = (
-        SolicitudCartaPractica.objects.filter(alumno_id=OuterRef("alumno_id"))
-        .order_by("-creado_en")
-        .values("dest_empresa")[:1]
-    )
+    try:
+        page = int(request.query_params.get("page", 1))
+    except (TypeError, ValueError):
+        page = 1
+    page = max(page, 1)
 
-    entregas = (
-        PracticaEvaluacionEntrega.objects.select_related("alumno", "evaluacion")
-        .filter(
-            Q(evaluacion__carrera__iexact=carrera)
-            | Q(evaluacion_id__in=evaluaciones_ids)
-            | Q(evaluacion__isnull=True),
-            alumno_id__in=alumnos_ids,
-        )
-        .annotate(empresa=Subquery(ultima_empresa))
-        .order_by("-created_at")
-    )
+    try:
+        size = int(request.query_params.get("size", 20))
+    except (TypeError, ValueError):
+        size = 20
+    size = max(1, min(size, 200))
+
+    total = entregas.count()
+    offset = (page - 1) * size
+    items = list(entregas.order_by("-created_at", "-pk")[offset : offset + size])
+    _asignar_empresas_practica(items)
 
     serializer = PracticaEvaluacionEntregaCoordinacionSerializer(
-        entregas, many=True, context={"request": request}
+        items, many=True, context={"request": request}
     )
-    return Response({"items": serializer.data})
+    return Response({"items": serializer.data, "total": total})
 
 
 @api_view(["PATCH"])
@@ -3611,7 +4157,7 @@ def actualizar_nota_entrega_practica(request, entrega_id: int):
     coordinador_param = request.query_params.get("coordinador") or request.data.get(
         "coordinador"
     )
-    coordinador = _obtener_usuario_por_id(coordinador_param)
+    coordinador = _obtener_solicitante(request, coordinador_param, rol="coordinador")
     if not coordinador or coordinador.rol != "coordinador":
         return Response(
             {"detail": "Coordinador no válido."},
@@ -3625,16 +4171,9 @@ def actualizar_nota_entrega_practica(request, entrega_id: int):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    evaluaciones_ids = _evaluaciones_ids_por_carrera(carrera)
-
     entrega = (
-        PracticaEvaluacionEntrega.objects.select_related("evaluacion")
-        .filter(
-            Q(evaluacion__carrera__iexact=carrera)
-            | Q(evaluacion_id__in=evaluaciones_ids)
-            | Q(evaluacion__isnull=True),
-            pk=entrega_id,
-        )
+        PracticaEvaluacionEntrega.objects.select_related("alumno", "evaluacion__uploaded_by")
+        .filter(_filtro_entregas_practica_por_carrera(carrera), pk=entrega_id)
         .first()
     )
     if not entrega:
@@ -3647,10 +4186,13 @@ def actualizar_nota_entrega_practica(request, entrega_id: int):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    entrega.nota = nota
-    entrega.save(update_fields=["nota"])
+    if entrega.nota != nota:
+        entrega.nota = nota
+        entrega.save(update_fields=["nota"])
+        invalidar_estadisticas_notas()
 
+    _asignar_empresas_practica([entrega])
     serializer = PracticaEvaluacionEntregaCoordinacionSerializer(
         entrega, context={"request": request}
     )
-    return Response(serializer.data)
\ No newline at end of file
+    return Response(serializer.data)
\ No newline at end of file
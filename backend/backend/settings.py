@@ -28,6 +28,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+# Para ver las métricas de cada respuesta desde las herramientas del navegador.
+CORS_EXPOSE_HEADERS = ['X-Query-Count', 'Server-Timing', 'X-Perfil']
 
 
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
@@ -77,6 +79,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricasMiddleware',
+    'api.middleware.PerfiladoMiddleware',
+    'api.middleware.ConsultasLentasMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,8 +90,63 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.RefrescoEstadosDiarioMiddleware',
 ]
 
+# Recalcula el estado de las evaluaciones en el primer request de cada día
+# (ver api/estados_evaluaciones.py); sin cron conviene activarlo.
+REFRESCAR_ESTADOS_EN_PRIMER_REQUEST = os.getenv('REFRESCAR_ESTADOS_EN_PRIMER_REQUEST', 'False') == 'True'
+
+# Métricas por ruta en /metrics (ver api/metricas.py). Los encabezados
+# X-Query-Count y Server-Timing siguen a DEBUG salvo que se indique otra cosa.
+# /metrics exige METRICAS_TOKEN salvo con DEBUG o METRICAS_PUBLICAS=True.
+METRICAS_HABILITADAS = os.getenv('METRICAS_HABILITADAS', 'True') == 'True'
+METRICAS_ENCABEZADOS = os.getenv('METRICAS_ENCABEZADOS', str(DEBUG)) == 'True'
+METRICAS_TOKEN = os.getenv('METRICAS_TOKEN', '')
+METRICAS_PUBLICAS = os.getenv('METRICAS_PUBLICAS', 'False') == 'True'
+# Perfilado con cProfile (ver api/perfilado.py): sin directorio queda apagado.
+# Se perfilan las solicitudes con X-Perfilar firmado y, al azar, la fracción
+# PERFILADO_MUESTREO (0 a 1) de las demás.
+PERFILADO_DIRECTORIO = os.getenv('PERFILADO_DIRECTORIO', '')
+PERFILADO_MUESTREO = float(os.getenv('PERFILADO_MUESTREO', '0'))
+PERFILADO_FIRMA_DURACION = int(os.getenv('PERFILADO_FIRMA_DURACION', '3600'))
+# Registro de consultas lentas con su plan (ver api/consultas_lentas.py); un
+# umbral de 0 lo apaga. Cada consulta distinta se registra una vez por intervalo.
+CONSULTAS_LENTAS_UMBRAL_MS = float(os.getenv('CONSULTAS_LENTAS_UMBRAL_MS', '500'))
+CONSULTAS_LENTAS_EXPLAIN = os.getenv('CONSULTAS_LENTAS_EXPLAIN', 'True') == 'True'
+CONSULTAS_LENTAS_INTERVALO = int(os.getenv('CONSULTAS_LENTAS_INTERVALO', '300'))
+CONSULTAS_LENTAS_MAX_POR_MINUTO = int(os.getenv('CONSULTAS_LENTAS_MAX_POR_MINUTO', '20'))
+
+# Autenticación con tokens firmados que entrega /api/login (ver api/autenticacion.py).
+# NUM_PROXIES es la cantidad de proxies de confianza delante de Django: con 0
+# la IP del cliente es REMOTE_ADDR y X-Forwarded-For (falsificable) se ignora.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': ['api.autenticacion.TokenFirmadoAuthentication'],
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
+}
+AUTH_TOKEN_DURACION = int(os.getenv('AUTH_TOKEN_DURACION', str(12 * 3600)))
+# Identificar al usuario por parámetro (?alumno=, ?docente=, ...) sin token
+# permite suplantar a cualquiera; solo para clientes que aún no envían el
+# token, y activándolo explícitamente.
+PERMITIR_USUARIO_POR_PARAMETRO = os.getenv('PERMITIR_USUARIO_POR_PARAMETRO', 'False') == 'True'
+
+# Intentos de login permitidos por IP y por correo en cada ventana (segundos);
+# ver api/limites_login.py.
+LOGIN_LIMITAR_INTENTOS = os.getenv('LOGIN_LIMITAR_INTENTOS', 'True') == 'True'
+LOGIN_INTENTOS_IP = int(os.getenv('LOGIN_INTENTOS_IP', '20'))
+LOGIN_INTENTOS_CORREO = int(os.getenv('LOGIN_INTENTOS_CORREO', '5'))
+LOGIN_VENTANA = int(os.getenv('LOGIN_VENTANA', '60'))
+# Resúmenes de usuario en memoria por proceso (ver api/directorio_usuarios.py).
+# Los cambios llegan a los demás procesos por la caché si es compartida
+# (CACHE_BACKEND=redis o archivo); si no, tras DIRECTORIO_USUARIOS_EDAD_MAXIMA.
+DIRECTORIO_USUARIOS_MAX = int(os.getenv('DIRECTORIO_USUARIOS_MAX', '5000'))
+DIRECTORIO_USUARIOS_REVISION = float(os.getenv('DIRECTORIO_USUARIOS_REVISION', '1'))
+DIRECTORIO_USUARIOS_EDAD_MAXIMA = float(os.getenv('DIRECTORIO_USUARIOS_EDAD_MAXIMA', '300'))
+# Lecturas que cambian poco, cacheadas hasta la próxima escritura de sus
+# modelos o por CACHE_LECTURAS_TTL segundos (ver api/cache_lecturas.py).
+CACHE_LECTURAS_ALIAS = os.getenv('CACHE_LECTURAS_ALIAS', 'default')
+CACHE_LECTURAS_TTL = int(os.getenv('CACHE_LECTURAS_TTL', '600'))
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -132,6 +192,26 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND: "locmem" en desarrollo; con varios procesos, "archivo"
+# (CACHE_UBICACION es un directorio) o "redis" (CACHE_UBICACION es la URL del
+# servidor, compatible con Redis; requiere el paquete redis).
+
+backends_cache = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "archivo": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": backends_cache[os.getenv("CACHE_BACKEND", "locmem")],
+        "LOCATION": os.getenv("CACHE_UBICACION", ""),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -169,8 +249,17 @@ USE_TZ = True
 STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# "x-accel-redirect" (nginx) o "x-sendfile" (Apache) delegan la entrega de media.
+MEDIA_ENVIO = os.getenv('MEDIA_ENVIO', '')
+MEDIA_ACCEL_PREFIJO = os.getenv('MEDIA_ACCEL_PREFIJO', '/media-interna/')
+
+# Los archivos subidos se deduplican por contenido (ver api/almacenamiento.py).
+STORAGES = {
+    'default': {'BACKEND': 'api.almacenamiento.AlmacenamientoDeduplicado'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -1,9 +1,13 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from api.descargas import servir_media
+from api.metricas import vista_metricas
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path("metrics", vista_metricas, name="metricas"),
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<ruta>.*)$", servir_media, name="media"),
+]
@@ -1,7 +1,8 @@
 import { ApplicationConfig, provideBrowserGlobalErrorListeners, provideZoneChangeDetection } from '@angular/core';
 import { provideRouter } from '@angular/router';
 import { routes } from './app.routes';
-import { provideHttpClient, withXsrfConfiguration } from '@angular/common/http';
+import { provideHttpClient, withInterceptors, withXsrfConfiguration } from '@angular/common/http';
+import { authTokenInterceptor } from './shared/interceptors/auth-token.interceptor';
 
 
 export const appConfig: ApplicationConfig = {
@@ -10,7 +11,8 @@ export const appConfig: ApplicationConfig = {
     provideZoneChangeDetection({ eventCoalescing: true }),
     provideRouter(routes),
     provideHttpClient(
-      withXsrfConfiguration({ cookieName: 'csrftoken', headerName: 'X-CSRFToken' })
+      withXsrfConfiguration({ cookieName: 'csrftoken', headerName: 'X-CSRFToken' }),
+      withInterceptors([authTokenInterceptor])
     )
   ]
 };
\ No newline at end of file
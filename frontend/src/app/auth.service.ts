@@ -29,7 +29,7 @@ export class AuthService {
   }
 
   logout(): Observable<void> {
-    const storageKeys = ['rol', 'usuario', 'userProfile', 'alumnoRut', 'alumnoCarrera'];
+    const storageKeys = ['rol', 'usuario', 'userProfile', 'alumnoRut', 'alumnoCarrera', 'authToken'];
     for (const key of storageKeys) {
       localStorage.removeItem(key);
       sessionStorage.removeItem(key);
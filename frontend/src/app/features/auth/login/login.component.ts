@@ -4,6 +4,7 @@ import { FormBuilder, FormGroup, ReactiveFormsModule, Validators } from '@angula
 import { Router, RouterLink } from '@angular/router';
 import { HttpClient } from '@angular/common/http';
 import { CurrentUserService } from '../../../shared/services/current-user.service';
+import { AUTH_TOKEN_KEY } from '../../../shared/interceptors/auth-token.interceptor';
 
 interface LoginResponse {
   status: string;
@@ -15,6 +16,7 @@ interface LoginResponse {
   carrera?: string | null;
   id?: number;
   telefono?: string | null;
+  token?: string;
 }
 
 
@@ -54,6 +56,9 @@ export class LoginComponent implements OnInit {
           console.log('login OK:', res);
           localStorage.setItem('rol', res.rol);
           localStorage.setItem('usuario', res.nombre);
+          if (res.token) {
+            localStorage.setItem(AUTH_TOKEN_KEY, res.token);
+          }
 
           this.currentUserService.saveProfile({
             id: res.id ?? null,
@@ -2,6 +2,7 @@ import { CommonModule } from '@angular/common';
 import { Component, ElementRef, ViewChild, inject, signal, computed } from '@angular/core';
 import { FormsModule, ReactiveFormsModule, FormBuilder, Validators } from '@angular/forms';
 import { HttpClient, HttpClientModule } from '@angular/common/http';
+import { firstValueFrom } from 'rxjs';
 import jsPDF from 'jspdf';
 import { CurrentUserService } from '../../../shared/services/current-user.service';
 
@@ -194,6 +195,9 @@ export class PracticasComponent {
   entregasEvaluacion = signal<PracticaEvaluacionEntrega[]>([]);
   entregasEvaluacionLoading = signal(false);
   entregasEvaluacionError = signal<string | null>(null);
+  entregasPage = signal(1);
+  entregasSize = signal(50);
+  entregasTotal = signal(0);
   notasEdicion = signal<Record<number, string | undefined>>({});
   guardandoNotas = signal<Record<number, boolean>>({});
   notaErrores = signal<Record<number, string | null>>({});
@@ -624,54 +628,95 @@ export class PracticasComponent {
   cargarEntregasEvaluacion() {
     if (this.coordinadorId === null) {
       this.entregasEvaluacion.set([]);
+      this.entregasTotal.set(0);
       return;
     }
 
     this.entregasEvaluacionLoading.set(true);
     this.entregasEvaluacionError.set(null);
 
-    this.http
-      .get<{ items: PracticaEvaluacionEntrega[] }>(
-        '/api/coordinacion/practicas/evaluacion/entregas/',
-        {
-          params: { coordinador: String(this.coordinadorId) },
-        }
-      )
-      .subscribe({
-        next: (res) => {
-          const items = Array.isArray(res.items) ? res.items : [];
-          const mapped = items.map((item) => ({
-            id: item.id,
-            createdAt: item.createdAt || (item as any).created_at || '',
-            nota: item.nota ?? '',
-            archivoUrl: item.archivoUrl || (item as any).archivo_url || null,
-            archivoNombre: item.archivoNombre || (item as any).archivo_nombre || '',
-            empresa: item.empresa || '',
-            alumno: item.alumno || null,
-            evaluacion: item.evaluacion,
-          }));
+    this.pedirEntregasEvaluacion(this.entregasPage(), this.entregasSize()).subscribe({
+      next: (res) => {
+        const items = Array.isArray(res.items) ? res.items : [];
+        const mapped = items.map((item) => this.mapearEntregaEvaluacion(item));
 
-          const notas: Record<number, string> = {};
-          const errores: Record<number, string | null> = {};
+        const notas: Record<number, string> = {};
+        const errores: Record<number, string | null> = {};
 
-          mapped.forEach((m) => {
-            notas[m.id] = m.nota || '';
-            errores[m.id] = null; // sin error al inicio
-          });
+        mapped.forEach((m) => {
+          notas[m.id] = m.nota || '';
+          errores[m.id] = null; // sin error al inicio
+        });
 
-          this.entregasEvaluacion.set(mapped);
-          this.notasEdicion.set(notas);
-          this.notaErrores.set(errores);
-          this.entregasEvaluacionLoading.set(false);
-        },
-        error: () => {
-          this.entregasEvaluacionError.set(
-            'No se pudieron cargar las entregas de los alumnos.'
-          );
-          this.entregasEvaluacion.set([]);
-          this.entregasEvaluacionLoading.set(false);
+        this.entregasEvaluacion.set(mapped);
+        this.entregasTotal.set(Number(res.total) || 0);
+        this.notasEdicion.set(notas);
+        this.notaErrores.set(errores);
+        this.entregasEvaluacionLoading.set(false);
+      },
+      error: () => {
+        this.entregasEvaluacionError.set(
+          'No se pudieron cargar las entregas de los alumnos.'
+        );
+        this.entregasEvaluacion.set([]);
+        this.entregasTotal.set(0);
+        this.entregasEvaluacionLoading.set(false);
+      },
+    });
+  }
+
+  entregasNextPage() {
+    if (this.entregasPage() * this.entregasSize() < this.entregasTotal()) {
+      this.entregasPage.update((v) => v + 1);
+      this.cargarEntregasEvaluacion();
+    }
+  }
+
+  entregasPrevPage() {
+    if (this.entregasPage() > 1) {
+      this.entregasPage.update((v) => v - 1);
+      this.cargarEntregasEvaluacion();
+    }
+  }
+
+  private pedirEntregasEvaluacion(page: number, size: number) {
+    return this.http.get<{ items: PracticaEvaluacionEntrega[]; total: number }>(
+      '/api/coordinacion/practicas/evaluacion/entregas/',
+      {
+        params: {
+          coordinador: String(this.coordinadorId),
+          page: String(page),
+          size: String(size),
         },
-      });
+      }
+    );
+  }
+
+  private mapearEntregaEvaluacion(item: PracticaEvaluacionEntrega): PracticaEvaluacionEntrega {
+    return {
+      id: item.id,
+      createdAt: item.createdAt || (item as any).created_at || '',
+      nota: item.nota ?? '',
+      archivoUrl: item.archivoUrl || (item as any).archivo_url || null,
+      archivoNombre: item.archivoNombre || (item as any).archivo_nombre || '',
+      empresa: item.empresa || '',
+      alumno: item.alumno || null,
+      evaluacion: item.evaluacion,
+    };
+  }
+
+  // El CSV incluye todas las entregas, no solo la página visible.
+  private async obtenerTodasLasEntregas(): Promise<PracticaEvaluacionEntrega[]> {
+    const size = 200;
+    const todas: PracticaEvaluacionEntrega[] = [];
+    for (let page = 1; ; page++) {
+      const res = await firstValueFrom(this.pedirEntregasEvaluacion(page, size));
+      const items = Array.isArray(res.items) ? res.items : [];
+      todas.push(...items.map((item) => this.mapearEntregaEvaluacion(item)));
+      if (!items.length || page * size >= (Number(res.total) || 0)) {
+        return todas;
+      }
+    }
   }
 
   onEvaluacionSeleccionada(event: Event) {
@@ -848,8 +893,14 @@ export class PracticasComponent {
     this.notasEdicion.update((prev) => ({ ...prev, [entregaId]: nota }));
   }
 
-  descargarCsvEntregas() {
-    const filas = this.entregasEvaluacion();
+  async descargarCsvEntregas() {
+    let filas: PracticaEvaluacionEntrega[];
+    try {
+      filas = await this.obtenerTodasLasEntregas();
+    } catch {
+      this.toast.set('No se pudieron obtener las entregas para exportar.');
+      return;
+    }
     if (!filas.length) {
       this.toast.set('No hay entregas para exportar.');
       return;
@@ -0,0 +1,27 @@
+import { HttpErrorResponse, HttpInterceptorFn } from '@angular/common/http';
+import { catchError, throwError } from 'rxjs';
+
+export const AUTH_TOKEN_KEY = 'authToken';
+
+/**
+ * Adjunta el token entregado por /api/login a cada solicitud. Si el backend
+ * lo rechaza (401), se descarta para no seguir enviando un token vencido.
+ */
+export const authTokenInterceptor: HttpInterceptorFn = (req, next) => {
+  const token = localStorage.getItem(AUTH_TOKEN_KEY);
+  if (!token || req.headers.has('Authorization')) {
+    return next(req);
+  }
+  return next(req.clone({ setHeaders: { Authorization: `Bearer ${token}` } })).pipe(
+    catchError((error: unknown) => {
+      if (
+        error instanceof HttpErrorResponse &&
+        error.status === 401 &&
+        localStorage.getItem(AUTH_TOKEN_KEY) === token
+      ) {
+        localStorage.removeItem(AUTH_TOKEN_KEY);
+      }
+      return throwError(() => error);
+    })
+  );
+};